@@ -28,40 +28,32 @@
 #
 #
 
-import os
 from abc import abstractmethod
 
-from tvb.adapters.analyzers.matlab_worker import MatlabWorker
 from tvb.adapters.datatypes.db.connectivity import ConnectivityIndex
 from tvb.adapters.datatypes.db.graph import ConnectivityMeasureIndex
 from tvb.adapters.datatypes.db.mapped_value import ValueWrapperIndex
 from tvb.adapters.datatypes.h5.mapped_value_h5 import ValueWrapper
-from tvb.basic.profile import TvbProfile
+from tvb.analyzers import graph_metrics
 from tvb.core.adapters.abcadapter import ABCAdapterForm, ABCAdapter
 from tvb.core.entities.filters.chain import FilterChain
 from tvb.core.entities.model.model_operation import AlgorithmTransientGroup
 from tvb.core.neocom import h5
 from tvb.core.neotraits.forms import TraitDataTypeSelectField
 from tvb.core.neotraits.view_model import ViewModel, DataTypeGidAttr
-from tvb.core.utils import extract_matlab_doc_string
 from tvb.datatypes.connectivity import Connectivity
 from tvb.datatypes.graph import ConnectivityMeasure
 
 BCT_GROUP_MODULARITY = AlgorithmTransientGroup("Modularity Algorithms", "Brain Connectivity Toolbox", "bct")
 BCT_GROUP_DISTANCE = AlgorithmTransientGroup("Distance Algorithms", "Brain Connectivity Toolbox", "bctdistance")
 
-BCT_PATH = os.path.join(TvbProfile.current.EXTERNALS_FOLDER_PARENT, "externals/BCT")
-BCT_PATH_ENV = 'BCT_PATH'
-if BCT_PATH_ENV in os.environ and os.path.exists(os.environ[BCT_PATH_ENV]) and os.path.isdir(os.environ[BCT_PATH_ENV]):
-    BCT_PATH = os.environ[BCT_PATH_ENV]
-
 LABEL_CONNECTIVITY_BINARY = "Binary (directed/undirected) connection matrix"
 LABEL_CONN_WEIGHTED_DIRECTED = "Weighted directed connection matrix"
 LABEL_CONN_WEIGHTED_UNDIRECTED = "Weighted undirected connection matrix"
 
 
-def bct_description(mat_file_name):
-    return extract_matlab_doc_string(os.path.join(BCT_PATH, mat_file_name))
+def bct_description(measure):
+    return graph_metrics.describe(measure).replace("\n", "<br/>")
 
 
 class BaseBCTModel(ViewModel):
@@ -103,17 +95,11 @@ class BaseUnidirectedBCTForm(BaseBCTForm):
 
 class BaseBCT(ABCAdapter):
     """
-    Interface between Brain Connectivity Toolbox of Olaf Sporns and TVB Framework.
-    This adapter requires BCT deployed locally, and Matlab or Octave installed separately of TVB.
+    Interface between the measures of the Brain Connectivity Toolbox of Olaf Sporns and TVB Framework.
+    The measures are computed in process, by tvb.analyzers.graph_metrics.
     """
-
-    def __init__(self):
-        ABCAdapter.__init__(self)
-        self.matlab_worker = MatlabWorker()
-
-    @staticmethod
-    def can_be_active():
-        return not not TvbProfile.current.MATLAB_EXECUTABLE
+    # Names of the graph measures computed, from tvb.analyzers.graph_metrics.MEASURES
+    _measures = ()
 
     def get_form_class(self):
         return BaseBCTForm
@@ -131,13 +117,10 @@ class BaseBCT(ABCAdapter):
     def get_connectivity(self, view_model):
         return self.load_traited_by_gid(view_model.connectivity)
 
-    def execute_matlab(self, matlab_code, data):
-        self.matlab_worker.add_to_path(BCT_PATH)
-        self.log.info("Starting execution of MATLAB code:" + matlab_code)
-        runcode, matlablog, result = self.matlab_worker.matlab(matlab_code, data=data, work_dir=self.storage_path)
-        self.log.debug("Code run in MATLAB: " + str(runcode))
-        self.log.debug("MATLAB log: " + str(matlablog))
-        self.log.debug("Finished MATLAB execution:" + str(result))
+    def compute_measures(self, matrix):
+        self.log.info("Computing graph measures: " + ", ".join(self._measures))
+        result = graph_metrics.compute_measures(matrix, self._measures)
+        self.log.debug("Finished computing graph measures: " + ", ".join(result))
         return result
 
     def build_connectivity_measure(self, result, key, connectivity, title="", label_x="", label_y=""):
@@ -186,16 +169,15 @@ class ModularityOCSM(BaseBCT):
     _ui_group = BCT_GROUP_MODULARITY
 
     _ui_name = "Compute optimal Community Structure and Modularity from a Directed (weighted or binary) connection matrix:"
-    _ui_description = bct_description("modularity_dir.m")
-    _matlab_code = "[Ci,Q] = modularity_dir(CW);"
+    _ui_description = bct_description("modularity_dir")
+    _measures = ("modularity_dir",)
 
     def launch(self, view_model):
         # Prepare parameters
         connectivity = self.get_connectivity(view_model)
-        data = {'CW': connectivity.weights}
 
-        # Execute the matlab code
-        result = self.execute_matlab(self._matlab_code, data=data)
+        # Compute the measures
+        result = self.compute_measures(connectivity.weights)
         # Gather results
         measure = self.build_connectivity_measure(result, 'Ci', connectivity, "Optimal Community Structure")
         value = self.build_float_value_wrapper(result, 'Q', title="Maximized Modularity")
@@ -206,8 +188,8 @@ class ModularityOpCSMU(ModularityOCSM):
     """
     """
     _ui_name = "Optimal Community Structure and Modularity (Undirected):"
-    _ui_description = bct_description("modularity_und.m")
-    _matlab_code = "[Ci,Q] = modularity_und(CW);"
+    _ui_description = bct_description("modularity_und")
+    _measures = ("modularity_und",)
 
 
 class DistanceDBIN(BaseBCT):
@@ -216,14 +198,12 @@ class DistanceDBIN(BaseBCT):
     _ui_group = BCT_GROUP_DISTANCE
 
     _ui_name = "Distance binary matrix"
-    _ui_description = bct_description("distance_bin.m")
-    _matlab_code = "D = distance_bin(A);"
+    _ui_description = bct_description("distance_bin")
+    _measures = ("distance_bin",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure = self.build_connectivity_measure(result, 'D', connectivity, "Distance matrix")
         return [measure]
 
@@ -232,22 +212,20 @@ class DistanceDWEI(DistanceDBIN):
     """
     """
     _ui_name = "Distance weighted matrix over a Weighted (directed/undirected) connection matrix"
-    _ui_description = bct_description("distance_wei.m")
-    _matlab_code = "D = distance_wei(A);"
+    _ui_description = bct_description("distance_wei")
+    _measures = ("distance_wei",)
 
 
 class DistanceRDM(DistanceDBIN):
     """
     """
     _ui_name = "Reachability and distance matrices (Breadth-first search)"
-    _ui_description = bct_description("breadthdist.m")
-    _matlab_code = "[R,D] = breadthdist(A);"
+    _ui_description = bct_description("breadthdist")
+    _measures = ("breadthdist",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
 
         measure1 = self.build_connectivity_measure(result, 'R', connectivity, "Reachability matrix")
         measure2 = self.build_connectivity_measure(result, 'D', connectivity, "Distance matrix")
@@ -258,24 +236,54 @@ class DistanceRDA(DistanceRDM):
     """
     """
     _ui_name = "Reachability and distance matrices (Algebraic path count)"
-    _ui_description = bct_description("reachdist.m")
-    _matlab_code = "[R,D] = reachdist(A);"
+    _ui_description = bct_description("reachdist")
+    _measures = ("reachdist",)
 
 
 class DistanceNETW(DistanceDBIN):
     """
     """
     _ui_name = "Network walks"
-    _ui_description = bct_description("findwalks.m")
-    _matlab_code = "[Wq,twalk,wlq]  = findwalks(A);"
+    _ui_description = bct_description("findwalks")
+    _measures = ("findwalks",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
 
         measure1 = self.build_connectivity_measure(result, 'Wq', connectivity, "3D matrix")
         measure2 = self.build_connectivity_measure(result, 'wlq', connectivity, "Walk length distribution")
         value = self.build_float_value_wrapper(result, 'twalk', title="Total number of walks found")
         return [measure1, value, measure2]
+
+
+class EfficiencyBIN(DistanceDBIN):
+    """
+    """
+    _ui_name = "Global and local efficiency: " + LABEL_CONNECTIVITY_BINARY
+    _ui_description = bct_description("efficiency_bin")
+    _measures = ("efficiency_bin",)
+
+    def launch(self, view_model):
+        connectivity = self.get_connectivity(view_model)
+        result = self.compute_measures(connectivity.weights)
+
+        value = self.build_float_value_wrapper(result, 'Eglob', title="Global efficiency")
+        measure = self.build_connectivity_measure(result, 'Eloc', connectivity, "Local efficiency", "Nodes")
+        return [value, measure]
+
+
+class EfficiencyWEI(EfficiencyBIN):
+    """
+    """
+    _ui_name = "Global and local efficiency: Weighted (directed/undirected) connection matrix"
+    _ui_description = bct_description("efficiency_wei")
+    _measures = ("efficiency_wei",)
+
+    def launch(self, view_model):
+        connectivity = self.get_connectivity(view_model)
+        result = self.compute_measures(connectivity.scaled_weights())
+
+        value = self.build_float_value_wrapper(result, 'Eglob', title="Global efficiency")
+        measure = self.build_connectivity_measure(result, 'Eloc', connectivity, "Local efficiency", "Nodes")
+        return [value, measure]
@@ -39,14 +39,12 @@ class CentralityNodeBinary(BaseBCT):
     _ui_group = BCT_GROUP_CENTRALITY
 
     _ui_name = "Node Betweenness Centrality Binary: " + LABEL_CONNECTIVITY_BINARY
-    _ui_description = bct_description("betweenness_bin.m")
-    _matlab_code = "C = betweenness_bin(A);"
+    _ui_description = bct_description("betweenness_bin")
+    _measures = ("betweenness_bin",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure_index = self.build_connectivity_measure(result, 'C', connectivity,
                                                   "Node Betweenness Centrality Binary", "Nodes")
         return [measure_index]
@@ -57,14 +55,12 @@ class CentralityNodeWeighted(BaseBCT):
     _ui_group = BCT_GROUP_CENTRALITY
 
     _ui_name = "Node Betweenness Centrality Weighted: Weighted (directed/undirected)  connection matrix"
-    _ui_description = bct_description("betweenness_wei.m")
-    _matlab_code = "C = betweenness_wei(A);"
+    _ui_description = bct_description("betweenness_wei")
+    _measures = ("betweenness_wei",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure_index = self.build_connectivity_measure(result, 'C', connectivity,
                                                   "Node Betweenness Centrality Weighted", "Nodes")
         return [measure_index]
@@ -74,15 +70,13 @@ class CentralityEdgeBinary(CentralityNodeBinary):
     """
     """
     _ui_name = "Edge Betweenness Centrality Weighted"
-    _ui_description = bct_description("edge_betweenness_bin.m")
-    _matlab_code = "[EBC,BC] = edge_betweenness_bin(A);"
+    _ui_description = bct_description("edge_betweenness_bin")
+    _measures = ("edge_betweenness_bin",)
 
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure_index1 = self.build_connectivity_measure(result, 'EBC', connectivity, "Edge Betweenness Centrality Matrix")
         measure_index2 = self.build_connectivity_measure(result, 'BC', connectivity, "Node Betweenness Centrality Vector")
         return [measure_index1, measure_index2]
@@ -92,15 +86,13 @@ class CentralityEdgeWeighted(CentralityNodeWeighted):
     """
     """
     _ui_name = "Edge Betweenness Centrality Weighted"
-    _ui_description = bct_description("edge_betweenness_wei.m")
-    _matlab_code = "[EBC,BC] = edge_betweenness_wei(A);"
+    _ui_description = bct_description("edge_betweenness_wei")
+    _measures = ("edge_betweenness_wei",)
 
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure_index1 = self.build_connectivity_measure(result, 'EBC', connectivity, "Edge Betweenness Centrality Matrix")
         measure_index2 = self.build_connectivity_measure(result, 'BC', connectivity, "Node Betweenness Centrality Vector")
         return [measure_index1, measure_index2]
@@ -112,15 +104,13 @@ class CentralityEigenVector(BaseUndirected):
     _ui_group = BCT_GROUP_CENTRALITY
 
     _ui_name = "EigenVector Centrality"
-    _ui_description = bct_description("eigenvector_centrality_und.m")
-    _matlab_code = "v = eigenvector_centrality_und(CIJ)"
+    _ui_description = bct_description("eigenvector_centrality_und")
+    _measures = ("eigenvector_centrality_und",)
 
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'CIJ': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure_index = self.build_connectivity_measure(result, 'v', connectivity, "Eigen vector centrality")
         return [measure_index]
 
@@ -130,14 +120,12 @@ class CentralityKCoreness(BaseUndirected):
     _ui_group = BCT_GROUP_CENTRALITY
 
     _ui_name = "K-coreness centrality BU: " + LABEL_CONNECTIVITY_BINARY
-    _ui_description = bct_description("kcoreness_centrality_bu.m")
-    _matlab_code = "[coreness, kn] = kcoreness_centrality_bu(CIJ);"
+    _ui_description = bct_description("kcoreness_centrality_bu")
+    _measures = ("kcoreness_centrality_bu",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'CIJ': connectivity.binarized_weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.binarized_weights)
         measure_index1 = self.build_connectivity_measure(result, 'coreness', connectivity, "Node coreness BU")
         measure_index2 = self.build_connectivity_measure(result, 'kn', connectivity, "Size of k-core")
         return [measure_index1, measure_index2]
@@ -147,15 +135,13 @@ class CentralityKCorenessBD(CentralityNodeBinary):
     """
     """
     _ui_name = "K-coreness centrality BD"
-    _ui_description = bct_description("kcoreness_centrality_bd.m")
-    _matlab_code = "[coreness, kn] = kcoreness_centrality_bd(CIJ);"
+    _ui_description = bct_description("kcoreness_centrality_bd")
+    _measures = ("kcoreness_centrality_bd",)
 
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'CIJ': connectivity.binarized_weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.binarized_weights)
         measure_index1 = self.build_connectivity_measure(result, 'coreness', connectivity, "Node coreness BD")
         measure_index2 = self.build_connectivity_measure(result, 'kn', connectivity, "Size of k-core")
         return [measure_index1, measure_index2]
@@ -165,14 +151,12 @@ class CentralityShortcuts(CentralityNodeBinary):
     """
 
     _ui_name = "Centrality Shortcuts: Binary directed connection matrix"
-    _ui_description = bct_description("erange.m")
-    _matlab_code = "[Erange,eta,Eshort,fs]  = erange(A);"
+    _ui_description = bct_description("erange")
+    _measures = ("erange",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.binarized_weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.binarized_weights)
 
         measure_index1 = self.build_connectivity_measure(result, 'Erange', connectivity, "Range for each edge")
         value1 = self.build_int_value_wrapper(result, 'eta', "Average range for entire graph")
@@ -185,14 +169,12 @@ class FlowCoefficients(CentralityNodeBinary):
     """
     """
     _ui_name = "Node-wise flow coefficients"
-    _ui_description = bct_description("flow_coef_bd.m")
-    _matlab_code = "[fc,FC,total_flo] = flow_coef_bd(CIJ);"
+    _ui_description = bct_description("flow_coef_bd")
+    _measures = ("flow_coef_bd",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'CIJ': connectivity.binarized_weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.binarized_weights)
 
         measure_index1 = self.build_connectivity_measure(result, 'fc', connectivity, "Flow coefficient for each node")
         value1 = self.build_float_value_wrapper(result, 'FC', "Average flow coefficient over the network")
@@ -206,14 +188,12 @@ class ParticipationCoefficient(BaseBCT):
     _ui_group = BCT_GROUP_CENTRALITY
 
     _ui_name = "Participation Coefficient: Binary/weighted, directed/undirected connection matrix"
-    _ui_description = bct_description("participation_coef.m")
-    _matlab_code = "[Ci, Q]=modularity_dir(W); P = participation_coef(W, Ci);"
+    _ui_description = bct_description("participation_coef")
+    _measures = ("participation_coef",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'W': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
 
         measure_index = self.build_connectivity_measure(result, 'P', connectivity, "Participation Coefficient")
         return [measure_index]
@@ -223,15 +203,13 @@ class ParticipationCoefficientSign(ParticipationCoefficient):
     """
     """
     _ui_name = "Participation Coefficient Sign"
-    _ui_description = bct_description("participation_coef_sign.m")
-    _matlab_code = "[Ci, Q]=modularity_dir(W); [Ppos, Pneg] = participation_coef_sign(W, Ci);"
+    _ui_description = bct_description("participation_coef_sign")
+    _measures = ("participation_coef_sign",)
 
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'W': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
 
         measure_index1 = self.build_connectivity_measure(result, 'Ppos', connectivity,
                                                    "Participation Coefficient from positive weights")
@@ -244,14 +222,12 @@ class SubgraphCentrality(CentralityNodeBinary):
     """
 
     _ui_name = "Subgraph centrality of a network: Adjacency matrix (binary)"
-    _ui_description = bct_description("subgraph_centrality.m")
-    _matlab_code = "Cs = subgraph_centrality(CIJ);"
+    _ui_description = bct_description("subgraph_centrality")
+    _measures = ("subgraph_centrality",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'CIJ': connectivity.binarized_weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.binarized_weights)
 
         measure_index = self.build_connectivity_measure(result, 'Cs', connectivity, "Subgraph Centrality")
         return [measure_index]
@@ -40,14 +40,12 @@ class ClusteringCoefficient(BaseBCT):
     _ui_group = BCT_GROUP_CLUSTERING
 
     _ui_name = "Clustering Coefficient BD: Binary directed connection matrix"
-    _ui_description = bct_description("clustering_coef_bd.m")
-    _matlab_code = "C = clustering_coef_bd(A);"
+    _ui_description = bct_description("clustering_coef_bd")
+    _measures = ("clustering_coef_bd",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure_index = self.build_connectivity_measure(result, 'C', connectivity, "Clustering Coefficient BD")
         return [measure_index]
 
@@ -58,14 +56,12 @@ class ClusteringCoefficientBU(BaseUndirected):
     _ui_group = BCT_GROUP_CLUSTERING
 
     _ui_name = "Clustering Coefficient BU"
-    _ui_description = bct_description("clustering_coef_bu.m")
-    _matlab_code = "C = clustering_coef_bu(A);"
+    _ui_description = bct_description("clustering_coef_bu")
+    _measures = ("clustering_coef_bu",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure_index = self.build_connectivity_measure(result, 'C', connectivity, "Clustering Coefficient BU")
         return [measure_index]
 
@@ -75,14 +71,12 @@ class ClusteringCoefficientWU(BaseUndirected):
     _ui_group = BCT_GROUP_CLUSTERING
 
     _ui_name = "Clustering Coeficient WU: " + LABEL_CONN_WEIGHTED_UNDIRECTED
-    _ui_description = bct_description("clustering_coef_wu.m")
-    _matlab_code = "C = clustering_coef_wu(A);"
+    _ui_description = bct_description("clustering_coef_wu")
+    _measures = ("clustering_coef_wu",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.scaled_weights()}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.scaled_weights())
         measure_index = self.build_connectivity_measure(result, 'C', connectivity, "Clustering Coefficient WU")
         return [measure_index]
 
@@ -90,14 +84,12 @@ class ClusteringCoefficientWD(ClusteringCoefficient):
     """
     """
     _ui_name = "Clustering Coeficient WD: " + LABEL_CONN_WEIGHTED_DIRECTED
-    _ui_description = bct_description("clustering_coef_wd.m")
-    _matlab_code = "C = clustering_coef_wd(A);"
+    _ui_description = bct_description("clustering_coef_wd")
+    _measures = ("clustering_coef_wd",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.scaled_weights()}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.scaled_weights())
         measure_index = self.build_connectivity_measure(result, 'C', connectivity, "Clustering Coefficient WD")
         return [measure_index]
 
@@ -107,14 +99,12 @@ class TransitivityBinaryDirected(BaseBCT):
     _ui_group = BCT_GROUP_CLUSTERING
 
     _ui_name = "Transitivity Binary Directed: Binary directed connection matrix"
-    _ui_description = bct_description("transitivity_bd.m")
-    _matlab_code = "T = transitivity_bd(A);"
+    _ui_description = bct_description("transitivity_bd")
+    _measures = ("transitivity_bd",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         value = self.build_float_value_wrapper(result, 'T', "Transitivity Binary Directed")
         return [value]
 
@@ -122,14 +112,12 @@ class TransitivityWeightedDirected(TransitivityBinaryDirected):
     """
     """
     _ui_name = "Transitivity Weighted Directed: " + LABEL_CONN_WEIGHTED_DIRECTED
-    _ui_description = bct_description("transitivity_wd.m")
-    _matlab_code = "T = transitivity_wd(A);"
+    _ui_description = bct_description("transitivity_wd")
+    _measures = ("transitivity_wd",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.scaled_weights()}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.scaled_weights())
         value = self.build_float_value_wrapper(result, 'T', "Transitivity Weighted Directed")
         return [value]
 
@@ -140,14 +128,12 @@ class TransitivityBinaryUnDirected(BaseUndirected):
     _ui_group = BCT_GROUP_CLUSTERING
 
     _ui_name = "Transitivity Binary Undirected"
-    _ui_description = bct_description("transitivity_bu.m")
-    _matlab_code = "T = transitivity_bu(A);"
+    _ui_description = bct_description("transitivity_bu")
+    _measures = ("transitivity_bu",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         value = self.build_float_value_wrapper(result, 'T', "Transitivity Binary Undirected")
         return [value]
 
@@ -155,13 +141,11 @@ class TransitivityWeightedUnDirected(TransitivityBinaryUnDirected):
     """
     """
     _ui_name = "Transitivity Weighted undirected: " + LABEL_CONN_WEIGHTED_UNDIRECTED
-    _ui_description = bct_description("transitivity_wu.m")
-    _matlab_code = "T = transitivity_wu(A);"
+    _ui_description = bct_description("transitivity_wu")
+    _measures = ("transitivity_wu",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.scaled_weights()}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.scaled_weights())
         value = self.build_float_value_wrapper(result, 'T', "Transitivity Weighted Undirected")
         return [value]
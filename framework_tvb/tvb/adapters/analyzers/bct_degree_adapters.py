@@ -41,14 +41,12 @@ class Degree(BaseBCT):
     _ui_group = BCT_GROUP_DEGREE
 
     _ui_name = "Degree: Undirected (binary/weighted) connection matrix"
-    _ui_description = bct_description("degrees_und.m")
-    _matlab_code = "deg = degrees_und(CIJ);"
+    _ui_description = bct_description("degrees_und")
+    _measures = ("degrees_und",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'CIJ': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure_index = self.build_connectivity_measure(result, 'deg', connectivity, "Node degree")
         return [measure_index]
 
@@ -58,14 +56,12 @@ class DegreeIOD(Degree):
     """
 
     _ui_name = "Indegree and outdegree: Directed (binary/weighted) connection matrix"
-    _ui_description = bct_description("degrees_dir.m")
-    _matlab_code = "[id,od,deg] = degrees_dir(CIJ);"
+    _ui_description = bct_description("degrees_dir")
+    _measures = ("degrees_dir",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'CIJ': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure_index1 = self.build_connectivity_measure(result, 'id', connectivity, "Node indegree")
         measure_index2 = self.build_connectivity_measure(result, 'od', connectivity, "Node outdegree")
         measure_index3 = self.build_connectivity_measure(result, 'deg', connectivity,
@@ -77,14 +73,12 @@ class JointDegree(Degree):
     """
     """
     _ui_name = "Joint Degree"
-    _ui_description = bct_description("jdegree.m")
-    _matlab_code = "[J,J_od,J_id,J_bl] = jdegree(CIJ);"
+    _ui_description = bct_description("jdegree")
+    _measures = ("jdegree",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'CIJ': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure_index = self.build_connectivity_measure(result, 'J', connectivity,
                                                         "Joint Degree JOD=" + str(result['J_od']) +
                                                         ", JID=" + str(result['J_id']) +
@@ -100,14 +94,12 @@ class MatchingIndex(Degree):
     """
     """
     _ui_name = "Matching Index: Connection/adjacency matrix"
-    _ui_description = bct_description("matching_ind.m")
-    _matlab_code = "[Min,Mout,Mall] = matching_ind(CIJ);"
+    _ui_description = bct_description("matching_ind")
+    _measures = ("matching_ind",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'CIJ': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure_index1 = self.build_connectivity_measure(result, 'Min', connectivity,
                                                          "Matching index for incoming connections")
         measure_index2 = self.build_connectivity_measure(result, 'Mout', connectivity,
@@ -121,14 +113,12 @@ class Strength(Degree):
     """
     """
     _ui_name = "Strength: Directed weighted connection matrix"
-    _ui_description = bct_description("strengths_und.m")
-    _matlab_code = "strength = strengths_und(CIJ);"
+    _ui_description = bct_description("strengths_und")
+    _measures = ("strengths_und",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'CIJ': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure_index = self.build_connectivity_measure(result, 'strength', connectivity, "Node strength")
         return [measure_index]
 
@@ -137,14 +127,12 @@ class StrengthISOS(Strength):
     """
     """
     _ui_name = "Instrength and Outstrength"
-    _ui_description = bct_description("strengths_dir.m")
-    _matlab_code = "[is,os,strength] = strengths_dir(CIJ);"
+    _ui_description = bct_description("strengths_dir")
+    _measures = ("strengths_dir",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'CIJ': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure_index1 = self.build_connectivity_measure(result, 'is', connectivity, "Node instrength")
         measure_index2 = self.build_connectivity_measure(result, 'os', connectivity, "Node outstrength")
         measure_index3 = self.build_connectivity_measure(result, 'strength', connectivity,
@@ -156,14 +144,12 @@ class StrengthWeights(Strength):
     """
     """
     _ui_name = "Strength and Weight"
-    _ui_description = bct_description("strengths_und_sign.m")
-    _matlab_code = "[Spos,Sneg,vpos,vneg] = strengths_und_sign(CIJ);"
+    _ui_description = bct_description("strengths_und_sign")
+    _measures = ("strengths_und_sign",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'CIJ': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         measure_index1 = self.build_connectivity_measure(result, 'Spos', connectivity,
                                                          "Nodal strength of positive weights")
         measure_index2 = self.build_connectivity_measure(result, 'Sneg', connectivity,
@@ -179,14 +165,12 @@ class DensityDirected(BaseBCT):
     _ui_group = BCT_GROUP_DENSITY
 
     _ui_name = "Density Directed: Directed (weighted/binary) connection matrix"
-    _ui_description = bct_description("density_dir.m")
-    _matlab_code = "[kden,N,K]  = density_dir(A);"
+    _ui_description = bct_description("density_dir")
+    _measures = ("density_dir",)
 
     def launch(self, view_model):
         connectivity = self.get_connectivity(view_model)
-        data = {'A': connectivity.weights}
-
-        result = self.execute_matlab(self._matlab_code, data=data)
+        result = self.compute_measures(connectivity.weights)
         value1 = self.build_float_value_wrapper(result, 'kden', title="Density")
         value2 = self.build_int_value_wrapper(result, 'N', title="Number of vertices")
         value3 = self.build_int_value_wrapper(result, 'K', title="Number of edges")
@@ -197,5 +181,5 @@ class DensityUndirected(DensityDirected):
     """
     """
     _ui_name = "Density Unirected: Undirected (weighted/binary) connection matrix"
-    _ui_description = bct_description("density_und.m")
-    _matlab_code = "[kden,N,K]  = density_und(A);"
+    _ui_description = bct_description("density_und")
+    _measures = ("density_und",)
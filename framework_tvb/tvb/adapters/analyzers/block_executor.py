@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and 
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+#
+
+"""
+Run time-series analyzers block by block, straight from the TimeSeriesH5 file, so that inputs larger
+than the available memory can be analysed.
+
+Blocks are read in order by the calling thread (h5py files should not be read concurrently), analysed
+on a pool of worker threads (numpy and scipy release the GIL in their FFT and linear algebra routines)
+and handed back in the same order, to be appended to the result H5 file.
+At most one block more than the number of workers is held in memory at any time.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+import psutil
+from tvb.basic.profile import TvbProfile
+from tvb.core.adapters.abcadapter import OPERATION_CPUS
+
+# Share of the memory available on the machine which one analysis may fill with blocks
+MEMORY_FRACTION = 0.5
+
+
+class BlockExecutor(object):
+    """
+    Splits a 4D TimeSeriesH5 along one dimension: nodes for the analyzers working on every node
+    independently, state variables for those which relate the nodes to each other, or time.
+    """
+
+    def __init__(self, time_series_h5, axis, unit_bytes=None, memory_limit=None, workers=None):
+        """
+        :param time_series_h5: the opened input file
+        :param axis: the dimension along which the data is split
+        :param unit_bytes: memory needed to analyse one element along `axis` (input and results);
+                           by default the size of the input only
+        :param memory_limit: memory in bytes which the blocks in flight may use together
+        :param workers: number of threads analysing blocks, normally the CPUs the adapter declared with
+                        `get_required_cpus`; by default those reserved for any operation
+        """
+        self.time_series_h5 = time_series_h5
+        self.shape = time_series_h5.data.shape
+        self.axis = axis
+        if unit_bytes is None:
+            unit_bytes = numpy.prod(self.shape, dtype=numpy.float64) / max(self.shape[axis], 1) * 8
+        if memory_limit is None:
+            memory_limit = psutil.virtual_memory().available * MEMORY_FRACTION
+        self.workers = max(1, min(workers or OPERATION_CPUS, self.shape[axis]))
+        block_length = int(memory_limit / (max(unit_bytes, 1) * (self.workers + 1)))
+        self.block_length = max(1, min(block_length, self.shape[axis]))
+
+    @staticmethod
+    def usable_cpus():
+        """
+        CPUs which an analyzer working in blocks can use: those of the machine, up to the CPUs given to operations.
+        """
+        return max(1, min(os.cpu_count() or 1, TvbProfile.current.MAX_THREADS_NUMBER))
+
+    def slices(self):
+        """
+        :returns: the slices of the input to read, one per block, in order
+        """
+        length = self.shape[self.axis]
+        for start in range(0, length, self.block_length):
+            block = [slice(dim) for dim in self.shape]
+            block[self.axis] = slice(start, min(start + self.block_length, length))
+            yield tuple(block)
+
+    def run(self, compute, write):
+        """
+        Analyse every block.
+        :param compute: function applied on the data array of one block, on a worker thread
+        :param write: function receiving the results of `compute`, on the calling thread and in block order
+        :returns: the result of the last block
+        """
+        last_result = None
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for block in self.slices():
+                pending.append(pool.submit(compute, self.time_series_h5.read_data_slice(block)))
+                if len(pending) > self.workers:
+                    last_result = pending.popleft().result()
+                    write(last_result)
+            while pending:
+                last_result = pending.popleft().result()
+                write(last_result)
+        return last_result
@@ -35,11 +35,11 @@ Adapter that uses the traits module to generate interfaces for FFT Analyzer.
 .. moduleauthor:: Stuart A. Knock <Stuart@tvb.invalid>
 
 """
-import math
 import uuid
 import numpy
 import psutil
 
+from tvb.adapters.analyzers.block_executor import BlockExecutor
 from tvb.adapters.datatypes.db.spectral import FourierSpectrumIndex
 from tvb.adapters.datatypes.db.time_series import TimeSeriesIndex
 from tvb.adapters.datatypes.h5.spectral_h5 import FourierSpectrumH5
@@ -168,6 +168,12 @@ class FourierAdapter(ABCAdapter):
             self.memory_factor += 1
         return total_required_memory / self.memory_factor
 
+    def get_required_cpus(self, view_model):
+        """
+        The blocks of the input are analysed in parallel.
+        """
+        return BlockExecutor.usable_cpus()
+
     def get_required_disk_size(self, view_model):
         # type: (FFTAdapterModel) -> int
         """
@@ -184,10 +190,9 @@ class FourierAdapter(ABCAdapter):
         :param view_model: the ViewModel keeping the algorithm inputs
         :return: the fourier spectrum for the specified time series
         """
-        block_size = int(math.floor(self.input_shape[2] / self.memory_factor))
-        blocks = int(math.ceil(self.input_shape[2] / block_size))
-
         input_time_series_h5 = h5.h5_file_for_index(self.input_time_series_index)
+        sample_period = input_time_series_h5.sample_period.load()
+        sample_period_unit = input_time_series_h5.sample_period_unit.load()
 
         # --------------------- Prepare result entities ----------------------
         fft_index = FourierSpectrumIndex()
@@ -195,28 +200,32 @@ class FourierAdapter(ABCAdapter):
         spectra_file = FourierSpectrumH5(dest_path)
 
         # ------------- NOTE: Assumes 4D, Simulator timeSeries. --------------
-        node_slice = [slice(self.input_shape[0]), slice(self.input_shape[1]), None, slice(self.input_shape[3])]
-
-        # ---------- Iterate over slices and compose final result ------------
-        small_ts = TimeSeries()
-        small_ts.sample_period = input_time_series_h5.sample_period.load()
-        small_ts.sample_period_unit = input_time_series_h5.sample_period_unit.load()
-
-        for block in range(blocks):
-            node_slice[2] = slice(block * block_size, min([(block + 1) * block_size, self.input_shape[2]]), 1)
-            small_ts.data = input_time_series_h5.read_data_slice(tuple(node_slice))
-
-            partial_result = compute_fast_fourier_transform(small_ts, view_model.segment_length,
-                                                            view_model.window_function, view_model.detrend)
-
-            if blocks <= 1 and len(partial_result.array_data) == 0:
-                self.add_operation_additional_info(
-                    "Fourier produced empty result (most probably due to a very short input TimeSeries).")
-                return None
-            spectra_file.write_data_slice(partial_result)
-
+        required_memory = numpy.prod(self.input_shape) * 8.0 + self.result_size(self.input_shape,
+                                                                                 view_model.segment_length,
+                                                                                 sample_period)
+        executor = BlockExecutor(input_time_series_h5, 2, unit_bytes=required_memory / self.input_shape[2],
+                                 memory_limit=required_memory / self.memory_factor,
+                                 workers=self.get_required_cpus(view_model))
+
+        # ---------- Iterate over node blocks and compose final result ------------
+        def compute(data):
+            small_ts = TimeSeries(data=data, sample_period=sample_period, sample_period_unit=sample_period_unit)
+            return compute_fast_fourier_transform(small_ts, view_model.segment_length,
+                                                  view_model.window_function, view_model.detrend)
+
+        def write(partial_result):
+            if len(partial_result.array_data) > 0:
+                spectra_file.write_data_slice(partial_result)
+
+        partial_result = executor.run(compute, write)
         input_time_series_h5.close()
 
+        if len(partial_result.array_data) == 0:
+            spectra_file.close()
+            self.add_operation_additional_info(
+                "Fourier produced empty result (most probably due to a very short input TimeSeries).")
+            return None
+
         # ---------------------------- Fill results ----------------------------
         partial_result.source.gid = view_model.time_series
         partial_result.gid = uuid.UUID(fft_index.gid)
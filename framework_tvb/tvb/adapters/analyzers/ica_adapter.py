@@ -38,6 +38,7 @@ Adapter that uses the traits module to generate interfaces for ICA Analyzer.
 import uuid
 
 import numpy
+from tvb.adapters.analyzers.block_executor import BlockExecutor
 from tvb.adapters.datatypes.db.mode_decompositions import IndependentComponentsIndex
 from tvb.adapters.datatypes.db.time_series import TimeSeriesIndex
 from tvb.adapters.datatypes.h5.mode_decompositions_h5 import IndependentComponentsH5
@@ -131,6 +132,12 @@ class ICAAdapter(ABCAdapter):
         output_size = self.result_size(self.input_shape, view_model.n_components)
         return input_size + output_size
 
+    def get_required_cpus(self, view_model):
+        """
+        The blocks of the input are analysed in parallel.
+        """
+        return BlockExecutor.usable_cpus()
+
     def get_required_disk_size(self, view_model):
         # type: (ICAAdapterModel) -> int
         """
@@ -153,17 +160,13 @@ class ICAAdapter(ABCAdapter):
 
         # ------------- NOTE: Assumes 4D, Simulator timeSeries. --------------##
         time_series_h5 = h5.h5_file_for_index(self.input_time_series_index)
-        input_shape = time_series_h5.data.shape
-        node_slice = [slice(input_shape[0]), None, slice(input_shape[2]), slice(input_shape[3])]
+        executor = BlockExecutor(time_series_h5, 1, workers=self.get_required_cpus(view_model))
 
-        # ---------- Iterate over slices and compose final result ------------##
-        small_ts = TimeSeries()
-        for var in range(input_shape[1]):
-            node_slice[1] = slice(var, var + 1)
-            small_ts.data = time_series_h5.read_data_slice(tuple(node_slice))
-            partial_ica = compute_ica_decomposition(small_ts, view_model.n_components)
-            ica_h5.write_data_slice(partial_ica)
+        # ---------- Iterate over state variable blocks and compose final result ------------##
+        def compute(data):
+            return compute_ica_decomposition(TimeSeries(data=data), view_model.n_components)
 
+        partial_ica = executor.run(compute, ica_h5.write_data_slice)
         time_series_h5.close()
 
         partial_ica.source.gid = view_model.time_series
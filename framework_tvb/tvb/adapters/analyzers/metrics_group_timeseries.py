@@ -38,6 +38,7 @@ Analyzer used to calculate a single measure for TimeSeries.
 .. moduleauthor:: Lia Domide <lia.domide@codemart.ro>
 
 """
+import uuid
 import numpy
 from tvb.adapters.datatypes.db.mapped_value import DatatypeMeasureIndex
 from tvb.adapters.datatypes.db.time_series import TimeSeriesIndex
@@ -52,6 +53,11 @@ from tvb.core.neotraits.forms import TraitDataTypeSelectField, MultiSelectField,
 from tvb.core.neotraits.view_model import ViewModel, DataTypeGidAttr
 from tvb.datatypes.time_series import TimeSeries
 
+# These metrics only need the variance over time of each state variable, node and mode,
+# which comes from the statistics stored with the time series, instead of loading all its data.
+VARIANCE_METRICS = {'GlobalVariance': lambda variance: variance.mean(),
+                    'VarianceNodeVariance': lambda variance: variance.mean(axis=(0, 2)).var()}
+
 
 class TimeseriesMetricsAdapterModel(ViewModel):
     time_series = DataTypeGidAttr(
@@ -169,7 +175,10 @@ class TimeseriesMetricsAdapter(ABCAdapter):
             algorithms = list(ALGORITHMS)
 
         self.log.debug("time_series shape is %s" % str(self.input_shape))
-        dt_timeseries = self.load_traited_by_gid(self.input_time_series_index.gid)
+        dt_timeseries = None
+        variance = None
+        if any(algorithm_name in VARIANCE_METRICS for algorithm_name in algorithms):
+            variance = self._read_variance(view_model)
 
         metrics_results = {}
         for algorithm_name in algorithms:
@@ -186,15 +195,43 @@ class TimeseriesMetricsAdapter(ABCAdapter):
             else:
                 self.log.debug("Applying measure: " + str(algorithm_name))
 
-            unstored_result = algorithm_func({'time_series': dt_timeseries, 'start_point': view_model.start_point,
-                                              'segment': view_model.segment})
+            if variance is not None and algorithm_name in VARIANCE_METRICS:
+                unstored_result = VARIANCE_METRICS[algorithm_name](variance)
+            else:
+                if dt_timeseries is None:
+                    dt_timeseries = self.load_traited_by_gid(self.input_time_series_index.gid)
+                unstored_result = algorithm_func({'time_series': dt_timeseries,
+                                                  'start_point': view_model.start_point,
+                                                  'segment': view_model.segment})
             # ----------------- Prepare a Float object(s) for result ----------------##
             if isinstance(unstored_result, dict):
                 metrics_results.update(unstored_result)
             else:
                 metrics_results[algorithm_name] = unstored_result
 
+        if dt_timeseries is None:
+            # Only the gid of the analyzed time series is stored with the measure
+            dt_timeseries = TimeSeries(gid=uuid.UUID(self.input_time_series_index.gid))
         dt_metric = DatatypeMeasure(analyzed_datatype=dt_timeseries, metrics=metrics_results)
         result = h5.store_complete(dt_metric, self._get_output_path())
 
         return result
+
+    def _read_variance(self, view_model):
+        """
+        Variance of each state variable, node and mode, over the time points the metrics consider.
+        The start point is handled the same way as in the metrics of tvb.analyzers.
+        :returns: None for time series stored without statistics
+        """
+        with h5.h5_file_for_index(self.input_time_series_index) as ts_h5:
+            tpts = ts_h5.data.shape[0]
+            start_tpt = 0
+            if view_model.start_point != 0.0:
+                start_tpt = view_model.start_point / ts_h5.sample_period.load()
+            if start_tpt > tpts:
+                start_tpt = (view_model.segment - 1) * (tpts // view_model.segment)
+            statistics = ts_h5.data.get_statistics(int(start_tpt))
+
+        if statistics is None or not statistics.count or statistics.mean.ndim != 3:
+            return None
+        return statistics.variance
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and 
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+
+"""
+Adapter that uses the traits module to generate interfaces for the Multiscale Entropy Analyzer.
+
+"""
+import uuid
+
+import numpy
+from tvb.adapters.datatypes.db.entropy import MultiscaleEntropyIndex
+from tvb.adapters.datatypes.db.time_series import TimeSeriesIndex
+from tvb.adapters.datatypes.h5.entropy_h5 import MultiscaleEntropyH5
+from tvb.analyzers.info import calculate_multiscale_entropy
+from tvb.basic.neotraits.api import Int, Float, NArray
+from tvb.core.adapters.abcadapter import ABCAdapterForm, ABCAdapter
+from tvb.core.adapters.exceptions import LaunchException
+from tvb.core.entities.filters.chain import FilterChain
+from tvb.core.neocom import h5
+from tvb.core.neotraits.forms import TraitDataTypeSelectField, IntField, FloatField, ArrayField
+from tvb.core.neotraits.view_model import ViewModel, DataTypeGidAttr
+from tvb.datatypes.time_series import TimeSeries
+
+
+class MultiscaleEntropyAdapterModel(ViewModel):
+    time_series = DataTypeGidAttr(
+        linked_datatype=TimeSeries,
+        label="Time Series",
+        required=True,
+        doc="""The timeseries for which the sample entropy of each node is computed."""
+    )
+
+    embedding_dimension = Int(
+        label="Embedding dimension",
+        default=2,
+        doc="""Length of the templates which are compared.""")
+
+    tolerance = Float(
+        label="Tolerance",
+        default=0.15,
+        doc="""Match tolerance, as a fraction of the standard deviation of each signal.""")
+
+    scales = NArray(
+        dtype=int,
+        label="Scale factors",
+        default=numpy.arange(1, 11),
+        doc="""The factors by which the time series is coarse grained, before computing the sample entropy.""")
+
+
+class MultiscaleEntropyAdapterForm(ABCAdapterForm):
+    def __init__(self):
+        super(MultiscaleEntropyAdapterForm, self).__init__()
+        self.time_series = TraitDataTypeSelectField(MultiscaleEntropyAdapterModel.time_series,
+                                                    name=self.get_input_name(), conditions=self.get_filters(),
+                                                    has_all_option=True)
+        self.embedding_dimension = IntField(MultiscaleEntropyAdapterModel.embedding_dimension)
+        self.tolerance = FloatField(MultiscaleEntropyAdapterModel.tolerance)
+        self.scales = ArrayField(MultiscaleEntropyAdapterModel.scales)
+
+    @staticmethod
+    def get_view_model():
+        return MultiscaleEntropyAdapterModel
+
+    @staticmethod
+    def get_required_datatype():
+        return TimeSeriesIndex
+
+    @staticmethod
+    def get_input_name():
+        return 'time_series'
+
+    @staticmethod
+    def get_filters():
+        return FilterChain(fields=[FilterChain.datatype + '.data_ndim'], operations=["=="], values=[4])
+
+
+class MultiscaleEntropyAdapter(ABCAdapter):
+    """ TVB adapter for calling the Multiscale Entropy algorithm. """
+    _ui_name = "Multiscale Entropy"
+    _ui_description = "Compute the Sample Entropy of each node, at multiple time scales, for a TimeSeries input."
+    _ui_subsection = "entropy"
+
+    # Maximum number of time series values read from disk at once
+    READ_BLOCK_SIZE = 2 ** 23
+
+    def get_form_class(self):
+        return MultiscaleEntropyAdapterForm
+
+    def get_output(self):
+        return [MultiscaleEntropyIndex]
+
+    def configure(self, view_model):
+        # type: (MultiscaleEntropyAdapterModel) -> None
+        """
+        Store the input shape to be later used to estimate memory usage.
+        """
+        self.input_time_series_index = self.load_entity_by_gid(view_model.time_series)
+        self.input_shape = (self.input_time_series_index.data_length_1d,
+                            self.input_time_series_index.data_length_2d,
+                            self.input_time_series_index.data_length_3d,
+                            self.input_time_series_index.data_length_4d)
+        scales = numpy.atleast_1d(view_model.scales)
+        if scales.size == 0 or scales.min() < 1:
+            raise LaunchException("Scale factors need to be positive integers.")
+        if self.input_shape[0] // scales.max() <= view_model.embedding_dimension + 1:
+            raise LaunchException("The time series is too short for the largest scale factor (%d)." % scales.max())
+
+    def _nodes_per_block(self):
+        return max(1, min(self.input_shape[2], self.READ_BLOCK_SIZE // max(1, self.input_shape[0])))
+
+    def get_required_memory_size(self, view_model):
+        # type: (MultiscaleEntropyAdapterModel) -> int
+        """
+        Return the required memory to run this algorithm.
+        """
+        input_size = self.input_shape[0] * self._nodes_per_block() * 8.0
+        # embedding vectors and KD-tree for one signal
+        tree_size = self.input_shape[0] * (view_model.embedding_dimension + 1) * 8.0 * 3
+        return input_size + tree_size + self._result_size(view_model)
+
+    def get_required_disk_size(self, view_model):
+        # type: (MultiscaleEntropyAdapterModel) -> int
+        """
+        Returns the required disk size to be able to run the adapter ( in kB).
+        """
+        return self.array_size2kb(self._result_size(view_model))
+
+    def launch(self, view_model):
+        # type: (MultiscaleEntropyAdapterModel) -> [MultiscaleEntropyIndex]
+        """
+        Launch algorithm and build results.
+        The time series is read in blocks of nodes, for each state variable and mode.
+        :param view_model: the ViewModel keeping the algorithm inputs
+        :return: the `MultiscaleEntropyIndex` built with the given time_series index as source
+        """
+        scales = numpy.atleast_1d(view_model.scales).astype(int)
+        result = numpy.empty((scales.size,) + tuple(self.input_shape[1:]))
+        nodes_per_block = self._nodes_per_block()
+
+        ts_h5 = h5.h5_file_for_index(self.input_time_series_index)
+        for mode in range(self.input_shape[3]):
+            for var in range(self.input_shape[1]):
+                for start in range(0, self.input_shape[2], nodes_per_block):
+                    stop = min(start + nodes_per_block, self.input_shape[2])
+                    small_ts = TimeSeries()
+                    small_ts.data = ts_h5.read_data_slice((slice(None), slice(var, var + 1),
+                                                           slice(start, stop), slice(mode, mode + 1)))
+                    partial = calculate_multiscale_entropy(small_ts, m=view_model.embedding_dimension,
+                                                           r=view_model.tolerance, taus=scales)
+                    result[:, var:var + 1, start:stop, mode:mode + 1] = partial.array_data
+        ts_h5.close()
+
+        entropy_index = MultiscaleEntropyIndex()
+        partial.array_data = result
+        partial.source.gid = view_model.time_series
+        partial.gid = uuid.UUID(entropy_index.gid)
+        entropy_index.fill_from_has_traits(partial)
+
+        entropy_h5_path = h5.path_for(self.storage_path, MultiscaleEntropyH5, entropy_index.gid)
+        with MultiscaleEntropyH5(entropy_h5_path) as entropy_h5:
+            entropy_h5.store(partial)
+        return entropy_index
+
+    def _result_size(self, view_model):
+        """
+        Returns the storage size in Bytes of the MultiscaleEntropy result.
+        """
+        return numpy.atleast_1d(view_model.scales).size * numpy.prod(self.input_shape[1:]) * 8.0
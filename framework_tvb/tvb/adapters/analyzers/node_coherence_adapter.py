@@ -39,6 +39,7 @@ Adapter that uses the traits module to generate interfaces for FFT Analyzer.
 import uuid
 
 import numpy
+from tvb.adapters.analyzers.block_executor import BlockExecutor
 from tvb.adapters.datatypes.db.spectral import CoherenceSpectrumIndex
 from tvb.adapters.datatypes.db.time_series import TimeSeriesIndex
 from tvb.adapters.datatypes.h5.spectral_h5 import CoherenceSpectrumH5
@@ -129,6 +130,12 @@ class NodeCoherenceAdapter(ABCAdapter):
         output_size = self.result_size(used_shape, view_model.nfft)
         return input_size + output_size
 
+    def get_required_cpus(self, view_model):
+        """
+        The blocks of the input are analysed in parallel.
+        """
+        return BlockExecutor.usable_cpus()
+
     def get_required_disk_size(self, view_model):
         # type: (NodeCoherenceModel) -> int
         """
@@ -154,20 +161,18 @@ class NodeCoherenceAdapter(ABCAdapter):
 
         # ------------- NOTE: Assumes 4D, Simulator timeSeries. --------------##
         time_series_h5 = h5.h5_file_for_index(self.input_time_series_index)
-        input_shape = time_series_h5.data.shape
-        node_slice = [slice(input_shape[0]), None, slice(input_shape[2]), slice(input_shape[3])]
-
-        # ---------- Iterate over slices and compose final result ------------##
-        small_ts = TimeSeries()
-        small_ts.sample_period = time_series_h5.sample_period.load()
-        small_ts.sample_period_unit = time_series_h5.sample_period_unit.load()
-        partial_coh = None
-        for var in range(input_shape[1]):
-            node_slice[1] = slice(var, var + 1)
-            small_ts.data = time_series_h5.read_data_slice(tuple(node_slice))
-            partial_coh = calculate_cross_coherence(small_ts, view_model.nfft)
-            coherence_h5.write_data_slice(partial_coh)
+        executor = BlockExecutor(time_series_h5, 1, unit_bytes=self.get_required_memory_size(view_model),
+                                 workers=self.get_required_cpus(view_model))
+
+        # ---------- Iterate over state variable blocks and compose final result ------------##
+        sample_period = time_series_h5.sample_period.load()
+        sample_period_unit = time_series_h5.sample_period_unit.load()
+
+        def compute(data):
+            small_ts = TimeSeries(data=data, sample_period=sample_period, sample_period_unit=sample_period_unit)
+            return calculate_cross_coherence(small_ts, view_model.nfft)
 
+        partial_coh = executor.run(compute, coherence_h5.write_data_slice)
         time_series_h5.close()
 
         partial_coh.source.gid = view_model.time_series
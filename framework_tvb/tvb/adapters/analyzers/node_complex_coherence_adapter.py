@@ -37,6 +37,7 @@ Adapter that uses the traits module to generate interfaces for FFT Analyzer.
 """
 
 import numpy
+from tvb.adapters.analyzers.block_executor import BlockExecutor
 from tvb.adapters.datatypes.db.spectral import ComplexCoherenceSpectrumIndex
 from tvb.adapters.datatypes.db.time_series import TimeSeriesIndex
 from tvb.adapters.datatypes.h5.spectral_h5 import ComplexCoherenceSpectrumH5
@@ -183,6 +184,12 @@ class NodeComplexCoherenceAdapter(ABCAdapter):
 
         return input_size + output_size
 
+    def get_required_cpus(self, view_model):
+        """
+        The blocks of the input are analysed in parallel.
+        """
+        return BlockExecutor.usable_cpus()
+
     def get_required_disk_size(self, view_model):
         # type: (NodeComplexCoherenceModel) -> int
         """
@@ -213,8 +220,18 @@ class NodeComplexCoherenceAdapter(ABCAdapter):
         :param view_model: the ViewModel keeping the algorithm inputs
         :return: the complex coherence for the specified time series
         """
-        # TODO ---------- Iterate over slices and compose final result ------------##
-        time_series = h5.load_from_index(self.input_time_series_index)
+        # ---------- Average over state variables and modes, block by block in time ------------##
+        # The algorithm only uses this average, which is much smaller than the whole input
+        time_series_h5 = h5.h5_file_for_index(self.input_time_series_index)
+        executor = BlockExecutor(time_series_h5, 0, workers=self.get_required_cpus(view_model))
+        node_averages = []
+        executor.run(lambda data: data.mean(axis=-1).mean(axis=1), node_averages.append)
+        time_series = TimeSeries(data=numpy.concatenate(node_averages)[:, numpy.newaxis, :, numpy.newaxis],
+                                 sample_period=time_series_h5.sample_period.load(),
+                                 sample_period_unit=time_series_h5.sample_period_unit.load())
+        time_series.gid = view_model.time_series
+        time_series_h5.close()
+
         ht_result = calculate_complex_cross_coherence(time_series, view_model.epoch_length,
                                                       view_model.segment_length,
                                                       view_model.segment_shift,
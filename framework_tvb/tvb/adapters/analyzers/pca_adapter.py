@@ -38,6 +38,7 @@ Adapter that uses the traits module to generate interfaces for FFT Analyzer.
 import uuid
 
 import numpy
+from tvb.adapters.analyzers.block_executor import BlockExecutor
 from tvb.adapters.datatypes.db.mode_decompositions import PrincipalComponentsIndex
 from tvb.adapters.datatypes.db.time_series import TimeSeriesIndex
 from tvb.adapters.datatypes.h5.mode_decompositions_h5 import PrincipalComponentsH5
@@ -120,6 +121,12 @@ class PCAAdapter(ABCAdapter):
         output_size = self.result_size(used_shape)
         return input_size + output_size
 
+    def get_required_cpus(self, view_model):
+        """
+        The blocks of the input are analysed in parallel.
+        """
+        return BlockExecutor.usable_cpus()
+
     def get_required_disk_size(self, view_model):
         # type: (PCAAdapterModel) -> int
         """
@@ -142,18 +149,13 @@ class PCAAdapter(ABCAdapter):
 
         # ------------- NOTE: Assumes 4D, Simulator timeSeries. --------------##
         time_series_h5 = h5.h5_file_for_index(self.input_time_series_index)
-        input_shape = time_series_h5.data.shape
-        node_slice = [slice(input_shape[0]), None, slice(input_shape[2]), slice(input_shape[3])]
-
-        # ---------- Iterate over slices and compose final result ------------##
-        small_ts = TimeSeries()
-        for var in range(input_shape[1]):
-            node_slice[1] = slice(var, var + 1)
-            small_ts.data = time_series_h5.read_data_slice(tuple(node_slice))
-            self.time_series = small_ts.gid
-            partial_pca = compute_pca(small_ts)
-            pca_h5.write_data_slice(partial_pca)
+        executor = BlockExecutor(time_series_h5, 1, workers=self.get_required_cpus(view_model))
+
+        # ---------- Iterate over state variable blocks and compose final result ------------##
+        def compute(data):
+            return compute_pca(TimeSeries(data=data))
 
+        partial_pca = executor.run(compute, pca_h5.write_data_slice)
         time_series_h5.close()
 
         partial_pca.source.gid = view_model.time_series
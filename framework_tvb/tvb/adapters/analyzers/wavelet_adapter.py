@@ -40,6 +40,7 @@ ContinuousWaveletTransform Analyzer.
 import uuid
 
 import numpy
+from tvb.adapters.analyzers.block_executor import BlockExecutor
 from tvb.adapters.datatypes.db.spectral import WaveletCoefficientsIndex
 from tvb.adapters.datatypes.db.time_series import TimeSeriesIndex
 from tvb.adapters.datatypes.h5.spectral_h5 import WaveletCoefficientsH5
@@ -191,6 +192,12 @@ class ContinuousWaveletTransformAdapter(ABCAdapter):
                                        used_shape, self.input_time_series_index.sample_period)
         return input_size + output_size
 
+    def get_required_cpus(self, view_model):
+        """
+        The blocks of the input are analysed in parallel.
+        """
+        return BlockExecutor.usable_cpus()
+
     def get_required_disk_size(self, view_model):
         """
         Returns the required disk size to be able to run the adapter.(in kB)
@@ -222,21 +229,20 @@ class ContinuousWaveletTransformAdapter(ABCAdapter):
         wavelet_h5 = WaveletCoefficientsH5(path=dest_path)
 
         # ------------- NOTE: Assumes 4D, Simulator timeSeries. --------------##
-        node_slice = [slice(self.input_shape[0]), slice(self.input_shape[1]), None, slice(self.input_shape[3])]
-
-        # ---------- Iterate over slices and compose final result ------------##
-        small_ts = TimeSeries()
-        small_ts.sample_period = time_series_h5.sample_period.load()
-        small_ts.sample_period_unit = time_series_h5.sample_period_unit.load()
-        for node in range(self.input_shape[2]):
-            node_slice[2] = slice(node, node + 1)
-            small_ts.data = time_series_h5.read_data_slice(tuple(node_slice))
-            partial_wavelet = compute_continuous_wavelet_transform(small_ts, view_model.frequencies,
-                                                                   view_model.sample_period,
-                                                                   view_model.q_ratio, view_model.normalisation,
-                                                                   view_model.mother)
-            wavelet_h5.write_data_slice(partial_wavelet)
+        executor = BlockExecutor(time_series_h5, 2, unit_bytes=self.get_required_memory_size(view_model),
+                                 workers=self.get_required_cpus(view_model))
+
+        # ---------- Iterate over node blocks and compose final result ------------##
+        sample_period = time_series_h5.sample_period.load()
+        sample_period_unit = time_series_h5.sample_period_unit.load()
+
+        def compute(data):
+            small_ts = TimeSeries(data=data, sample_period=sample_period, sample_period_unit=sample_period_unit)
+            return compute_continuous_wavelet_transform(small_ts, view_model.frequencies, view_model.sample_period,
+                                                        view_model.q_ratio, view_model.normalisation,
+                                                        view_model.mother)
 
+        partial_wavelet = executor.run(compute, wavelet_h5.write_data_slice)
         time_series_h5.close()
 
         partial_wavelet.source.gid = view_model.time_series
@@ -27,6 +27,7 @@
 #   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
 #
 #
+from tvb.adapters.datatypes.db.entropy import MultiscaleEntropyIndex
 from tvb.adapters.datatypes.db.fcd import FcdIndex
 from tvb.adapters.datatypes.db.graph import CovarianceIndex, CorrelationCoefficientsIndex
 from tvb.adapters.datatypes.db.mapped_value import DatatypeMeasureIndex
@@ -59,6 +60,7 @@ class TimeseriesRemover(ABCRemover):
             associated_coef = dao.get_generic_entity(CorrelationCoefficientsIndex, self.handled_datatype.gid, key)
             associated_dtm = dao.get_generic_entity(DatatypeMeasureIndex, self.handled_datatype.gid, key)
             associated_ccs = dao.get_generic_entity(ComplexCoherenceSpectrumIndex, self.handled_datatype.gid, key)
+            associated_mse = dao.get_generic_entity(MultiscaleEntropyIndex, self.handled_datatype.gid, key)
 
             msg = "TimeSeries cannot be removed as it is used by at least one "
 
@@ -84,5 +86,7 @@ class TimeseriesRemover(ABCRemover):
                 raise RemoveDataTypeException(msg + " DatatypeMeasure.")
             if len(associated_ccs) > 0:
                 raise RemoveDataTypeException(msg + " ComplexCoherenceSpectrum.")
+            if len(associated_mse) > 0:
+                raise RemoveDataTypeException(msg + " MultiscaleEntropy.")
 
         ABCRemover.remove_datatype(self, skip_validation)
@@ -111,16 +111,16 @@ class WaveletCoefficientsH5(DataTypeMatrixH5):
 
     def __init__(self, path):
         super(WaveletCoefficientsH5, self).__init__(path)
-        self.array_data = DataSet(WaveletCoefficients.array_data, self, expand_dimension=2)
+        self.array_data = DataSet(WaveletCoefficients.array_data, self, expand_dimension=3)
         self.source = Reference(WaveletCoefficients.source, self)
         self.mother = Scalar(WaveletCoefficients.mother, self)
         self.sample_period = Scalar(WaveletCoefficients.sample_period, self)
         self.frequencies = DataSet(WaveletCoefficients.frequencies, self)
         self.normalisation = Scalar(WaveletCoefficients.normalisation, self)
         self.q_ratio = Scalar(WaveletCoefficients.q_ratio, self)
-        self.amplitude = DataSet(WaveletCoefficients.amplitude, self, expand_dimension=2)
-        self.phase = DataSet(WaveletCoefficients.phase, self, expand_dimension=2)
-        self.power = DataSet(WaveletCoefficients.power, self, expand_dimension=2)
+        self.amplitude = DataSet(WaveletCoefficients.amplitude, self, expand_dimension=3)
+        self.phase = DataSet(WaveletCoefficients.phase, self, expand_dimension=3)
+        self.power = DataSet(WaveletCoefficients.power, self, expand_dimension=3)
 
     def write_data_slice(self, partial_result):
         """
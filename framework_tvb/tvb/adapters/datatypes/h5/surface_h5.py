@@ -31,7 +31,7 @@
 import numpy
 from tvb.basic.logger.builder import get_logger
 from tvb.basic.neotraits.api import NArray, Int, Attr
-from tvb.core.neotraits.h5 import H5File, DataSet, Scalar, Json
+from tvb.core.neotraits.h5 import H5File, DataSet, Scalar, Json, StoragePolicy
 from tvb.datatypes.surfaces import Surface
 
 LOG = get_logger(__name__)
@@ -45,6 +45,9 @@ SPLIT_MAX_SIZE = 40000
 SPLIT_BUFFER_SIZE = 15000
 SPLIT_PICK_MAX_TRIANGLE = 20000
 
+# Chunks of rows aligned with the split slices above, which is how the surface viewers read them
+MESH_STORAGE = StoragePolicy(chunks=(5000, None), compression='gzip', compression_level=4, shuffle=True)
+
 KEY_TRIANGLES = "triangles"
 KEY_VERTICES = "vertices"
 KEY_HEMISPHERE = "hemisphere"
@@ -60,10 +63,10 @@ class SurfaceH5(H5File):
 
     def __init__(self, path):
         super(SurfaceH5, self).__init__(path)
-        self.vertices = DataSet(Surface.vertices, self)
-        self.triangles = DataSet(Surface.triangles, self)
-        self.vertex_normals = DataSet(Surface.vertex_normals, self)
-        self.triangle_normals = DataSet(Surface.triangle_normals, self)
+        self.vertices = DataSet(Surface.vertices, self, storage_policy=MESH_STORAGE)
+        self.triangles = DataSet(Surface.triangles, self, storage_policy=MESH_STORAGE)
+        self.vertex_normals = DataSet(Surface.vertex_normals, self, storage_policy=MESH_STORAGE)
+        self.triangle_normals = DataSet(Surface.triangle_normals, self, storage_policy=MESH_STORAGE)
         self.number_of_vertices = Scalar(Surface.number_of_vertices, self)
         self.number_of_triangles = Scalar(Surface.number_of_triangles, self)
         self.edge_mean_length = Scalar(Surface.edge_mean_length, self)
@@ -37,18 +37,24 @@ import json
 
 from tvb.basic.neotraits.api import Int
 from tvb.core.adapters.arguments_serialisation import *
-from tvb.core.neotraits.h5 import H5File, Scalar, DataSet, Reference, Json
+from tvb.core.neotraits.h5 import H5File, Scalar, DataSet, Reference, Json, StoragePolicy
 from tvb.core.utils import prepare_time_slice
 from tvb.datatypes.time_series import *
 
 NO_OF_DEFAULT_SELECTED_CHANNELS = 20
 
+# Pages are read as a window of time points over all the nodes of one state variable and mode
+TIME_MAJOR_STORAGE = StoragePolicy(chunks=(None, 1, None, 1))
+# Volumes are read as whole frames, and as the whole time line of one voxel from a second layout
+VOLUME_STORAGE = StoragePolicy(chunks=(None, None, None, None), alternate_chunks=(None, 4, 4, 4))
+
 
 class TimeSeriesH5(H5File):
     def __init__(self, path):
         super(TimeSeriesH5, self).__init__(path)
         self.title = Scalar(TimeSeries.title, self)
-        self.data = DataSet(TimeSeries.data, self, expand_dimension=0)
+        self.data = DataSet(TimeSeries.data, self, expand_dimension=0, storage_policy=TIME_MAJOR_STORAGE,
+                            statistics=True)
         self.nr_dimensions = Scalar(Int(), self, name="nr_dimensions")
 
         # omitted length_nd , these are indexing props, to be removed from datatype too
@@ -285,6 +291,7 @@ class TimeSeriesSurfaceH5(TimeSeriesH5):
 class TimeSeriesVolumeH5(TimeSeriesH5):
     def __init__(self, path):
         super(TimeSeriesVolumeH5, self).__init__(path)
+        self.data.storage_policy = VOLUME_STORAGE
         self.volume = Reference(TimeSeriesVolume.volume, self)
         self.labels_ordering = Json(TimeSeriesVolume.labels_ordering, self)
 
@@ -33,7 +33,8 @@ from tvb.basic.neotraits.api import Attr
 from tvb.core.entities.file.simulator.view_model import HeunDeterministicViewModel, HeunStochasticViewModel, \
     EulerDeterministicViewModel, EulerStochasticViewModel, RungeKutta4thOrderDeterministicViewModel, IdentityViewModel, \
     VODEViewModel, VODEStochasticViewModel, Dopri5ViewModel, Dopri5StochasticViewModel, Dop853ViewModel, \
-    Dop853StochasticViewModel, IntegratorViewModel, NoiseViewModel
+    Dop853StochasticViewModel, IntegratorViewModel, NoiseViewModel, SemiImplicitEulerDeterministicViewModel, \
+    SemiImplicitEulerStochasticViewModel, ExponentialEulerDeterministicViewModel, ExponentialEulerStochasticViewModel
 from tvb.core.entities.file.simulator.view_model import IntegratorStochasticViewModel
 from tvb.core.neotraits.forms import Form, SelectField, FloatField
 
@@ -51,7 +52,11 @@ def get_integrator_to_form_dict():
         Dopri5ViewModel: IntegratorForm,
         Dopri5StochasticViewModel: IntegratorStochasticForm,
         Dop853ViewModel: IntegratorForm,
-        Dop853StochasticViewModel: IntegratorStochasticForm
+        Dop853StochasticViewModel: IntegratorStochasticForm,
+        SemiImplicitEulerDeterministicViewModel: IntegratorForm,
+        SemiImplicitEulerStochasticViewModel: IntegratorStochasticForm,
+        ExponentialEulerDeterministicViewModel: IntegratorForm,
+        ExponentialEulerStochasticViewModel: IntegratorStochasticForm
     }
     return integrator_class_to_form
 
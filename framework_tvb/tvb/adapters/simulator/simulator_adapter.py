@@ -52,6 +52,7 @@ from tvb.adapters.simulator.model_forms import get_model_to_form_dict
 from tvb.adapters.simulator.monitor_forms import get_monitor_to_form_dict
 from tvb.adapters.simulator.simulator_fragments import *
 from tvb.basic.neotraits.api import Attr
+from tvb.basic.timings import active_timings
 from tvb.core.adapters.abcadapter import ABCAdapterForm, ABCAdapter
 from tvb.core.adapters.exceptions import LaunchException, InvalidParameterException
 from tvb.core.entities.file.simulator.simulation_history_h5 import SimulationHistory
@@ -215,6 +216,20 @@ class SimulatorAdapter(ABCAdapter):
                       approx_modes * self.algorithm.simulation_length / approx_integrator_dt)
         return max(int(estimation), 1)
 
+    def get_cost_features(self, view_model):
+        # type: (SimulatorAdapterModel) -> dict
+        """
+        Return the sizes driving the cost of the configured simulation.
+        """
+        dt = self.algorithm.integrator.dt or 1.0
+        simulation_length = self.algorithm.simulation_length
+        monitor_samples = sum(simulation_length / (monitor.period or dt) for monitor in self.algorithm.monitors)
+        return {'nodes': self.algorithm.number_of_nodes,
+                'state_variables': self.algorithm.model.nvar,
+                'modes': self.algorithm.model.number_of_modes,
+                'steps': simulation_length / dt,
+                'monitor_samples': monitor_samples}
+
     def _try_find_mapping(self, mapping_class, connectivity_gid):
         """
         Try to find a DataType instance of class "mapping_class", linked to the given Connectivity.
@@ -309,15 +324,20 @@ class SimulatorAdapter(ABCAdapter):
             result_indexes[m_name] = ts_index
             result_h5[m_name] = ts_h5
 
-        # Run simulation
+        # Run simulation, adding the time of each stage of its loop to those of the operation, if measured
         self.log.debug("Starting simulation...")
-        for result in self.algorithm(simulation_length=self.algorithm.simulation_length):
-            for j, monitor in enumerate(self.algorithm.monitors):
-                if result[j] is not None:
-                    m_name = type(monitor).__name__
-                    ts_h5 = result_h5[m_name]
-                    ts_h5.write_time_slice([result[j][0]])
-                    ts_h5.write_data_slice([result[j][1]])
+        self.algorithm.stage_timings = active_timings()
+        try:
+            for result in self.algorithm(simulation_length=self.algorithm.simulation_length):
+                for j, monitor in enumerate(self.algorithm.monitors):
+                    if result[j] is not None:
+                        m_name = type(monitor).__name__
+                        ts_h5 = result_h5[m_name]
+                        ts_h5.write_time_slice([result[j][0]])
+                        ts_h5.write_data_slice([result[j][1]])
+        finally:
+            # The timings belong to this operation, the simulator should not keep them alive after it
+            self.algorithm.stage_timings = None
 
         self.log.debug("Completed simulation, starting to store simulation state ")
         # Now store simulator history, at the simulation end
@@ -33,7 +33,9 @@ from functools import partial
 from tvb.core.entities.file.simulator.view_model import HeunDeterministicViewModel, HeunStochasticViewModel, \
     EulerDeterministicViewModel, EulerStochasticViewModel, RungeKutta4thOrderDeterministicViewModel, IdentityViewModel, \
     VODEViewModel, VODEStochasticViewModel, Dopri5ViewModel, Dopri5StochasticViewModel, Dop853ViewModel, \
-    Dop853StochasticViewModel, AdditiveNoiseViewModel, MultiplicativeNoiseViewModel
+    Dop853StochasticViewModel, AdditiveNoiseViewModel, MultiplicativeNoiseViewModel, \
+    SemiImplicitEulerDeterministicViewModel, SemiImplicitEulerStochasticViewModel, \
+    ExponentialEulerDeterministicViewModel, ExponentialEulerStochasticViewModel
 from tvb.datatypes.equations import *
 
 LINEAR_EQUATION = 'Linear'
@@ -74,7 +76,8 @@ def get_integrator_name_list():
     return ['Heun', 'Stochastic Heun', 'Euler', 'Euler-Maruyama', 'Runge-Kutta 4th order', 'Difference equation',
             'Variable-order Adams / BDF', 'Stochastic variable-order Adams / BDF', 'Dormand-Prince, order (4, 5)',
             'Stochastic Dormand-Prince, order (4, 5)', 'Stochastic Dormand-Prince, order (4, 5)',
-            'Stochastic Dormand-Prince, order 8 (5, 3)']
+            'Stochastic Dormand-Prince, order 8 (5, 3)', 'Semi-implicit Euler', 'Stochastic semi-implicit Euler',
+            'Exponential Euler', 'Stochastic exponential Euler']
 
 
 def get_ui_name_to_integrator_dict():
@@ -91,6 +94,10 @@ def get_ui_name_to_integrator_dict():
         'Stochastic Dormand-Prince, order (4, 5)': Dopri5StochasticViewModel,
         'Dormand-Prince, order 8 (5, 3)': Dop853ViewModel,
         'Stochastic Dormand-Prince, order 8 (5, 3)': Dop853StochasticViewModel,
+        'Semi-implicit Euler': SemiImplicitEulerDeterministicViewModel,
+        'Stochastic semi-implicit Euler': SemiImplicitEulerStochasticViewModel,
+        'Exponential Euler': ExponentialEulerDeterministicViewModel,
+        'Stochastic exponential Euler': ExponentialEulerStochasticViewModel,
 
     }
     return ui_name_to_integrator
@@ -329,14 +329,10 @@ class EegMonitor(ABCSpaceDisplayer):
                 if idx in self.selected_dimensions:
                     resulting_shape.append(shape)
 
-            page_chunk_data = timeseries.read_data_page(self.current_page * self.page_size,
-                                                        (self.current_page + 1) * self.page_size)
             channels_per_set.append(int(resulting_shape[1]))
 
-            for idx in range(resulting_shape[1]):
-                self.has_nan = self.has_nan or replace_nan_values(page_chunk_data[:, idx])
-                array_max = numpy.max(page_chunk_data[:, idx])
-                array_min = numpy.min(page_chunk_data[:, idx])
+            channels_min, channels_max = self._read_channel_ranges(timeseries, resulting_shape[1])
+            for array_min, array_max in zip(channels_min, channels_max):
                 translations.append(float((array_max + array_min) / 2))
                 if array_max == array_min:
                     array_max += 1
@@ -344,6 +340,26 @@ class EegMonitor(ABCSpaceDisplayer):
 
         return float(max(step)), translations, channels_per_set
 
+    def _read_channel_ranges(self, timeseries, nr_channels):
+        """
+        Min and max of each channel displayed, for the first state variable and mode.
+        They come from the statistics stored with the time series, over all its time points.
+        Time series without finite statistics (older files, NaN values) have the current page scanned instead.
+        """
+        statistics = timeseries.data.get_statistics()
+        if statistics is not None and statistics.is_finite and statistics.min.ndim == 3 \
+                and self.selected_dimensions == [0, 2]:
+            return statistics.min[0, :nr_channels, 0], statistics.max[0, :nr_channels, 0]
+
+        page_chunk_data = timeseries.read_data_page(self.current_page * self.page_size,
+                                                    (self.current_page + 1) * self.page_size)
+        channels_min, channels_max = [], []
+        for idx in range(nr_channels):
+            self.has_nan = self.has_nan or replace_nan_values(page_chunk_data[:, idx])
+            channels_max.append(numpy.max(page_chunk_data[:, idx]))
+            channels_min.append(numpy.min(page_chunk_data[:, idx]))
+        return channels_min, channels_max
+
     @staticmethod
     def _get_sub_title(datatype_list):
         """ Compute sub-title for current page"""
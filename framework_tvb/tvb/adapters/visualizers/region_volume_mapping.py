@@ -43,6 +43,7 @@ from tvb.adapters.datatypes.db.region_mapping import RegionVolumeMappingIndex
 from tvb.adapters.datatypes.db.structural import StructuralMRIIndex
 from tvb.adapters.datatypes.db.volume import VolumeIndex
 from tvb.adapters.datatypes.h5.time_series_h5 import TimeSeriesRegionH5
+from tvb.adapters.visualizers.region_voxel_index import VOXEL_INDEX_CACHE, RegionVoxelIndex
 from tvb.basic.neotraits.api import Attr
 from tvb.core.adapters.abcadapter import ABCAdapterForm
 from tvb.core.adapters.abcdisplayer import ABCDisplayer, URLGenerator
@@ -125,12 +126,10 @@ class _MappedArrayVolumeBase(ABCDisplayer):
     def get_mapped_array_volume_view(self, entity_gid, mapped_array_gid, x_plane, y_plane, z_plane,
                                      mapped_array_slice=None, **kwargs):
 
-        with h5.h5_file_for_gid(entity_gid) as entity_h5:
-            data_shape = entity_h5.array_data.shape
-            x_plane, y_plane, z_plane = preprocess_space_parameters(x_plane, y_plane, z_plane, data_shape[0],
-                                                                    data_shape[1], data_shape[2])
-            slice_x, slice_y, slice_z = entity_h5.get_volume_slice(x_plane, y_plane, z_plane)
-            connectivity_gid = entity_h5.connectivity.load()
+        voxel_index = VOXEL_INDEX_CACHE.get(entity_gid)
+        x_plane, y_plane, z_plane = preprocess_space_parameters(x_plane, y_plane, z_plane, *voxel_index.shape)
+        slice_x, slice_y, slice_z = voxel_index.volume_slice(x_plane, y_plane, z_plane)
+        connectivity_gid = voxel_index.connectivity_gid
 
         with h5.h5_file_for_gid(mapped_array_gid) as mapped_array_h5:
             if mapped_array_slice:
@@ -162,19 +161,9 @@ class _MappedArrayVolumeBase(ABCDisplayer):
         return dict(minBackgroundValue=min_value, maxBackgroundValue=max_value, urlBackgroundVolumeData=url)
 
     def get_voxel_region(self, region_mapping_volume_gid, x_plane, y_plane, z_plane):
-        with h5.h5_file_for_gid(region_mapping_volume_gid) as entity_h5:
-            data_shape = entity_h5.array_data.shape
-            x_plane, y_plane, z_plane = preprocess_space_parameters(x_plane, y_plane, z_plane, data_shape[0],
-                                                                    data_shape[1], data_shape[2])
-            slices = slice(x_plane, x_plane + 1), slice(y_plane, y_plane + 1), slice(z_plane, z_plane + 1)
-            voxel = entity_h5.array_data[slices][0, 0, 0]
-            connectivity_gid = entity_h5.connectivity.load()
-
-        if voxel != -1:
-            conn = self.load_traited_by_gid(connectivity_gid)
-            return conn.region_labels[int(voxel)]
-        else:
-            return 'background'
+        voxel_index = VOXEL_INDEX_CACHE.get(region_mapping_volume_gid)
+        x_plane, y_plane, z_plane = preprocess_space_parameters(x_plane, y_plane, z_plane, *voxel_index.shape)
+        return voxel_index.label_at(x_plane, y_plane, z_plane)
 
     def compute_params(self, region_mapping_volume=None, measure=None, data_slice='', background=None):
         # type: (RegionVolumeMappingIndex, DataTypeMatrix, str, StructuralMRIIndex) -> dict
@@ -224,22 +213,17 @@ class _MappedArrayVolumeBase(ABCDisplayer):
         if region_mapping_volume_gid is None:
             raise Exception("Invalid method called for TS without Volume Mapping!")
 
-        with h5.h5_file_for_gid(region_mapping_volume_gid) as volume_rm_h5:
-            volume_rm_shape = volume_rm_h5.array_data.shape
-
-            # Work with space inside Volume:
-            x_plane, y_plane, z_plane = preprocess_space_parameters(x_plane, y_plane, z_plane, volume_rm_shape[0],
-                                                                    volume_rm_shape[1], volume_rm_shape[2])
-            region = self.get_view_region(ts_h5, volume_rm_h5, from_idx, to_idx, x_plane, y_plane, z_plane, var, mode)
-
-        return region
+        voxel_index = VOXEL_INDEX_CACHE.get(region_mapping_volume_gid)
+        # Work with space inside Volume:
+        x_plane, y_plane, z_plane = preprocess_space_parameters(x_plane, y_plane, z_plane, *voxel_index.shape)
+        return self.get_view_region(ts_h5, voxel_index, from_idx, to_idx, x_plane, y_plane, z_plane, var, mode)
 
-    def get_view_region(self, ts_h5, volume_rm_h5, from_idx, to_idx, x_plane, y_plane, z_plane, var=0, mode=0):
+    def get_view_region(self, ts_h5, voxel_index, from_idx, to_idx, x_plane, y_plane, z_plane, var=0, mode=0):
         """
         Retrieve 3 slices through the Volume TS, at the given X, y and Z coordinates, and in time [from_idx .. to_idx].
 
         :param ts_h5: input TimeSeriesH5
-        :param volume_rm_h5: input RegionVolumeMappingH5
+        :param voxel_index: RegionVoxelIndex of the region volume mapping of the TS
         :param from_idx: int This will be the limit on the first dimension (time)
         :param to_idx: int Also limit on the first Dimension (time)
         :param x_plane: int coordinate
@@ -249,7 +233,7 @@ class _MappedArrayVolumeBase(ABCDisplayer):
         :return: An array of 3 Matrices 2D, each containing the values to display in planes xy, yz and xy.
         """
         var, mode = int(var), int(mode)
-        slice_x, slice_y, slice_z = volume_rm_h5.get_volume_slice(x_plane, y_plane, z_plane)
+        planes = voxel_index.volume_slice(x_plane, y_plane, z_plane)
 
         # Read from the current TS:
         from_idx, to_idx, current_time_length = preprocess_time_parameters(from_idx, to_idx, ts_h5.data.shape[0])
@@ -257,18 +241,10 @@ class _MappedArrayVolumeBase(ABCDisplayer):
         time_slices = slice(from_idx, to_idx), slice(var, var + 1), slice(no_of_regions), slice(mode, mode + 1)
 
         min_signal = ts_h5.get_min_max_values()[0]
+        # Only the (time, regions) window is read, voxels are gathered from it
         regions_ts = ts_h5.read_data_slice(time_slices)[:, 0, :, 0]
-        regions_ts = numpy.hstack((regions_ts, numpy.ones((current_time_length, 1)) * ts_h5.out_of_range(min_signal)))
-
-        # Index from TS with the space mapping:
-        result_x, result_y, result_z = [], [], []
-
-        for i in range(0, current_time_length):
-            result_x.append(regions_ts[i][slice_x].tolist())
-            result_y.append(regions_ts[i][slice_y].tolist())
-            result_z.append(regions_ts[i][slice_z].tolist())
-
-        return [result_x, result_y, result_z]
+        result = RegionVoxelIndex.gather_planes(regions_ts, planes, ts_h5.out_of_range(min_signal))
+        return [plane_ts.tolist() for plane_ts in result]
 
 
 class BaseVolumeVisualizerModel(ViewModel):
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Voxel lookups of region volume mappings, precomputed once per mapping and shared by the volume visualizers.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy
+from tvb.core.neocom import h5
+
+BACKGROUND_LABEL = 'background'
+
+
+class RegionVoxelIndex(object):
+    """
+    The region of each voxel of a RegionVolumeMapping, run-length encoded in C order. Runs never cross an x slice,
+    so one slice decodes on its own. A CSR index lists the runs of each region.
+    Voxels outside the brain are mapped to -1.
+    """
+
+    def __init__(self, array_data, region_labels, connectivity_gid=None):
+        mapping = numpy.asarray(array_data, dtype=numpy.int32)
+        self.shape = mapping.shape
+        self.region_labels = numpy.asarray(region_labels)
+        self.connectivity_gid = connectivity_gid
+
+        flat = mapping.ravel()
+        slice_length = self.shape[1] * self.shape[2]
+        slice_starts = numpy.arange(0, flat.size, slice_length)
+        changes = numpy.flatnonzero(flat[1:] != flat[:-1]) + 1
+        self.run_starts = numpy.union1d(changes, slice_starts)
+        self.run_lengths = numpy.diff(numpy.append(self.run_starts, flat.size))
+        self.run_labels = flat[self.run_starts]
+        # First run of each x slice, and the end of the last one
+        self.slice_runs = numpy.append(numpy.searchsorted(self.run_starts, slice_starts), self.run_starts.size)
+
+        in_brain = numpy.flatnonzero(self.run_labels >= 0)
+        self.region_runs = in_brain[numpy.argsort(self.run_labels[in_brain], kind='stable')]
+        self.region_run_ptr = numpy.searchsorted(self.run_labels[self.region_runs],
+                                                 numpy.arange(self.region_labels.size + 1))
+
+    def labels_at(self, flat_indices):
+        """
+        :returns: the regions of the voxels at the given flat (C order) indices
+        """
+        return self.run_labels[numpy.searchsorted(self.run_starts, flat_indices, side='right') - 1]
+
+    def region_at(self, x, y, z):
+        return int(self.labels_at(numpy.ravel_multi_index((x, y, z), self.shape)))
+
+    def label_at(self, x, y, z):
+        region = self.region_at(x, y, z)
+        return self.region_labels[region] if region >= 0 else BACKGROUND_LABEL
+
+    def _decode_slice(self, x):
+        runs = slice(self.slice_runs[x], self.slice_runs[x + 1])
+        return numpy.repeat(self.run_labels[runs], self.run_lengths[runs]).reshape(self.shape[1:])
+
+    def volume_slice(self, x_plane, y_plane, z_plane):
+        """
+        The same planes as RegionVolumeMappingH5.get_volume_slice, without reading the mapping again.
+        """
+        length_1d, length_2d, length_3d = self.shape
+        rows = numpy.arange(length_1d)[:, numpy.newaxis] * length_2d * length_3d
+
+        slice_x = self.labels_at(rows + numpy.arange(length_2d) * length_3d + z_plane)
+        slice_y = self._decode_slice(x_plane)[..., ::-1]
+        slice_z = self.labels_at(rows + y_plane * length_3d + numpy.arange(length_3d))[..., ::-1]
+        return [slice_x, slice_y, slice_z]
+
+    def region_voxels(self, region):
+        """
+        :returns: the flat (C order) indices of all the voxels of region
+        """
+        runs = self.region_runs[self.region_run_ptr[region]:self.region_run_ptr[region + 1]]
+        if runs.size == 0:
+            return numpy.empty(0, dtype=numpy.int64)
+        lengths = self.run_lengths[runs]
+        # Offsets inside each run, added to the start of the run they belong to
+        run_of_voxel = numpy.repeat(numpy.arange(runs.size), lengths)
+        offsets = numpy.arange(lengths.sum()) - numpy.repeat(numpy.cumsum(lengths) - lengths, lengths)
+        return self.run_starts[runs][run_of_voxel] + offsets
+
+    def region_sizes(self):
+        """
+        :returns: the number of voxels of each region
+        """
+        in_brain = self.run_labels >= 0
+        return numpy.bincount(self.run_labels[in_brain], weights=self.run_lengths[in_brain],
+                              minlength=self.region_labels.size).astype(numpy.int64)
+
+    @staticmethod
+    def gather_planes(regions_data, planes, background_value):
+        """
+        Project region values on volume planes.
+
+        :param regions_data: array (..., regions), e.g. a window of a region time series as (time, regions)
+        :param planes: 2D arrays of region indices, as returned by volume_slice
+        :param background_value: value shown for the voxels outside the brain
+        :returns: one array (..., plane shape) per plane
+        """
+        background = numpy.full(regions_data.shape[:-1] + (1,), background_value, dtype=regions_data.dtype)
+        # Region -1 picks the background column, appended last
+        regions_data = numpy.concatenate((regions_data, background), axis=-1)
+        return [regions_data[..., plane] for plane in planes]
+
+
+class RegionVoxelIndexCache(object):
+    """
+    RegionVoxelIndex instances of the most recently viewed region volume mappings, by GID.
+    DataTypes do not change once stored, so entries are never stale.
+    """
+
+    def __init__(self, max_size=8):
+        self.max_size = max_size
+        self._indices = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, region_mapping_volume_gid):
+        with self._lock:
+            voxel_index = self._indices.get(region_mapping_volume_gid)
+            if voxel_index is not None:
+                self._indices.move_to_end(region_mapping_volume_gid)
+                return voxel_index
+
+        voxel_index = self._build(region_mapping_volume_gid)
+        with self._lock:
+            self._indices[region_mapping_volume_gid] = voxel_index
+            self._indices.move_to_end(region_mapping_volume_gid)
+            while len(self._indices) > self.max_size:
+                self._indices.popitem(last=False)
+        return voxel_index
+
+    @staticmethod
+    def _build(region_mapping_volume_gid):
+        with h5.h5_file_for_gid(region_mapping_volume_gid) as region_mapping_h5:
+            array_data = region_mapping_h5.array_data.load()
+            connectivity_gid = region_mapping_h5.connectivity.load()
+        with h5.h5_file_for_gid(connectivity_gid) as connectivity_h5:
+            region_labels = connectivity_h5.region_labels.load()
+        return RegionVoxelIndex(array_data, region_labels, connectivity_gid)
+
+
+VOXEL_INDEX_CACHE = RegionVoxelIndexCache()
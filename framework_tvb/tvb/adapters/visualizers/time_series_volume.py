@@ -111,7 +111,9 @@ class TimeSeriesVolumeVisualiser(_MappedArrayVolumeBase):
     def launch(self, view_model):
         # type: (TimeSeriesVolumeVisualiserModel) -> dict
 
-        url_volume_data = URLGenerator.build_url(MappedArrayVolumeVisualizer.stored_adapter.id, 'get_volume_view', view_model.time_series, '')
+        volume_adapter = dao.get_algorithm_by_module(MappedArrayVolumeVisualizer.__module__,
+                                                     MappedArrayVolumeVisualizer.__name__)
+        url_volume_data = URLGenerator.build_url(volume_adapter.id, 'get_volume_view', view_model.time_series, '')
         url_timeseries_data = URLGenerator.build_url(self.stored_adapter.id, 'get_voxel_time_series',
                                                      view_model.time_series, '')
 
@@ -185,24 +187,19 @@ class TimeSeriesVolumeVisualiser(_MappedArrayVolumeBase):
             data = ts_h5.get_voxel_time_series(**kwargs)
         return data
 
-    def get_view_region(self, ts_h5, volume_rm_h5, from_idx, to_idx, x, y, z, var=0, mode=0):
-        idx_slices = slice(x, x + 1), slice(y, y + 1), slice(z, z + 1)
-
-        idx = int(volume_rm_h5.array_data[idx_slices])
+    def get_view_region(self, ts_h5, voxel_index, from_idx, to_idx, x, y, z, var=0, mode=0):
+        idx = voxel_index.region_at(x, y, z)
 
         time_length = ts_h5.data.shape[0]
         var, mode = int(var), int(mode)
         voxel_slices = prepare_time_slice(time_length), slice(var, var + 1), slice(idx, idx + 1), slice(mode, mode + 1)
 
-        connectivity_gid = volume_rm_h5.connectivity.load()
-        with h5.h5_file_for_gid(connectivity_gid) as connectivity_h5:
-            label = connectivity_h5.region_labels.load()[idx]
+        label = voxel_index.label_at(x, y, z)
 
         background, back_min, back_max = None, None, None
         if idx < 0:
             back_min, back_max = ts_h5.get_min_max_values()
             background = numpy.ones((time_length, 1)) * ts_h5.out_of_range(back_min)
-            label = 'background'
 
         result = postprocess_voxel_ts(ts_h5, voxel_slices, background, back_min, back_max, label)
         return result
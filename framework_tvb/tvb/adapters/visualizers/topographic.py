@@ -241,10 +241,20 @@ class TopographicViewer(ABCDisplayer):
 
         connectivities_idx = []
         measures_ht = []
+        min_vals = []
+        max_vals = []
         for measure in [view_model.data_0, view_model.data_1, view_model.data_2]:
             if measure is not None:
                 measure_index = self.load_entity_by_gid(measure)
-                measures_ht.append(h5.load_from_index(measure_index))
+                measure_ht = h5.load_from_index(measure_index)
+                measures_ht.append(measure_ht)
+                # The ranges were computed when the measure got indexed, there is no need to scan it again
+                if measure_index.array_data_min is None or measure_index.array_data_max is None:
+                    min_vals.append(measure_ht.array_data.min())
+                    max_vals.append(measure_ht.array_data.max())
+                else:
+                    min_vals.append(measure_index.array_data_min)
+                    max_vals.append(measure_index.array_data_max)
                 conn_index = self.load_entity_by_gid(measure_index.fk_connectivity_gid)
                 connectivities_idx.append(conn_index)
 
@@ -255,8 +265,6 @@ class TopographicViewer(ABCDisplayer):
 
         arrays = []
         titles = []
-        min_vals = []
-        max_vals = []
         data_array = []
         data_arrays = []
         for i, measure in enumerate(measures_ht):
@@ -264,8 +272,6 @@ class TopographicViewer(ABCDisplayer):
                 raise Exception("Use the same connectivity!!!")
             arrays.append(measure.array_data.tolist())
             titles.append(measure.title)
-            min_vals.append(measure.array_data.min())
-            max_vals.append(measure.array_data.max())
 
         color_bar_min = min(min_vals)
         color_bar_max = max(max_vals)
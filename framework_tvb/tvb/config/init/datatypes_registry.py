@@ -30,6 +30,7 @@
 from tvb.core.entities.file.simulator.burst_configuration_h5 import BurstConfigurationH5
 from tvb.core.entities.model.model_burst import BurstConfiguration
 from tvb.datatypes.connectivity import Connectivity
+from tvb.datatypes.entropy import MultiscaleEntropy
 from tvb.datatypes.fcd import Fcd
 from tvb.datatypes.graph import ConnectivityMeasure, CorrelationCoefficients, Covariance
 from tvb.datatypes.local_connectivity import LocalConnectivity
@@ -49,6 +50,7 @@ from tvb.datatypes.volumes import Volume
 from tvb.core.entities.file.simulator.simulation_history_h5 import SimulationHistoryH5, SimulationHistory
 from tvb.adapters.datatypes.h5.annotation_h5 import ConnectivityAnnotationsH5, ConnectivityAnnotations
 from tvb.adapters.datatypes.h5.connectivity_h5 import ConnectivityH5
+from tvb.adapters.datatypes.h5.entropy_h5 import MultiscaleEntropyH5
 from tvb.adapters.datatypes.h5.fcd_h5 import FcdH5
 from tvb.adapters.datatypes.h5.graph_h5 import ConnectivityMeasureH5, CorrelationCoefficientsH5, CovarianceH5
 from tvb.adapters.datatypes.h5.local_connectivity_h5 import LocalConnectivityH5
@@ -71,6 +73,7 @@ from tvb.adapters.datatypes.h5.tracts_h5 import TractsH5
 from tvb.adapters.datatypes.h5.volumes_h5 import VolumeH5
 from tvb.adapters.datatypes.db.annotation import ConnectivityAnnotationsIndex
 from tvb.adapters.datatypes.db.connectivity import ConnectivityIndex
+from tvb.adapters.datatypes.db.entropy import MultiscaleEntropyIndex
 from tvb.adapters.datatypes.db.fcd import FcdIndex
 from tvb.adapters.datatypes.db.graph import ConnectivityMeasureIndex, CorrelationCoefficientsIndex
 from tvb.adapters.datatypes.db.graph import CovarianceIndex
@@ -129,6 +132,7 @@ def populate_datatypes_registry():
     REGISTRY.register_datatype(CorrelationCoefficients, CorrelationCoefficientsH5, CorrelationCoefficientsIndex)
     REGISTRY.register_datatype(Covariance, CovarianceH5, CovarianceIndex)
     REGISTRY.register_datatype(Fcd, FcdH5, FcdIndex)
+    REGISTRY.register_datatype(MultiscaleEntropy, MultiscaleEntropyH5, MultiscaleEntropyIndex)
     REGISTRY.register_datatype(SpatioTemporalPattern, None, SpatioTemporalPatternIndex)
     REGISTRY.register_datatype(StimuliRegion, StimuliRegionH5, StimuliRegionIndex)
     REGISTRY.register_datatype(StimuliSurface, StimuliSurfaceH5, StimuliSurfaceIndex)
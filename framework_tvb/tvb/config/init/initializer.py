@@ -40,6 +40,7 @@ from tvb.basic.logger.builder import get_logger
 from tvb.basic.profile import TvbProfile
 from tvb.config import VIEW_MODEL2ADAPTER
 from tvb.config.init.datatypes_registry import populate_datatypes_registry
+from tvb.config.init.introspection_manifest import IntrospectionManifest, compute_code_hash
 from tvb.config.init.introspector_registry import IntrospectionRegistry
 from tvb.config.init.model_manager import initialize_startup, reset_database
 from tvb.core import removers_factory
@@ -54,6 +55,8 @@ from tvb.core.services.project_service import initialize_storage
 from tvb.core.services.settings_service import SettingsService
 from tvb.core.services.user_service import UserService
 
+LOGGER = get_logger(__name__)
+
 
 def reset():
     """
@@ -62,7 +65,7 @@ def reset():
     reset_database()
 
 
-def command_initializer(persist_settings=True, skip_import=False):
+def command_initializer(persist_settings=True, skip_import=False, skip_updates=False):
     if persist_settings and TvbProfile.is_first_run():
         settings_service = SettingsService()
         settings = {}
@@ -76,7 +79,7 @@ def command_initializer(persist_settings=True, skip_import=False):
     SA_SESSIONMAKER.configure(bind=new_db_engine)
 
     # Initialize application
-    initialize(skip_import)
+    initialize(skip_import, skip_updates)
 
 
 def initialize(skip_import=False, skip_updates=False):
@@ -94,14 +97,18 @@ def initialize(skip_import=False, skip_updates=False):
 
     # Populate DB algorithms, by introspection
     start_introspection_time = datetime.now()
-    # Introspection is always done, even if DB was not empty.
+    # Introspection is always done, even if DB was not empty, but adapters are only imported when changed.
     introspector = Introspector()
-    introspector.introspect()
+    if introspector.introspect():
+        to_invalidate = dao.get_non_validated_entities(start_introspection_time)
+        for entity in to_invalidate:
+            entity.removed = True
+        dao.store_entities(to_invalidate)
 
-    to_invalidate = dao.get_non_validated_entities(start_introspection_time)
-    for entity in to_invalidate:
-        entity.removed = True
-    dao.store_entities(to_invalidate)
+    # Counters might be missing or stale after an upgrade, or after rows were removed outside of this application
+    changed_counters = dao.reconcile_disk_usage()
+    if changed_counters:
+        LOGGER.info("%d disk usage counters were recomputed" % changed_counters)
 
     if not TvbProfile.is_first_run() and not skip_updates:
         # Create default users.
@@ -131,18 +138,42 @@ def initialize(skip_import=False, skip_updates=False):
 
 class Introspector(object):
 
-    def __init__(self):
+    def __init__(self, manifest=None):
         self.introspection_registry = IntrospectionRegistry()
+        self.manifest = manifest or IntrospectionManifest()
         self.logger = get_logger(self.__class__.__module__)
 
     def introspect(self):
+        """
+        Create the DataType tables and synchronize the ALGORITHMS table with the registered adapters.
+        The adapter modules are not imported, and the table is left as it is, when the manifest written by the
+        previous synchronization matches the current code and every algorithm it lists is still in the DB.
+        :returns: True when the algorithms were synchronized, False when that was skipped
+        """
         self._ensure_datatype_tables_are_created()
         populate_datatypes_registry()
-        for algo_category_class in IntrospectionRegistry.ADAPTERS:
-            algo_category_id = self._populate_algorithm_categories(algo_category_class)
-            self._populate_algorithms(algo_category_class, algo_category_id)
         removers_factory.update_dictionary(DATATYPE_REMOVERS)
 
+        code_hash = compute_code_hash()
+        if not IntrospectionRegistry.adapters_loaded() and self._is_db_in_sync(self.manifest.read(code_hash)):
+            self.logger.info("Introspection manifest is up to date, adapters will be imported on first use")
+            return False
+
+        self.manifest.remove()
+        manifest_entries = []
+        for algo_category_class in self.introspection_registry.ADAPTERS:
+            algo_category_id = self._populate_algorithm_categories(algo_category_class)
+            manifest_entries.extend(self._populate_algorithms(algo_category_class, algo_category_id))
+        self.manifest.write(code_hash, manifest_entries)
+        return True
+
+    @staticmethod
+    def _is_db_in_sync(manifest_entries):
+        if not manifest_entries:
+            return False
+        stored = set((algo.module, algo.classname) for algo in dao.get_all_algorithms() or [] if not algo.removed)
+        return all((entry['module'], entry['classname']) in stored for entry in manifest_entries)
+
     @staticmethod
     def _ensure_datatype_tables_are_created():
         session = SA_SESSIONMAKER()
@@ -169,6 +200,7 @@ class Introspector(object):
         return algo_category_instance.id
 
     def _populate_algorithms(self, algo_category_class, algo_category_id):
+        manifest_entries = []
         for adapter_class in self.introspection_registry.ADAPTERS[algo_category_class]:
             try:
                 if not adapter_class.can_be_active():
@@ -203,5 +235,7 @@ class Introspector(object):
                 VIEW_MODEL2ADAPTER[view_model_class] = stored_adapter
 
                 adapter_class.stored_adapter = stored_adapter
+                manifest_entries.append(IntrospectionManifest.entry(algo_category_class, stored_adapter))
             except Exception:
                 self.logger.exception("Could not introspect Adapters file:" + adapter_class.__module__)
+        return manifest_entries
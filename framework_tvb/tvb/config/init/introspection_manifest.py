@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+"""
+A manifest of the Algorithm rows written by the last introspection, validated by a hash of the code and
+settings they were generated from, so that restarts with unchanged code can skip importing all adapters.
+"""
+import hashlib
+import json
+import os
+
+import tvb.adapters
+import tvb.config
+from tvb.basic.logger.builder import get_logger
+from tvb.basic.profile import TvbProfile
+
+LOGGER = get_logger(__name__)
+
+
+def compute_code_hash(packages=(tvb.adapters, tvb.config)):
+    """
+    Hash the version, the DB URL and the size and modification time of every python file under the given
+    packages. This only stats files, it does not import them.
+    """
+    code_hash = hashlib.sha1()
+    code_hash.update(TvbProfile.current.version.CURRENT_VERSION.encode())
+    code_hash.update(TvbProfile.current.db.DB_URL.encode())
+    for package in packages:
+        for root, dirs, files in os.walk(os.path.dirname(package.__file__)):
+            dirs.sort()
+            for file_name in sorted(files):
+                if file_name.endswith('.py'):
+                    stat = os.stat(os.path.join(root, file_name))
+                    code_hash.update(("%s/%s:%d:%d" % (root, file_name, stat.st_size, stat.st_mtime_ns)).encode())
+    return code_hash.hexdigest()
+
+
+class IntrospectionManifest(object):
+    """
+    JSON file holding the code hash and, per introspected adapter, its class path, category, UI metadata and
+    output types, as stored in the Algorithm table.
+    """
+    FILE_NAME = "introspection_manifest.json"
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(TvbProfile.current.TVB_STORAGE, self.FILE_NAME)
+
+    def read(self, code_hash):
+        """
+        :returns: the list of adapter entries, or None when there is no manifest for this code hash
+        """
+        try:
+            with open(self.path) as manifest_file:
+                manifest = json.load(manifest_file)
+        except (IOError, ValueError):
+            return None
+        if manifest.get('code_hash') != code_hash:
+            return None
+        return manifest.get('adapters')
+
+    def write(self, code_hash, adapters):
+        try:
+            with open(self.path, 'w') as manifest_file:
+                json.dump({'code_hash': code_hash, 'adapters': adapters}, manifest_file, indent=1)
+        except IOError:
+            LOGGER.exception("Could not write the introspection manifest " + self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    @staticmethod
+    def entry(algo_category_class, stored_adapter):
+        return {'category': algo_category_class.category_name,
+                'module': stored_adapter.module,
+                'classname': stored_adapter.classname,
+                'group_name': stored_adapter.group_name,
+                'displayname': stored_adapter.displayname,
+                'subsection_name': stored_adapter.subsection_name,
+                'required_datatype': stored_adapter.required_datatype,
+                'datatype_filter': stored_adapter.datatype_filter,
+                'parameter_name': stored_adapter.parameter_name,
+                'outputlist': stored_adapter.outputlist}
@@ -31,6 +31,9 @@
 import inspect
 from importlib import import_module
 
+import tvb.adapters.analyzers
+import tvb.adapters.creators
+import tvb.adapters.simulator
 import tvb.adapters.uploaders
 import tvb.adapters.visualizers
 import tvb.adapters.datatypes.db
@@ -44,12 +47,6 @@ from tvb.config.algorithm_categories import *
 from tvb.basic.logger.builder import get_logger
 from tvb.core.adapters.abcadapter import ABCAdapter
 from tvb.core.entities.model.model_datatype import DataType
-from tvb.adapters.analyzers.metrics_group_timeseries import TimeseriesMetricsAdapter
-from tvb.adapters.creators.allen_creator import AllenConnectomeBuilder
-from tvb.adapters.simulator.simulator_adapter import SimulatorAdapter
-from tvb.adapters.visualizers.connectivity import ConnectivityViewer
-from tvb.adapters.visualizers.pse_discrete import DiscretePSEAdapter
-from tvb.adapters.visualizers.pse_isocline import IsoclinePSEAdapter
 
 LOGGER = get_logger(__name__)
 
@@ -99,6 +96,36 @@ def import_dt_index(dt_top_module, all_dt_files):
     return result
 
 
+class _ImportedOnFirstAccess(object):
+    """
+    Class attribute computed by ``load`` the first time it is read, so that importing the registry
+    does not import every adapter module.
+    """
+
+    def __init__(self, load):
+        self.load = load
+        self.value = None
+
+    def __get__(self, instance, owner):
+        if self.value is None:
+            self.value = self.load()
+        return self.value
+
+    @property
+    def loaded(self):
+        return self.value is not None
+
+
+def _import_all_adapters():
+    return {
+        AnalyzeAlgorithmCategoryConfig: import_adapters(tvb.adapters.analyzers, ALL_ANALYZERS),
+        SimulateAlgorithmCategoryConfig: import_adapters(tvb.adapters.simulator, ALL_SIMULATORS),
+        UploadAlgorithmCategoryConfig: import_adapters(tvb.adapters.uploaders, ALL_UPLOADERS),
+        ViewAlgorithmCategoryConfig: import_adapters(tvb.adapters.visualizers, ALL_VISUALIZERS),
+        CreateAlgorithmCategoryConfig: import_adapters(tvb.adapters.creators, ALL_CREATORS),
+    }
+
+
 class IntrospectionRegistry(object):
     """
     This registry gathers classes that have a role in generating DB tables and rows.
@@ -110,34 +137,33 @@ class IntrospectionRegistry(object):
     All classes that subclass AlgorithmCategoryConfig, ABCAdapter, ABCRemover, HasTraitsIndex should be imported here
     and added to the proper dictionary/list.
     e.g. Each new class of type HasTraitsIndex should be imported here and added to the DATATYPES list.
+    The adapter modules are only imported when ADAPTERS is first accessed.
     """
-    ADAPTERS = {
-        AnalyzeAlgorithmCategoryConfig: import_adapters(tvb.adapters.analyzers, ALL_ANALYZERS),
-        SimulateAlgorithmCategoryConfig: import_adapters(tvb.adapters.simulator, ALL_SIMULATORS),
-        UploadAlgorithmCategoryConfig: import_adapters(tvb.adapters.uploaders, ALL_UPLOADERS),
-        ViewAlgorithmCategoryConfig: import_adapters(tvb.adapters.visualizers, ALL_VISUALIZERS),
-        CreateAlgorithmCategoryConfig: import_adapters(tvb.adapters.creators, ALL_CREATORS),
-    }
+    ADAPTERS = _ImportedOnFirstAccess(_import_all_adapters)
 
     DATATYPES = import_dt_index(tvb.adapters.datatypes.db, ALL_DATATYPES)
 
-    SIMULATOR_MODULE = SimulatorAdapter.__module__
-    SIMULATOR_CLASS = SimulatorAdapter.__name__
+    SIMULATOR_MODULE = "tvb.adapters.simulator.simulator_adapter"
+    SIMULATOR_CLASS = "SimulatorAdapter"
+
+    CONNECTIVITY_MODULE = "tvb.adapters.visualizers.connectivity"
+    CONNECTIVITY_CLASS = "ConnectivityViewer"
 
-    CONNECTIVITY_MODULE = ConnectivityViewer.__module__
-    CONNECTIVITY_CLASS = ConnectivityViewer.__name__
+    ALLEN_CREATOR_MODULE = "tvb.adapters.creators.allen_creator"
+    ALLEN_CREATOR_CLASS = "AllenConnectomeBuilder"
 
-    ALLEN_CREATOR_MODULE = AllenConnectomeBuilder.__module__
-    ALLEN_CREATOR_CLASS = AllenConnectomeBuilder.__name__
+    MEASURE_METRICS_MODULE = "tvb.adapters.analyzers.metrics_group_timeseries"
+    MEASURE_METRICS_CLASS = "TimeseriesMetricsAdapter"
 
-    MEASURE_METRICS_MODULE = TimeseriesMetricsAdapter.__module__
-    MEASURE_METRICS_CLASS = TimeseriesMetricsAdapter.__name__
+    DISCRETE_PSE_ADAPTER_MODULE = "tvb.adapters.visualizers.pse_discrete"
+    DISCRETE_PSE_ADAPTER_CLASS = "DiscretePSEAdapter"
 
-    DISCRETE_PSE_ADAPTER_MODULE = DiscretePSEAdapter.__module__
-    DISCRETE_PSE_ADAPTER_CLASS = DiscretePSEAdapter.__name__
+    ISOCLINE_PSE_ADAPTER_MODULE = "tvb.adapters.visualizers.pse_isocline"
+    ISOCLINE_PSE_ADAPTER_CLASS = "IsoclinePSEAdapter"
 
-    ISOCLINE_PSE_ADAPTER_MODULE = IsoclinePSEAdapter.__module__
-    ISOCLINE_PSE_ADAPTER_CLASS = IsoclinePSEAdapter.__name__
+    @classmethod
+    def adapters_loaded(cls):
+        return cls.__dict__['ADAPTERS'].loaded
 
 
 
@@ -50,6 +50,8 @@ from six import add_metaclass
 from tvb.basic.logger.builder import get_logger
 from tvb.basic.neotraits.api import Attr, HasTraits, List
 from tvb.basic.profile import TvbProfile
+from tvb.basic.timings import stage
+from tvb.core.adapters.cost_estimator import CostEstimate, OperationCostEstimator, peak_memory
 from tvb.core.adapters.exceptions import IntrospectionException, LaunchException, InvalidParameterException
 from tvb.core.adapters.exceptions import NoMemoryAvailableException
 from tvb.core.entities.generic_attributes import GenericAttributes
@@ -67,6 +69,10 @@ from tvb.storage.storage_interface import StorageInterface
 
 LOGGER = get_logger("ABCAdapter")
 
+STAGE_CONFIGURE = "configure"
+STAGE_LAUNCH = "launch"
+STAGE_STORE_RESULTS = "store_results"
+
 
 def nan_not_allowed():
     """
@@ -160,6 +166,10 @@ class ABCAdapterForm(Form):
                 field.fill_from_post(form_data)
 
 
+# CPUs reserved for an operation, unless its adapter declares more with get_required_cpus
+OPERATION_CPUS = 1
+
+
 class AdapterLaunchModeEnum(Enum):
     SYNC_SAME_MEM = 'sync_same_mem'
     SYNC_DIFF_MEM = 'sync_diff_mem'
@@ -174,6 +184,8 @@ class ABCAdapter(object):
     # model.Algorithm instance that will be set for each adapter class created by in build_adapter method
     stored_adapter = None
     launch_mode = AdapterLaunchModeEnum.ASYNC_DIFF_MEM
+    # Whether the large data sets of the results are shared with identical ones already stored (see BlobStore)
+    deduplicate_results = False
 
     def __init__(self):
         self.generic_attributes = GenericAttributes()
@@ -271,6 +283,13 @@ class ABCAdapter(object):
         for launching the adapter.
         """
 
+    def get_required_cpus(self, view_model):
+        """
+        Number of CPUs the adapter uses when launched, which are reserved for its operation.
+        To be overridden in the adapters running their work in parallel.
+        """
+        return OPERATION_CPUS
+
     @abstractmethod
     def get_required_disk_size(self, view_model):
         """
@@ -285,6 +304,29 @@ class ABCAdapter(object):
         """
         return -1
 
+    def get_cost_features(self, view_model):
+        """
+        To be implemented in adapters whose cost depends on the size of their input.
+        Should return a dict of the numbers (e.g. number of nodes, of time points) which drive the runtime,
+        memory and disk size of the launch, by name. These are recorded with the measured costs of each
+        operation, and the costs of the next operations are fitted on them.
+        """
+        return {}
+
+    def estimate_cost(self, view_model):
+        """
+        Estimate the resources needed for launching this (configured) adapter, from the measures of the previous
+        operations of the same algorithm, or as declared by the adapter while too few measures exist.
+        :returns: a CostEstimate, with runtime in seconds, memory in bytes and disk size in kilo-Bytes
+        """
+        def declared_cost():
+            return CostEstimate(self.get_execution_time_approximation(view_model),
+                                self.get_required_memory_size(view_model),
+                                self.get_required_disk_size(view_model), 0)
+
+        algorithm_id = self.stored_adapter.id if self.stored_adapter is not None else None
+        return OperationCostEstimator().estimate(algorithm_id, self.get_cost_features(view_model), declared_cost)
+
     @abstractmethod
     def launch(self, view_model):
         """
@@ -318,7 +360,8 @@ class ABCAdapter(object):
         total_free_memory = psutil.virtual_memory().free + psutil.swap_memory().free
         total_existent_memory = psutil.virtual_memory().total + psutil.swap_memory().total
         memory_reference = (total_free_memory + total_existent_memory) / 2
-        adapter_required_memory = self.get_required_memory_size(view_model)
+        cost = self.estimate_cost(view_model)
+        adapter_required_memory = cost.memory
 
         if adapter_required_memory > memory_reference:
             msg = "Machine does not have enough RAM memory for the operation (expected %.2g GB, but found %.2g GB)."
@@ -326,7 +369,7 @@ class ABCAdapter(object):
 
         # Compare the expected size of the operation results with the HDD space currently available for the user
         # TVB defines a quota per user.
-        required_disk_space = self.get_required_disk_size(view_model)
+        required_disk_space = cost.disk_size
         if available_disk_space < 0:
             msg = "You have exceeded you HDD space quota by %.2f MB Stopping execution."
             raise NoMemoryAvailableException(msg % (- available_disk_space / 2 ** 10))
@@ -349,16 +392,27 @@ class ABCAdapter(object):
         """
         self.extract_operation_data(operation)
         self.generic_attributes.fill_from(view_model.generic_attributes)
-        self.configure(view_model)
+        with stage(STAGE_CONFIGURE):
+            self.configure(view_model)
         required_disk_size = self._ensure_enough_resources(available_disk_space, view_model)
         self._update_operation_entity(operation, required_disk_size)
 
-        result = self.launch(view_model)
+        start_time = datetime.now()
+        with stage(STAGE_LAUNCH):
+            result = self.launch(view_model)
+        runtime = (datetime.now() - start_time).total_seconds()
 
         if not isinstance(result, (list, tuple)):
             result = [result, ]
         self.__check_integrity(result)
-        return self._capture_operation_results(result)
+        with stage(STAGE_STORE_RESULTS):
+            message, count_stored = self._capture_operation_results(result)
+
+        if operation is not None and OperationCostEstimator.is_measured(operation.id):
+            disk_size = sum(res.disk_size or 0 for res in result if res is not None)
+            OperationCostEstimator.record(operation.fk_from_algo, self.get_cost_features(view_model), runtime,
+                                          peak_memory(), disk_size, operation.id)
+        return message, count_stored
 
     def _capture_operation_results(self, result):
         """
@@ -391,6 +445,8 @@ class ABCAdapter(object):
                 if not res.fixed_generic_attributes:
                     with H5File.from_file(associated_file) as f:
                         f.store_generic_attributes(self.generic_attributes)
+                if self.deduplicate_results:
+                    self.storage_interface.deduplicate_h5(associated_file)
                 # Compute size-on disk, in case file-storage is used
                 res.disk_size = self.storage_interface.compute_size_on_disk(associated_file)
 
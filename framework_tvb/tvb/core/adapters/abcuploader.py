@@ -90,6 +90,8 @@ class ABCUploader(ABCAdapter, metaclass=ABCMeta):
     """
     LOGGER = get_logger(__name__)
     launch_mode = AdapterLaunchModeEnum.SYNC_DIFF_MEM
+    # The same connectivities, surfaces and sensors get uploaded in many projects
+    deduplicate_results = True
 
     def _prelaunch(self, operation, view_model, available_disk_space=0):
         """
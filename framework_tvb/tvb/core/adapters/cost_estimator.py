@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and 
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+"""
+Estimation of the runtime, memory and disk size of an operation, from the resources measured on the previous
+operations of the same algorithm in this installation.
+
+For every algorithm, each cost is fitted as a power law of the shape parameters declared by the adapter
+(e.g. number of nodes and of integration steps for a simulation), by least squares in log space.
+While too few measures exist, the estimations declared by the adapter itself are used.
+"""
+
+import json
+import sys
+from collections import namedtuple
+import numpy
+import psutil
+from tvb.basic.logger.builder import get_logger
+from tvb.core.entities.model.model_operation import OperationCost
+from tvb.core.entities.storage import dao
+
+LOGGER = get_logger(__name__)
+
+CostEstimate = namedtuple('CostEstimate', ['runtime', 'memory', 'disk_size', 'samples'])
+
+
+def peak_memory():
+    """
+    :returns: the peak resident memory of the current process, in bytes
+    """
+    try:
+        import resource
+    except ImportError:
+        # Windows
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 2 ** 10
+
+
+class OperationCostEstimator(object):
+    """
+    Records the resources used by finished operations and predicts the ones needed by the next operations.
+    """
+    # Fewer measures than this, or than the number of parameters of the fit plus two, leave the adapter estimation
+    MIN_SAMPLES = 5
+    # Only the most recent measures are fitted, so that the model follows changes of the machine and of the code
+    MAX_SAMPLES = 200
+    # Extra margin over the largest under-estimation seen on the fitted measures
+    SAFETY_FACTOR = 1.2
+
+    COSTS = ('runtime', 'peak_memory', 'disk_size')
+
+    # Id of the operation for which the current process was started. Only that operation is measured: the peak
+    # memory of any other process (e.g. the web server) or of later operations includes what ran before them.
+    measured_operation_id = None
+
+    @classmethod
+    def measure_process(cls, operation_id):
+        """ Declare the current process as started for running one operation, whose costs should be recorded """
+        cls.measured_operation_id = int(operation_id)
+
+    @classmethod
+    def is_measured(cls, operation_id):
+        """ :returns: True when operation_id is the one this process was started for, and not measured yet """
+        if operation_id is None or cls.measured_operation_id != int(operation_id):
+            return False
+        cls.measured_operation_id = None
+        return True
+
+    @staticmethod
+    def record(algorithm_id, features, runtime, memory, disk_size, operation_id=None):
+        """
+        Store the resources used by one operation which finished successfully.
+        """
+        try:
+            dao.store_entity(OperationCost(algorithm_id, features, runtime, memory, disk_size, operation_id))
+        except Exception as excep:
+            # A missing measure only makes the estimations less precise
+            LOGGER.warning("Could not record the cost of operation %s: %s" % (operation_id, excep))
+
+    @staticmethod
+    def _log_features(features, names):
+        return numpy.log1p(numpy.abs(numpy.array([float(features[name]) for name in names])))
+
+    def fit(self, algorithm_id, features):
+        """
+        Fit the cost model of an algorithm on the stored measures with the same shape parameters.
+        :returns: None when there are too few measures, otherwise a dict from each of `COSTS` to a pair
+                  (coefficients, log margin), and the number of measures used under the 'samples' key
+        """
+        names = sorted(features)
+        samples = []
+        for cost in dao.get_operation_costs(algorithm_id, self.MAX_SAMPLES):
+            sample_features = json.loads(cost.features)
+            if sorted(sample_features) == names:
+                samples.append((sample_features, cost))
+        if len(samples) < max(self.MIN_SAMPLES, len(names) + 3):
+            return None
+
+        design = numpy.ones((len(samples), len(names) + 1))
+        for i, (sample_features, _) in enumerate(samples):
+            design[i, 1:] = self._log_features(sample_features, names)
+
+        model = {'samples': len(samples)}
+        for attr in self.COSTS:
+            observed = numpy.log1p(numpy.array([max(getattr(cost, attr) or 0, 0) for _, cost in samples], dtype=float))
+            coefficients = numpy.linalg.lstsq(design, observed, rcond=None)[0]
+            margin = max((observed - design.dot(coefficients)).max(), 0.0)
+            model[attr] = coefficients, margin
+        return model
+
+    def estimate(self, algorithm_id, features, fallback):
+        """
+        :param algorithm_id: ID of the Algorithm to be launched
+        :param features: dict of the shape parameters of the operation input, by name
+        :param fallback: callable returning a CostEstimate, used while too few measures exist
+        :returns: a CostEstimate with runtime in seconds, memory in bytes and disk size in KB
+        """
+        model = None
+        if algorithm_id is not None:
+            try:
+                model = self.fit(algorithm_id, features)
+            except Exception as excep:
+                LOGGER.warning("Could not fit the cost model for algorithm %s: %s" % (algorithm_id, excep))
+        if model is None:
+            return fallback()
+
+        row = numpy.concatenate(([1.0], self._log_features(features, sorted(features))))
+        predicted = []
+        for attr in self.COSTS:
+            coefficients, margin = model[attr]
+            predicted.append(numpy.expm1(row.dot(coefficients) + margin) * self.SAFETY_FACTOR)
+        runtime, memory, disk_size = predicted
+        return CostEstimate(max(int(numpy.ceil(runtime)), 1), int(memory), int(disk_size), model['samples'])
@@ -56,9 +56,10 @@ class UpdateManager(object):
         self.checked_version = check_version
         self.current_version = current_version
 
-    def get_update_scripts(self, checked_version=None):
+    def get_update_scripts(self, checked_version=None, last_version=None):
         """
         Return all update scripts that need to be executed in order to bring code up to date.
+        When last_version is given, the scripts for the versions after it are left out.
         """
         unprocessed_scripts = []
         if checked_version is None:
@@ -67,7 +68,7 @@ class UpdateManager(object):
         for file_n in os.listdir(os.path.dirname(self.update_scripts_module.__file__)):
             if '_update' in file_n and file_n.endswith('.py'):
                 version_nr = int(file_n.split('_')[0])
-                if version_nr > checked_version:
+                if version_nr > checked_version and (last_version is None or version_nr <= last_version):
                     unprocessed_scripts.append(file_n)
 
         result = sorted(unprocessed_scripts, key=lambda x: int(x.split('_')[0]))
@@ -75,12 +76,22 @@ class UpdateManager(object):
             self.log.info("Found unprocessed update scripts: %s." % result)
         return result
 
+    def _load_script(self, script_name):
+        script_module_name = self.update_scripts_module.__name__ + '.' + script_name.split('.')[0]
+        return importlib.import_module(script_module_name)
+
+    def is_parallel_safe(self, script_name):
+        """
+        True when the script declares, with a module level PARALLEL_SAFE = True, that it only touches the
+        file it is given, so that it can run for several files at once, in separate processes.
+        """
+        return getattr(self._load_script(script_name), 'PARALLEL_SAFE', False)
+
     def run_update_script(self, script_name, **kwargs):
         """
         Run one script file.
         """
-        script_module_name = self.update_scripts_module.__name__ + '.' + script_name.split('.')[0]
-        script_module = importlib.import_module(script_module_name)
+        script_module = self._load_script(script_name)
 
         if not hasattr(script_module, 'update'):
             raise InvalidUpgradeScriptException("Code update scripts should expose a 'update()' method.")
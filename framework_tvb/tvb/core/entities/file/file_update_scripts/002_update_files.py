@@ -44,6 +44,8 @@ from tvb.storage.h5.file.exceptions import FileVersioningException
 
 PYTHON_EXE_PATH = TvbProfile.current.PYTHON_INTERPRETER_PATH
 DATA_BUFFER_SIZE = 50000000 / 8  # 500 MB maximum read at once (just assume worst case float64)
+# Every file is converted in its own Python process, from its own content only
+PARALLEL_SAFE = True
 
 # ---------------------- TVB 1.0 Specific constants and functions start here --------------------------
 # We duplicate these constants here since they were the ones used in TVB 1.0 and 
@@ -42,6 +42,10 @@ CONVENTIONS:
     - Each file corresponding to ${VERSION_NR} should have a public function `upgrade(input_file)` which takes as input
       a string representing a file path and does any changes required to bring that file from:
       ${VERSION_NR} - 1 to ${VERSION_NR}
+
+    - A script which only reads and writes the file it receives (no DB access, no state shared between files)
+      can declare a module level `PARALLEL_SAFE = True`. Migrations then run it for many files at once,
+      in a pool of processes, before the remaining scripts which run file by file.
 """  
 
 
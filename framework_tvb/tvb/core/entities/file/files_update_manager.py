@@ -36,13 +36,19 @@ Manager for the file storage version updates.
 .. moduleauthor:: Bogdan Neacsa <bogdan.neacsa@codemart.ro>
 .. moduleauthor:: Robert Vincze <robert.vincze@codemart.ro>
 """
-from datetime import datetime
+import hashlib
 import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
 
 import tvb.core.entities.file.file_update_scripts as file_update_scripts
 from tvb.basic.config import stored
 from tvb.basic.profile import TvbProfile
 from tvb.core.code_versions.base_classes import UpdateManager
+from tvb.core.entities.file.migration_journal import MigrationJournal, STATUS_DONE
 from tvb.core.entities.model.db_update_scripts.helper import delete_old_burst_table_after_migration
 from tvb.core.entities.storage import dao
 from tvb.core.neotraits.h5 import H5File
@@ -54,9 +60,45 @@ FILE_STORAGE_VALID = 'valid'
 FILE_STORAGE_INVALID = 'invalid'
 
 
+def _init_worker(profile_name):
+    # Processes might be spawned instead of forked, in which case they start without a profile
+    if TvbProfile.CURRENT_PROFILE_NAME != profile_name:
+        TvbProfile.set_profile(profile_name)
+
+
+def _inspect_h5_file(h5_path):
+    """
+    Read, with a single opening of the file, what the migration needs to know about it.
+
+    :returns: a tuple (path, create date, data version, size on disk) or None for the files without a
+        creation date, which are left out of migrations
+    """
+    try:
+        metadata = StorageInterface.get_storage_manager(h5_path).get_metadata()
+    except FileStructureException:
+        return None
+    create_date = metadata.get('Create_date')
+    if create_date is None:
+        return None
+    if not isinstance(create_date, datetime):
+        create_date = string2date(str(create_date, 'utf-8'), date_format='datetime:%Y-%m-%d %H:%M:%S.%f')
+    data_version = metadata.get(TvbProfile.current.version.DATA_VERSION_ATTRIBUTE)
+    return h5_path, create_date or datetime.now(), data_version, os.path.getsize(h5_path)
+
+
+def _upgrade_in_worker(h5_path, last_version):
+    start_time = time.time()
+    succeeded = FilesUpdateManager().upgrade_file(h5_path, last_version=last_version)
+    return succeeded, time.time() - start_time
+
+
 class FilesUpdateManager(UpdateManager):
     """
     Manager for updating H5 files version, when code gets changed.
+
+    With more than one worker, the leading update scripts marked as PARALLEL_SAFE run in a pool of processes,
+    the others follow, file by file, in the order in which the files were created.
+    Progress is kept in a MigrationJournal, so that a migration which was stopped continues where it was.
     """
 
     UPDATE_SCRIPTS_SUFFIX = "_update_files"
@@ -65,11 +107,14 @@ class FilesUpdateManager(UpdateManager):
     STATUS = True
     MESSAGE = "Done"
 
-    def __init__(self):
+    def __init__(self, workers=1, journal=None):
         super(FilesUpdateManager, self).__init__(file_update_scripts,
                                                  TvbProfile.current.version.DATA_CHECKED_TO_VERSION,
                                                  TvbProfile.current.version.DATA_VERSION)
         self.storage_interface = StorageInterface()
+        self.workers = workers
+        self.journal = journal
+        self._disk_sizes = {}
 
     def get_file_data_version(self, file_path):
         """
@@ -99,12 +144,25 @@ class FilesUpdateManager(UpdateManager):
             return True
         return False
 
-    def upgrade_file(self, input_file_name, datatype=None, burst_match_dict=None):
+    @staticmethod
+    def _backup_path(input_file_name):
+        # H5 files of different projects might share their name
+        path_hash = hashlib.md5(input_file_name.encode('utf-8')).hexdigest()[:8]
+        return os.path.join(TvbProfile.current.TVB_TEMP_FOLDER,
+                            "%s_%s.tmp" % (path_hash, os.path.basename(input_file_name)))
+
+    def _take_backup(self, input_file_name, backup_path):
+        # Copied under another name first, so that a backup is never found only half written
+        self.storage_interface.copy_file(input_file_name, backup_path + '.part')
+        os.replace(backup_path + '.part', backup_path)
+
+    def upgrade_file(self, input_file_name, datatype=None, burst_match_dict=None, last_version=None):
         """
         Upgrades the given file to the latest data version. The file will be upgraded
         sequentially, up until the current version from tvb.basic.config.settings.VersionSettings.DB_STRUCTURE_VERSION
 
         :param input_file_name the path to the file which needs to be upgraded
+        :param last_version: when given, stop after the update script for this version
         :return True when update was successful and False when it resulted in an error.
         """
         if self.is_file_up_to_date(input_file_name):
@@ -112,18 +170,30 @@ class FilesUpdateManager(UpdateManager):
             return True
 
         file_version = self.get_file_data_version(input_file_name)
+        update_scripts = self.get_update_scripts(file_version, last_version)
+        if not update_scripts:
+            return True
+
         self.log.info("Updating from version %s , file: %s " % (file_version, input_file_name))
-        for script_name in self.get_update_scripts(file_version):
-            temp_file_path = os.path.join(TvbProfile.current.TVB_TEMP_FOLDER,
-                                          os.path.basename(input_file_name) + '.tmp')
-            self.storage_interface.copy_file(input_file_name, temp_file_path)
-            try:
+        start_time = time.time()
+        # One copy for all the scripts: a failure puts back the file as it was before the first of them
+        backup_path = self._backup_path(input_file_name)
+        self._take_backup(input_file_name, backup_path)
+        if self.journal is not None:
+            self.journal.start(input_file_name, backup_path)
+        try:
+            for script_name in update_scripts:
                 self.run_update_script(script_name, input_file=input_file_name, burst_match_dict=burst_match_dict)
-            except FileMigrationException as excep:
-                self.storage_interface.copy_file(temp_file_path, input_file_name)
-                os.remove(temp_file_path)
-                self.log.error(excep)
-                return False
+        except FileMigrationException as excep:
+            shutil.move(backup_path, input_file_name)
+            self.log.error(excep)
+            self._finish(input_file_name, False, start_time)
+            return False
+        except Exception:
+            shutil.move(backup_path, input_file_name)
+            raise
+        os.remove(backup_path)
+        self._finish(input_file_name, True, start_time)
 
         if datatype:
             # Compute and update the disk_size attribute of the DataType in DB:
@@ -132,10 +202,72 @@ class FilesUpdateManager(UpdateManager):
 
         return True
 
+    def _finish(self, input_file_name, succeeded, start_time):
+        if self.journal is not None:
+            self.journal.finish(input_file_name, succeeded, time.time() - start_time,
+                                os.path.getsize(input_file_name))
+
+    def _parallel_safe_until(self, file_version):
+        """
+        :returns: the version up to which a file at file_version can be upgraded in a pool of processes,
+            or None when its first update script is not PARALLEL_SAFE
+        """
+        last_version = None
+        for script_name in self.get_update_scripts(file_version):
+            if not self.is_parallel_safe(script_name):
+                break
+            last_version = int(script_name.split('_')[0])
+        return last_version
+
+    def __upgrade_in_parallel(self, h5_files):
+        """
+        Run, in a pool of processes, the PARALLEL_SAFE update scripts which the given files start with.
+
+        :param h5_files: list of (path, data version) pairs
+        :returns: the paths for which the upgrade failed
+        """
+        jobs = []
+        for path, file_version in h5_files:
+            last_version = self._parallel_safe_until(file_version)
+            if last_version is not None:
+                jobs.append((path, last_version))
+        if not jobs:
+            return set()
+
+        self.log.info("Upgrading %d files in %d processes" % (len(jobs), self.workers))
+        failed = set()
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                 initargs=(TvbProfile.CURRENT_PROFILE_NAME,)) as pool:
+            futures = {}
+            for path, last_version in jobs:
+                # The worker takes the backup: until it exists, the file was not changed
+                self.journal.start(path, self._backup_path(path))
+                futures[pool.submit(_upgrade_in_worker, path, last_version)] = (path, last_version)
+
+            for future in as_completed(futures):
+                path, last_version = futures[future]
+                try:
+                    succeeded, seconds = future.result()
+                except Exception as excep:
+                    self.log.exception(excep)
+                    succeeded, seconds = False, None
+                    backup_path = self._backup_path(path)
+                    if os.path.exists(backup_path):
+                        shutil.move(backup_path, path)
+
+                if not succeeded:
+                    failed.add(path)
+                    self.journal.finish(path, False, seconds, os.path.getsize(path))
+                elif not self.get_update_scripts(last_version):
+                    self.journal.finish(path, True, seconds, os.path.getsize(path))
+                    self._record_disk_size(path)
+        return failed
+
     def __upgrade_h5_list(self, h5_files):
         """
         Upgrade a list of DataTypes to the current version.
 
+        :param h5_files: list of (path, data version) pairs, in the order of creation of the files
         :returns: (nr_of_dts_upgraded_fine, nr_of_dts_ignored) a two-tuple of integers representing
             the number of DataTypes for which the upgrade worked fine, and the number of DataTypes for which
             the upgrade has failed.
@@ -143,17 +275,53 @@ class FilesUpdateManager(UpdateManager):
         nr_of_dts_upgraded_fine = 0
         nr_of_dts_failed = 0
 
+        failed = set()
+        if self.workers > 1:
+            failed = self.__upgrade_in_parallel(h5_files)
+            nr_of_dts_failed = len(failed)
+
         burst_match_dict = {}
-        for path in h5_files:
+        for path, file_version in h5_files:
+            if path in failed:
+                continue
+            if self.journal.is_done(path):
+                nr_of_dts_upgraded_fine += 1
+                continue
             update_result = self.upgrade_file(path, burst_match_dict=burst_match_dict)
 
             if update_result:
                 nr_of_dts_upgraded_fine += 1
+                if file_version != self.current_version:
+                    self._record_disk_size(path)
             else:
                 nr_of_dts_failed += 1
 
+        self._store_disk_sizes()
+        self.journal.flush()
         return nr_of_dts_upgraded_fine, nr_of_dts_failed
 
+    def _record_disk_size(self, path):
+        """
+        Keep the new size of an upgraded file, for its DataType. The DB is updated in batches.
+        """
+        try:
+            gid = H5File.get_metadata_param(path, 'gid')
+        except FileStructureException:
+            return
+        if gid is None:
+            return
+        self._disk_sizes[uuid.UUID(gid).hex] = self.storage_interface.compute_size_on_disk(path)
+        if len(self._disk_sizes) >= self.DATA_TYPES_PAGE_SIZE:
+            self._store_disk_sizes()
+
+    def _store_disk_sizes(self):
+        datatypes = dao.get_datatypes_by_gids(list(self._disk_sizes))
+        for datatype in datatypes:
+            datatype.disk_size = self._disk_sizes[datatype.gid]
+        if datatypes:
+            dao.store_entities(datatypes)
+        self._disk_sizes = {}
+
     # TO DO: We should migrate the older scripts to Python 3 if we want to support migration for versions < 4
     def run_all_updates(self):
         """
@@ -165,10 +333,18 @@ class FilesUpdateManager(UpdateManager):
         """
         if TvbProfile.current.version.DATA_CHECKED_TO_VERSION < TvbProfile.current.version.DATA_VERSION:
             start_time = datetime.now()
-
-            file_paths = self.get_all_h5_paths()
-            total_count = len(file_paths)
-            no_ok, no_error = self.__upgrade_h5_list(file_paths)
+            if self.journal is None:
+                self.journal = MigrationJournal(self.current_version)
+            restored = self.journal.restore_interrupted()
+            if restored:
+                self.log.warning("%d files were put back as they were before an interrupted upgrade" % len(restored))
+
+            # Files upgraded before an interruption are not even opened again
+            already_done = self.journal.count(STATUS_DONE)
+            h5_files = self.get_all_h5_files(self.workers, skip=self.journal.is_done)
+            total_count = len(h5_files) + already_done
+            no_ok, no_error = self.__upgrade_h5_list([(path, version) for path, _, version, _ in h5_files])
+            no_ok += already_done
 
             self.log.info("Updated H5 files in total: %d [fine:%d, failed:%d in: %s min]" % (
                 total_count, no_ok, no_error, int((datetime.now() - start_time).seconds / 60)))
@@ -195,14 +371,49 @@ class FilesUpdateManager(UpdateManager):
 
             TvbProfile.current.version.DATA_CHECKED_TO_VERSION = TvbProfile.current.version.DATA_VERSION
             TvbProfile.current.manager.add_entries_to_config_file(config_file_update_dict)
+            # The storage is at the new version, so the journal is of no use anymore
+            self.journal.remove()
+
+    def estimate(self):
+        """
+        Estimate how long the upgrade of the current storage would take, without changing anything.
+        The speed measured by an interrupted migration is used when there is one, otherwise the time to copy
+        a file, which every upgrade does at least twice (the backup, then the rewrite).
+
+        :returns: a tuple (number of files to upgrade, their size in bytes, estimated seconds)
+        """
+        journal = self.journal or MigrationJournal(self.current_version)
+        h5_files = [(path, version, size) for path, _, version, size
+                    in self.get_all_h5_files(self.workers, skip=journal.is_done) if version != self.current_version]
+        if not h5_files:
+            return 0, 0, 0.0
+
+        parallel_size, sequential_size = 0, 0
+        for _, version, size in h5_files:
+            if self.workers > 1 and self._parallel_safe_until(version) is not None:
+                parallel_size += size
+            else:
+                sequential_size += size
+
+        seconds_per_byte = journal.seconds_per_byte()
+        if seconds_per_byte is None:
+            seconds_per_byte = 2 * self._measure_copy_speed(max(h5_files, key=lambda h5_file: h5_file[2])[0])
+        seconds = seconds_per_byte * (parallel_size / self.workers + sequential_size)
+        return len(h5_files), parallel_size + sequential_size, seconds
+
+    def _measure_copy_speed(self, h5_path):
+        backup_path = self._backup_path(h5_path)
+        start_time = time.time()
+        self.storage_interface.copy_file(h5_path, backup_path)
+        seconds = time.time() - start_time
+        os.remove(backup_path)
+        return seconds / max(os.path.getsize(h5_path), 1)
 
     @staticmethod
-    def get_all_h5_paths():
+    def _list_h5_files():
         """
-        This method returns a list of all h5 files and it is used in the migration from version 4 to 5.
-        The h5 files inside a certain project are retrieved in numerical order (1, 2, 3 etc.).
+        Yield the paths of the H5 files found in the operation folders of every project.
         """
-        h5_files = []
         projects_folder = StorageInterface().get_projects_folder()
 
         for project_path in os.listdir(projects_folder):
@@ -220,27 +431,32 @@ class FilesUpdateManager(UpdateManager):
                     op_folder_path = os.path.join(project_full_path, op_folder)
                     for file in os.listdir(op_folder_path):
                         if StorageInterface().ends_with_tvb_storage_file_extension(file):
-                            h5_file = os.path.join(op_folder_path, file)
-                            try:
-                                if FilesUpdateManager._is_empty_file(h5_file):
-                                    continue
-                                h5_files.append(h5_file)
-                            except FileStructureException:
-                                continue
+                            yield os.path.join(op_folder_path, file)
                 except ValueError:
                     pass
 
-        # Sort all h5 files based on their creation date stored in the files themselves
-        sorted_h5_files = sorted(h5_files, key=lambda h5_path: FilesUpdateManager._get_create_date_for_sorting(
-            h5_path) or datetime.now())
-        return sorted_h5_files
-
     @staticmethod
-    def _is_empty_file(h5_file):
-        return H5File.get_metadata_param(h5_file, 'Create_date') is None
+    def get_all_h5_files(workers=1, skip=None):
+        """
+        Inspect all the H5 files of the storage, in a pool of processes when more than one worker is asked for.
+
+        :param skip: optional predicate on a path, for the files to leave out without opening them
+        :returns: list of (path, create date, data version, size) tuples, sorted by creation date
+        """
+        h5_paths = [path for path in FilesUpdateManager._list_h5_files() if skip is None or not skip(path)]
+        if workers > 1:
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(TvbProfile.CURRENT_PROFILE_NAME,)) as pool:
+                h5_files = list(pool.map(_inspect_h5_file, h5_paths, chunksize=64))
+        else:
+            h5_files = [_inspect_h5_file(path) for path in h5_paths]
+        # Sort all h5 files based on their creation date stored in the files themselves
+        return sorted((h5_file for h5_file in h5_files if h5_file is not None), key=lambda h5_file: h5_file[1])
 
     @staticmethod
-    def _get_create_date_for_sorting(h5_file):
-        create_date_str = str(H5File.get_metadata_param(h5_file, 'Create_date'), 'utf-8')
-        create_date = string2date(create_date_str, date_format='datetime:%Y-%m-%d %H:%M:%S.%f')
-        return create_date
+    def get_all_h5_paths():
+        """
+        This method returns a list of all h5 files and it is used in the migration from version 4 to 5.
+        The h5 files inside a certain project are retrieved in numerical order (1, 2, 3 etc.).
+        """
+        return [h5_file[0] for h5_file in FilesUpdateManager.get_all_h5_files()]
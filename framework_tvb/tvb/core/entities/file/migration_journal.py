@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Journal of a storage migration, which lets an interrupted upgrade continue where it stopped.
+
+Every H5 file handled gets one JSON line: "started" before it is changed, with the path of its backup,
+then "done" or "failed" with the time it took. The "done" lines are written in batches, the "started"
+ones right away, because they are what allows to restore a file left half rewritten by a crash.
+"""
+
+import json
+import os
+import shutil
+
+from tvb.basic.logger.builder import get_logger
+from tvb.basic.profile import TvbProfile
+
+STATUS_STARTED = "started"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+class MigrationJournal(object):
+    """
+    Per file progress of the migration of the whole storage up to one data version.
+    Lines written for another target version are ignored, and dropped at the next write.
+    """
+    FILE_NAME = "migration_journal.jsonl"
+
+    def __init__(self, target_version, path=None, batch_size=100):
+        self.log = get_logger(self.__class__.__module__)
+        self.target_version = target_version
+        self.path = path or os.path.join(TvbProfile.current.TVB_STORAGE, self.FILE_NAME)
+        self.batch_size = batch_size
+        self.entries = {}
+        self._pending = []
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        stale = False
+        with open(self.path) as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # The last line might have been cut by the crash we are recovering from
+                    continue
+                if entry.get('version') != self.target_version:
+                    stale = True
+                    continue
+                self.entries[entry['path']] = entry
+        if stale:
+            self._rewrite()
+
+    def _rewrite(self):
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, 'w') as journal_file:
+            for entry in self.entries.values():
+                journal_file.write(json.dumps(entry) + "\n")
+        os.replace(temporary_path, self.path)
+
+    def status(self, path):
+        entry = self.entries.get(path)
+        return entry['status'] if entry else None
+
+    def is_done(self, path):
+        return self.status(path) == STATUS_DONE
+
+    def start(self, path, backup_path):
+        """
+        Record that path is about to be changed, after a copy of it was taken at backup_path.
+        """
+        self._append(dict(path=path, status=STATUS_STARTED, backup=backup_path))
+        self.flush()
+
+    def finish(self, path, succeeded, seconds, size):
+        self._append(dict(path=path, status=STATUS_DONE if succeeded else STATUS_FAILED, seconds=seconds, size=size))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def _append(self, entry):
+        entry['version'] = self.target_version
+        self.entries[entry['path']] = entry
+        self._pending.append(entry)
+
+    def flush(self):
+        if not self._pending:
+            return
+        with open(self.path, 'a') as journal_file:
+            for entry in self._pending:
+                journal_file.write(json.dumps(entry) + "\n")
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+        self._pending = []
+
+    def restore_interrupted(self):
+        """
+        Put back the backups of the files which were being changed when the previous run stopped.
+        :returns: the paths restored
+        """
+        restored = []
+        for path, entry in list(self.entries.items()):
+            if entry['status'] != STATUS_STARTED:
+                continue
+            backup_path = entry.get('backup')
+            if backup_path and os.path.exists(backup_path):
+                self.log.warning("Restoring %s, its migration was interrupted" % path)
+                shutil.move(backup_path, path)
+                restored.append(path)
+            del self.entries[path]
+        self._rewrite()
+        return restored
+
+    def seconds_per_byte(self):
+        """
+        Average migration speed measured so far, used for estimates. None when nothing was measured yet.
+        """
+        measured = [entry for entry in self.entries.values()
+                    if entry['status'] == STATUS_DONE and entry.get('size') and entry.get('seconds') is not None]
+        total_size = sum(entry['size'] for entry in measured)
+        if not total_size:
+            return None
+        return sum(entry['seconds'] for entry in measured) / total_size
+
+    def count(self, status):
+        return sum(1 for entry in self.entries.values() if entry['status'] == status)
+
+    def remove(self):
+        self._pending = []
+        self.entries = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
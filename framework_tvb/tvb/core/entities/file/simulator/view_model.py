@@ -40,7 +40,8 @@ from tvb.datatypes.sensors import SensorsEEG, SensorsMEG, SensorsInternal
 from tvb.datatypes.surfaces import CorticalSurface
 from tvb.simulator.integrators import HeunDeterministic, Integrator, IntegratorStochastic, HeunStochastic, \
     EulerDeterministic, EulerStochastic, RungeKutta4thOrderDeterministic, Identity, VODE, VODEStochastic, Dopri5, \
-    Dopri5Stochastic, Dop853, Dop853Stochastic
+    Dopri5Stochastic, Dop853, Dop853Stochastic, SemiImplicitEulerDeterministic, SemiImplicitEulerStochastic, \
+    ExponentialEulerDeterministic, ExponentialEulerStochastic
 from tvb.simulator.monitors import Monitor, EEG, MEG, iEEG, Raw, SubSample, SpatialAverage, GlobalAverage, \
     TemporalAverage, Projection, Bold, BoldRegionROI
 from tvb.simulator.noise import Noise, Additive, Multiplicative
@@ -165,6 +166,30 @@ class Dop853StochasticViewModel(IntegratorStochasticViewModel, Dop853Stochastic)
         return Dop853Stochastic
 
 
+class SemiImplicitEulerDeterministicViewModel(IntegratorViewModel, SemiImplicitEulerDeterministic):
+    @property
+    def linked_has_traits(self):
+        return SemiImplicitEulerDeterministic
+
+
+class SemiImplicitEulerStochasticViewModel(IntegratorStochasticViewModel, SemiImplicitEulerStochastic):
+    @property
+    def linked_has_traits(self):
+        return SemiImplicitEulerStochastic
+
+
+class ExponentialEulerDeterministicViewModel(IntegratorViewModel, ExponentialEulerDeterministic):
+    @property
+    def linked_has_traits(self):
+        return ExponentialEulerDeterministic
+
+
+class ExponentialEulerStochasticViewModel(IntegratorStochasticViewModel, ExponentialEulerStochastic):
+    @property
+    def linked_has_traits(self):
+        return ExponentialEulerStochastic
+
+
 class MonitorViewModel(ViewModel, Monitor):
     @property
     def linked_has_traits(self):
@@ -177,8 +177,16 @@ class DataType(HasTraitsIndex):
         To be implemented in each sub-class which is about to be displayed in UI, 
         and return the text to appear.
         """
-        display_name = self.display_type
-        for tag in [self.user_tag_1, self.user_tag_2, self.user_tag_3, self.user_tag_4, self.user_tag_5]:
+        return self.compose_display_name(self.type, [self.user_tag_1, self.user_tag_2, self.user_tag_3,
+                                                     self.user_tag_4, self.user_tag_5])
+
+    @staticmethod
+    def compose_display_name(datatype_type, user_tags):
+        """
+        The default display_name, from the type and the user tags of a DataType, without loading it.
+        """
+        display_name = datatype_type.replace("Index", "")
+        for tag in user_tags:
             if tag is not None and len(tag) > 0:
                 display_name += " - " + str(tag)
         return display_name
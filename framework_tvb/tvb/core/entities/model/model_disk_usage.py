@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and 
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Disk usage counters, kept per user, per project and per simulation burst.
+
+The counters are updated in the same transaction which stores, moves or removes a DataType or an Operation,
+so that quota checks and listings read one row instead of summing over all the DataTypes of an owner.
+They can always be recomputed from the DataTypes table, with `DatatypeDAO.reconcile_disk_usage`.
+
+"""
+
+from sqlalchemy import BigInteger, Column, Integer, String, UniqueConstraint, and_, event, func, select
+from sqlalchemy.orm.attributes import get_history
+from tvb.core.entities.model.model_burst import BurstConfiguration
+from tvb.core.entities.model.model_datatype import DataType
+from tvb.core.entities.model.model_operation import Operation
+from tvb.core.entities.model.model_project import Project, User
+from tvb.core.neotraits.db import Base
+
+OWNER_USER = 'user'
+OWNER_PROJECT = 'project'
+OWNER_BURST = 'burst'
+
+
+class DiskUsage(Base):
+    """
+    Number of KB used on disk by the DataTypes of one owner.
+    For a user and a project this is the sum of DataType.disk_size over the operations launched by or in them
+    (the project also counts the view models stored for its operations), for a burst the sum over the DataTypes
+    generated by it, without the DataTypeGroups, which already include the size of their members.
+    """
+    __tablename__ = 'DISK_USAGE'
+    __table_args__ = (UniqueConstraint('owner_type', 'owner_key'),)
+
+    id = Column(Integer, primary_key=True)
+    owner_type = Column(String)
+    owner_key = Column(String)
+    disk_size = Column(BigInteger, default=0)
+
+    def __init__(self, owner_type, owner_key, disk_size=0):
+        self.owner_type = owner_type
+        self.owner_key = str(owner_key)
+        self.disk_size = disk_size
+
+    def __repr__(self):
+        return "<DiskUsage(%s, %s, %s)>" % (self.owner_type, self.owner_key, self.disk_size)
+
+
+def _write_disk_usage(connection, owner_type, owner_key, value, delta=0):
+    table = DiskUsage.__table__
+    owner_key = str(owner_key)
+    result = connection.execute(table.update().where(
+        and_(table.c.owner_type == owner_type, table.c.owner_key == owner_key)
+    ).values(disk_size=value + delta))
+    if result.rowcount == 0:
+        connection.execute(table.insert().values(owner_type=owner_type, owner_key=owner_key, disk_size=delta))
+
+
+def _add_disk_usage(connection, owner_type, owner_key, delta):
+    if not delta or owner_key is None:
+        return
+    _write_disk_usage(connection, owner_type, owner_key, DiskUsage.__table__.c.disk_size, delta)
+
+
+def _operation_owners(connection, operation_id):
+    if operation_id is None:
+        return None, None
+    table = Operation.__table__
+    row = connection.execute(select([table.c.fk_launched_by, table.c.fk_launched_in]
+                                    ).where(table.c.id == operation_id)).first()
+    return (row[0], row[1]) if row is not None else (None, None)
+
+
+def _add_datatype_usage(connection, disk_size, operation_id, burst_gid, datatype_type, sign):
+    if not disk_size:
+        return
+    delta = sign * disk_size
+    user_id, project_id = _operation_owners(connection, operation_id)
+    _add_disk_usage(connection, OWNER_USER, user_id, delta)
+    _add_disk_usage(connection, OWNER_PROJECT, project_id, delta)
+    if datatype_type != "DataTypeGroup":
+        _add_disk_usage(connection, OWNER_BURST, burst_gid, delta)
+
+
+def _stored_datatype(connection, datatype_id):
+    table = DataType.__table__
+    return connection.execute(select([table.c.disk_size, table.c.fk_from_operation, table.c.fk_parent_burst,
+                                      table.c.type]).where(table.c.id == datatype_id)).first()
+
+
+def _datatype_inserted(mapper, connection, target):
+    _add_datatype_usage(connection, target.disk_size, target.fk_from_operation, target.fk_parent_burst,
+                        target.type, 1)
+
+
+def _datatype_updating(mapper, connection, target):
+    if not any(get_history(target, attr).has_changes()
+               for attr in ('disk_size', 'fk_from_operation', 'fk_parent_burst')):
+        return
+    stored = _stored_datatype(connection, target.id)
+    if stored is not None:
+        _add_datatype_usage(connection, *stored, sign=-1)
+    _add_datatype_usage(connection, target.disk_size, target.fk_from_operation, target.fk_parent_burst,
+                        target.type, 1)
+
+
+def _datatype_deleting(mapper, connection, target):
+    stored = _stored_datatype(connection, target.id)
+    if stored is not None:
+        _add_datatype_usage(connection, *stored, sign=-1)
+
+
+def _stored_operation(connection, operation_id):
+    table = Operation.__table__
+    return connection.execute(select([table.c.view_model_disk_size, table.c.fk_launched_by, table.c.fk_launched_in]
+                                     ).where(table.c.id == operation_id)).first()
+
+
+def _operation_datatypes_size(connection, operation_id):
+    table = DataType.__table__
+    return connection.execute(select([func.sum(table.c.disk_size)]
+                                     ).where(table.c.fk_from_operation == operation_id)).scalar() or 0
+
+
+def _operation_inserted(mapper, connection, target):
+    _add_disk_usage(connection, OWNER_PROJECT, target.fk_launched_in, target.view_model_disk_size)
+
+
+def _operation_updating(mapper, connection, target):
+    if not any(get_history(target, attr).has_changes()
+               for attr in ('view_model_disk_size', 'fk_launched_by', 'fk_launched_in')):
+        return
+    stored = _stored_operation(connection, target.id)
+    if stored is None:
+        return
+    view_model_size, user_id, project_id = stored
+    datatypes_size = 0
+    if user_id != target.fk_launched_by or project_id != target.fk_launched_in:
+        datatypes_size = _operation_datatypes_size(connection, target.id)
+        _add_disk_usage(connection, OWNER_USER, user_id, -datatypes_size)
+        _add_disk_usage(connection, OWNER_USER, target.fk_launched_by, datatypes_size)
+    _add_disk_usage(connection, OWNER_PROJECT, project_id, -((view_model_size or 0) + datatypes_size))
+    _add_disk_usage(connection, OWNER_PROJECT, target.fk_launched_in,
+                    (target.view_model_disk_size or 0) + datatypes_size)
+
+
+def _operation_deleting(mapper, connection, target):
+    stored = _stored_operation(connection, target.id)
+    if stored is not None:
+        _add_disk_usage(connection, OWNER_PROJECT, stored[2], -(stored[0] or 0))
+
+
+def _owner_listeners(owner_type, key_attr):
+    table = DiskUsage.__table__
+
+    def inserted(mapper, connection, target):
+        # A counter left behind by an owner removed outside of the ORM is reset, instead of failing on the key
+        if getattr(target, key_attr) is not None:
+            _write_disk_usage(connection, owner_type, getattr(target, key_attr), 0)
+
+    def deleted(mapper, connection, target):
+        connection.execute(table.delete().where(and_(table.c.owner_type == owner_type,
+                                                     table.c.owner_key == str(getattr(target, key_attr)))))
+
+    return inserted, deleted
+
+
+event.listen(DataType, 'after_insert', _datatype_inserted, propagate=True)
+event.listen(DataType, 'before_update', _datatype_updating, propagate=True)
+event.listen(DataType, 'before_delete', _datatype_deleting, propagate=True)
+event.listen(Operation, 'after_insert', _operation_inserted)
+event.listen(Operation, 'before_update', _operation_updating)
+event.listen(Operation, 'before_delete', _operation_deleting)
+
+for _owner_class, _owner_type, _key_attr in ((User, OWNER_USER, 'id'), (Project, OWNER_PROJECT, 'id'),
+                                             (BurstConfiguration, OWNER_BURST, 'gid')):
+    _inserted, _deleted = _owner_listeners(_owner_type, _key_attr)
+    event.listen(_owner_class, 'after_insert', _inserted)
+    event.listen(_owner_class, 'after_delete', _deleted)
@@ -38,9 +38,10 @@ Here we define entities for Operations and Algorithms.
 
 import json
 from datetime import datetime
-from sqlalchemy import Boolean, Integer, String, DateTime, Column, ForeignKey
+from sqlalchemy import BigInteger, Boolean, Float, Integer, String, DateTime, Column, ForeignKey
 from sqlalchemy.orm import relationship, backref
 from tvb.basic.logger.builder import get_logger
+from tvb.basic.timings import StageTimings
 from tvb.config import TVB_IMPORTER_CLASS, TVB_IMPORTER_MODULE
 from tvb.core.entities.exportable import Exportable
 from tvb.core.entities.model.model_project import Project, User
@@ -426,6 +427,70 @@ class OperationProcessIdentifier(Base):
         self.job_id = job_id
 
 
+class OperationCost(Base):
+    """
+    Resources actually used by one finished operation, together with the shape parameters
+    of its input (as returned by the adapter), so that the cost of the next operations can be estimated.
+    """
+    __tablename__ = "OPERATION_COSTS"
+
+    id = Column(Integer, primary_key=True)
+    fk_from_algo = Column(Integer, ForeignKey('ALGORITHMS.id', ondelete="CASCADE"))
+    # Kept when the operation is removed, the measure remains valid for the estimations
+    fk_from_operation = Column(Integer)
+    features = Column(String)
+    runtime = Column(Float)  # seconds
+    peak_memory = Column(BigInteger)  # bytes
+    disk_size = Column(Integer)  # KB
+    create_date = Column(DateTime)
+
+    def __init__(self, algorithm_id, features, runtime, peak_memory, disk_size, operation_id=None):
+        self.fk_from_algo = algorithm_id
+        self.features = json.dumps(features, sort_keys=True)
+        self.runtime = runtime
+        self.peak_memory = peak_memory
+        self.disk_size = disk_size
+        self.fk_from_operation = operation_id
+        self.create_date = datetime.now()
+
+    def __repr__(self):
+        return "<OperationCost(%s, %s, %s, %s, %s)>" % (self.fk_from_algo, self.features, self.runtime,
+                                                       self.peak_memory, self.disk_size)
+
+
+class OperationStageTimings(Base):
+    """
+    Wall clock time spent in each stage of one operation (queueing, process spawn, view model load,
+    H5 I/O, DB writes, launch and, for simulations, each stage of the integration loop),
+    kept together with the TVB version which ran it, to compare runs and versions.
+    """
+    __tablename__ = "OPERATION_STAGE_TIMINGS"
+
+    id = Column(Integer, primary_key=True)
+    fk_from_algo = Column(Integer, ForeignKey('ALGORITHMS.id', ondelete="CASCADE"))
+    # Kept when the operation is removed, as the measure of a past version
+    fk_from_operation = Column(Integer, index=True)
+    tvb_version = Column(String)
+    timings = Column(String)
+    create_date = Column(DateTime)
+
+    algorithm = relationship(Algorithm)
+
+    def __init__(self, operation_id, algorithm_id, tvb_version, timings):
+        self.fk_from_operation = operation_id
+        self.fk_from_algo = algorithm_id
+        self.tvb_version = tvb_version
+        self.timings = json.dumps(timings.to_dict(), sort_keys=True)
+        self.create_date = datetime.now()
+
+    @property
+    def stage_timings(self):
+        return StageTimings.from_dict(json.loads(self.timings))
+
+    def __repr__(self):
+        return "<OperationStageTimings(%s, %s, %s)>" % (self.fk_from_operation, self.tvb_version, self.timings)
+
+
 class ResultFigure(Base, Exportable):
     """
     Class for storing figures from results, visualize them eventually next to each other.
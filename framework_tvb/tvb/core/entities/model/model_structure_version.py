@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and 
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Structure versions, one counter per project, increased whenever the project data tree could look different.
+
+The counters are updated in the same transaction which stores, changes, links or removes a DataType, also from the
+processes running operations, so that a cached tree can be checked with one row read instead of being rebuilt.
+
+"""
+
+from sqlalchemy import BigInteger, Column, Integer, event, select
+from sqlalchemy.orm.attributes import get_history
+from tvb.core.entities.model.model_burst import BurstConfiguration
+from tvb.core.entities.model.model_datatype import DataType, Links
+from tvb.core.entities.model.model_operation import Operation
+from tvb.core.entities.model.model_project import Project
+from tvb.core.neotraits.db import Base
+
+# Fields shown in, or used for grouping, the project tree
+DATATYPE_TREE_FIELDS = ('subject', 'state', 'visible', 'invalid', 'user_tag_1', 'user_tag_2', 'user_tag_3',
+                        'user_tag_4', 'user_tag_5', 'fk_parent_burst', 'fk_datatype_group', 'fk_from_operation')
+OPERATION_TREE_FIELDS = ('user_group', 'completion_date', 'fk_launched_in', 'fk_operation_group')
+
+
+class ProjectStructureVersion(Base):
+    """
+    Version of the data tree of one project.
+    There is no foreign key to the project, as versions are increased while a project is being removed.
+    """
+    __tablename__ = 'PROJECT_STRUCTURE_VERSIONS'
+
+    fk_project = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(BigInteger, default=0)
+
+    def __init__(self, project_id, version=0):
+        self.fk_project = project_id
+        self.version = version
+
+    def __repr__(self):
+        return "<ProjectStructureVersion(%s, %s)>" % (self.fk_project, self.version)
+
+
+def _increase_version(connection, project_id):
+    if project_id is None:
+        return
+    table = ProjectStructureVersion.__table__
+    result = connection.execute(table.update().where(table.c.fk_project == project_id
+                                                     ).values(version=table.c.version + 1))
+    if result.rowcount == 0:
+        connection.execute(table.insert().values(fk_project=project_id, version=1))
+
+
+def _datatype_projects(connection, datatype_id, operation_id):
+    """
+    The project where the DataType was generated, and the projects it is linked into.
+    """
+    projects = set()
+    if operation_id is not None:
+        operations = Operation.__table__
+        projects.update(row[0] for row in connection.execute(
+            select([operations.c.fk_launched_in]).where(operations.c.id == operation_id)))
+    if datatype_id is not None:
+        links = Links.__table__
+        projects.update(row[0] for row in connection.execute(
+            select([links.c.fk_to_project]).where(links.c.fk_from_datatype == datatype_id)))
+    return projects
+
+
+def _datatype_changed(mapper, connection, target):
+    operation_ids = {target.fk_from_operation}
+    operation_ids.update(get_history(target, 'fk_from_operation').deleted or ())
+    for operation_id in operation_ids:
+        for project_id in _datatype_projects(connection, target.id, operation_id):
+            _increase_version(connection, project_id)
+
+
+def _datatype_updating(mapper, connection, target):
+    if any(get_history(target, attr).has_changes() for attr in DATATYPE_TREE_FIELDS):
+        _datatype_changed(mapper, connection, target)
+
+
+def _operation_updating(mapper, connection, target):
+    if not any(get_history(target, attr).has_changes() for attr in OPERATION_TREE_FIELDS):
+        return
+    _increase_version(connection, target.fk_launched_in)
+    for project_id in get_history(target, 'fk_launched_in').deleted or ():
+        _increase_version(connection, project_id)
+
+
+def _operation_deleting(mapper, connection, target):
+    _increase_version(connection, target.fk_launched_in)
+
+
+def _link_changed(mapper, connection, target):
+    _increase_version(connection, target.fk_to_project)
+
+
+def _burst_updating(mapper, connection, target):
+    if get_history(target, 'name').has_changes():
+        _increase_version(connection, target.fk_project)
+
+
+def _project_deleted(mapper, connection, target):
+    table = ProjectStructureVersion.__table__
+    connection.execute(table.delete().where(table.c.fk_project == target.id))
+
+
+event.listen(DataType, 'after_insert', _datatype_changed, propagate=True)
+event.listen(DataType, 'before_update', _datatype_updating, propagate=True)
+event.listen(DataType, 'before_delete', _datatype_changed, propagate=True)
+event.listen(Operation, 'before_update', _operation_updating)
+event.listen(Operation, 'before_delete', _operation_deleting)
+event.listen(Links, 'after_insert', _link_changed)
+event.listen(Links, 'after_delete', _link_changed)
+event.listen(BurstConfiguration, 'before_update', _burst_updating)
+event.listen(Project, 'after_delete', _project_deleted)
@@ -45,7 +45,10 @@ from sqlalchemy.sql.expression import desc, cast
 from sqlalchemy.types import Text
 from tvb.core.entities.model.model_burst import BurstConfiguration
 from tvb.core.entities.model.model_datatype import *
+from tvb.core.entities.model.model_disk_usage import DiskUsage, OWNER_BURST, OWNER_PROJECT, OWNER_USER
 from tvb.core.entities.model.model_operation import Operation, AlgorithmCategory, Algorithm, OperationGroup
+from tvb.core.entities.model.model_structure_version import ProjectStructureVersion
+from tvb.core.entities.model.model_project import User, Project
 from tvb.core.entities.storage.root_dao import RootDAO, DEFAULT_PAGE_SIZE
 from tvb.core.neotraits.db import Base
 
@@ -181,16 +184,75 @@ class DatatypeDAO(RootDAO):
         # For those bursts the size will be zero
         ret = {b_gid: 0 for b_gid in burst_gids}
         try:
-            query = self.session.query(DataType.fk_parent_burst, func.sum(DataType.disk_size)
-                        ).group_by(DataType.fk_parent_burst
-                        ).filter(DataType.type != "DataTypeGroup"
-                        ).filter(DataType.fk_parent_burst.in_(burst_gids))
+            query = self.session.query(DiskUsage.owner_key, DiskUsage.disk_size
+                                       ).filter(DiskUsage.owner_type == OWNER_BURST
+                                       ).filter(DiskUsage.owner_key.in_(burst_gids))
             for b_gid, size in query.all():
                 ret[b_gid] = size or 0
         except SQLAlchemyError as excep:
             self.logger.exception(excep)
         return ret
 
+    def reconcile_disk_usage(self):
+        """
+        Recompute all the disk usage counters from the DATA_TYPES and OPERATIONS tables,
+        fixing the ones which went out of sync (e.g. after rows were removed outside of the ORM).
+        The counters are locked while they are recomputed, and only corrected by the difference found,
+        so that the DataTypes stored meanwhile by other transactions are still counted.
+        :returns the number of counters which were changed
+        """
+        stored = dict(((owner_type, owner_key), (usage_id, size)) for usage_id, owner_type, owner_key, size
+                      in self.session.query(DiskUsage.id, DiskUsage.owner_type, DiskUsage.owner_key,
+                                            DiskUsage.disk_size).with_for_update())
+        expected = {}
+        for user_id, in self.session.query(User.id):
+            expected[(OWNER_USER, str(user_id))] = 0
+        for project_id, in self.session.query(Project.id):
+            expected[(OWNER_PROJECT, str(project_id))] = 0
+        for burst_gid, in self.session.query(BurstConfiguration.gid).filter(BurstConfiguration.gid.isnot(None)):
+            expected[(OWNER_BURST, burst_gid)] = 0
+
+        datatypes_per_operation = self.session.query(DataType.disk_size.label('disk_size'),
+                                                     Operation.fk_launched_by.label('user_id'),
+                                                     Operation.fk_launched_in.label('project_id')
+                                                     ).join(Operation).subquery()
+        for owner_type, owner_column in ((OWNER_USER, datatypes_per_operation.c.user_id),
+                                         (OWNER_PROJECT, datatypes_per_operation.c.project_id)):
+            query = self.session.query(owner_column, func.sum(datatypes_per_operation.c.disk_size)
+                                       ).group_by(owner_column)
+            for owner_id, size in query.all():
+                if owner_id is not None:
+                    expected[(owner_type, str(owner_id))] = size or 0
+        query = self.session.query(Operation.fk_launched_in, func.sum(Operation.view_model_disk_size)
+                                   ).group_by(Operation.fk_launched_in)
+        for project_id, size in query.all():
+            key = (OWNER_PROJECT, str(project_id))
+            if project_id is not None and key in expected:
+                expected[key] += size or 0
+        query = self.session.query(DataType.fk_parent_burst, func.sum(DataType.disk_size)
+                                   ).filter(DataType.type != self.EXCEPTION_DATATYPE_GROUP
+                                   ).filter(DataType.fk_parent_burst.isnot(None)).group_by(DataType.fk_parent_burst)
+        for burst_gid, size in query.all():
+            expected[(OWNER_BURST, burst_gid)] = size or 0
+
+        changed = 0
+        for (owner_type, owner_key), size in expected.items():
+            usage = stored.pop((owner_type, owner_key), None)
+            if usage is None:
+                self.session.add(DiskUsage(owner_type, owner_key, size))
+            elif usage[1] != size:
+                self.session.query(DiskUsage).filter(DiskUsage.id == usage[0]).update(
+                    {DiskUsage.disk_size: DiskUsage.disk_size + (size - (usage[1] or 0))}, synchronize_session=False)
+            else:
+                continue
+            changed += 1
+        if stored:
+            self.session.query(DiskUsage).filter(DiskUsage.id.in_([usage_id for usage_id, _ in stored.values()])
+                                                 ).delete(synchronize_session=False)
+            changed += len(stored)
+        self.session.commit()
+        return changed
+
     #
     # DATA_TYPE RELATED METHODS
     #
@@ -293,50 +355,8 @@ class DatatypeDAO(RootDAO):
         """
         resulted_data = []
         try:
-            # First Query DT, DT_gr, Lk_DT and Lk_DT_gr
-            query = self.session.query(DataType
-                        ).join((Operation, Operation.id == DataType.fk_from_operation)
-                        ).join(Algorithm).join(AlgorithmCategory
-                        ).outerjoin((Links, and_(Links.fk_from_datatype == DataType.id,
-                                                       Links.fk_to_project == project_id))
-                        ).outerjoin(BurstConfiguration,
-                                    DataType.fk_parent_burst == BurstConfiguration.gid
-                                    ).filter(DataType.fk_datatype_group == None
-                        ).filter(or_(Operation.fk_launched_in == project_id,
-                                     Links.fk_to_project == project_id))
-
-            if visibility_filter:
-                filter_str = visibility_filter.get_sql_filter_equivalent()
-                if filter_str is not None:
-                    query = query.filter(eval(filter_str))
-            if filter_value is not None:
-                query = query.filter(self._compose_filter_datatype_ilike(filter_value))
-
-            resulted_data = query.all()
-
-            # Now query what it was not covered before:
-            # Links of DT which are part of a group, but the entire group is not linked
-            links = aliased(Links)
-            query2 = self.session.query(DataType
-                        ).join((Operation, Operation.id == DataType.fk_from_operation)
-                        ).join(Algorithm).join(AlgorithmCategory
-                        ).join((Links, and_(Links.fk_from_datatype == DataType.id,
-                                                  Links.fk_to_project == project_id))
-                        ).outerjoin(links, and_(links.fk_from_datatype == DataType.fk_datatype_group,
-                                                links.fk_to_project == project_id)
-                        ).outerjoin(BurstConfiguration,
-                                    DataType.fk_parent_burst == BurstConfiguration.gid
-                                    ).filter(DataType.fk_datatype_group != None
-                        ).filter(links.id == None)
-
-            if visibility_filter:
-                filter_str = visibility_filter.get_sql_filter_equivalent()
-                if filter_str is not None:
-                    query2 = query2.filter(eval(filter_str))
-            if filter_value is not None:
-                query2 = query2.filter(self._compose_filter_datatype_ilike(filter_value))
-
-            resulted_data.extend(query2.all())
+            for query in self._query_data_in_project((DataType,), project_id, visibility_filter, filter_value):
+                resulted_data.extend(query.all())
 
             # Load lazy fields for future usage
             for dt in resulted_data:
@@ -354,6 +374,102 @@ class DatatypeDAO(RootDAO):
         return resulted_data
 
 
+    def get_structure_data_in_project(self, project_id, visibility_filter=None, filter_value=None):
+        """
+        Same DataTypes as get_data_in_project, but only the columns displayed in the project tree, read in one
+        query per selection together with their operation, algorithm, author, operation group and burst.
+        :returns: a list of named rows
+        """
+        columns = (DataType.id, DataType.gid, DataType.type, DataType.subject, DataType.state, DataType.visible,
+                   DataType.invalid, DataType.user_tag_1, DataType.user_tag_2, DataType.user_tag_3,
+                   DataType.user_tag_4, DataType.user_tag_5, Operation.fk_launched_in, Operation.user_group,
+                   Operation.completion_date, Operation.fk_operation_group,
+                   OperationGroup.name.label('operation_group_name'), Algorithm.displayname.label('algorithm_name'),
+                   AlgorithmCategory.displayname.label('category_name'), User.username,
+                   BurstConfiguration.name.label('burst_name'))
+        resulted_data = []
+        try:
+            for query in self._query_data_in_project(columns, project_id, visibility_filter, filter_value):
+                query = query.join(User, User.id == Operation.fk_launched_by
+                                   ).outerjoin(OperationGroup, OperationGroup.id == Operation.fk_operation_group)
+                resulted_data.extend(query.all())
+        except Exception as excep:
+            self.logger.exception(excep)
+        return resulted_data
+
+
+    def _query_data_in_project(self, entities, project_id, visibility_filter, filter_value):
+        """
+        :returns: the two queries selecting the data of a project, on the given entities or columns
+        """
+        # First Query DT, DT_gr, Lk_DT and Lk_DT_gr
+        query = self.session.query(*entities
+                    ).select_from(DataType
+                    ).join((Operation, Operation.id == DataType.fk_from_operation)
+                    ).join(Algorithm, Algorithm.id == Operation.fk_from_algo
+                    ).join(AlgorithmCategory, AlgorithmCategory.id == Algorithm.fk_category
+                    ).outerjoin((Links, and_(Links.fk_from_datatype == DataType.id,
+                                                   Links.fk_to_project == project_id))
+                    ).outerjoin(BurstConfiguration,
+                                DataType.fk_parent_burst == BurstConfiguration.gid
+                                ).filter(DataType.fk_datatype_group == None
+                    ).filter(or_(Operation.fk_launched_in == project_id,
+                                 Links.fk_to_project == project_id))
+
+        # Now query what it was not covered before:
+        # Links of DT which are part of a group, but the entire group is not linked
+        links = aliased(Links)
+        query2 = self.session.query(*entities
+                    ).select_from(DataType
+                    ).join((Operation, Operation.id == DataType.fk_from_operation)
+                    ).join(Algorithm, Algorithm.id == Operation.fk_from_algo
+                    ).join(AlgorithmCategory, AlgorithmCategory.id == Algorithm.fk_category
+                    ).join((Links, and_(Links.fk_from_datatype == DataType.id,
+                                              Links.fk_to_project == project_id))
+                    ).outerjoin(links, and_(links.fk_from_datatype == DataType.fk_datatype_group,
+                                            links.fk_to_project == project_id)
+                    ).outerjoin(BurstConfiguration,
+                                DataType.fk_parent_burst == BurstConfiguration.gid
+                                ).filter(DataType.fk_datatype_group != None
+                    ).filter(links.id == None)
+
+        queries = []
+        for selection in (query, query2):
+            if visibility_filter:
+                filter_str = visibility_filter.get_sql_filter_equivalent()
+                if filter_str is not None:
+                    selection = selection.filter(eval(filter_str))
+            if filter_value is not None:
+                selection = selection.filter(self._compose_filter_datatype_ilike(filter_value))
+            queries.append(selection)
+        return queries
+
+
+    def get_display_names(self, datatype_class, datatype_ids, chunk_size=500):
+        """
+        :returns: dictionary {DataType id: display_name} for DataTypes of one class, loaded with their own columns
+        """
+        display_names = {}
+        datatype_ids = list(datatype_ids)
+        try:
+            for start in range(0, len(datatype_ids), chunk_size):
+                query = self.session.query(datatype_class
+                                           ).filter(datatype_class.id.in_(datatype_ids[start:start + chunk_size]))
+                display_names.update((datatype.id, datatype.display_name) for datatype in query.all())
+        except SQLAlchemyError as excep:
+            self.logger.exception(excep)
+        return display_names
+
+
+    def get_project_structure_version(self, project_id):
+        """
+        :returns: the version of the data tree of a project, which changes with any DataType shown in it
+        """
+        version = self.session.query(ProjectStructureVersion.version
+                                     ).filter(ProjectStructureVersion.fk_project == project_id).scalar()
+        return version or 0
+
+
     def _compose_filter_datatype_ilike(self, filter_string):
         """
         :param filter_string: String to be search for with ilike.
@@ -422,6 +538,15 @@ class DatatypeDAO(RootDAO):
             self.logger.exception(excep)
         return None
 
+    def get_datatypes_by_gids(self, gids):
+        """
+        Retrieve the DataType DB references, not loaded as their subclasses, for a batch of global identifiers.
+        GIDs without a DataType in DB are left out.
+        """
+        if not gids:
+            return []
+        return self.session.query(DataType).filter(DataType.gid.in_(gids)).all()
+
 
     def get_links_for_datatype(self, data_id):
         """Get the links to a specific datatype"""
@@ -167,6 +167,69 @@ class OperationDAO(RootDAO):
             return None
 
 
+    def get_operation_costs(self, algorithm_id, limit):
+        """
+        Get the most recent resource measures for operations of one algorithm, newest first.
+        """
+        try:
+            result = self.session.query(OperationCost).filter(OperationCost.fk_from_algo == algorithm_id
+                                                              ).order_by(desc(OperationCost.id)).limit(limit).all()
+        except SQLAlchemyError as excep:
+            self.logger.exception(excep)
+            result = []
+        return result
+
+
+    def get_operation_stage_timings(self, operation_id):
+        """
+        Get the stage timings recorded for an operation, or None when it was not measured.
+        """
+        try:
+            return self.session.query(OperationStageTimings).filter(
+                OperationStageTimings.fk_from_operation == operation_id).order_by(
+                desc(OperationStageTimings.id)).first()
+        except SQLAlchemyError as excep:
+            self.logger.exception(excep)
+            return None
+
+
+    def prune_stage_timings(self, algorithm_id, keep):
+        """
+        Remove the stage timings of an algorithm, except for the `keep` most recent ones.
+        """
+        try:
+            oldest_kept = self.session.query(OperationStageTimings.id).filter(
+                OperationStageTimings.fk_from_algo == algorithm_id).order_by(
+                desc(OperationStageTimings.id)).offset(keep - 1).limit(1).scalar()
+            if oldest_kept is not None:
+                self.session.query(OperationStageTimings).filter(
+                    OperationStageTimings.fk_from_algo == algorithm_id).filter(
+                    OperationStageTimings.id < oldest_kept).delete(synchronize_session=False)
+                self.session.commit()
+        except SQLAlchemyError as excep:
+            self.logger.exception(excep)
+
+
+    def get_stage_timings(self, algorithm_classname=None, tvb_version=None):
+        """
+        Get the stage timings of all the measured operations, oldest first,
+        optionally only those of an algorithm (by class name) or of a TVB version.
+        :returns: list of (OperationStageTimings, algorithm module, algorithm class name)
+        """
+        try:
+            query = self.session.query(OperationStageTimings, Algorithm.module, Algorithm.classname
+                                       ).join(Algorithm, OperationStageTimings.fk_from_algo == Algorithm.id)
+            if algorithm_classname is not None:
+                query = query.filter(Algorithm.classname == algorithm_classname)
+            if tvb_version is not None:
+                query = query.filter(OperationStageTimings.tvb_version == tvb_version)
+            result = query.order_by(OperationStageTimings.id).all()
+        except SQLAlchemyError as excep:
+            self.logger.exception(excep)
+            result = []
+        return result
+
+
     def get_operation_process_for_operation(self, operation_id):
         """
         Get the OperationProcessIdentifier for this operation id.
@@ -35,12 +35,13 @@ DAO operation related to Users and Projects are defined here.
 .. moduleauthor:: Bogdan Neacsa <bogdan.neacsa@codemart.ro>
 """
 
-from sqlalchemy import or_, and_, func
+from sqlalchemy import or_, and_
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.sql.expression import desc
 from tvb.basic.profile import TvbProfile
 from tvb.core.entities.model.model_datatype import DataType, Links
+from tvb.core.entities.model.model_disk_usage import DiskUsage, OWNER_PROJECT, OWNER_USER
 from tvb.core.entities.model.model_operation import Operation
 from tvb.core.entities.model.model_project import User, ROLE_ADMINISTRATOR, Project, User_to_Project
 from tvb.core.entities.storage.root_dao import RootDAO, DEFAULT_PAGE_SIZE
@@ -159,13 +160,13 @@ class CaseDAO(RootDAO):
 
     def compute_user_generated_disk_size(self, user_id):
         """
-        Do a SUM on DATA_TYPES table column DISK_SIZE, for the current user.
+        Read the maintained SUM of DATA_TYPES column DISK_SIZE, for the current user.
         :returns 0 when no DT are found, or SUM from DB.
         """
         try:
-            total_size = self.session.query(func.sum(DataType.disk_size)).join(Operation
-                                                                               ).filter(
-                Operation.fk_launched_by == user_id).scalar()
+            total_size = self.session.query(DiskUsage.disk_size).filter(DiskUsage.owner_type == OWNER_USER
+                                                                        ).filter(
+                DiskUsage.owner_key == str(user_id)).scalar()
             return total_size or 0
         except SQLAlchemyError as excep:
             self.logger.exception(excep)
@@ -213,17 +214,15 @@ class CaseDAO(RootDAO):
 
     def get_project_disk_size(self, project_id):
         """
-        Do a SUM on DATA_TYPES table column DISK_SIZE, for the current project.
+        Read the maintained SUM of DATA_TYPES column DISK_SIZE and OPERATIONS column VIEW_MODEL_DISK_SIZE,
+        for the current project.
         :returns 0 when no DT are found, or SUM from DB.
         """
         try:
-            total_size_for_dt = self.session.query(func.sum(DataType.disk_size)).join(Operation
-                                                                               ).filter(
-                Operation.fk_launched_in == project_id).scalar() or 0
-            total_size = self.session.query(func.sum(Operation.view_model_disk_size)).filter(
-                Operation.fk_launched_in == project_id).scalar() or 0
-            total_size = total_size + total_size_for_dt
-            return total_size
+            total_size = self.session.query(DiskUsage.disk_size).filter(DiskUsage.owner_type == OWNER_PROJECT
+                                                                        ).filter(
+                DiskUsage.owner_key == str(project_id)).scalar()
+            return total_size or 0
         except SQLAlchemyError as excep:
             self.logger.exception(excep)
             return -1
@@ -38,6 +38,7 @@ import importlib
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.exc import NoResultFound
 from tvb.basic.logger.builder import get_logger
+from tvb.basic.timings import timed
 from tvb.core.entities.model.model_datatype import DataType
 from tvb.core.entities.storage.session_maker import SESSION_META_CLASS
 from tvb.config import SIMULATION_DATATYPE_CLASS
@@ -45,6 +46,8 @@ from tvb.config import SIMULATION_DATATYPE_CLASS
 
 DEFAULT_PAGE_SIZE = 200
 
+STAGE_DB_WRITE = "db_write"
+
 
 class RootDAO(object, metaclass=SESSION_META_CLASS):
     """
@@ -57,6 +60,7 @@ class RootDAO(object, metaclass=SESSION_META_CLASS):
     EXCEPTION_DATATYPE_SIMULATION = SIMULATION_DATATYPE_CLASS
 
 
+    @timed(STAGE_DB_WRITE)
     def store_entity(self, entity, merge=False):
         """
         Store in DB one generic entity.
@@ -75,6 +79,7 @@ class RootDAO(object, metaclass=SESSION_META_CLASS):
         return saved_entity
 
 
+    @timed(STAGE_DB_WRITE)
     def store_entities(self, entities_list):
         """
         Store in DB a list of generic entities.
@@ -107,6 +112,7 @@ class RootDAO(object, metaclass=SESSION_META_CLASS):
         return result
 
 
+    @timed(STAGE_DB_WRITE)
     def remove_entity(self, entity_class, entity_id):
         """ 
         Find entity by Id and Type, end then remove it.
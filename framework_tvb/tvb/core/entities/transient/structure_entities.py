@@ -67,6 +67,8 @@ class StructureNode:
         self._type = ntype
         self.metadata = meta
         self.children = children
+        # When True, children are sent to UI only when this node is expanded
+        self.lazy = False
 
     @property
     def has_children(self):
@@ -119,6 +121,14 @@ class StructureNode:
         should be structured the tree. Those fields should exists
         into the data dict of each DataTypeMetaData object.
         """
+        forest = StructureNode.metadata2forest(metadatas, first_level, second_level)
+        return StructureNode.forest2json(forest, project_id, project_name)
+
+    @staticmethod
+    def metadata2forest(metadatas, first_level, second_level):
+        """
+        Group a list of DataTypeMetaData entities on two levels, as a list of StructureNode entities.
+        """
         levels = {}
         for meta in metadatas:
             level_one = str(meta[first_level])
@@ -161,6 +171,19 @@ class StructureNode:
             level_node = StructureNode(level, dir_name, children=level_children)
             level_node._type = StructureNode._capitalize_first_letter(first_level)
             forest.append(level_node)
+        return forest
+
+    @staticmethod
+    def forest2json(forest, project_id, project_name, lazy=False):
+        """
+        Convert the nodes returned by metadata2forest into the JSON tree displayed in UI.
+        When lazy, the second level nodes are sent closed and without their DataTypes,
+        which the UI asks for with children2json when such a node is expanded.
+        """
+        if lazy:
+            for level_node in forest:
+                for sublevel_node in level_node.children:
+                    sublevel_node.lazy = True
 
         json_children = StructureNode.__convert2json(forest, project_id)
         if len(json_children) > 0:
@@ -175,6 +198,13 @@ class StructureNode:
 
         return result
 
+    @staticmethod
+    def children2json(node, project_id):
+        """
+        :returns: the JSON list of the children of one node, for expanding it in UI
+        """
+        return '[' + StructureNode.__convert2json(node.children or [], project_id) + ']'
+
     @staticmethod
     def _prepare_node_name(name, level_filter):
         """
@@ -207,7 +237,7 @@ class StructureNode:
             else:
                 json_node += node.type + '.png"},'
             if node.metadata is None and node.has_children:
-                json_node += ' state:"open", '
+                json_node += ' state:"closed", ' if node.lazy else ' state:"open", '
 
             json_node += 'attr:{id:"' + StructureNode.PREFIX_ID_NODE + node.id + '", separator: ">>", '
             json_node += 'projectId:"' + str(project_id) + '"'
@@ -223,7 +253,7 @@ class StructureNode:
                 json_node += 'font-style: italic;'
             json_node += '" }'
 
-            if node.has_children:
+            if node.has_children and not node.lazy:
                 json_node += ', children:[' + StructureNode.__convert2json(node.children, project_id) + ']'
 
             json_node += '}'
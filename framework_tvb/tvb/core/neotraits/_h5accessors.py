@@ -36,8 +36,9 @@ import uuid
 import numpy
 import scipy.sparse
 from tvb.basic.neotraits.api import HasTraits, Attr, NArray, Range
+from tvb.core.neotraits._h5statistics import DataSetStatistics, STATISTICS_GROUP
 from tvb.datatypes import equations
-from tvb.storage.h5.file.exceptions import MissingDataSetException
+from tvb.storage.h5.file.exceptions import MissingDataSetException, FileStructureException
 
 
 class Accessor(object, metaclass=abc.ABCMeta):
@@ -132,17 +133,19 @@ class DataSetMetaData(object):
     """
 
     # noinspection PyShadowingBuiltins
-    def __init__(self, min, max, mean, is_finite=True, has_complex=False):
+    def __init__(self, min, max, mean, is_finite=True, has_complex=False, size=None):
         self.min, self.max, self.mean = min, max, mean
         self.is_finite = is_finite
         self.has_complex = has_complex
+        # Number of values behind the mean, known only while appending. It is not stored.
+        self.size = size
 
     @classmethod
     def from_array(cls, array):
         try:
             return cls(min=array.min(), max=array.max(), mean=array.mean(),
                        is_finite=numpy.isfinite(array).all().item(),
-                       has_complex=numpy.iscomplex(array).any().item())
+                       has_complex=numpy.iscomplex(array).any().item(), size=array.size)
         except (TypeError, ValueError):
             # likely a string array
             return cls(min=None, max=None, mean=None)
@@ -159,7 +162,11 @@ class DataSetMetaData(object):
     def merge(self, other):
         self.min = min(self.min, other.min)
         self.max = max(self.max, other.max)
-        self.mean = (self.mean + other.mean) / 2
+        if self.size and other.size:
+            self.mean = (self.mean * self.size + other.mean * other.size) / (self.size + other.size)
+            self.size += other.size
+        else:
+            self.mean = (self.mean + other.mean) / 2
         self.is_finite = self.is_finite and other.is_finite
         self.has_complex = self.has_complex or other.has_complex
 
@@ -169,8 +176,9 @@ class DataSet(Accessor):
     A dataset in a h5 file that corresponds to a traited NArray.
     """
 
-    def __init__(self, trait_attribute, h5file, name=None, expand_dimension=-1):
-        # type: (NArray, H5File, str, int) -> None
+    def __init__(self, trait_attribute, h5file, name=None, expand_dimension=-1, storage_policy=None,
+                 statistics=False):
+        # type: (NArray, H5File, str, int, StoragePolicy, bool) -> None
         """
         :param trait_attribute: A traited attribute
         :param h5file: The parent H5file that contains this Accessor
@@ -179,11 +187,20 @@ class DataSet(Accessor):
                      If the traited attribute is not a member of a HasTraits then
                      it has no name and you have to provide this parameter
         :param expand_dimension: An int designating a dimension of the array that may grow.
+        :param storage_policy: Optional StoragePolicy (chunks, compression, second layout) used when the dataset
+                               is created. It should follow the way the dataset is most often read.
+        :param statistics: When True, DataSetStatistics along expand_dimension are kept while the dataset is
+                           written and stored next to it, see get_statistics.
         """
         super(DataSet, self).__init__(trait_attribute, h5file, name)
         self.expand_dimension = expand_dimension
+        self.storage_policy = storage_policy
         # Cache metadata for expandable DataSets to avoid multiple reads/writes at append time
         self.meta = None
+        self.keep_statistics = statistics
+        # Running statistics of the appended data, stored at file close time, together with the metadata
+        self.statistics = None
+        self._statistics_resumed = False
 
     def append(self, data, close_file=True, grow_dimension=None):
         # type: (numpy.ndarray, bool, int) -> None
@@ -193,11 +210,14 @@ class DataSet(Accessor):
         """
         if not grow_dimension:
             grow_dimension = self.expand_dimension
+        if self.keep_statistics:
+            self._update_statistics(numpy.asarray(data), grow_dimension)
         self.owner.storage_manager.append_data(
             data,
             self.field_name,
             grow_dimension=grow_dimension,
-            close_file=close_file
+            close_file=close_file,
+            storage_policy=self.storage_policy
         )
         # update the cached array min max metadata values
         new_meta = DataSetMetaData.from_array(numpy.array(data))
@@ -215,12 +235,65 @@ class DataSet(Accessor):
         if data is None:
             return
 
-        self.owner.storage_manager.store_data(data, self.field_name)
+        self.owner.storage_manager.store_data(data, self.field_name, storage_policy=self.storage_policy)
         # cache some array information
         self.owner.storage_manager.set_metadata(
             DataSetMetaData.from_array(data).to_dict(),
             self.field_name
         )
+        if self.keep_statistics and data.size and DataSetStatistics.supports(data):
+            self._store_statistics(DataSetStatistics.from_array(data, self.expand_dimension))
+
+    def store_cached_metadata(self):
+        """
+        Write what was gathered while appending: the metadata and, when kept, the statistics.
+        """
+        self.owner.storage_manager.set_metadata(self.meta.to_dict(), self.field_name)
+        if self.statistics is not None and self.statistics.count:
+            self._store_statistics(self.statistics)
+
+    def _update_statistics(self, data, grow_dimension):
+        if not self._statistics_resumed:
+            self._statistics_resumed = True
+            try:
+                self.owner.storage_manager.get_data_shape(self.field_name)
+                # Data written before is covered only when its statistics were stored with it
+                self.statistics = self._load_statistics()
+            except MissingDataSetException:
+                self.statistics = DataSetStatistics(grow_dimension % max(data.ndim, 1))
+
+        if self.statistics is None:
+            return
+        if not data.ndim or not DataSetStatistics.supports(data) \
+                or grow_dimension % data.ndim != self.statistics.grow_dimension:
+            # The statistics would not describe the whole dataset anymore, so better none than wrong ones
+            self.statistics = None
+            self._remove_statistics()
+            return
+        self.statistics.update(data)
+
+    def _store_statistics(self, statistics):
+        where = STATISTICS_GROUP + self.field_name + '/'
+        for name, array in statistics.to_arrays().items():
+            if array is not None:
+                self.owner.storage_manager.store_data(array, name, where=where)
+        self.owner.storage_manager.set_metadata(statistics.to_dict(), self.field_name, where=STATISTICS_GROUP)
+
+    def _remove_statistics(self):
+        try:
+            self.owner.storage_manager.remove_data(self.field_name, where=STATISTICS_GROUP)
+        except FileStructureException:
+            pass
+
+    def _load_statistics(self):
+        where = STATISTICS_GROUP + self.field_name + '/'
+        try:
+            dikt = self.owner.storage_manager.get_metadata(self.field_name, where=STATISTICS_GROUP)
+        except MissingDataSetException:
+            return None
+        arrays = {name: self.owner.storage_manager.get_data(name, where=where, ignore_errors=True)
+                  for name in DataSetStatistics.ARRAYS}
+        return DataSetStatistics.from_stored(arrays, dikt)
 
     def load(self):
         # type: () -> numpy.ndarray
@@ -248,6 +321,26 @@ class DataSet(Accessor):
         meta = self.owner.storage_manager.get_metadata(self.field_name)
         return DataSetMetaData.from_dict(meta)
 
+    def get_statistics(self, start=0):
+        """
+        Returns the DataSetStatistics kept for this dataset, or None when they were not kept (e.g. older files).
+        With a start index along the grow dimension, only the data from there on is described. Then the cheaper
+        of the two parts is read: the skipped head, subtracted from the statistics, or the remaining tail.
+        """
+        if self._statistics_resumed:
+            statistics = self.statistics
+        else:
+            statistics = self._load_statistics()
+        if statistics is None or start <= 0:
+            return statistics
+
+        slices = [slice(None)] * len(self.shape)
+        if start <= statistics.count - start:
+            slices[statistics.grow_dimension] = slice(0, start)
+            return statistics.without_head(self[tuple(slices)])
+        slices[statistics.grow_dimension] = slice(start, None)
+        return DataSetStatistics.from_array(self[tuple(slices)], statistics.grow_dimension)
+
 
 class EquationScalar(Accessor):
     """
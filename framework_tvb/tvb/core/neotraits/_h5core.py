@@ -123,7 +123,7 @@ class H5File(object):
 
     def close(self):
         for dataset in self.expandable_datasets:
-            self.storage_manager.set_metadata(dataset.meta.to_dict(), dataset.field_name)
+            dataset.store_cached_metadata()
         self.storage_manager.close_file()
 
     def store(self, datatype, scalars_only=False, store_references=True):
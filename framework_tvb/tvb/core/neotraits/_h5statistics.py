@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Running statistics of the data sets which grow by appending chunks, like the TimeSeries data.
+
+The statistics are merged chunk by chunk with the pairwise update of Chan et al., so they stay exact
+whatever the chunking, and are stored next to the data set, under /statistics/<data set name>/.
+Readers get means, variances and ranges from there without scanning the data again.
+"""
+
+import numpy
+
+STATISTICS_GROUP = "/statistics/"
+
+
+class DataSetStatistics(object):
+    """
+    Count, mean, sum of squared deviations (m2), min and max for every entry of a data set, taken along the
+    dimension on which the data set grows. For a TimeSeries this means one value per state variable,
+    node and mode, over all the time points written so far.
+    A histogram sketch of all the finite values is kept too. Its bins double in width whenever a new chunk
+    falls outside of them, so that every earlier bin still falls in exactly one of the wider bins.
+    """
+    HISTOGRAM_BINS = 64
+    ARRAYS = ('mean', 'm2', 'min', 'max', 'histogram')
+
+    # noinspection PyShadowingBuiltins
+    def __init__(self, grow_dimension, count=0, mean=None, m2=None, min=None, max=None, is_finite=True,
+                 histogram=None, histogram_low=0.0, histogram_width=0.0):
+        self.grow_dimension = grow_dimension
+        self.count = count
+        self.mean, self.m2, self.min, self.max = mean, m2, min, max
+        self.is_finite = is_finite
+        self.histogram = histogram
+        self.histogram_low = histogram_low
+        self.histogram_width = histogram_width
+
+    @staticmethod
+    def supports(array):
+        """ Statistics are kept only for real numeric data """
+        return numpy.asarray(array).dtype.kind in 'iuf'
+
+    @classmethod
+    def from_array(cls, array, grow_dimension):
+        array = numpy.asarray(array)
+        statistics = cls(grow_dimension % array.ndim)
+        statistics.update(array)
+        return statistics
+
+    @classmethod
+    def from_stored(cls, arrays, dikt):
+        """
+        Rebuild statistics from what `to_arrays` and `to_dict` returned, once read back from the H5 file.
+        """
+        return cls(dikt['GrowDimension'], count=dikt['Count'], mean=arrays['mean'], m2=arrays['m2'],
+                   min=arrays['min'], max=arrays['max'], is_finite=dikt['IsFinite'], histogram=arrays['histogram'],
+                   histogram_low=dikt['HistogramLow'], histogram_width=dikt['HistogramWidth'])
+
+    def to_arrays(self):
+        return {name: getattr(self, name) for name in self.ARRAYS}
+
+    def to_dict(self):
+        return {'GrowDimension': self.grow_dimension, 'Count': self.count, 'IsFinite': self.is_finite,
+                'HistogramLow': self.histogram_low, 'HistogramWidth': self.histogram_width}
+
+    def update(self, chunk):
+        """
+        Add one chunk, appended to the data set along the grow dimension.
+        """
+        chunk = numpy.asarray(chunk, dtype=numpy.float64)
+        count = chunk.shape[self.grow_dimension]
+        if count == 0:
+            return
+        mean = chunk.mean(axis=self.grow_dimension)
+        deviations = chunk - numpy.expand_dims(mean, self.grow_dimension)
+        m2 = (deviations ** 2).sum(axis=self.grow_dimension)
+        self._merge_moments(count, mean, m2)
+
+        chunk_min = chunk.min(axis=self.grow_dimension)
+        chunk_max = chunk.max(axis=self.grow_dimension)
+        self.min = chunk_min if self.min is None else numpy.minimum(self.min, chunk_min)
+        self.max = chunk_max if self.max is None else numpy.maximum(self.max, chunk_max)
+
+        finite = numpy.isfinite(chunk)
+        if finite.all():
+            self._add_to_histogram(chunk)
+        else:
+            self.is_finite = False
+            self._add_to_histogram(chunk[finite])
+
+    def merge(self, other):
+        """
+        Merge the statistics of a chunk which follows, along the grow dimension, the data seen so far.
+        """
+        if other.count == 0:
+            return
+        self._merge_moments(other.count, other.mean, other.m2)
+        self.min = other.min if self.min is None else numpy.minimum(self.min, other.min)
+        self.max = other.max if self.max is None else numpy.maximum(self.max, other.max)
+        self.is_finite = self.is_finite and other.is_finite
+        if other.histogram is not None:
+            if self.histogram is None:
+                self.histogram = other.histogram.copy()
+                self.histogram_low, self.histogram_width = other.histogram_low, other.histogram_width
+            else:
+                self._merge_histogram(other)
+
+    def without_head(self, head):
+        """
+        Statistics of the data set without its first entries along the grow dimension, given in head.
+        Moments and the histogram are subtracted exactly, the ranges can not be, so min and max are dropped.
+        Reading the head is cheaper than reading the remaining tail, while the head is the smaller part.
+        """
+        head = numpy.asarray(head, dtype=numpy.float64)
+        head_statistics = DataSetStatistics.from_array(head, self.grow_dimension)
+        count = self.count - head_statistics.count
+        if count <= 0:
+            return DataSetStatistics(self.grow_dimension)
+
+        delta = head_statistics.mean - self.mean
+        mean = (self.count * self.mean - head_statistics.count * head_statistics.mean) / count
+        m2 = self.m2 - head_statistics.m2 - delta ** 2 * head_statistics.count * self.count / count
+        remaining = DataSetStatistics(self.grow_dimension, count=count, mean=mean, m2=numpy.maximum(m2, 0),
+                                      is_finite=self.is_finite)
+        if self.histogram is not None:
+            finite = head[numpy.isfinite(head)]
+            head_counts, _ = numpy.histogram(finite, bins=self.HISTOGRAM_BINS, range=self.histogram_range)
+            remaining.histogram = self.histogram - head_counts
+            remaining.histogram_low, remaining.histogram_width = self.histogram_low, self.histogram_width
+        return remaining
+
+    @property
+    def variance(self):
+        """ Population variance of each entry, along the grow dimension """
+        return self.m2 / self.count
+
+    @property
+    def histogram_range(self):
+        return self.histogram_low, self.histogram_low + self.HISTOGRAM_BINS * self.histogram_width
+
+    @property
+    def histogram_edges(self):
+        return self.histogram_low + self.histogram_width * numpy.arange(self.HISTOGRAM_BINS + 1)
+
+    def global_mean(self):
+        # Every entry has seen the same number of values, so the mean of means is exact
+        return float(self.mean.mean())
+
+    def global_variance(self):
+        """ Population variance over all the values of the data set """
+        global_mean = self.mean.mean()
+        spread = ((self.mean - global_mean) ** 2).sum()
+        return float((self.m2.sum() + self.count * spread) / (self.count * self.mean.size))
+
+    def global_min(self):
+        return float(self.min.min())
+
+    def global_max(self):
+        return float(self.max.max())
+
+    def _merge_moments(self, count, mean, m2):
+        if self.count == 0:
+            self.count, self.mean, self.m2 = count, mean, m2
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * (self.count * count / total)
+        self.count = total
+
+    def _add_to_histogram(self, values):
+        if values.size == 0:
+            return
+        low, high = values.min(), values.max()
+        if self.histogram is None:
+            span = (high - low) or abs(low) or 1.0
+            self.histogram = numpy.zeros(self.HISTOGRAM_BINS, dtype=numpy.int64)
+            self.histogram_low, self.histogram_width = float(low), float(span) / self.HISTOGRAM_BINS
+            if self.histogram_range[1] < high:
+                # Rounding must not cost a widening, halving the resolution from the very first chunk
+                self.histogram_width = numpy.nextafter(self.histogram_width, numpy.inf)
+        self._widen_histogram(low, high)
+        counts, _ = numpy.histogram(values, bins=self.HISTOGRAM_BINS, range=self.histogram_range)
+        self.histogram += counts
+
+    def _merge_histogram(self, other):
+        other_edges = other.histogram_edges
+        self._widen_histogram(other_edges[0], other_edges[-1])
+        while self.histogram_width < other.histogram_width:
+            self._widen_histogram(self.histogram_range[0], self.histogram_range[1] + self.histogram_width)
+        # Each bin of the other sketch is counted in the bin holding its center
+        centers = (other_edges[:-1] + other_edges[1:]) / 2
+        counts, _ = numpy.histogram(centers, bins=self.HISTOGRAM_BINS, range=self.histogram_range,
+                                    weights=other.histogram)
+        self.histogram += counts.astype(numpy.int64)
+
+    def _widen_histogram(self, low, high):
+        half = self.HISTOGRAM_BINS // 2
+        while low < self.histogram_range[0] or high > self.histogram_range[1]:
+            pairs = self.histogram.reshape(half, 2).sum(axis=1)
+            if low < self.histogram_range[0]:
+                # Grow downwards, the current bins end up in the upper half
+                self.histogram_low -= self.HISTOGRAM_BINS * self.histogram_width
+                self.histogram = numpy.concatenate((numpy.zeros(half, dtype=numpy.int64), pairs))
+            else:
+                self.histogram = numpy.concatenate((pairs, numpy.zeros(half, dtype=numpy.int64)))
+            self.histogram_width *= 2
@@ -33,6 +33,8 @@ from ._h5accessors import Scalar, Reference, Accessor, ReferenceList
 from ._h5accessors import SparseMatrix, SparseMatrixMetaData
 from ._h5accessors import Json, JsonFinal, EquationScalar
 from ._h5core import H5File, ViewModelH5
+from ._h5statistics import DataSetStatistics
+from tvb.storage.h5.file.storage_policy import StoragePolicy
 
 import h5py
 STORE_STRING = h5py.string_dtype(encoding='utf-8')
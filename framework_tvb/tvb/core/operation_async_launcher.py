@@ -48,6 +48,7 @@ from tvb.basic.logger.builder import get_logger
 from tvb.core.entities.model.model_operation import has_finished
 from tvb.core.entities.model.model_burst import BurstConfiguration
 from tvb.core.adapters.abcadapter import ABCAdapter
+from tvb.core.adapters.cost_estimator import OperationCostEstimator
 from tvb.core.entities.storage import dao
 from tvb.core.services.operation_service import OperationService
 from tvb.core.services.burst_service import BurstService
@@ -108,6 +109,7 @@ def do_operation_launch(operation_id):
 
 if __name__ == '__main__':
     OPERATION_ID = sys.argv[1]
+    OperationCostEstimator.measure_process(OPERATION_ID)
     storage_interface = StorageInterface()
     storage_interface.start()
     do_operation_launch(OPERATION_ID)
@@ -34,6 +34,9 @@
 
 from abc import abstractmethod
 
+# Set in the environment of the process launching an operation, to the (epoch) time at which it was spawned
+SPAWN_TIME_VARIABLE = "TVB_OPERATION_SPAWNED_AT"
+
 
 class BackendClient(object):
     """
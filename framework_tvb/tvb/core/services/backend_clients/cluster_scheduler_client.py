@@ -68,7 +68,8 @@ class ClusterSchedulerClient(BackendClient):
         operation = dao.get_operation_by_id(operation_identifier)
         view_model = h5.load_view_model(operation)
         # kwargs = adapter_instance.prepare_ui_inputs(kwargs)
-        time_estimate = int(adapter_instance.get_execution_time_approximation(view_model))
+        adapter_instance.configure(view_model)
+        time_estimate = int(adapter_instance.estimate_cost(view_model).runtime)
         hours = int(time_estimate / 3600)
         minutes = (int(time_estimate) % 3600) / 60
         seconds = int(time_estimate) % 60
@@ -45,6 +45,7 @@ from tvb.basic.config.settings import HPCSettings
 from tvb.basic.logger.builder import get_logger
 from tvb.basic.profile import TvbProfile
 from tvb.config import MEASURE_METRICS_MODEL_CLASS
+from tvb.core.adapters.abcadapter import ABCAdapter
 from tvb.core.entities.file.simulator.datatype_measure_h5 import DatatypeMeasureH5
 from tvb.core.entities.model.model_operation import Operation, STATUS_CANCELED, STATUS_ERROR, OperationProcessIdentifier
 from tvb.core.entities.storage import dao, OperationDAO
@@ -123,8 +124,8 @@ class HPCSchedulerClient(BackendClient):
         return vm_files
 
     @staticmethod
-    def _configure_job(simulator_gid, available_space, is_group_launch, operation_id):
-        # type: (str, int, bool, int) -> (dict, list)
+    def _configure_job(simulator_gid, available_space, is_group_launch, operation_id, cost_estimate=None):
+        # type: (str, int, bool, int, CostEstimate) -> (dict, list)
         bash_entrypoint = os.path.join(os.environ[HPCSchedulerClient.TVB_BIN_ENV_KEY],
                                        HPCSettings.HPC_LAUNCHER_SH_SCRIPT)
         base_url = TvbProfile.current.web.BASE_URL
@@ -138,6 +139,13 @@ class HPCSchedulerClient(BackendClient):
                                                  inputs_in_container, HPCSchedulerClient.HOME_FOLDER_MOUNT,
                                                  operation_id], HPCSettings.UNICORE_RESOURCER_KEY: {"CPUs": "1"}}
 
+        # Size the job from the costs measured on previous runs, when these are known
+        if cost_estimate is not None:
+            if cost_estimate.runtime > 0:
+                my_job[HPCSettings.UNICORE_RESOURCER_KEY]["Runtime"] = str(int(cost_estimate.runtime))
+            if cost_estimate.memory > 0:
+                my_job[HPCSettings.UNICORE_RESOURCER_KEY]["Memory"] = "%dM" % (cost_estimate.memory // 2 ** 20 + 1)
+
         if HPCSchedulerClient.CSCS_PROJECT in os.environ:
             my_job[HPCSettings.UNICORE_PROJECT_KEY] = os.environ[HPCSchedulerClient.CSCS_PROJECT]
 
@@ -270,8 +278,9 @@ class HPCSchedulerClient(BackendClient):
         available_space = HPCSchedulerClient.compute_available_disk_space(operation)
 
         LOGGER.info("Prepare job configuration for operation: {}".format(operation.id))
+        cost_estimate = HPCSchedulerClient._estimate_cost(operation)
         job_config, job_script = HPCSchedulerClient._configure_job(simulator_gid, available_space,
-                                                                   is_group_launch, operation.id)
+                                                                   is_group_launch, operation.id, cost_estimate)
 
         LOGGER.info("Prepare encryption for operation: {}".format(operation.id))
         storage_interface = StorageInterface()
@@ -293,6 +302,18 @@ class HPCSchedulerClient(BackendClient):
         LOGGER.info("Job mount point: {}".format(job.working_dir.properties[HPCSettings.JOB_MOUNT_POINT_KEY]))
         return job
 
+    @staticmethod
+    def _estimate_cost(operation):
+        # type: (Operation) -> CostEstimate
+        try:
+            adapter_instance = ABCAdapter.build_adapter(operation.algorithm)
+            view_model = adapter_instance.load_view_model(operation)
+            adapter_instance.configure(view_model)
+            return adapter_instance.estimate_cost(view_model)
+        except Exception:
+            LOGGER.warning("Could not estimate the cost of operation {}".format(operation.id), exc_info=True)
+            return None
+
     @staticmethod
     def compute_available_disk_space(operation):
         # type: (Operation) -> int
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+#
+
+"""
+Admission of the operations launched on the local machine, by the memory and CPUs they are expected to use.
+
+Operations are started in the order of their priority class (interactive before normal, before batch PSE
+operations) while their estimated memory fits in the memory budget and the CPUs their adapters declare
+in MAX_THREADS_NUMBER.
+When the first waiting operation does not fit, it is guaranteed to start as soon as enough of the running
+operations finish (its shadow time), and only smaller operations which do not delay it are started around it.
+"""
+
+import threading
+import time
+
+import psutil
+from tvb.basic.logger.builder import get_logger
+from tvb.basic.profile import TvbProfile
+from tvb.core.adapters.abcadapter import ABCAdapter, AdapterLaunchModeEnum, OPERATION_CPUS
+
+LOGGER = get_logger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BATCH = 2
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: 'interactive', PRIORITY_NORMAL: 'normal', PRIORITY_BATCH: 'batch'}
+
+
+class ScheduledOperation(object):
+    """
+    The resources reserved for one operation, while it waits and while it runs.
+    Memory is in bytes, runtime in seconds (None when unknown).
+    """
+
+    def __init__(self, operation_id, priority, memory, runtime=None, cpus=OPERATION_CPUS):
+        self.operation_id = operation_id
+        self.priority = priority
+        self.memory = memory
+        self.runtime = runtime
+        self.cpus = cpus
+        self.queued_since = time.time()
+        self.started = None
+
+    def expected_end(self, now):
+        if self.runtime is None:
+            return float('inf')
+        return max(self.started + self.runtime, now)
+
+
+class OperationScheduler(object):
+    """
+    Keeps the queue of the operations waiting for resources, and the reservations of the running ones.
+    """
+
+    # Operations expected to end within this many seconds are considered interactive
+    INTERACTIVE_RUNTIME = 60
+
+    def __init__(self, memory_budget=None, cpu_budget=None):
+        if memory_budget is None:
+            memory_budget = TvbProfile.current.OPERATIONS_MEMORY_BUDGET * 2 ** 20
+            if memory_budget <= 0:
+                memory_budget = int(psutil.virtual_memory().total * 0.75)
+        self.memory_budget = memory_budget
+        self.cpu_budget = cpu_budget or TvbProfile.current.MAX_THREADS_NUMBER
+        self.queued = {}
+        self.running = {}
+        self.admitted = 0
+        self.backfilled = 0
+        self._estimates = {}
+        self._group_estimates = {}
+        self._lock = threading.RLock()
+
+    @property
+    def default_memory(self):
+        """ Memory reserved for operations without a usable estimate: an equal share of the budget per CPU. """
+        return self.memory_budget // self.cpu_budget
+
+    def describe(self, operation, adapter_instance=None):
+        """
+        Build the reservation of an Operation, from the cost estimated and the CPUs declared by its adapter.
+        The estimate is computed once per operation, and kept until the operation is released or forgotten.
+        Operations in the same group (PSE) share the estimate of the first one described.
+        """
+        group_id = operation.fk_operation_group
+        with self._lock:
+            if operation.id in self._estimates:
+                return ScheduledOperation(operation.id, *self._estimates[operation.id][1:])
+            if group_id is not None and group_id in self._group_estimates:
+                memory, runtime, cpus = self._group_estimates[group_id]
+                self._estimates[operation.id] = (group_id, PRIORITY_BATCH, memory, runtime, cpus)
+                return ScheduledOperation(operation.id, PRIORITY_BATCH, memory, runtime, cpus)
+
+        memory, runtime, cpus = self.default_memory, None, OPERATION_CPUS
+        priority = PRIORITY_NORMAL if group_id is None else PRIORITY_BATCH
+        try:
+            if adapter_instance is None:
+                adapter_instance = ABCAdapter.build_adapter(operation.algorithm)
+            if adapter_instance.launch_mode is AdapterLaunchModeEnum.SYNC_DIFF_MEM:
+                priority = PRIORITY_INTERACTIVE
+            view_model = adapter_instance.load_view_model(operation)
+            adapter_instance.configure(view_model)
+            cost = adapter_instance.estimate_cost(view_model)
+            # Operations needing more CPUs than the budget get all of it, otherwise they would never start
+            cpus = max(1, min(adapter_instance.get_required_cpus(view_model), self.cpu_budget))
+            if cost.memory > 0:
+                memory = cost.memory
+            if cost.runtime > 0:
+                runtime = cost.runtime
+        except Exception:
+            LOGGER.warning("Could not estimate the cost of operation {}".format(operation.id), exc_info=True)
+
+        if priority == PRIORITY_NORMAL and runtime is not None and runtime <= self.INTERACTIVE_RUNTIME:
+            priority = PRIORITY_INTERACTIVE
+        with self._lock:
+            if group_id is not None:
+                self._group_estimates[group_id] = (memory, runtime, cpus)
+            self._estimates[operation.id] = (group_id, priority, memory, runtime, cpus)
+        return ScheduledOperation(operation.id, priority, memory, runtime, cpus)
+
+    def enqueue(self, operation, adapter_instance=None):
+        """ Add an Operation to the queue, unless it is already waiting or running. """
+        with self._lock:
+            if operation.id in self.queued or operation.id in self.running:
+                return
+        self.add(self.describe(operation, adapter_instance))
+
+    def add(self, scheduled_operation):
+        with self._lock:
+            if scheduled_operation.operation_id not in self.running:
+                self.queued.setdefault(scheduled_operation.operation_id, scheduled_operation)
+
+    def discard(self, operation_id, forget=True):
+        """
+        Remove a waiting operation from the queue (e.g. canceled or removed before being started).
+        :param forget: when False, its estimate is kept for when the operation is queued again
+        """
+        with self._lock:
+            self.queued.pop(operation_id, None)
+            if forget:
+                self._forget(operation_id)
+
+    def release(self, operation_id):
+        """ Give back the resources of an operation which finished. Calling it more than once is harmless. """
+        with self._lock:
+            self.running.pop(operation_id, None)
+            self.queued.pop(operation_id, None)
+            self._forget(operation_id)
+
+    def _forget(self, operation_id):
+        """ Drop the estimate of an operation, and the one of its group once no operation of that group is left. """
+        group_id = self._estimates.pop(operation_id, (None,))[0]
+        if group_id is not None and all(estimate[0] != group_id for estimate in self._estimates.values()):
+            self._group_estimates.pop(group_id, None)
+
+    def has_queued(self):
+        return len(self.queued) > 0
+
+    def waiting(self):
+        """ :returns: the ids of the operations queued, or described and not started yet """
+        with self._lock:
+            return (set(self.queued) | set(self._estimates)) - set(self.running)
+
+    def select(self):
+        """
+        Decide which of the waiting operations can start now, and move them among the running ones.
+        :returns: the ids of the admitted operations, in the order they should be started
+        """
+        with self._lock:
+            now = time.time()
+            free_memory = self.memory_budget - sum(op.memory for op in self.running.values())
+            free_cpus = self.cpu_budget - sum(op.cpus for op in self.running.values())
+            waiting = sorted(self.queued.values(), key=lambda op: (op.priority, op.queued_since, op.operation_id))
+
+            shadow_time = None
+            spare_memory = spare_cpus = 0
+            selected = []
+            for candidate in waiting:
+                fits = candidate.memory <= free_memory and candidate.cpus <= free_cpus
+                if not fits and not self.running and not selected:
+                    # Larger than the whole budget: it can only run alone
+                    fits = candidate.cpus <= free_cpus
+                if shadow_time is None:
+                    if not fits:
+                        shadow_time, spare_memory, spare_cpus = self._reserve(candidate, free_memory, free_cpus, now)
+                        continue
+                elif fits:
+                    ends_in_time = candidate.runtime is not None and now + candidate.runtime <= shadow_time
+                    if not ends_in_time:
+                        if candidate.memory > spare_memory or candidate.cpus > spare_cpus:
+                            continue
+                        spare_memory -= candidate.memory
+                        spare_cpus -= candidate.cpus
+                    self.backfilled += 1
+                else:
+                    continue
+
+                free_memory -= candidate.memory
+                free_cpus -= candidate.cpus
+                candidate.started = now
+                del self.queued[candidate.operation_id]
+                self.running[candidate.operation_id] = candidate
+                self.admitted += 1
+                selected.append(candidate.operation_id)
+            return selected
+
+    def _reserve(self, head, free_memory, free_cpus, now):
+        """
+        Compute when the head of the queue will fit, if the running operations end as estimated (its shadow time),
+        and how much memory and how many CPUs will be left for other operations at that moment.
+        """
+        shadow_time = now
+        for running in sorted(self.running.values(), key=lambda op: op.expected_end(now)):
+            if head.memory <= free_memory and head.cpus <= free_cpus:
+                break
+            free_memory += running.memory
+            free_cpus += running.cpus
+            shadow_time = running.expected_end(now)
+        return shadow_time, max(free_memory - head.memory, 0), max(free_cpus - head.cpus, 0)
+
+    def metrics(self):
+        """
+        :returns: a dictionary describing the queue and the reserved resources
+        """
+        with self._lock:
+            now = time.time()
+            queued_per_priority = dict((name, 0) for name in PRIORITY_NAMES.values())
+            for operation in self.queued.values():
+                queued_per_priority[PRIORITY_NAMES[operation.priority]] += 1
+            longest_wait = max([now - op.queued_since for op in self.queued.values()] or [0])
+            return {'running': len(self.running),
+                    'queued': len(self.queued),
+                    'queued_per_priority': queued_per_priority,
+                    'memory_reserved': sum(op.memory for op in self.running.values()),
+                    'memory_budget': self.memory_budget,
+                    'cpus_reserved': sum(op.cpus for op in self.running.values()),
+                    'cpu_budget': self.cpu_budget,
+                    'admitted': self.admitted,
+                    'backfilled': self.backfilled,
+                    'longest_wait': longest_wait}
@@ -35,9 +35,9 @@
 """
 
 import os
-import queue
 import signal
 import sys
+import time
 from subprocess import Popen, PIPE
 from threading import Thread, Event
 
@@ -47,7 +47,8 @@ from tvb.basic.profile import TvbProfile
 from tvb.core.adapters.abcadapter import AdapterLaunchModeEnum, ABCAdapter
 from tvb.core.entities.model.model_operation import OperationProcessIdentifier, STATUS_ERROR, STATUS_CANCELED, Operation
 from tvb.core.entities.storage import dao
-from tvb.core.services.backend_clients.backend_client import BackendClient
+from tvb.core.services.backend_clients.backend_client import BackendClient, SPAWN_TIME_VARIABLE
+from tvb.core.services.backend_clients.operation_scheduler import OperationScheduler
 from tvb.core.services.burst_service import BurstService
 from tvb.storage.storage_interface import StorageInterface
 from tvb.core.services.kube_service import KubeService
@@ -56,9 +57,7 @@ LOGGER = get_logger(__name__)
 
 CURRENT_ACTIVE_THREADS = []
 
-LOCKS_QUEUE = queue.Queue(0)
-for i in range(TvbProfile.current.MAX_THREADS_NUMBER):
-    LOCKS_QUEUE.put(1)
+SCHEDULER = OperationScheduler()
 
 
 class OperationExecutor(Thread):
@@ -75,6 +74,17 @@ class OperationExecutor(Thread):
         """
         Get the required data from the operation queue and launch the operation.
         """
+        try:
+            self._launch()
+        finally:
+            # Give back the reserved resources now that you finished your operation
+            if self in CURRENT_ACTIVE_THREADS:
+                CURRENT_ACTIVE_THREADS.remove(self)
+            SCHEDULER.release(self.operation_id)
+            if SCHEDULER.has_queued():
+                Thread(target=StandAloneClient.start_admitted_operations).start()
+
+    def _launch(self):
         operation_id = self.operation_id
         run_params = [TvbProfile.current.PYTHON_INTERPRETER_PATH, '-m', 'tvb.core.operation_async_launcher',
                       str(operation_id), TvbProfile.CURRENT_PROFILE_NAME]
@@ -93,6 +103,7 @@ class OperationExecutor(Thread):
             env = os.environ.copy()
             env['PYTHONPATH'] = os.pathsep.join(sys.path)
             # anything that was already in $PYTHONPATH should have been reproduced in sys.path
+            env[SPAWN_TIME_VARIABLE] = str(time.time())
 
             launched_process = Popen(run_params, stdout=PIPE, stderr=PIPE, env=env)
 
@@ -125,10 +136,6 @@ class OperationExecutor(Thread):
 
         storage_interface.check_and_delete(project_folder)
 
-        # Give back empty spot now that you finished your operation
-        CURRENT_ACTIVE_THREADS.remove(self)
-        LOCKS_QUEUE.put(1)
-
     def _stop(self):
         """ Mark current thread for stop"""
         self._stop_ev.set()
@@ -169,26 +176,52 @@ class StandAloneClient(BackendClient):
 
     @staticmethod
     def process_queued_operations():
+        """
+        Bring the scheduler queue in sync with the operations flagged in DB as waiting (e.g. after a restart, or
+        when they were canceled meanwhile) and start those for which resources are available.
+        """
         LOGGER.info("Start Queued operations job")
         try:
             operations = dao.get_generic_entity(Operation, True, "queue_full")
+            queued_ids = set(operation.id for operation in operations)
+            for operation_id in SCHEDULER.waiting():
+                if operation_id not in queued_ids:
+                    SCHEDULER.discard(operation_id)
             if len(operations) == 0:
                 return
             LOGGER.info("Found {} operations with the queue full flag set.".format(len(operations)))
-            operations.sort(key=lambda l_operation: l_operation.id)
-            for operation in operations[0:TvbProfile.current.MAX_THREADS_NUMBER]:
-                try:
-                    op = dao.get_operation_by_id(operation.id)
-                    operation_process = dao.get_operation_process_for_operation(operation.id)
-                    if operation_process is not None or not op.queue_full or LOCKS_QUEUE.qsize() == 0:
-                        continue
-                    LOCKS_QUEUE.get()
-                    StandAloneClient.start_operation(operation.id)
-                except Exception as e:
-                    LOGGER.error("Starting operation error", e)
+            for operation in operations:
+                if operation.id not in SCHEDULER.queued and operation.id not in SCHEDULER.running:
+                    SCHEDULER.enqueue(dao.get_operation_by_id(operation.id))
+            StandAloneClient.start_admitted_operations()
+            LOGGER.info("Operations queue: {}".format(SCHEDULER.metrics()))
         except Exception as e:
             LOGGER.error("Error", e)
 
+    @staticmethod
+    def start_admitted_operations(operation_id=None):
+        """
+        Start the waiting operations which the scheduler admits now.
+        :param operation_id: an operation whose launch errors should be raised to the caller
+        :returns: True when the operation with `operation_id` was started
+        """
+        started = False
+        for admitted_id in SCHEDULER.select():
+            try:
+                operation = dao.try_get_operation_by_id(admitted_id)
+                if operation is None or not operation.queue_full or operation.has_finished or \
+                        dao.get_operation_process_for_operation(admitted_id) is not None:
+                    SCHEDULER.release(admitted_id)
+                    continue
+                started = started or admitted_id == operation_id
+                StandAloneClient.start_operation(admitted_id)
+            except Exception as e:
+                SCHEDULER.release(admitted_id)
+                if admitted_id == operation_id:
+                    raise
+                LOGGER.error("Starting operation error", e)
+        return started
+
     @staticmethod
     def start_operation(operation_id):
         LOGGER.info("Start processing operation id:{}".format(operation_id))
@@ -209,17 +242,34 @@ class StandAloneClient(BackendClient):
         else:
             thread.start()
 
+    @staticmethod
+    def start_if_admitted(operation_id, adapter_instance=None, keep_queued=True):
+        """
+        Queue an operation and start it, if the scheduler finds resources for it now.
+        :param keep_queued: when False, an operation which cannot start now is not kept waiting in this process
+        :returns: True when the operation was started
+        """
+        operation = dao.get_operation_by_id(operation_id)
+        if not operation.queue_full:
+            operation.queue_full = True
+            dao.store_entity(operation)
+        SCHEDULER.enqueue(operation, adapter_instance)
+        started = StandAloneClient.start_admitted_operations(operation.id)
+        if not started and not keep_queued:
+            SCHEDULER.discard(operation.id, forget=False)
+        return started
+
     @staticmethod
     def execute(operation_id, user_name_label, adapter_instance):
         """Start asynchronous operation locally"""
-        if TvbProfile.current.web.OPENSHIFT_DEPLOY or LOCKS_QUEUE.qsize() == 0:
+        if TvbProfile.current.web.OPENSHIFT_DEPLOY:
             operation = dao.get_operation_by_id(operation_id)
             operation.queue_full = True
             dao.store_entity(operation)
             return
 
-        LOCKS_QUEUE.get(True)
-        StandAloneClient.start_operation(operation_id)
+        if not StandAloneClient.start_if_admitted(operation_id, adapter_instance):
+            LOGGER.info("Operation {} waits for resources. Queue: {}".format(operation_id, SCHEDULER.metrics()))
 
     @staticmethod
     def stop_operation(operation_id):
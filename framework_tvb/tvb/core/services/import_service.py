@@ -229,13 +229,18 @@ class ImportService(object):
         return all_datatypes
 
     @staticmethod
-    def check_import_references(file_path, datatype):
+    def check_import_references(file_path, datatype, pending_gids=None):
+        """
+        :param pending_gids: GIDs of the datatypes which are about to be stored in the same transaction
+        """
         h5_class = H5File.h5_class_from_file(file_path)
         reference_list = h5_class(file_path).gather_references()
 
         for _, reference_gid in reference_list:
             if not reference_gid:
                 continue
+            if pending_gids and getattr(reference_gid, 'hex', None) in pending_gids:
+                continue
 
             ref_index = load.load_entity_by_gid(reference_gid)
             if ref_index is None:
@@ -259,20 +264,44 @@ class ImportService(object):
         if not datatype_already_in_tvb:
             self.store_datatype(datatype, dt_path)
             stored_dt_count = 1
-        elif datatype_already_in_tvb.parent_operation.project.id != project_id:
+        else:
+            self._link_existing_datatype(datatype_already_in_tvb, project_id)
+        return stored_dt_count
+
+    @staticmethod
+    def _link_existing_datatype(datatype_already_in_tvb, project_id):
+        if datatype_already_in_tvb.parent_operation.project.id != project_id:
             AlgorithmService.create_link([datatype_already_in_tvb.id], project_id)
             if datatype_already_in_tvb.fk_datatype_group:
                 AlgorithmService.create_link([datatype_already_in_tvb.fk_datatype_group], project_id)
-        return stored_dt_count
 
     def _store_imported_datatypes_in_db(self, project, all_datatypes):
         # type: (Project, dict) -> int
+        """
+        Store the new datatypes of an operation in a single DB transaction and link the already existing ones.
+        """
         sorted_dts = sorted(all_datatypes.items(),
                             key=lambda dt_item: dt_item[1].create_date or datetime.now())
-        count = 0
-        for dt_path, datatype in sorted_dts:
-            count += self.store_or_link_datatype(datatype, dt_path, project.id)
-        return count
+        new_datatypes = []
+        new_gids = set()
+        try:
+            for dt_path, datatype in sorted_dts:
+                self.check_import_references(dt_path, datatype, new_gids)
+                if datatype.gid in new_gids:
+                    continue
+                datatype_already_in_tvb = load.load_entity_by_gid(datatype.gid)
+                if datatype_already_in_tvb:
+                    self._link_existing_datatype(datatype_already_in_tvb, project.id)
+                    continue
+                self._import_datatype_file(datatype, dt_path)
+                new_datatypes.append(datatype)
+                new_gids.add(datatype.gid)
+        except (MissingReferenceException, ImportException):
+            # Keep the datatypes validated before the failing one, as the one by one import did
+            self.store_datatypes(new_datatypes)
+            raise
+        self.store_datatypes(new_datatypes)
+        return len(new_datatypes)
 
     def _store_imported_images(self, project, temp_project_path, project_name):
         """
@@ -580,12 +609,12 @@ class ImportService(object):
         try:
             self.logger.debug("Store datatype: %s with Gid: %s" % (datatype.__class__.__name__, datatype.gid))
             # Now move storage file into correct folder if necessary
-            if current_file is not None:
-                final_path = h5.path_for_stored_index(datatype)
-                if final_path != current_file:
-                    shutil.move(current_file, final_path)
+            self._move_imported_file(datatype, current_file)
             stored_entry = load.load_entity_by_gid(datatype.gid)
             if not stored_entry:
+                if current_file is not None:
+                    # Projects importing the same data share its large data sets
+                    self.storage_interface.deduplicate_h5(h5.path_for_stored_index(datatype))
                 stored_entry = dao.store_entity(datatype)
 
             return stored_entry
@@ -599,6 +628,40 @@ class ImportService(object):
                         "the same name or gid." % datatype.gid
             raise ImportException(error_msg)
 
+    def _import_datatype_file(self, datatype, current_file):
+        """
+        Move the H5 file of a new datatype into its operation folder and share its large data sets,
+        before the datatype gets stored in bulk.
+        """
+        try:
+            self._move_imported_file(datatype, current_file)
+            if current_file is not None:
+                # Projects importing the same data share its large data sets
+                self.storage_interface.deduplicate_h5(h5.path_for_stored_index(datatype))
+        except MissingDataSetException as e:
+            self.logger.exception(e)
+            error_msg = "Datatype %s has missing data and could not be imported properly." % (datatype,)
+            raise ImportException(error_msg)
+
+    @staticmethod
+    def _move_imported_file(datatype, current_file):
+        if current_file is not None:
+            final_path = h5.path_for_stored_index(datatype)
+            if final_path != current_file:
+                shutil.move(current_file, final_path)
+
+    def store_datatypes(self, datatypes):
+        """This method stores a list of data types into DB, within a single transaction"""
+        if len(datatypes) == 0:
+            return []
+        try:
+            self.logger.debug("Store %d datatypes in bulk" % len(datatypes))
+            return dao.store_entities(datatypes)
+        except IntegrityError as excep:
+            self.logger.exception(excep)
+            # Fall back to storing them one by one, to keep the valid ones and report the one which failed
+            return [self.store_datatype(datatype) for datatype in datatypes]
+
     def __populate_project(self, project_path):
         """
         Create and store a Project entity.
@@ -41,6 +41,7 @@ import json
 import os
 import shutil
 import sys
+import time
 import uuid
 import zipfile
 from inspect import isclass
@@ -48,6 +49,7 @@ from inspect import isclass
 from tvb.basic.exceptions import TVBException
 from tvb.basic.logger.builder import get_logger
 from tvb.basic.profile import TvbProfile
+from tvb.basic.timings import StageTimings, collecting, stage
 from tvb.config import MEASURE_METRICS_MODULE, MEASURE_METRICS_CLASS, MEASURE_METRICS_MODEL_CLASS, ALGORITHMS
 from tvb.core.adapters.abcadapter import ABCAdapter, AdapterLaunchModeEnum
 from tvb.core.adapters.exceptions import LaunchException
@@ -56,11 +58,12 @@ from tvb.core.entities.load import get_class_by_name
 from tvb.core.entities.model.model_burst import PARAM_RANGE_PREFIX, RANGE_PARAMETER_1, RANGE_PARAMETER_2, \
     BurstConfiguration
 from tvb.core.entities.model.model_datatype import DataTypeGroup
-from tvb.core.entities.model.model_operation import STATUS_FINISHED, STATUS_ERROR, Operation
+from tvb.core.entities.model.model_operation import STATUS_FINISHED, STATUS_ERROR, Operation, OperationStageTimings
 from tvb.core.entities.storage import dao, transactional
 from tvb.core.neocom import h5
 from tvb.core.neotraits.h5 import ViewModelH5
 from tvb.core.services.backend_client_factory import BackendClientFactory
+from tvb.core.services.backend_clients.backend_client import SPAWN_TIME_VARIABLE
 from tvb.core.services.burst_service import BurstService
 from tvb.core.services.exceptions import OperationException
 from tvb.core.services.project_service import ProjectService
@@ -72,6 +75,12 @@ RANGE_PARAMETER_2 = RANGE_PARAMETER_2
 
 GROUP_BURST_PENDING = {}
 
+STAGE_QUEUEING = "queueing"
+STAGE_PROCESS_SPAWN = "process_spawn"
+STAGE_VIEW_MODEL_LOAD = "view_model_load"
+# Stage timings kept per algorithm, the older ones are removed as new operations are measured
+STAGE_TIMINGS_KEPT = 1000
+
 
 class OperationService:
     """
@@ -214,7 +223,43 @@ class OperationService:
         """
         Public method.
         This should be the common point in calling an adapter- method.
+        The time spent in each stage of the operation is stored with it, as OperationStageTimings.
         """
+        timings = StageTimings()
+        self._add_waiting_stages(operation, timings)
+        with collecting(timings):
+            try:
+                return self._initiate_prelaunch(operation, adapter_instance)
+            finally:
+                self._store_stage_timings(operation, timings)
+
+    @staticmethod
+    def _add_waiting_stages(operation, timings):
+        """
+        Count the time from the creation of the operation until now: in the queue, then (when run by
+        a new process) in starting that process, until it got here.
+        """
+        now = time.time()
+        # Popped, so that the operations launched afterwards by this process don't count it again
+        spawned_at = os.environ.pop(SPAWN_TIME_VARIABLE, None)
+        queue_end = now
+        if spawned_at is not None:
+            queue_end = min(float(spawned_at), now)
+            timings.add(STAGE_PROCESS_SPAWN, now - queue_end)
+        if operation.create_date is not None:
+            timings.add(STAGE_QUEUEING, max(queue_end - operation.create_date.timestamp(), 0.0))
+
+    def _store_stage_timings(self, operation, timings):
+        self.logger.debug("Stage timings of operation %s:\n%s" % (operation.id, timings.report()))
+        try:
+            dao.store_entity(OperationStageTimings(operation.id, operation.fk_from_algo,
+                                                   TvbProfile.current.version.CURRENT_VERSION, timings))
+            dao.prune_stage_timings(operation.fk_from_algo, STAGE_TIMINGS_KEPT)
+        except Exception:
+            # Measures are not worth failing the operation for
+            self.logger.exception("Could not store the stage timings of operation %s" % operation.id)
+
+    def _initiate_prelaunch(self, operation, adapter_instance):
         result_msg = ""
         temp_files = []
         try:
@@ -225,7 +270,8 @@ class OperationService:
             user_disk_space = dao.compute_user_generated_disk_size(operation.fk_launched_by)  # From kB to Bytes
             available_space = disk_space_per_user - pending_op_disk_space - user_disk_space
 
-            view_model = adapter_instance.load_view_model(operation)
+            with stage(STAGE_VIEW_MODEL_LOAD):
+                view_model = adapter_instance.load_view_model(operation)
             try:
                 form = adapter_instance.get_form()
                 form = form() if isclass(form) else form
@@ -368,6 +414,26 @@ class OperationService:
         operation.burst = dao.get_burst_for_operation_id(operation_id)
         return operation
 
+    @staticmethod
+    def load_stage_timings(operation_id):
+        """ The StageTimings measured for an operation, or None when it was not measured """
+        record = dao.get_operation_stage_timings(operation_id)
+        return record.stage_timings if record is not None else None
+
+    @staticmethod
+    def get_stage_timings_rows(algorithm_classname=None, tvb_version=None):
+        """
+        The stage timings of all the measured operations, optionally of one algorithm or TVB version,
+        as one dict per operation and stage, ready to be exported (e.g. as CSV) and compared.
+        """
+        rows = []
+        for record, module, classname in dao.get_stage_timings(algorithm_classname, tvb_version):
+            for stage_name, values in sorted(record.stage_timings.to_dict().items()):
+                rows.append(dict(operation_id=record.fk_from_operation, algorithm=module + "." + classname,
+                                 tvb_version=record.tvb_version, date=str(record.create_date), stage=stage_name,
+                                 seconds=values['seconds'], calls=values['calls']))
+        return rows
+
     @staticmethod
     def stop_operation(operation_id, is_group=False, remove_after_stop=False):
         # type: (int, bool, bool) -> bool
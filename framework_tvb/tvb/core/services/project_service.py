@@ -35,6 +35,9 @@ Service Layer for the Project entity.
 .. moduleauthor:: Bogdan Neacsa <bogdan.neacsa@codemart.ro>
 """
 
+import threading
+from collections import OrderedDict
+
 import formencode
 from tvb.basic.logger.builder import get_logger
 from tvb.core.adapters.abcadapter import ABCAdapter
@@ -76,6 +79,36 @@ PROJECTS_PAGE_SIZE = 20
 
 MONTH_YEAR_FORMAT = "%B %Y"
 DAY_MONTH_YEAR_FORMAT = "%d %B %Y"
+LAZY_STRUCTURE_SIZE = 1000
+
+
+class ProjectStructureCache(object):
+    """
+    Project trees already converted for UI, each kept with the structure version of its project.
+    """
+
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        self._trees = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._trees.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._trees.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, version, tree):
+        with self._lock:
+            self._trees[key] = (version, tree)
+            self._trees.move_to_end(key)
+            while len(self._trees) > self.max_size:
+                self._trees.popitem(last=False)
+
+
+STRUCTURE_CACHE = ProjectStructureCache()
 
 
 class ProjectService:
@@ -446,62 +479,108 @@ class ProjectService:
         """
         return DataTypeMetaData.get_filterable_meta()
 
-    def get_project_structure(self, project, visibility_filter, first_level, second_level, filter_value):
+    def get_project_structure(self, project, visibility_filter, first_level, second_level, filter_value,
+                              node_id=None):
         """
         Find all DataTypes (including the linked ones and the groups) relevant for the current project.
         In case of a problem, will return an empty list.
+
+        Trees are kept in STRUCTURE_CACHE until the structure version of their project changes. For projects with
+        more than LAZY_STRUCTURE_SIZE DataTypes, the second level nodes are returned closed, and node_id asks for
+        the DataTypes under one of them.
+        """
+        filter_key = visibility_filter.get_sql_filter_equivalent() if visibility_filter else None
+        cache_key = (project.gid, project.name, filter_key, first_level, second_level, filter_value)
+        version = dao.get_project_structure_version(project.id)
+        tree = STRUCTURE_CACHE.get(cache_key, version)
+
+        if tree is None:
+            metadata_list = self._get_structure_metadata(project, visibility_filter, filter_value)
+            forest = StructureNode.metadata2forest(metadata_list, first_level, second_level)
+            lazy = len(metadata_list) > LAZY_STRUCTURE_SIZE
+            children = {}
+            if lazy:
+                for level_node in forest:
+                    for sublevel_node in level_node.children:
+                        children[StructureNode.PREFIX_ID_NODE + sublevel_node.id] = StructureNode.children2json(
+                            sublevel_node, project.id)
+            tree = StructureNode.forest2json(forest, project.id, project.name, lazy), children
+            STRUCTURE_CACHE.put(cache_key, version, tree)
+
+        if node_id is None:
+            return tree[0]
+        return tree[1].get(node_id, '[]')
+
+    @staticmethod
+    def _get_structure_metadata(project, visibility_filter, filter_value):
+        """
+        Prepare the DT results from DB, for usage in controller, by converting into DataTypeMetaData objects
         """
         metadata_list = []
-        dt_list = dao.get_data_in_project(project.id, visibility_filter, filter_value)
+        rows = dao.get_structure_data_in_project(project.id, visibility_filter, filter_value)
+        display_names = ProjectService._get_display_names(rows)
 
-        for dt in dt_list:
-            # Prepare the DT results from DB, for usage in controller, by converting into DataTypeMetaData objects
+        for row in rows:
             data = {}
-            is_group = False
-            group_op = None
-            #  Filter by dt.type, otherwise Links to individual DT inside a group will be mistaken
-            if dt.type == "DataTypeGroup" and dt.parent_operation.operation_group is not None:
-                is_group = True
-                group_op = dt.parent_operation.operation_group
+            #  Filter by type, otherwise Links to individual DT inside a group will be mistaken
+            is_group = row.type == DataTypeGroup.__name__ and row.fk_operation_group is not None
 
             # All these fields are necessary here for dynamic Tree levels.
-            data[DataTypeMetaData.KEY_DATATYPE_ID] = dt.id
-            data[DataTypeMetaData.KEY_GID] = dt.gid
-            data[DataTypeMetaData.KEY_NODE_TYPE] = dt.display_type
-            data[DataTypeMetaData.KEY_STATE] = dt.state
-            data[DataTypeMetaData.KEY_SUBJECT] = str(dt.subject)
-            data[DataTypeMetaData.KEY_TITLE] = dt.display_name
-            data[DataTypeMetaData.KEY_RELEVANCY] = dt.visible
-            data[DataTypeMetaData.KEY_LINK] = dt.parent_operation.fk_launched_in != project.id
-
-            data[DataTypeMetaData.KEY_TAG_1] = dt.user_tag_1 if dt.user_tag_1 else ''
-            data[DataTypeMetaData.KEY_TAG_2] = dt.user_tag_2 if dt.user_tag_2 else ''
-            data[DataTypeMetaData.KEY_TAG_3] = dt.user_tag_3 if dt.user_tag_3 else ''
-            data[DataTypeMetaData.KEY_TAG_4] = dt.user_tag_4 if dt.user_tag_4 else ''
-            data[DataTypeMetaData.KEY_TAG_5] = dt.user_tag_5 if dt.user_tag_5 else ''
+            data[DataTypeMetaData.KEY_DATATYPE_ID] = row.id
+            data[DataTypeMetaData.KEY_GID] = row.gid
+            data[DataTypeMetaData.KEY_NODE_TYPE] = row.type.replace("Index", "")
+            data[DataTypeMetaData.KEY_STATE] = row.state
+            data[DataTypeMetaData.KEY_SUBJECT] = str(row.subject)
+            data[DataTypeMetaData.KEY_TITLE] = display_names[row.id]
+            data[DataTypeMetaData.KEY_RELEVANCY] = row.visible
+            data[DataTypeMetaData.KEY_LINK] = row.fk_launched_in != project.id
+
+            data[DataTypeMetaData.KEY_TAG_1] = row.user_tag_1 if row.user_tag_1 else ''
+            data[DataTypeMetaData.KEY_TAG_2] = row.user_tag_2 if row.user_tag_2 else ''
+            data[DataTypeMetaData.KEY_TAG_3] = row.user_tag_3 if row.user_tag_3 else ''
+            data[DataTypeMetaData.KEY_TAG_4] = row.user_tag_4 if row.user_tag_4 else ''
+            data[DataTypeMetaData.KEY_TAG_5] = row.user_tag_5 if row.user_tag_5 else ''
 
             # Operation related fields:
-            operation_name = CommonDetails.compute_operation_name(
-                dt.parent_operation.algorithm.algorithm_category.displayname,
-                dt.parent_operation.algorithm.displayname)
+            operation_name = CommonDetails.compute_operation_name(row.category_name, row.algorithm_name)
             data[DataTypeMetaData.KEY_OPERATION_TYPE] = operation_name
-            data[DataTypeMetaData.KEY_OPERATION_ALGORITHM] = dt.parent_operation.algorithm.displayname
-            data[DataTypeMetaData.KEY_AUTHOR] = dt.parent_operation.user.username
-            data[DataTypeMetaData.KEY_OPERATION_TAG] = group_op.name if is_group else dt.parent_operation.user_group
-            data[DataTypeMetaData.KEY_OP_GROUP_ID] = group_op.id if is_group else None
+            data[DataTypeMetaData.KEY_OPERATION_ALGORITHM] = row.algorithm_name
+            data[DataTypeMetaData.KEY_AUTHOR] = row.username
+            data[DataTypeMetaData.KEY_OPERATION_TAG] = row.operation_group_name if is_group else row.user_group
+            data[DataTypeMetaData.KEY_OP_GROUP_ID] = row.fk_operation_group if is_group else None
 
-            completion_date = dt.parent_operation.completion_date
+            completion_date = row.completion_date
             string_year = completion_date.strftime(MONTH_YEAR_FORMAT) if completion_date is not None else ""
             string_month = completion_date.strftime(DAY_MONTH_YEAR_FORMAT) if completion_date is not None else ""
             data[DataTypeMetaData.KEY_DATE] = date2string(completion_date) if (completion_date is not None) else ''
             data[DataTypeMetaData.KEY_CREATE_DATA_MONTH] = string_year
             data[DataTypeMetaData.KEY_CREATE_DATA_DAY] = string_month
 
-            data[DataTypeMetaData.KEY_BURST] = dt._parent_burst.name if dt._parent_burst is not None else '-None-'
+            data[DataTypeMetaData.KEY_BURST] = row.burst_name if row.burst_name is not None else '-None-'
 
-            metadata_list.append(DataTypeMetaData(data, dt.invalid))
+            metadata_list.append(DataTypeMetaData(data, row.invalid))
+        return metadata_list
 
-        return StructureNode.metadata2tree(metadata_list, first_level, second_level, project.id, project.name)
+    @staticmethod
+    def _get_display_names(rows):
+        """
+        Most DataTypes are displayed by type and tags. The classes overriding display_name need their own columns,
+        so their DataTypes are loaded with one query per class.
+        """
+        display_names = {}
+        ids_per_class = {}
+        polymorphic_map = DataType.__mapper__.polymorphic_map
+        for row in rows:
+            display_names[row.id] = DataType.compose_display_name(row.type, [row.user_tag_1, row.user_tag_2,
+                                                                             row.user_tag_3, row.user_tag_4,
+                                                                             row.user_tag_5])
+            mapper = polymorphic_map.get(row.type)
+            if mapper is not None and mapper.class_.display_name is not DataType.display_name:
+                ids_per_class.setdefault(mapper.class_, []).append(row.id)
+
+        for datatype_class, datatype_ids in ids_per_class.items():
+            display_names.update(dao.get_display_names(datatype_class, datatype_ids))
+        return display_names
 
     @staticmethod
     def get_datatype_details(datatype_gid):
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Command line tools for the on-disk layout of TVB H5 files:
+
+    python -m tvb.interfaces.command.h5_storage repack <file or folder> ...
+    python -m tvb.interfaces.command.h5_storage benchmark
+    python -m tvb.interfaces.command.h5_storage deduplicate <file or folder> ...
+    python -m tvb.interfaces.command.h5_storage gc
+
+`repack` rewrites existing files with the storage policies declared on their H5File classes.
+`deduplicate` moves the large data sets of existing files into the shared blob store, e.g. after an upgrade.
+`gc` removes the shared data sets which no file of the projects folder links to anymore.
+`benchmark` compares the disk footprint and the dominant read latencies of synthetic time series,
+written with and without those policies.
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+import uuid
+
+import numpy
+from tvb.adapters.datatypes.h5.time_series_h5 import TimeSeriesRegionH5, TimeSeriesVolumeH5
+from tvb.basic.profile import TvbProfile
+from tvb.core.neocom import h5
+from tvb.storage.storage_interface import StorageInterface
+
+HEADER = "%-28s %-10s %12s %16s"
+
+
+def repack_files(paths):
+    """
+    Repack all the H5 files found at the given paths (files or folders, searched recursively).
+    """
+    total_before, total_after = 0, 0
+    for h5_path in _iter_h5_files(paths):
+        size_before, size_after = h5.repack(h5_path)
+        total_before += size_before
+        total_after += size_after
+        print("%s: %d -> %d bytes" % (h5_path, size_before, size_after))
+    print("Total: %d -> %d bytes" % (total_before, total_after))
+
+
+def deduplicate_files(paths):
+    """
+    Share the large data sets of all the H5 files found at the given paths with identical ones.
+    """
+    storage_interface = StorageInterface()
+    total_freed = 0
+    for h5_path in _iter_h5_files(paths):
+        freed = storage_interface.deduplicate_h5(h5_path)
+        total_freed += freed
+        print("%s: %d bytes freed" % (h5_path, freed))
+    print("Total: %d bytes freed, shared data sets take %d KB" % (total_freed,
+                                                                  StorageInterface.compute_blob_store_size()))
+
+
+def collect_garbage():
+    freed = StorageInterface.collect_blob_garbage()
+    print("%d bytes freed, shared data sets take %d KB" % (freed, StorageInterface.compute_blob_store_size()))
+
+
+def _iter_h5_files(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for folder, _, files in os.walk(path):
+            for file_name in sorted(files):
+                if file_name.endswith('.h5'):
+                    yield os.path.join(folder, file_name)
+
+
+def _write(h5_class, folder, blocks, with_policy):
+    path = os.path.join(folder, "%s_%s.h5" % (h5_class.__name__, uuid.uuid4().hex))
+    with h5_class(path) as h5_file:
+        h5_file.sample_period.store(1.0)
+        h5_file.start_time.store(0.0)
+        if not with_policy:
+            h5_file.data.storage_policy = None
+        # Appended in blocks of time points, the way monitors write simulation results
+        for block in blocks:
+            h5_file.data.append(block, close_file=False)
+    return path
+
+
+def _time_read(h5_class, path, read, repeats):
+    with h5_class(path) as h5_file:
+        return min(timeit.repeat(lambda: read(h5_file), number=1, repeat=repeats))
+
+
+def benchmark(time_points=20000, regions=192, volume_shape=(32, 32, 32), volume_time_points=2000, repeats=5):
+    """
+    Write the same synthetic region and volume time series with and without storage policies,
+    then print their size on disk and the best time of their dominant reads.
+    """
+    rng = numpy.random.default_rng(42)
+    region_blocks = [rng.standard_normal((500, 1, regions, 1)) for _ in range(time_points // 500)]
+    volume_blocks = [rng.standard_normal((100,) + tuple(volume_shape)) for _ in range(volume_time_points // 100)]
+    middle = tuple(length // 2 for length in volume_shape)
+
+    cases = [
+        ("region page (1000 points)", TimeSeriesRegionH5, region_blocks,
+         lambda h5_file: h5_file.read_data_page(time_points // 2, time_points // 2 + 1000)),
+        ("voxel time line", TimeSeriesVolumeH5, volume_blocks,
+         lambda h5_file: h5_file.data[(slice(None),) + middle]),
+        ("volume frame", TimeSeriesVolumeH5, volume_blocks,
+         lambda h5_file: h5_file.data[volume_time_points // 2]),
+    ]
+
+    print(HEADER % ("read", "policy", "size (MB)", "latency (ms)"))
+    with tempfile.TemporaryDirectory() as folder:
+        for label, h5_class, blocks, read in cases:
+            for with_policy in (False, True):
+                path = _write(h5_class, folder, blocks, with_policy)
+                size = os.path.getsize(path) / 2 ** 20
+                latency = _time_read(h5_class, path, read, repeats) * 1000
+                print(HEADER % (label, "yes" if with_policy else "no", "%.1f" % size, "%.2f" % latency))
+
+
+def main(argv):
+    TvbProfile.set_profile(TvbProfile.COMMAND_PROFILE)
+    if len(argv) > 1 and argv[0] == 'repack':
+        repack_files(argv[1:])
+    elif len(argv) == 1 and argv[0] == 'benchmark':
+        benchmark()
+    elif len(argv) > 1 and argv[0] == 'deduplicate':
+        deduplicate_files(argv[1:])
+    elif len(argv) == 1 and argv[0] == 'gc':
+        collect_garbage()
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
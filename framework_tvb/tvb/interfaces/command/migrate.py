@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Offline upgrade of TVB to the current code and storage versions, instead of the one done at startup:
+
+    python -m tvb.interfaces.command.migrate run [workers]
+    python -m tvb.interfaces.command.migrate dry-run [workers]
+    python -m tvb.interfaces.command.migrate status
+
+`run` applies the code updates, then the H5 file updates, the latter with the given number of processes
+(default 1). It can be stopped at any moment: the next `run` continues where it stopped.
+`dry-run` estimates how long the H5 file updates would take, without changing anything.
+`status` prints the progress recorded by an interrupted `run`.
+"""
+
+import sys
+
+from tvb.basic.profile import TvbProfile
+from tvb.config.init.initializer import command_initializer
+from tvb.core.code_versions.code_update_manager import CodeUpdateManager
+from tvb.core.entities.file.files_update_manager import FilesUpdateManager
+from tvb.core.entities.file.migration_journal import MigrationJournal, STATUS_STARTED, STATUS_DONE, STATUS_FAILED
+
+
+def run(workers):
+    CodeUpdateManager().run_all_updates()
+    FilesUpdateManager(workers).run_all_updates()
+    print(FilesUpdateManager.MESSAGE)
+
+
+def dry_run(workers):
+    files_count, size, seconds = FilesUpdateManager(workers).estimate()
+    print("%d H5 files (%.1f MB) to upgrade, in about %d min" % (files_count, size / 2 ** 20, round(seconds / 60)))
+
+
+def status():
+    version = TvbProfile.current.version
+    print("Storage checked to version %d out of %d" % (version.DATA_CHECKED_TO_VERSION, version.DATA_VERSION))
+    journal = MigrationJournal(version.DATA_VERSION)
+    print("Files upgraded: %d, failed: %d, interrupted: %d" % (
+        journal.count(STATUS_DONE), journal.count(STATUS_FAILED), journal.count(STATUS_STARTED)))
+
+
+def main(argv):
+    workers = int(argv[1]) if len(argv) == 2 else 1
+    if len(argv) in (1, 2) and argv[0] in ('run', 'dry-run'):
+        # Only the DB structure is upgraded by the initialization, the rest is done here
+        command_initializer(skip_updates=True)
+        if argv[0] == 'run':
+            run(workers)
+        else:
+            dry_run(workers)
+    elif len(argv) == 1 and argv[0] == 'status':
+        TvbProfile.set_profile(TvbProfile.COMMAND_PROFILE)
+        status()
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
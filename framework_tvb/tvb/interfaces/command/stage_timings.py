@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Export the time spent in each stage of the operations run so far, to compare runs and TVB versions:
+
+    python -m tvb.interfaces.command.stage_timings export <file.csv or file.json> [algorithm class name]
+    python -m tvb.interfaces.command.stage_timings summary [algorithm class name]
+
+`export` writes one row per operation and stage (queueing, process_spawn, view_model_load, h5_io, db_write,
+launch, and for simulations each stage of the integration loop, e.g. simulator.coupling).
+`summary` prints the mean seconds of each stage, per algorithm and TVB version.
+"""
+
+import csv
+import json
+import sys
+
+from tvb.basic.profile import TvbProfile
+from tvb.core.services.operation_service import OperationService
+
+COLUMNS = ['operation_id', 'algorithm', 'tvb_version', 'date', 'stage', 'seconds', 'calls']
+
+
+def export(file_path, algorithm_classname=None):
+    rows = OperationService.get_stage_timings_rows(algorithm_classname)
+    with open(file_path, 'w', newline='') as export_file:
+        if file_path.endswith('.json'):
+            json.dump(rows, export_file, indent=1)
+        else:
+            writer = csv.DictWriter(export_file, COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    print("%d stage timings exported to %s" % (len(rows), file_path))
+
+
+def summary(algorithm_classname=None):
+    means = {}
+    for row in OperationService.get_stage_timings_rows(algorithm_classname):
+        seconds = means.setdefault((row['algorithm'], row['tvb_version']), {}).setdefault(row['stage'], [])
+        seconds.append(row['seconds'])
+    for (algorithm, version), stages in sorted(means.items()):
+        print("%s, TVB %s" % (algorithm, version))
+        for stage_name, seconds in sorted(stages.items(), key=lambda item: -sum(item[1]) / len(item[1])):
+            print("    %-40s %10.3f s (mean of %d)" % (stage_name, sum(seconds) / len(seconds), len(seconds)))
+
+
+def main(argv):
+    if len(argv) in (2, 3) and argv[0] == 'export':
+        TvbProfile.set_profile(TvbProfile.COMMAND_PROFILE)
+        export(*argv[1:])
+    elif len(argv) in (1, 2) and argv[0] == 'summary':
+        TvbProfile.set_profile(TvbProfile.COMMAND_PROFILE)
+        summary(*argv[1:])
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -29,36 +29,149 @@
 #
 
 import cgi
+import io
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy
+import requests
 from tvb.basic.neotraits.api import HasTraits
 from tvb.core.neocom import h5
 from tvb.core.neocom.h5 import REGISTRY, TVBLoader
+from tvb.core.neotraits.h5 import H5File
 from tvb.interfaces.rest.client.client_decorators import handle_response
+from tvb.interfaces.rest.client.datatype.datatype_cache import DatatypeFileCache
+from tvb.interfaces.rest.client.datatype.remote_dataset import RemoteDataSet
+from tvb.interfaces.rest.client.main_api import CONNECTION_POOL_SIZE
 from tvb.interfaces.rest.client.main_api import MainApi
+from tvb.interfaces.rest.commons import hyperslab
 from tvb.interfaces.rest.commons.dtos import AlgorithmDto
 from tvb.interfaces.rest.commons.exceptions import ClientException
 from tvb.interfaces.rest.commons.files_helper import save_file
-from tvb.interfaces.rest.commons.strings import RestLink, LinkPlaceholder
+from tvb.interfaces.rest.commons.status_codes import HTTP_STATUS_NOT_MODIFIED
+from tvb.interfaces.rest.commons.strings import RestLink, LinkPlaceholder, Strings
+
+SLICE_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+SLICE_DOWNLOAD_MAX_RETRIES = 3
 
 
 class DataTypeApi(MainApi):
 
+    def __init__(self, server_url, auth_token=''):
+        super(DataTypeApi, self).__init__(server_url, auth_token)
+        self._caches = {}
+        self._caches_lock = threading.Lock()
+
+    def _get_cache(self, download_folder):
+        # type: (str) -> DatatypeFileCache
+        cache_key = os.path.abspath(download_folder)
+        with self._caches_lock:
+            if cache_key not in self._caches:
+                self._caches[cache_key] = DatatypeFileCache(download_folder)
+            return self._caches[cache_key]
+
     def retrieve_datatype(self, datatype_gid, download_folder):
+        """
+        Download the H5 file of a datatype in the given folder. When a previous download of the same datatype
+        exists in that folder, the file is transferred again only if it has changed on the server.
+        """
+        cache = self._get_cache(download_folder)
+        cached_path, last_modified = cache.get(datatype_gid)
+        headers = {'If-Modified-Since': last_modified} if cached_path is not None else None
+
         response = self.secured_request().get(self.build_request_url(
             RestLink.GET_DATATYPE.compute_url(True,
-                                              {LinkPlaceholder.DATATYPE_GID.value: datatype_gid})), stream=True)
+                                              {LinkPlaceholder.DATATYPE_GID.value: datatype_gid})),
+            headers=headers, stream=True)
+        if cached_path is not None and response.status_code == HTTP_STATUS_NOT_MODIFIED:
+            response.close()
+            return cached_path
+
         if response.ok:
             content_disposition = response.headers['Content-Disposition']
             value, params = cgi.parse_header(content_disposition)
-            file_name = params['filename']
-            file_path = os.path.join(download_folder, os.path.basename(file_name))
-            return save_file(file_path, response)
+            file_name = os.path.basename(params['filename'])
+            file_path = os.path.join(download_folder, file_name)
+            # Invalidate first, so that an interrupted download is never taken as a valid cached file
+            cache.remove(datatype_gid)
+            save_file(file_path, response)
+            cache.put(datatype_gid, file_name, response.headers.get('Last-Modified'))
+            return file_path
 
         error_response = json.loads(response.content.decode('utf-8'))
         raise ClientException(error_response['message'], error_response['code'])
 
+    def retrieve_datatypes(self, datatype_gids, download_folder):
+        # type: (list, str) -> dict
+        """
+        Download (or validate the cached copies of) several datatypes concurrently.
+        :returns: a dictionary from datatype GID to the local H5 file path
+        """
+        unique_gids = list(dict.fromkeys(datatype_gids))
+        if len(unique_gids) <= 1:
+            return {gid: self.retrieve_datatype(gid, download_folder) for gid in unique_gids}
+
+        with ThreadPoolExecutor(max_workers=min(CONNECTION_POOL_SIZE, len(unique_gids))) as executor:
+            paths = executor.map(lambda gid: self.retrieve_datatype(gid, download_folder), unique_gids)
+            return dict(zip(unique_gids, paths))
+
+    @handle_response
+    def get_dataset_info(self, datatype_gid, dataset_name):
+        return self.secured_request().get(self.build_request_url(RestLink.DATATYPE_DATASET_INFO.compute_url(True, {
+            LinkPlaceholder.DATATYPE_GID.value: datatype_gid,
+            LinkPlaceholder.DATASET_NAME.value: dataset_name
+        })))
+
+    def retrieve_dataset_slice(self, datatype_gid, dataset_name, slice_spec=None):
+        # type: (str, str, str) -> numpy.ndarray
+        """
+        Download only a hyperslab of a dataset, streamed as NPY.
+        When the transfer is interrupted, it is resumed with a HTTP Range request from the last received byte.
+        :param slice_spec: hyperslab specification, eg. "0:1000:2,0,:". Everything is downloaded when None
+        """
+        url = self.build_request_url(RestLink.DATATYPE_DATASET.compute_url(True, {
+            LinkPlaceholder.DATATYPE_GID.value: datatype_gid,
+            LinkPlaceholder.DATASET_NAME.value: dataset_name
+        }))
+        params = {Strings.FORMAT.value: hyperslab.FORMAT_NPY}
+        if slice_spec is not None:
+            params[Strings.SLICE.value] = slice_spec
+
+        content = bytearray()
+        total_size = None
+        retries = 0
+        while total_size is None or len(content) < total_size:
+            headers = {'Range': 'bytes=%d-' % len(content)} if content else None
+            response = self.secured_request().get(url, params=params, headers=headers, stream=True)
+            if not response.ok:
+                error_response = json.loads(response.content.decode('utf-8'))
+                raise ClientException(error_response['message'], error_response['code'])
+            if content and 'Content-Range' not in response.headers:
+                # The server ignored the Range header, so we receive everything again
+                content = bytearray()
+            if total_size is None or not content:
+                total_size = len(content) + int(response.headers['Content-Length'])
+            try:
+                for chunk in response.iter_content(chunk_size=SLICE_DOWNLOAD_CHUNK_SIZE):
+                    content.extend(chunk)
+            except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ConnectionError):
+                pass
+            if len(content) < total_size:
+                retries += 1
+                if retries > SLICE_DOWNLOAD_MAX_RETRIES:
+                    raise ClientException("Could not download dataset %s, the connection was interrupted "
+                                          "too many times" % dataset_name)
+
+        stream = io.BytesIO(content)
+        dtype, shape = hyperslab.read_npy_header(stream)
+        return numpy.frombuffer(content, dtype=dtype, offset=stream.tell()).reshape(shape)
+
+    def get_remote_dataset(self, datatype_gid, dataset_name):
+        # type: (str, str) -> RemoteDataSet
+        return RemoteDataSet(self, datatype_gid, dataset_name)
+
     @handle_response
     def get_operations_for_datatype(self, datatype_gid):
         response = self.secured_request().get(
@@ -81,9 +194,19 @@ class DataTypeApi(MainApi):
 
     def _load_with_full_references(self, file_path, download_folder):
         # type: (str, str) -> HasTraits
+        with H5File.from_file(file_path) as f:
+            references = f.gather_references()
+
+        reference_gids = []
+        for _, sub_gid in references:
+            if isinstance(sub_gid, list):
+                reference_gids.extend(sub_gid)
+            elif sub_gid is not None:
+                reference_gids.append(sub_gid)
+        reference_paths = self.retrieve_datatypes([sub_gid.hex for sub_gid in reference_gids], download_folder)
+
         def load_ht_function(sub_gid, traited_attr):
-            ref_ht_path = self.retrieve_datatype(sub_gid.hex, download_folder)
-            ref_ht, _ = h5.load_with_links(ref_ht_path)
+            ref_ht, _ = h5.load_with_links(reference_paths[sub_gid.hex])
             return ref_ht
 
         loader = TVBLoader(REGISTRY)
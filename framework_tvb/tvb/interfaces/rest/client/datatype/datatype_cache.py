@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import json
+import os
+import threading
+
+
+class DatatypeFileCache(object):
+    """
+    Local cache of the datatype H5 files downloaded from a TVB REST server, stored in one download folder.
+    Entries are keyed by the datatype GID and by the modification time reported by the server for its H5 file,
+    so a file is downloaded again only when the server side copy has changed.
+    """
+    INDEX_FILE_NAME = "tvb_rest_cache.json"
+    KEY_FILE_NAME = "file_name"
+    KEY_LAST_MODIFIED = "last_modified"
+
+    def __init__(self, cache_folder):
+        self.cache_folder = cache_folder
+        self.index_path = os.path.join(cache_folder, self.INDEX_FILE_NAME)
+        self._lock = threading.Lock()
+        self._index = self._read_index()
+
+    def _read_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path) as index_file:
+                return json.load(index_file)
+        except ValueError:
+            # A corrupted index only means that files will be downloaded again
+            return {}
+
+    def _write_index(self):
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, 'w') as index_file:
+            json.dump(self._index, index_file)
+        os.replace(temp_path, self.index_path)
+
+    def get(self, datatype_gid):
+        """
+        :returns: a tuple (file_path, last_modified) for a cached datatype, or (None, None) when it is not cached
+        """
+        with self._lock:
+            entry = self._index.get(datatype_gid)
+        if entry is None:
+            return None, None
+        file_path = os.path.join(self.cache_folder, entry[self.KEY_FILE_NAME])
+        if not os.path.exists(file_path):
+            return None, None
+        return file_path, entry[self.KEY_LAST_MODIFIED]
+
+    def put(self, datatype_gid, file_name, last_modified):
+        """
+        Register a file, already downloaded in the cache folder, as the current version of a datatype.
+        """
+        if last_modified is None:
+            # Without a modification time we can not tell later whether the file is still valid
+            self.remove(datatype_gid)
+            return
+        with self._lock:
+            self._index[datatype_gid] = {self.KEY_FILE_NAME: file_name, self.KEY_LAST_MODIFIED: last_modified}
+            self._write_index()
+
+    def remove(self, datatype_gid):
+        with self._lock:
+            if self._index.pop(datatype_gid, None) is not None:
+                self._write_index()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import numpy
+
+from tvb.interfaces.rest.commons import hyperslab
+
+
+class RemoteDataSet(object):
+    """
+    Lazy, read-only proxy for a dataset of a DataType stored on a TVB REST server.
+    Only shape and dtype are requested at creation. Indexing (with ints and slices) fetches from the server
+    just the requested hyperslab, so large arrays (e.g. TimeSeries data) can be explored without downloading them.
+    """
+
+    def __init__(self, datatype_api, datatype_gid, dataset_name):
+        self.datatype_api = datatype_api
+        self.datatype_gid = datatype_gid
+        self.dataset_name = dataset_name
+        info = datatype_api.get_dataset_info(datatype_gid, dataset_name)
+        self.shape = tuple(info['shape'])
+        self.dtype = numpy.dtype(info['dtype'])
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return int(numpy.prod(self.shape, dtype=numpy.int64))
+
+    @property
+    def nbytes(self):
+        return self.size * self.dtype.itemsize
+
+    def __len__(self):
+        if not self.shape:
+            raise TypeError("len() of unsized object")
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        selection = hyperslab.normalize_selection(key, self.shape)
+        return self.datatype_api.retrieve_dataset_slice(self.datatype_gid, self.dataset_name,
+                                                        hyperslab.selection_to_spec(selection))
+
+    def __array__(self, dtype=None):
+        data = self[...]
+        if dtype is not None:
+            return data.astype(dtype)
+        return data
+
+    def __repr__(self):
+        return '<RemoteDataSet("{}", gid="{}", shape={}, dtype={})>'.format(self.dataset_name, self.datatype_gid,
+                                                                          self.shape, self.dtype)
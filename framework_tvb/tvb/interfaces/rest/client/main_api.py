@@ -30,9 +30,13 @@
 from datetime import datetime, timedelta
 
 import requests
+from requests.adapters import HTTPAdapter
 from tvb.interfaces.rest.client.client_decorators import handle_response
 from tvb.interfaces.rest.commons.strings import Strings, RestLink, FormKeyInput
 
+# Maximum number of connections kept alive towards the REST server, per API instance
+CONNECTION_POOL_SIZE = 8
+
 
 class MainApi:
     """
@@ -50,6 +54,7 @@ class MainApi:
         self.authorization_token = auth_token
         self.token_expiry_date = None
         self.refresh_token = None
+        self._session = None
 
     def build_request_url(self, url):
         return self.server_url + url
@@ -68,14 +73,20 @@ class MainApi:
 
     def _build_request(self):
         """
-        Build a secured request protected by the authorization token set before, used in the entire session
+        Build a secured request protected by the authorization token set before, used in the entire session.
+        The same session is reused between calls (and threads), so that connections to the server are pooled.
         :return: secured requests session
         """
 
         authorization_header = {Strings.AUTH_HEADER.value: Strings.BEARER.value + self.authorization_token}
-        with requests.Session() as request_session:
-            request_session.headers.update(authorization_header)
-            return request_session
+        if self._session is None:
+            request_session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=CONNECTION_POOL_SIZE, pool_maxsize=CONNECTION_POOL_SIZE)
+            request_session.mount('http://', adapter)
+            request_session.mount('https://', adapter)
+            self._session = request_session
+        self._session.headers.update(authorization_header)
+        return self._session
 
     @handle_response
     def _refresh_token(self):
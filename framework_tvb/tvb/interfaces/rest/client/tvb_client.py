@@ -47,7 +47,8 @@ class TVBClient:
     TVB-BrainX3 client class which expose the whole API.
     Initializing this class with the correct rest server url is mandatory.
     The methods for loading datatypes are not intended to be used for datatypes with expandable fields (eg. TimeSeries).
-    Those should be loaded in chunks, because they might be to large to be loaded in memory at once.
+    Those should be loaded in chunks, because they might be to large to be loaded in memory at once
+    (see get_remote_dataset and retrieve_dataset_slice).
     """
 
     def __init__(self, server_url, auth_token='', login_callback_port=8888):
@@ -171,6 +172,20 @@ class TVBClient:
 
         return self.datatype_api.retrieve_datatype(datatype_gid, download_folder)
 
+    def get_remote_dataset(self, datatype_gid, dataset_name):
+        """
+        Given a guid and the name of a dataset (e.g. "data" for a TimeSeries, "weights" for a Connectivity), return
+        a lazy array proxy. Indexing it (with ints and slices) downloads only the selected hyperslab from the server.
+        """
+        return self.datatype_api.get_remote_dataset(datatype_gid, dataset_name)
+
+    def retrieve_dataset_slice(self, datatype_gid, dataset_name, slice_spec=None):
+        """
+        Given a guid, a dataset name and a slice specification (e.g. "0:1000:2,0,:,0"), download only that part of
+        the dataset, as a numpy array.
+        """
+        return self.datatype_api.retrieve_dataset_slice(datatype_gid, dataset_name, slice_spec)
+
     def load_datatype_from_file(self, datatype_path):
         """
         Given a local H5 file location, where previously a valid H5 file has been downloaded from TVB server, load in
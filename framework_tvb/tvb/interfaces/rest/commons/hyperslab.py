@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Helpers shared by the REST server and client for describing a hyperslab (a strided, rectangular selection)
+of an H5 dataset and for encoding it as a NPY byte stream.
+
+A hyperslab is transported in the URL as a comma separated list, one entry per dimension:
+an integer index (e.g. ``3``) or a ``start:stop:step`` slice (e.g. ``0:1000:2``).
+"""
+
+import io
+
+import numpy
+from numpy.lib import format as npy_format
+
+SLICE_SEPARATOR = ","
+SLICE_BOUNDS_SEPARATOR = ":"
+
+FORMAT_NPY = "npy"
+FORMAT_RAW = "raw"
+SUPPORTED_FORMATS = [FORMAT_NPY, FORMAT_RAW]
+
+HEADER_DTYPE = "X-TVB-Dtype"
+HEADER_SHAPE = "X-TVB-Shape"
+
+
+class HyperslabException(ValueError):
+    """
+    Raised when a selection can not be mapped on a dataset as a hyperslab.
+    """
+
+
+def normalize_selection(key, shape):
+    """
+    Resolve a numpy-like indexing key against a dataset shape.
+    Negative and missing bounds are resolved, and the selection is padded with full slices.
+
+    :param key: an int, a slice, an Ellipsis or a tuple of those
+    :param shape: the shape of the dataset to select from
+    :returns: a tuple with one int or slice (with explicit start, stop and step) per dimension
+    """
+    if not isinstance(key, tuple):
+        key = (key,)
+
+    if sum(1 for item in key if item is Ellipsis) > 1:
+        raise HyperslabException("Only one Ellipsis is allowed in a selection")
+    if Ellipsis in key:
+        position = key.index(Ellipsis)
+        missing = len(shape) - len(key) + 1
+        key = key[:position] + (slice(None),) * missing + key[position + 1:]
+    if len(key) > len(shape):
+        raise HyperslabException("Too many indices (%d) for a dataset with shape %s" % (len(key), str(shape)))
+    key = key + (slice(None),) * (len(shape) - len(key))
+
+    selection = []
+    for item, dim_size in zip(key, shape):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(dim_size)
+            if step < 1:
+                raise HyperslabException("Only positive steps are supported, got %d" % step)
+            selection.append(slice(start, max(start, stop), step))
+        elif isinstance(item, (int, numpy.integer)):
+            index = int(item)
+            if index < 0:
+                index += dim_size
+            if not 0 <= index < dim_size:
+                raise HyperslabException("Index %d is out of bounds for size %d" % (int(item), dim_size))
+            selection.append(index)
+        else:
+            raise HyperslabException("Unsupported index %r. Only ints and slices can be requested remotely" % item)
+    return tuple(selection)
+
+
+def selection_shape(selection):
+    """
+    :param selection: a normalized selection, as returned by `normalize_selection`
+    :returns: the shape of the array obtained when reading the selection
+    """
+    return tuple(len(range(item.start, item.stop, item.step)) for item in selection if isinstance(item, slice))
+
+
+def selection_to_spec(selection):
+    """
+    Encode a normalized selection as a string, to be passed as an URL parameter.
+    """
+    items = []
+    for item in selection:
+        if isinstance(item, slice):
+            items.append(SLICE_BOUNDS_SEPARATOR.join(str(bound) for bound in (item.start, item.stop, item.step)))
+        else:
+            items.append(str(item))
+    return SLICE_SEPARATOR.join(items)
+
+
+def spec_to_key(spec):
+    """
+    Decode a string produced by `selection_to_spec` into an indexing key.
+    Missing bounds are allowed (e.g. ``::10``), they are resolved by `normalize_selection`.
+    """
+    if spec is None or not spec.strip():
+        return ()
+
+    key = []
+    for item in spec.split(SLICE_SEPARATOR):
+        item = item.strip()
+        try:
+            if SLICE_BOUNDS_SEPARATOR in item:
+                bounds = item.split(SLICE_BOUNDS_SEPARATOR)
+                if len(bounds) > 3:
+                    raise HyperslabException("Invalid slice %s" % item)
+                bounds = [int(bound) if bound.strip() else None for bound in bounds]
+                key.append(slice(*bounds))
+            else:
+                key.append(int(item))
+        except ValueError:
+            raise HyperslabException("Invalid selection item '%s'" % item)
+    return tuple(key)
+
+
+def block_selection(selection, first_row, last_row):
+    """
+    Restrict a normalized selection to the rows [first_row, last_row) of the first dimension of its result.
+    Integer indices preceding the first slice do not appear in the result, so they are kept as they are.
+    """
+    block = list(selection)
+    for idx, item in enumerate(block):
+        if isinstance(item, slice):
+            start = item.start + first_row * item.step
+            stop = min(item.start + last_row * item.step, item.stop)
+            block[idx] = slice(start, stop, item.step)
+            break
+    return tuple(block)
+
+
+def build_npy_header(dtype, shape):
+    """
+    :returns: the bytes of a NPY (version 1.0) header, for a C ordered array with the given dtype and shape
+    """
+    header = io.BytesIO()
+    npy_format.write_array_header_1_0(header, {'descr': npy_format.dtype_to_descr(numpy.dtype(dtype)),
+                                               'fortran_order': False,
+                                               'shape': tuple(shape)})
+    return header.getvalue()
+
+
+def read_npy_header(stream):
+    """
+    Parse a NPY header from a file-like object, leaving it positioned at the start of the array data.
+
+    :returns: a tuple (dtype, shape)
+    """
+    version = npy_format.read_magic(stream)
+    if version == (1, 0):
+        shape, fortran_order, dtype = npy_format.read_array_header_1_0(stream)
+    else:
+        shape, fortran_order, dtype = npy_format.read_array_header_2_0(stream)
+    if fortran_order:
+        raise HyperslabException("Fortran ordered streams are not supported")
+    return dtype, shape
+
+
+def format_shape(shape):
+    return SLICE_SEPARATOR.join(str(dim) for dim in shape)
+
+
+def parse_shape(shape_str):
+    if not shape_str:
+        return ()
+    return tuple(int(dim) for dim in shape_str.split(SLICE_SEPARATOR))
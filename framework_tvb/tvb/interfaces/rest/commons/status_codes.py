@@ -60,6 +60,7 @@ HTTP_STATUS_PRECOND_FAILED = 412
 HTTP_STATUS_REQUEST_TOO_LARGE = 413
 HTTP_STATUS_URI_TOO_LONG = 414
 HTTP_STATUS_UNSUPPORTED_MEDIA = 415
+HTTP_STATUS_RANGE_NOT_SATISFIABLE = 416
 HTTP_STATUS_RETRY_WITH = 449
 HTTP_STATUS_SERVER_ERROR = 500
 HTTP_STATUS_NOT_SUPPORTED = 501
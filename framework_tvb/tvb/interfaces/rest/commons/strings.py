@@ -38,6 +38,8 @@ class Strings(Enum):
     AUTH_HEADER = "Authorization"
     AUTH_URL = "auth_url"
     ACCOUNT_URL = "account_url"
+    SLICE = "slice"
+    FORMAT = "format"
 
 
 class RequestFileKey(Enum):
@@ -70,6 +72,7 @@ class LinkPlaceholder(Enum):
     OPERATION_GID = "operation_gid"
     ALG_MODULE = "algorithm_module"
     ALG_CLASSNAME = "algorithm_classname"
+    DATASET_NAME = "dataset_name"
 
 
 class RestLink(Enum):
@@ -87,6 +90,8 @@ class RestLink(Enum):
     GET_DATATYPE = "/{" + LinkPlaceholder.DATATYPE_GID.value + "}"
     DATATYPE_OPERATIONS = "/{" + LinkPlaceholder.DATATYPE_GID.value + "}/operations"
     DATATYPE_EXTRA_INFO = "/{" + LinkPlaceholder.DATATYPE_GID.value + "}/extra_info"
+    DATATYPE_DATASET = "/{" + LinkPlaceholder.DATATYPE_GID.value + "}/datasets/{" + LinkPlaceholder.DATASET_NAME.value + "}"
+    DATATYPE_DATASET_INFO = "/{" + LinkPlaceholder.DATATYPE_GID.value + "}/datasets/{" + LinkPlaceholder.DATASET_NAME.value + "}/info"
 
     # OPERATIONS
     LAUNCH_OPERATION = "/{" + LinkPlaceholder.PROJECT_GID.value + "}/algorithm/{" + LinkPlaceholder.ALG_MODULE.value + "}/{" + LinkPlaceholder.ALG_CLASSNAME.value + "}"
@@ -112,7 +117,8 @@ class RestLink(Enum):
 _namespace_url_dict = {
     RestNamespace.USERS: [RestLink.LOGIN, RestLink.PROJECTS, RestLink.USEFUL_URLS],
     RestNamespace.PROJECTS: [RestLink.DATA_IN_PROJECT, RestLink.OPERATIONS_IN_PROJECT, RestLink.PROJECT_MEMBERS],
-    RestNamespace.DATATYPES: [RestLink.GET_DATATYPE, RestLink.DATATYPE_OPERATIONS, RestLink.DATATYPE_EXTRA_INFO],
+    RestNamespace.DATATYPES: [RestLink.GET_DATATYPE, RestLink.DATATYPE_OPERATIONS, RestLink.DATATYPE_EXTRA_INFO,
+                              RestLink.DATATYPE_DATASET, RestLink.DATATYPE_DATASET_INFO],
     RestNamespace.OPERATIONS: [RestLink.LAUNCH_OPERATION, RestLink.OPERATION_STATUS, RestLink.OPERATION_RESULTS],
     RestNamespace.SIMULATION: [RestLink.FIRE_SIMULATION]
 }
@@ -28,11 +28,76 @@
 #
 #
 
+import numpy
+
 from tvb.core.entities.load import load_entity_by_gid
 from tvb.core.entities.storage import dao
 from tvb.core.neocom.h5 import h5_file_for_index
 from tvb.core.services.algorithm_service import AlgorithmService
+from tvb.interfaces.rest.commons import hyperslab
 from tvb.interfaces.rest.commons.dtos import AlgorithmDto, DataTypeDto
+from tvb.interfaces.rest.commons.exceptions import BadRequestException, InvalidIdentifierException
+from tvb.storage.h5.file.exceptions import MissingDataSetException
+from tvb.storage.storage_interface import StorageInterface
+
+# Approximate number of bytes read from H5 at once, while streaming a hyperslab
+STREAM_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+class DatasetSliceStream(object):
+    """
+    Serializes a hyperslab of a H5 dataset as bytes (optionally prefixed by a NPY header).
+    Data is read from H5 in blocks of rows along the first selected dimension, and only the blocks
+    overlapping the requested byte range are read, so that interrupted transfers can be resumed cheaply.
+    """
+
+    def __init__(self, h5_path, dataset_name, selection, dtype, data_format=hyperslab.FORMAT_NPY):
+        self.storage_manager = StorageInterface.get_storage_manager(h5_path)
+        self.dataset_name = dataset_name
+        self.selection = selection
+        self.dtype = numpy.dtype(dtype).newbyteorder('<')
+        self.shape = hyperslab.selection_shape(selection)
+        if data_format == hyperslab.FORMAT_NPY:
+            self.header = hyperslab.build_npy_header(self.dtype, self.shape)
+        else:
+            self.header = b''
+        self.data_size = int(numpy.prod(self.shape, dtype=numpy.int64)) * self.dtype.itemsize
+        self.size = len(self.header) + self.data_size
+
+        self.nr_rows = self.shape[0] if len(self.shape) > 0 else 1
+        self.row_size = self.data_size // self.nr_rows if self.nr_rows > 0 else 0
+        self.rows_per_block = max(1, STREAM_BLOCK_SIZE // max(1, self.row_size))
+
+    def _read_rows(self, first_row, last_row):
+        if len(self.shape) == 0:
+            data = self.storage_manager.get_data(self.dataset_name, data_slice=self.selection)
+        else:
+            data = self.storage_manager.get_data(self.dataset_name,
+                                                 data_slice=hyperslab.block_selection(self.selection,
+                                                                                      first_row, last_row))
+        return numpy.ascontiguousarray(data, dtype=self.dtype).tobytes()
+
+    def iter_bytes(self, start=0, stop=None):
+        """
+        Generate the bytes in the interval [start, stop) of the serialized hyperslab.
+        """
+        if stop is None or stop > self.size:
+            stop = self.size
+
+        if start < len(self.header):
+            yield self.header[start:stop]
+        data_start = max(start - len(self.header), 0)
+        data_stop = stop - len(self.header)
+        if data_stop <= data_start or self.row_size == 0:
+            return
+
+        first_row = data_start // self.row_size
+        while first_row * self.row_size < data_stop:
+            last_row = min(first_row + self.rows_per_block, self.nr_rows)
+            block = self._read_rows(first_row, last_row)
+            block_offset = first_row * self.row_size
+            yield block[max(data_start - block_offset, 0):data_stop - block_offset]
+            first_row = last_row
 
 
 class DatatypeFacade:
@@ -44,6 +109,38 @@ class DatatypeFacade:
         index = load_entity_by_gid(datatype_gid)
         return h5_file_for_index(index).path
 
+    @staticmethod
+    def _get_dataset_shape_and_dtype(h5_path, dataset_name):
+        storage_manager = StorageInterface.get_storage_manager(h5_path)
+        try:
+            shape = storage_manager.get_data_shape(dataset_name)
+            dtype = storage_manager.get_data_dtype(dataset_name)
+        except MissingDataSetException:
+            raise InvalidIdentifierException("No dataset %s found for the given datatype" % dataset_name)
+        if dtype.kind not in 'biufc':
+            raise BadRequestException("Dataset %s does not hold numeric data and can not be sliced" % dataset_name)
+        return shape, dtype
+
+    @staticmethod
+    def get_dataset_info(datatype_gid, dataset_name):
+        shape, dtype = DatatypeFacade._get_dataset_shape_and_dtype(DatatypeFacade.get_dt_h5_path(datatype_gid),
+                                                                   dataset_name)
+        return {'shape': list(shape), 'dtype': dtype.str}
+
+    @staticmethod
+    def get_dataset_slice_stream(datatype_gid, dataset_name, slice_spec, data_format=hyperslab.FORMAT_NPY):
+        # type: (str, str, str, str) -> DatasetSliceStream
+        if data_format not in hyperslab.SUPPORTED_FORMATS:
+            raise BadRequestException("Unsupported format %s. Use one of %s" % (data_format,
+                                                                               hyperslab.SUPPORTED_FORMATS))
+        h5_path = DatatypeFacade.get_dt_h5_path(datatype_gid)
+        shape, dtype = DatatypeFacade._get_dataset_shape_and_dtype(h5_path, dataset_name)
+        try:
+            selection = hyperslab.normalize_selection(hyperslab.spec_to_key(slice_spec), shape)
+        except hyperslab.HyperslabException as excep:
+            raise BadRequestException(str(excep))
+        return DatasetSliceStream(h5_path, dataset_name, selection, dtype, data_format)
+
     def get_datatype_operations(self, datatype_gid):
         categories = dao.get_launchable_categories(elimin_viewers=True)
         datatype = dao.get_datatype_by_gid(datatype_gid)
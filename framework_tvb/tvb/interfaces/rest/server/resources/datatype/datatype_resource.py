@@ -30,6 +30,10 @@
 import os
 
 import flask
+from tvb.interfaces.rest.commons import hyperslab
+from tvb.interfaces.rest.commons.status_codes import HTTP_STATUS_OK, HTTP_STATUS_PARTIAL_CONTENT, \
+    HTTP_STATUS_RANGE_NOT_SATISFIABLE
+from tvb.interfaces.rest.commons.strings import Strings
 from tvb.interfaces.rest.server.access_permissions.permissions import DataTypeAccessPermission
 from tvb.interfaces.rest.server.decorators.rest_decorators import check_permission
 from tvb.interfaces.rest.server.facades.datatype_facade import DatatypeFacade
@@ -41,11 +45,55 @@ class RetrieveDatatypeResource(SecuredResource):
     @check_permission(DataTypeAccessPermission, 'datatype_gid')
     def get(self, datatype_gid):
         """
-        :given a guid, this function will download the H5 full data
+        :given a guid, this function will download the H5 full data.
+        Conditional requests (If-Modified-Since) are answered with 304 when the file did not change,
+        so that clients can reuse their cached copies.
         """
         h5_file_path = DatatypeFacade.get_dt_h5_path(datatype_gid)
         file_name = os.path.basename(h5_file_path)
-        return flask.send_file(h5_file_path, as_attachment=True, attachment_filename=file_name)
+        return flask.send_file(h5_file_path, as_attachment=True, attachment_filename=file_name, conditional=True)
+
+
+class RetrieveDatatypeDatasetResource(SecuredResource):
+
+    @check_permission(DataTypeAccessPermission, 'datatype_gid')
+    def get(self, datatype_gid, dataset_name):
+        """
+        :given a guid, a dataset name and a slice specification (request arguments), this function will stream only
+        the requested hyperslab of the dataset, as NPY (default) or raw bytes. Byte ranges are supported,
+        so that an interrupted download can be resumed.
+        """
+        slice_spec = flask.request.args.get(Strings.SLICE.value)
+        data_format = flask.request.args.get(Strings.FORMAT.value, hyperslab.FORMAT_NPY)
+        stream = DatatypeFacade.get_dataset_slice_stream(datatype_gid, dataset_name, slice_spec, data_format)
+
+        headers = {'Accept-Ranges': 'bytes',
+                   hyperslab.HEADER_DTYPE: stream.dtype.str,
+                   hyperslab.HEADER_SHAPE: hyperslab.format_shape(stream.shape)}
+        start, stop, status = 0, stream.size, HTTP_STATUS_OK
+        if flask.request.range is not None:
+            byte_range = flask.request.range.range_for_length(stream.size)
+            if byte_range is None:
+                headers['Content-Range'] = 'bytes */%d' % stream.size
+                return flask.Response(status=HTTP_STATUS_RANGE_NOT_SATISFIABLE, headers=headers)
+            start, stop = byte_range
+            status = HTTP_STATUS_PARTIAL_CONTENT
+            headers['Content-Range'] = 'bytes %d-%d/%d' % (start, stop - 1, stream.size)
+
+        headers['Content-Length'] = str(stop - start)
+        return flask.Response(stream.iter_bytes(start, stop), status=status, headers=headers,
+                              mimetype='application/octet-stream', direct_passthrough=True)
+
+
+class GetDatasetInfoForDatatypeResource(RestResource):
+
+    @check_permission(DataTypeAccessPermission, 'datatype_gid')
+    def get(self, datatype_gid, dataset_name):
+        """
+        :return the shape and data type of a dataset of the DataType, needed before requesting slices of it.
+        """
+        return DatatypeFacade.get_dataset_info(datatype_gid, dataset_name)
+
 
 class GetExtraInfoForDatatypeResource(RestResource):
 
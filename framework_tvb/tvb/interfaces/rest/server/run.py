@@ -41,7 +41,8 @@ from tvb.core.services.exceptions import InvalidSettingsException
 from tvb.interfaces.rest.commons.strings import RestNamespace, RestLink, LinkPlaceholder, Strings
 from tvb.interfaces.rest.server.decorators.encoders import CustomFlaskEncoder
 from tvb.interfaces.rest.server.resources.datatype.datatype_resource import RetrieveDatatypeResource, \
-    GetOperationsForDatatypeResource, GetExtraInfoForDatatypeResource
+    GetOperationsForDatatypeResource, GetExtraInfoForDatatypeResource, RetrieveDatatypeDatasetResource, \
+    GetDatasetInfoForDatatypeResource
 from tvb.interfaces.rest.server.resources.operation.operation_resource import GetOperationStatusResource, \
     GetOperationResultsResource, LaunchOperationResource
 from tvb.interfaces.rest.server.resources.project.project_resource import GetOperationsInProjectResource, \
@@ -112,6 +113,12 @@ def initialize_flask():
         values={LinkPlaceholder.DATATYPE_GID.value: '<string:datatype_gid>'}))
     name_space_datatypes.add_resource(GetExtraInfoForDatatypeResource, RestLink.DATATYPE_EXTRA_INFO.compute_url(
         values={LinkPlaceholder.DATATYPE_GID.value: '<string:datatype_gid>'}))
+    name_space_datatypes.add_resource(RetrieveDatatypeDatasetResource, RestLink.DATATYPE_DATASET.compute_url(
+        values={LinkPlaceholder.DATATYPE_GID.value: '<string:datatype_gid>',
+                LinkPlaceholder.DATASET_NAME.value: '<string:dataset_name>'}))
+    name_space_datatypes.add_resource(GetDatasetInfoForDatatypeResource, RestLink.DATATYPE_DATASET_INFO.compute_url(
+        values={LinkPlaceholder.DATATYPE_GID.value: '<string:datatype_gid>',
+                LinkPlaceholder.DATASET_NAME.value: '<string:dataset_name>'}))
 
     # Operations namespace
     name_space_operations = api.namespace(build_path(RestNamespace.OPERATIONS),
@@ -32,7 +32,7 @@
 .. moduleauthor:: Bogdan Valean <bogdan.valean@codemart.ro>
 '''
 import cherrypy
-from tvb.core.services.backend_clients.standalone_client import StandAloneClient, LOCKS_QUEUE
+from tvb.core.services.backend_clients.standalone_client import StandAloneClient
 from tvb.interfaces.web.controllers.base_controller import BaseController
 from tvb.interfaces.web.controllers.decorators import check_kube_user
 
@@ -48,8 +48,5 @@ class KubeController(BaseController):
     @check_kube_user
     def start_operation_pod(self, operation_id):
         self.logger.info("Received a request to start operation {}".format(operation_id))
-        if LOCKS_QUEUE.qsize() == 0:
-            self.logger.info("Cannot start operation {} because queue is full.".format(operation_id))
-            return
-        LOCKS_QUEUE.get()
-        StandAloneClient.start_operation(operation_id)
+        if not StandAloneClient.start_if_admitted(operation_id, keep_queued=False):
+            self.logger.info("Cannot start operation {} because there are not enough resources.".format(operation_id))
@@ -589,11 +589,12 @@ class ProjectController(BaseController):
     @handle_error(redirect=False)
     @check_user
     def readjsonstructure(self, project_id, visibility_filter=StaticFiltersFactory.FULL_VIEW,
-                          first_level=None, second_level=None, filter_value=None):
+                          first_level=None, second_level=None, filter_value=None, node_id=None):
         """
         AJAX exposed method. 
         Will return the complete JSON for Project's structure, or filtered tree
         (filter only Relevant entities or Burst only Data).
+        For large projects, node_id is given when expanding a closed node, and only its children are returned.
         """
         if first_level is None or second_level is None:
             first_level, second_level = self.get_project_structure_grouping()
@@ -605,7 +606,8 @@ class ProjectController(BaseController):
             project_id = common.get_current_project().id
         project = self.project_service.find_project(project_id)
         json_structure = self.project_service.get_project_structure(project, selected_filter,
-                                                                    first_level, second_level, filter_value)
+                                                                    first_level, second_level, filter_value,
+                                                                    node_id)
         # This JSON encoding is necessary, otherwise we will get an error
         # from JSTree library while trying to load with AJAX 
         # the content of the tree.     
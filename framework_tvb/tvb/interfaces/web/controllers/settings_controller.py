@@ -40,6 +40,7 @@ import formencode
 from time import sleep
 from formencode import validators
 from tvb.basic.profile import TvbProfile
+from tvb.core.services.backend_clients.standalone_client import SCHEDULER
 from tvb.core.services.exceptions import InvalidSettingsException
 from tvb.core.services.settings_service import SettingsService
 from tvb.core.utils import check_matlab_version
@@ -160,6 +161,16 @@ class SettingsController(UserController):
         else:
             return {'status': 'not ok', 'message': 'Invalid Matlab/Octave path.'}
 
+    @cherrypy.expose
+    @handle_error(redirect=False)
+    @check_admin
+    @jsonify
+    def queue_metrics(self):
+        """
+        Describe the queue of the operations waiting for resources on this machine.
+        """
+        return SCHEDULER.metrics()
+
 
 class DiskSpaceValidator(formencode.FancyValidator):
     """
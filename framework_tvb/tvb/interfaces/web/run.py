@@ -55,6 +55,7 @@ from tvb.basic.profile import TvbProfile
 from tvb.config.init.initializer import initialize, reset
 from tvb.core.adapters.abcdisplayer import ABCDisplayer
 from tvb.core.decorators import user_environment_execution
+from tvb.core.entities.storage import dao
 from tvb.core.services.exceptions import InvalidSettingsException
 from tvb.core.services.hpc_operation_service import HPCOperationService
 from tvb.interfaces.web.controllers.base_controller import BaseController
@@ -177,6 +178,11 @@ def init_cherrypy(arguments=None):
             bus=cherrypy.engine)
         operations_job.start()
 
+    # Keep the disk usage counters in sync with the DataTypes, even when rows are changed outside of the ORM
+    disk_usage_job = cherrypy.process.plugins.BackgroundTask(
+        TvbProfile.current.DISK_USAGE_RECONCILE_INTERVAL, dao.reconcile_disk_usage, bus=cherrypy.engine)
+    disk_usage_job.start()
+
     # HTTP Server is fired now ######
     cherrypy.engine.start()
 
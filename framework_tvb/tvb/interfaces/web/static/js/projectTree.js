@@ -78,6 +78,10 @@ function updateTree(treeSelector, projectId, visibilityFilter) {
         },
         "json_data": {
             "ajax": { url: url,
+                // Large projects send their second level nodes closed, their children are read when expanded
+                data: function (node) {
+                    return node === -1 ? {} : {node_id: node.attr("id")};
+                },
                 success: function (d) {
                     return eval(d);
                 }
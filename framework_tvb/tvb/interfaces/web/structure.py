@@ -82,6 +82,7 @@ class WebStructure(object):
     SUB_SECTION_ANALYZE_16 = "bctdensity"
     SUB_SECTION_ANALYZE_17 = "bctdistance"
     SUB_SECTION_ANALYZE_18 = "fcd_calculator"
+    SUB_SECTION_ANALYZE_19 = "entropy"
 
     ### Subsections for STIMULUS section.
     SUB_SECTION_STIMULUS_MENU = "stimulus"
@@ -174,6 +175,7 @@ class WebStructure(object):
         SUB_SECTION_ANALYZE_16: "BCT Density",
         SUB_SECTION_ANALYZE_17: "BCT Distance",
         SUB_SECTION_ANALYZE_18: "Functional Connectivity Dynamics",
+        SUB_SECTION_ANALYZE_19: "Multiscale Entropy",
 
         SUB_SECTION_STIMULUS_MENU: "",
         SUB_SECTION_STIMULUS_SURFACE: "Region",
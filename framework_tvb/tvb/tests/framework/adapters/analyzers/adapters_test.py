@@ -29,16 +29,19 @@
 #
 
 import os
+import numpy
 from tvb.adapters.analyzers.cross_correlation_adapter import CrossCorrelateAdapter, PearsonCorrelationCoefficientAdapter
 from tvb.adapters.analyzers.fcd_adapter import FunctionalConnectivityDynamicsAdapter
 from tvb.adapters.analyzers.fmri_balloon_adapter import BalloonModelAdapter
 from tvb.adapters.analyzers.ica_adapter import ICAAdapter
 from tvb.adapters.analyzers.metrics_group_timeseries import TimeseriesMetricsAdapter
+from tvb.adapters.analyzers.multiscale_entropy_adapter import MultiscaleEntropyAdapter
 from tvb.adapters.analyzers.node_coherence_adapter import NodeCoherenceAdapter
 from tvb.adapters.analyzers.node_complex_coherence_adapter import NodeComplexCoherenceAdapter
 from tvb.adapters.analyzers.node_covariance_adapter import NodeCovarianceAdapter
 from tvb.adapters.analyzers.pca_adapter import PCAAdapter
 from tvb.adapters.analyzers.wavelet_adapter import ContinuousWaveletTransformAdapter
+from tvb.adapters.datatypes.h5.entropy_h5 import MultiscaleEntropyH5
 from tvb.adapters.datatypes.h5.fcd_h5 import FcdH5
 from tvb.adapters.datatypes.h5.graph_h5 import CovarianceH5, CorrelationCoefficientsH5
 from tvb.adapters.datatypes.h5.mode_decompositions_h5 import PrincipalComponentsH5, IndependentComponentsH5
@@ -69,6 +72,8 @@ class TestAdapters(TransactionalTestCase):
 
         result_h5 = h5.path_for(storage_folder, WaveletCoefficientsH5, wavelet_idx.gid)
         assert os.path.exists(result_h5)
+        with WaveletCoefficientsH5(result_h5) as wavelet_h5:
+            assert wavelet_h5.array_data.shape[2:] == (1, 3, 1)
 
     def test_pca_adapter(self, tmpdir, time_series_index_factory):
         storage_folder = str(tmpdir)
@@ -263,3 +268,28 @@ class TestAdapters(TransactionalTestCase):
 
         result_h5 = h5.path_for(storage_folder, CovarianceH5, covariance_idx.gid)
         assert os.path.exists(result_h5)
+
+    def test_multiscale_entropy_adapter(self, tmpdir, time_series_index_factory):
+        storage_folder = str(tmpdir)
+        ts_index = time_series_index_factory()
+
+        entropy_adapter = MultiscaleEntropyAdapter()
+        entropy_adapter.storage_path = storage_folder
+        view_model = entropy_adapter.get_view_model_class()()
+        view_model.time_series = ts_index.gid
+        view_model.scales = numpy.array([1, 2])
+        entropy_adapter.configure(view_model)
+
+        disk = entropy_adapter.get_required_disk_size(view_model)
+        mem = entropy_adapter.get_required_memory_size(view_model)
+
+        entropy_idx = entropy_adapter.launch(view_model)
+
+        result_h5 = h5.path_for(storage_folder, MultiscaleEntropyH5, entropy_idx.gid)
+        assert os.path.exists(result_h5)
+        with MultiscaleEntropyH5(result_h5) as entropy_h5:
+            assert entropy_h5.array_data.shape == (2,) + entropy_adapter.input_shape[1:]
+            assert list(entropy_h5.scales.load()) == [1, 2]
+            result_bytes = entropy_h5.array_data.load().nbytes
+        assert disk == entropy_adapter.array_size2kb(result_bytes)
+        assert mem > result_bytes
@@ -32,7 +32,6 @@
 .. moduleauthor:: Lia Domide <lia.domide@codemart.ro>
 """
 
-import pytest
 import os
 import tvb_data
 
@@ -40,7 +39,6 @@ from tvb.adapters.analyzers.bct_adapters import BaseBCTModel
 from tvb.core.entities.model.model_operation import Algorithm
 from tvb.tests.framework.core.base_testcase import TransactionalTestCase
 from tvb.core.adapters.abcadapter import ABCAdapter
-from tvb.core.utils import no_matlab
 from tvb.core.entities.storage import dao
 from tvb.tests.framework.core.factory import TestFactory
 
@@ -51,7 +49,6 @@ class TestBCT(TransactionalTestCase):
     We do not verify that the algorithms are correct, because that is outside the purpose of TVB framework.
     """
 
-    @pytest.mark.skipif(no_matlab(), reason="Matlab or Octave not installed!")
     def transactional_setup_method(self):
         """
         Sets up the environment for running the tests;
@@ -78,7 +75,6 @@ class TestBCT(TransactionalTestCase):
         """
         self.clean_database(True)
 
-    @pytest.mark.skipif(no_matlab(), reason="Matlab or Octave not installed!")
     def test_bct_all(self):
         """
         Iterate all BCT algorithms and execute them.
@@ -93,10 +89,9 @@ class TestBCT(TransactionalTestCase):
                                                         view_model)
             assert len(results) > 0
 
-    @pytest.mark.skipif(no_matlab(), reason="Matlab or Octave not installed!")
     def test_bct_descriptions(self):
         """
-        Iterate all BCT algorithms and check that description has been extracted from *.m files.
+        Iterate all BCT algorithms and check that each has a description.
         """
         for adapter_instance in self.bct_adapters:
             assert len(adapter_instance.stored_adapter.description) > 10, "Description was not loaded properly for " \
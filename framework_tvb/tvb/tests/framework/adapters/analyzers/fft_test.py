@@ -28,8 +28,12 @@
 #
 #
 import numpy
+from tvb.adapters.analyzers import fourier_adapter
+from tvb.adapters.analyzers.block_executor import BlockExecutor
 from tvb.adapters.analyzers.fourier_adapter import FourierAdapter
+from tvb.adapters.datatypes.h5.spectral_h5 import FourierSpectrumH5
 from tvb.analyzers.fft import compute_fast_fourier_transform
+from tvb.core.neocom import h5
 from tvb.tests.framework.core.base_testcase import TransactionalTestCase
 
 
@@ -78,3 +82,50 @@ class TestFFT(TransactionalTestCase):
         assert spectra_idx.fk_source_gid == ts_db.gid
         assert spectra_idx.gid is not None
         assert spectra_idx.segment_length == 1.0  # only 1 sec of signal
+
+    def test_fourier_adapter_in_node_blocks(self, tmpdir, time_series_factory, time_series_index_factory):
+        ts_db = time_series_index_factory()
+
+        adapter = FourierAdapter()
+        adapter.storage_path = str(tmpdir)
+        view_model = adapter.get_view_model_class()()
+        view_model.time_series = ts_db.gid
+        view_model.segment_length = 400
+        adapter.configure(view_model)
+        # As if the memory allowed only one node at a time
+        adapter.memory_factor = ts_db.data_length_3d
+        spectra_idx = adapter.launch(view_model)
+
+        expected = compute_fast_fourier_transform(time_series_factory(), 400, None, True)
+        expected.compute_power()
+        with FourierSpectrumH5(h5.path_for(str(tmpdir), FourierSpectrumH5, spectra_idx.gid)) as spectra_h5:
+            assert numpy.allclose(spectra_h5.array_data.load(), expected.array_data)
+            assert numpy.allclose(spectra_h5.power.load(), expected.power)
+
+    def test_fourier_adapter_uses_declared_cpus(self, tmpdir, time_series_factory, time_series_index_factory,
+                                                monkeypatch):
+        executors = []
+
+        class RecordingExecutor(BlockExecutor):
+            def __init__(self, *args, **kwargs):
+                super(RecordingExecutor, self).__init__(*args, **kwargs)
+                executors.append(self)
+
+        monkeypatch.setattr(fourier_adapter, 'BlockExecutor', RecordingExecutor)
+        monkeypatch.setattr(BlockExecutor, 'usable_cpus', staticmethod(lambda: 2))
+        ts_db = time_series_index_factory()
+
+        adapter = FourierAdapter()
+        adapter.storage_path = str(tmpdir)
+        view_model = adapter.get_view_model_class()()
+        view_model.time_series = ts_db.gid
+        view_model.segment_length = 400
+        adapter.configure(view_model)
+        adapter.memory_factor = ts_db.data_length_3d
+        assert 2 == adapter.get_required_cpus(view_model)
+        spectra_idx = adapter.launch(view_model)
+
+        assert min(2, executors[0].shape[2]) == executors[0].workers
+        expected = compute_fast_fourier_transform(time_series_factory(), 400, None, True)
+        with FourierSpectrumH5(h5.path_for(str(tmpdir), FourierSpectrumH5, spectra_idx.gid)) as spectra_h5:
+            assert numpy.allclose(spectra_h5.array_data.load(), expected.array_data)
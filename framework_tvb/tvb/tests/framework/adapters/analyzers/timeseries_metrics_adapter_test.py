@@ -33,10 +33,12 @@
 """
 
 import os
+import numpy
 import tvb_data
 import json
 from tvb.adapters.datatypes.db.mapped_value import DatatypeMeasureIndex
 from tvb.config import ALGORITHMS
+from tvb.core.neocom import h5
 from tvb.storage.storage_interface import StorageInterface
 from tvb.tests.framework.core.base_testcase import TransactionalTestCase
 from tvb.adapters.analyzers.metrics_group_timeseries import TimeseriesMetricsAdapter, TimeseriesMetricsAdapterModel
@@ -87,3 +89,26 @@ class TestTimeSeriesMetricsAdapter(TransactionalTestCase):
         assert len(metrics) >= len(ALGORITHMS) - 1, "At least one metric expected for every Algorithm, except Kuramoto."
         for metric_value in metrics.values():
             assert isinstance(metric_value, (float, int))
+
+    def test_variance_metrics_from_statistics(self, connectivity_factory, region_mapping_factory,
+                                              time_series_region_index_factory):
+        """
+        Test that the variance metrics read from the stored statistics match the ones computed on the data.
+        """
+        connectivity = connectivity_factory()
+        region_mapping = region_mapping_factory()
+        time_series_index = time_series_region_index_factory(connectivity=connectivity, region_mapping=region_mapping)
+
+        ts_metric_adapter = TimeseriesMetricsAdapter()
+        ts_metric_adapter.storage_path = StorageInterface().get_project_folder(self.test_project.name, "42")
+        view_model = TimeseriesMetricsAdapterModel()
+        view_model.time_series = time_series_index.gid
+        view_model.algorithms = ('GlobalVariance', 'VarianceNodeVariance')
+
+        ts_metric_adapter.configure(view_model)
+        metrics = json.loads(ts_metric_adapter.launch(view_model).metrics)
+
+        params = {'time_series': h5.load_from_index(time_series_index), 'start_point': view_model.start_point,
+                  'segment': view_model.segment}
+        for algorithm_name in view_model.algorithms:
+            numpy.testing.assert_allclose(metrics[algorithm_name], ALGORITHMS[algorithm_name](params))
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and 
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Tests for the precomputed voxel lookups of region volume mappings.
+"""
+
+import numpy
+from tvb.adapters.visualizers.region_voxel_index import RegionVoxelIndex, RegionVoxelIndexCache
+
+
+class TestRegionVoxelIndex(object):
+
+    def setup_method(self):
+        rng = numpy.random.default_rng(42)
+        # Runs of 4 voxels along z, and some voxels outside the brain
+        self.mapping = numpy.repeat(rng.integers(-1, 12, size=(9, 7, 5)), 4, axis=2)
+        self.labels = numpy.array(["region_%d" % i for i in range(12)])
+        self.voxel_index = RegionVoxelIndex(self.mapping, self.labels)
+
+    def test_volume_slice(self):
+        for x, y, z in [(0, 0, 0), (8, 6, 19), (4, 3, 10)]:
+            slice_x, slice_y, slice_z = self.voxel_index.volume_slice(x, y, z)
+            # Same planes as RegionVolumeMappingH5.get_volume_slice
+            numpy.testing.assert_array_equal(slice_x, self.mapping[:, :, z])
+            numpy.testing.assert_array_equal(slice_y, self.mapping[x, :, :][..., ::-1])
+            numpy.testing.assert_array_equal(slice_z, self.mapping[:, y, :][..., ::-1])
+
+            region = self.mapping[x, y, z]
+            assert self.voxel_index.region_at(x, y, z) == region
+            assert self.voxel_index.label_at(x, y, z) == (self.labels[region] if region >= 0 else "background")
+
+    def test_region_voxels(self):
+        assert self.voxel_index.run_starts.size < self.mapping.size / 2
+        flat = self.mapping.ravel()
+        for region in range(self.labels.size):
+            numpy.testing.assert_array_equal(numpy.sort(self.voxel_index.region_voxels(region)),
+                                             numpy.flatnonzero(flat == region))
+        numpy.testing.assert_array_equal(self.voxel_index.region_sizes(),
+                                         numpy.bincount(flat[flat >= 0], minlength=self.labels.size))
+
+    def test_gather_planes(self):
+        regions_ts = numpy.random.random((15, self.labels.size))
+        planes = self.voxel_index.volume_slice(2, 3, 4)
+        gathered = RegionVoxelIndex.gather_planes(regions_ts, planes, -1.5)
+
+        with_background = numpy.hstack((regions_ts, -1.5 * numpy.ones((15, 1))))
+        for plane, plane_ts in zip(planes, gathered):
+            assert plane_ts.shape == (15,) + plane.shape
+            for time_point in range(15):
+                numpy.testing.assert_array_equal(plane_ts[time_point], with_background[time_point][plane])
+
+    def test_cache(self, monkeypatch):
+        built = []
+
+        def build(gid):
+            built.append(gid)
+            return RegionVoxelIndex(self.mapping, self.labels)
+
+        cache = RegionVoxelIndexCache(max_size=2)
+        monkeypatch.setattr(cache, "_build", build)
+        first = cache.get("a")
+        assert cache.get("a") is first
+        cache.get("b")
+        cache.get("c")
+        cache.get("a")
+        assert built == ["a", "b", "c", "a"]
@@ -33,6 +33,7 @@
 """
 
 import pytest
+from tvb.core.adapters.cost_estimator import OperationCostEstimator
 from tvb.core.entities.model.model_operation import Operation, STATUS_STARTED
 from tvb.core.entities.storage import dao
 from tvb.core.adapters.exceptions import NoMemoryAvailableException
@@ -87,3 +88,84 @@ class TestAdapterMemoryUsage(TransactionalTestCase):
         # Launch operation
         with pytest.raises(NoMemoryAvailableException):
             OperationService().initiate_prelaunch(operation, adapter)
+
+    def test_learned_cost_estimation(self, test_adapter_factory):
+        """
+        Test that the costs measured on previous operations replace the ones declared by the adapter.
+        """
+        test_adapter_factory(adapter_class=DummyAdapterHugeMemoryRequired)
+        adapter = TestFactory.create_adapter("tvb.tests.framework.adapters.dummy_adapter3",
+                                             "DummyAdapterHugeMemoryRequired")
+        view_model = DummyAdapterHugeMemoryRequiredForm().get_view_model()()
+        declared = adapter.estimate_cost(view_model)
+        assert 0 == declared.samples
+        assert adapter.get_required_memory_size(view_model) == declared.memory
+
+        algorithm_id = adapter.stored_adapter.id
+        for _ in range(OperationCostEstimator.MIN_SAMPLES):
+            OperationCostEstimator.record(algorithm_id, {}, 3.0, 2 ** 20, 10)
+        learned = adapter.estimate_cost(view_model)
+        assert OperationCostEstimator.MIN_SAMPLES == learned.samples
+        assert 2 ** 20 <= learned.memory < 2 ** 21
+        assert 3 <= learned.runtime < 5
+
+        for size in range(1, 11):
+            OperationCostEstimator.record(algorithm_id, {'size': size}, 2.0 * size, 2 ** 20 * size, 10 * size)
+        estimate = OperationCostEstimator().estimate(algorithm_id, {'size': 20}, None)
+        assert 10 == estimate.samples
+        assert 40 <= estimate.runtime < 80
+        assert 20 * 2 ** 20 <= estimate.memory < 40 * 2 ** 20
+        assert 200 <= estimate.disk_size < 400
+
+    def _prepare_operation(self, adapter):
+        view_model = adapter.get_view_model()()
+        operation = dao.store_entity(Operation(view_model.gid.hex, self.test_user.id, self.test_project.id,
+                                               adapter.stored_adapter.id, status=STATUS_STARTED))
+        h5.store_view_model(view_model, StorageInterface().get_project_folder(self.test_project.name,
+                                                                              str(operation.id)))
+        return operation
+
+    def test_costs_recorded_for_measured_operation(self, test_adapter_factory):
+        """
+        Test that costs are only recorded for the operation which the current process was started for.
+        """
+        test_adapter_factory(adapter_class=DummyAdapterHDDRequired)
+        adapter = TestFactory.create_adapter("tvb.tests.framework.adapters.dummy_adapter3", "DummyAdapterHDDRequired")
+        algorithm_id = adapter.stored_adapter.id
+
+        OperationService().initiate_prelaunch(self._prepare_operation(adapter), adapter)
+        assert [] == dao.get_operation_costs(algorithm_id, 10)
+
+        measured = self._prepare_operation(adapter)
+        OperationCostEstimator.measure_process(measured.id)
+        OperationService().initiate_prelaunch(measured, adapter)
+        OperationService().initiate_prelaunch(self._prepare_operation(adapter), adapter)
+        assert [measured.id] == [cost.fk_from_operation for cost in dao.get_operation_costs(algorithm_id, 10)]
+
+    def test_prelaunch_without_operation(self, test_adapter_factory):
+        """
+        Test that an adapter launched without an Operation, as on HPC, runs without recording costs.
+        """
+
+        class HPCLikeAdapter(DummyAdapterHDDRequired):
+
+            def __init__(self, storage_path):
+                super(HPCLikeAdapter, self).__init__()
+                self.storage_path = storage_path
+
+            def extract_operation_data(self, operation=None):
+                pass
+
+            def _update_operation_entity(self, operation, required_disk_space):
+                pass
+
+            def _capture_operation_results(self, result):
+                return "", len(result)
+
+        test_adapter_factory(adapter_class=DummyAdapterHDDRequired)
+        algorithm = dao.get_algorithm_by_module("tvb.tests.framework.adapters.dummy_adapter3", "DummyAdapterHDDRequired")
+        adapter = HPCLikeAdapter(StorageInterface().get_project_folder(self.test_project.name))
+        adapter.stored_adapter = algorithm
+
+        assert ("", 1) == adapter._prelaunch(None, adapter.get_view_model()(), 1000)
+        assert [] == dao.get_operation_costs(algorithm.id, 10)
@@ -33,10 +33,15 @@
 .. moduleauthor:: Bogdan Neacsa <bogdan.neacsa@codemart.ro>
 """
 
+import os
+from importlib import import_module
+
 import tvb.tests.framework.adapters
 from tvb.config.algorithm_categories import AlgorithmCategoryConfig
 from tvb.config.init.initializer import Introspector
-from tvb.config.init.introspector_registry import import_adapters
+from tvb.config.init.introspection_manifest import IntrospectionManifest
+from tvb.config.init.introspector_registry import import_adapters, IntrospectionRegistry
+from tvb.core.adapters.abcadapter import ABCAdapter
 from tvb.core.entities.model.model_operation import Algorithm, AlgorithmCategory
 from tvb.core.entities.storage import dao
 from tvb.tests.framework.core.base_testcase import BaseTestCase
@@ -94,3 +99,33 @@ class TestIntrospector(BaseTestCase):
         for algorithm in adapters:
             dao.remove_entity(Algorithm, algorithm.id)
         dao.remove_entity(AlgorithmCategory, category_ids[0])
+
+
+class TestIntrospectionManifest(BaseTestCase):
+    """
+    Test class for the introspection manifest and the lazily imported registry.
+    """
+
+    def test_manifest(self, tmpdir):
+        """
+        Test that the manifest is only valid for the code hash it was written with, and only when
+        the algorithms it lists are in DB.
+        """
+        manifest = IntrospectionManifest(os.path.join(str(tmpdir), IntrospectionManifest.FILE_NAME))
+        assert manifest.read('hash') is None
+        simulator_entry = {'module': IntrospectionRegistry.SIMULATOR_MODULE,
+                           'classname': IntrospectionRegistry.SIMULATOR_CLASS}
+        manifest.write('hash', [simulator_entry])
+        assert manifest.read('other hash') is None
+        assert Introspector._is_db_in_sync(manifest.read('hash'))
+        assert not Introspector._is_db_in_sync([simulator_entry, {'module': 'tvb.missing', 'classname': 'Missing'}])
+        assert not Introspector._is_db_in_sync([])
+
+    def test_registry_class_paths(self):
+        """
+        Test that the adapters referenced by the registry by module and class name exist.
+        """
+        for name in ['SIMULATOR', 'CONNECTIVITY', 'ALLEN_CREATOR', 'MEASURE_METRICS', 'DISCRETE_PSE_ADAPTER',
+                     'ISOCLINE_PSE_ADAPTER']:
+            module = import_module(getattr(IntrospectionRegistry, name + '_MODULE'))
+            assert issubclass(getattr(module, getattr(IntrospectionRegistry, name + '_CLASS')), ABCAdapter)
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Tests for the journal and the backups which make H5 storage migrations resumable.
+"""
+
+import os
+import shutil
+from types import SimpleNamespace
+
+import pytest
+import tvb.core.entities.file.files_update_manager as files_update_manager
+from tvb.adapters.datatypes.h5.connectivity_h5 import ConnectivityH5
+from tvb.basic.profile import TvbProfile
+from tvb.core.entities.file.files_update_manager import FilesUpdateManager
+from tvb.core.entities.file.migration_journal import MigrationJournal, STATUS_DONE, STATUS_FAILED, STATUS_STARTED
+from tvb.storage.h5.file.exceptions import FileMigrationException
+from tvb.storage.storage_interface import StorageInterface
+
+
+@pytest.fixture()
+def journal_path(tmpdir):
+    return os.path.join(str(tmpdir), MigrationJournal.FILE_NAME)
+
+
+@pytest.fixture()
+def old_h5_file(tmph5factory, connectivity_factory):
+    path = tmph5factory()
+    with ConnectivityH5(path) as conn_h5:
+        conn_h5.store(connectivity_factory(2))
+    data_version = TvbProfile.current.version.DATA_VERSION_ATTRIBUTE
+    StorageInterface.get_storage_manager(path).set_metadata({data_version: TvbProfile.current.version.DATA_VERSION - 1})
+    return path
+
+
+@pytest.fixture()
+def old_storage(tmpdir, connectivity_factory, monkeypatch):
+    """
+    Two H5 files at the previous data version, in the operation folder of a project, and a stub update script
+    which brings them to the current version, noting the process it ran in.
+    """
+    operation_folder = os.path.join(str(tmpdir), 'projects', 'project', '1')
+    os.makedirs(operation_folder)
+    data_version = TvbProfile.current.version.DATA_VERSION_ATTRIBUTE
+    paths = []
+    for file_name, create_date in (('first.h5', '2020-01-01'), ('second.h5', '2021-01-01')):
+        path = os.path.join(operation_folder, file_name)
+        with ConnectivityH5(path) as conn_h5:
+            conn_h5.store(connectivity_factory(2))
+        StorageInterface.get_storage_manager(path).set_metadata(
+            {'Create_date': 'datetime:%s 10:00:00.000000' % create_date,
+             data_version: TvbProfile.current.version.DATA_VERSION - 1})
+        paths.append(path)
+
+    def update(input_file, **kwargs):
+        StorageInterface.get_storage_manager(input_file).set_metadata(
+            {data_version: TvbProfile.current.version.DATA_VERSION, 'upgraded_by': os.getpid()})
+
+    # Set on the class, so that the managers of the worker processes see them as well
+    monkeypatch.setattr(FilesUpdateManager, '_load_script',
+                        lambda self, script_name: SimpleNamespace(PARALLEL_SAFE=True, update=update))
+    monkeypatch.setattr(StorageInterface, 'get_projects_folder', lambda self: os.path.dirname(
+        os.path.dirname(operation_folder)))
+    # What run_all_updates does besides the files is left out
+    monkeypatch.setattr(files_update_manager, 'delete_old_burst_table_after_migration', lambda: None)
+    monkeypatch.setattr(TvbProfile.current.manager, 'add_entries_to_config_file', lambda entries: None)
+    monkeypatch.setattr(TvbProfile.current.version, 'DATA_CHECKED_TO_VERSION',
+                        TvbProfile.current.version.DATA_VERSION - 1)
+    monkeypatch.setattr(FilesUpdateManager, 'STATUS', True)
+    monkeypatch.setattr(FilesUpdateManager, 'MESSAGE', "Done")
+    return paths
+
+
+def _upgraded_by(path):
+    metadata = StorageInterface.get_storage_manager(path).get_metadata()
+    assert metadata[TvbProfile.current.version.DATA_VERSION_ATTRIBUTE] == TvbProfile.current.version.DATA_VERSION
+    return metadata['upgraded_by']
+
+
+def test_journal_reload(journal_path):
+    journal = MigrationJournal(5, journal_path, batch_size=3)
+    journal.start('a.h5', 'a.h5.tmp')
+    journal.finish('a.h5', True, 2.0, 100)
+    journal.start('b.h5', 'b.h5.tmp')
+    journal.finish('b.h5', False, 1.0, 50)
+    journal.finish('c.h5', True, 3.0, 200)
+    # Starts are written right away, the last two results are still pending, as they would be lost by a crash
+    reloaded = MigrationJournal(5, journal_path)
+    assert reloaded.is_done('a.h5')
+    assert reloaded.status('b.h5') == STATUS_STARTED
+    assert reloaded.status('c.h5') is None
+
+    journal.flush()
+    reloaded = MigrationJournal(5, journal_path)
+    assert reloaded.status('b.h5') == STATUS_FAILED
+    assert reloaded.count(STATUS_DONE) == 2
+    assert reloaded.seconds_per_byte() == pytest.approx(5.0 / 300)
+
+
+def test_journal_ignores_other_versions(journal_path):
+    journal = MigrationJournal(4, journal_path)
+    journal.finish('a.h5', True, 2.0, 100)
+    journal.flush()
+    with open(journal_path, 'a') as journal_file:
+        journal_file.write('{"path": "b.h5", "sta')
+
+    journal = MigrationJournal(5, journal_path)
+    assert journal.status('a.h5') is None
+    assert journal.seconds_per_byte() is None
+
+
+def test_journal_restores_interrupted(journal_path, tmpdir):
+    path = os.path.join(str(tmpdir), 'a.h5')
+    backup_path = path + '.tmp'
+    for file_path, content in ((path, 'half written'), (backup_path, 'original')):
+        with open(file_path, 'w') as written_file:
+            written_file.write(content)
+    journal = MigrationJournal(5, journal_path)
+    journal.start(path, backup_path)
+
+    journal = MigrationJournal(5, journal_path)
+    assert journal.status(path) == STATUS_STARTED
+    assert journal.restore_interrupted() == [path]
+    with open(path) as restored_file:
+        assert restored_file.read() == 'original'
+    assert not os.path.exists(backup_path)
+    assert journal.status(path) is None
+
+
+def test_upgrade_file_failure_restores_the_file(old_h5_file, journal_path, monkeypatch):
+    def failing_update(*args, **kwargs):
+        with open(old_h5_file, 'w') as broken_file:
+            broken_file.write('half written')
+        raise FileMigrationException("Test")
+
+    manager = FilesUpdateManager(journal=MigrationJournal(TvbProfile.current.version.DATA_VERSION, journal_path))
+    monkeypatch.setattr(manager, 'run_update_script', failing_update)
+    assert not manager.upgrade_file(old_h5_file)
+
+    assert not manager.is_file_up_to_date(old_h5_file)
+    assert not os.path.exists(FilesUpdateManager._backup_path(old_h5_file))
+    assert manager.journal.status(old_h5_file) == STATUS_FAILED
+
+
+def test_upgrade_file_journal(old_h5_file, journal_path, monkeypatch):
+    scripts_run = []
+    manager = FilesUpdateManager(journal=MigrationJournal(TvbProfile.current.version.DATA_VERSION, journal_path))
+    monkeypatch.setattr(manager, 'run_update_script', lambda script_name, **kwargs: scripts_run.append(script_name))
+    assert manager.upgrade_file(old_h5_file)
+
+    assert scripts_run == ['%03d_update_files.py' % TvbProfile.current.version.DATA_VERSION]
+    assert not os.path.exists(FilesUpdateManager._backup_path(old_h5_file))
+    assert manager.journal.is_done(old_h5_file)
+    assert manager.journal.seconds_per_byte() is not None
+
+
+def test_get_all_h5_files(old_h5_file, connectivity_factory, tmpdir, monkeypatch):
+    operation_folder = os.path.join(str(tmpdir), 'projects', 'project', '1')
+    os.makedirs(operation_folder)
+    os.rename(old_h5_file, os.path.join(operation_folder, 'old.h5'))
+    with ConnectivityH5(os.path.join(operation_folder, 'new.h5')) as conn_h5:
+        conn_h5.store(connectivity_factory(2))
+    with ConnectivityH5(os.path.join(operation_folder, 'without_date.h5')) as conn_h5:
+        conn_h5.store(connectivity_factory(2))
+    for file_name, create_date in (('old.h5', '2020-01-01'), ('new.h5', '2021-01-01')):
+        StorageInterface.get_storage_manager(os.path.join(operation_folder, file_name)).set_metadata(
+            {'Create_date': 'datetime:%s 10:00:00.000000' % create_date})
+    monkeypatch.setattr(StorageInterface, 'get_projects_folder', lambda self: os.path.dirname(
+        os.path.dirname(operation_folder)))
+
+    h5_files = FilesUpdateManager.get_all_h5_files()
+    assert [os.path.basename(h5_file[0]) for h5_file in h5_files] == ['old.h5', 'new.h5']
+    assert [h5_file[2] for h5_file in h5_files] == [TvbProfile.current.version.DATA_VERSION - 1,
+                                                    TvbProfile.current.version.DATA_VERSION]
+    assert FilesUpdateManager.get_all_h5_files(workers=2) == h5_files
+    assert FilesUpdateManager.get_all_h5_paths() == [h5_file[0] for h5_file in h5_files]
+
+
+def test_run_all_updates_in_parallel(old_storage, journal_path):
+    journal = MigrationJournal(TvbProfile.current.version.DATA_VERSION, journal_path)
+    FilesUpdateManager(workers=2, journal=journal).run_all_updates()
+
+    assert FilesUpdateManager.STATUS
+    for path in old_storage:
+        assert _upgraded_by(path) != os.getpid()
+        assert not os.path.exists(FilesUpdateManager._backup_path(path))
+    assert not os.path.exists(journal_path)
+
+
+def test_run_all_updates_resumes_from_journal(old_storage, journal_path):
+    first_path, second_path = old_storage
+    # The first file was being upgraded when the migration stopped, the second one had been upgraded before
+    backup_path = FilesUpdateManager._backup_path(first_path)
+    shutil.copy(first_path, backup_path)
+    with open(first_path, 'w') as broken_file:
+        broken_file.write('half written')
+    journal = MigrationJournal(TvbProfile.current.version.DATA_VERSION, journal_path)
+    journal.start(first_path, backup_path)
+    journal.finish(second_path, True, 1.0, os.path.getsize(second_path))
+    journal.flush()
+
+    journal = MigrationJournal(TvbProfile.current.version.DATA_VERSION, journal_path)
+    FilesUpdateManager(journal=journal).run_all_updates()
+
+    assert FilesUpdateManager.STATUS
+    assert _upgraded_by(first_path) == os.getpid()
+    assert not os.path.exists(backup_path)
+    metadata = StorageInterface.get_storage_manager(second_path).get_metadata()
+    assert metadata[TvbProfile.current.version.DATA_VERSION_ATTRIBUTE] == TvbProfile.current.version.DATA_VERSION - 1
+    assert 'upgraded_by' not in metadata
+    assert not os.path.exists(journal_path)
@@ -206,3 +206,59 @@ def test_props_datatype_file(tmph5factory):
 
     with PropsDataTypeFile(path) as f:
         f.load_into(ret)
+
+
+class SignalFile(H5File):
+    def __init__(self, path):
+        super(SignalFile, self).__init__(path)
+        self.signal = DataSet(NArray(), self, name='signal', expand_dimension=0, statistics=True)
+
+
+def test_append_statistics(tmph5factory):
+    pth = tmph5factory()
+    rng = numpy.random.RandomState(42)
+    chunks = [rng.normal(loc=i, scale=i + 1, size=(length, 2, 5, 1)) for i, length in enumerate([3, 17, 1, 40])]
+    data = numpy.concatenate(chunks)
+
+    with SignalFile(pth) as f:
+        for chunk in chunks:
+            f.signal.append(chunk, close_file=False)
+        numpy.testing.assert_allclose(f.signal.get_cached_metadata().mean, data.mean())
+
+    with SignalFile(pth) as f:
+        statistics = f.signal.get_statistics()
+        assert statistics.count == data.shape[0]
+        numpy.testing.assert_allclose(statistics.mean, data.mean(axis=0))
+        numpy.testing.assert_allclose(statistics.variance, data.var(axis=0))
+        numpy.testing.assert_equal(statistics.min, data.min(axis=0))
+        numpy.testing.assert_equal(statistics.max, data.max(axis=0))
+        numpy.testing.assert_allclose(statistics.global_variance(), data.var())
+        assert statistics.histogram.sum() == data.size
+        assert statistics.histogram_range[0] <= data.min() and data.max() <= statistics.histogram_range[1]
+
+        for start in [5, 50]:
+            numpy.testing.assert_allclose(f.signal.get_statistics(start).variance, data[start:].var(axis=0))
+
+
+def test_statistics_resume_on_reopened_file(tmph5factory):
+    pth = tmph5factory()
+    data = numpy.arange(60, dtype=float).reshape((10, 1, 6, 1)) ** 2
+
+    with SignalFile(pth) as f:
+        f.signal.append(data[:4])
+    with SignalFile(pth) as f:
+        f.signal.append(data[4:])
+
+    with SignalFile(pth) as f:
+        statistics = f.signal.get_statistics()
+        numpy.testing.assert_allclose(statistics.mean, data.mean(axis=0))
+        numpy.testing.assert_allclose(statistics.variance, data.var(axis=0))
+
+
+def test_stored_statistics(tmph5factory):
+    data = numpy.random.random((20, 3))
+    with SignalFile(tmph5factory()) as f:
+        f.signal.store(data)
+        statistics = f.signal.get_statistics()
+        numpy.testing.assert_allclose(statistics.variance, data.var(axis=0))
+        assert statistics.global_max() == data.max()
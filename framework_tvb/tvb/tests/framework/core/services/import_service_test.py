@@ -46,15 +46,21 @@ from tvb.basic.profile import TvbProfile
 from tvb.core import utils
 from tvb.core.entities.model.model_datatype import DataType
 from tvb.core.entities.storage import dao
+from tvb.core.neocom import h5
 from tvb.core.entities.load import try_get_last_datatype
 from tvb.core.services.figure_service import FigureService
 from tvb.core.services.import_service import ImportService
 from tvb.core.services.project_service import ProjectService
 from tvb.core.services.exceptions import ImportException
 from tvb.core.utils import no_matlab
+from tvb.storage.h5.file.exceptions import MissingDataSetException
+from tvb.storage.h5.file.blob_store import BlobStore
+from tvb.storage.storage_interface import StorageInterface
 from tvb.tests.framework.core.factory import TestFactory
 from tvb.tests.framework.core.base_testcase import BaseTestCase
 from tvb.tests.framework.core.services.figure_service_test import IMG_DATA
+from tvb.tests.framework.datatypes.dummy_datatype import DummyDataType
+from tvb.tests.framework.datatypes.dummy_datatype_index import DummyDataTypeIndex
 
 
 class TestImportService(BaseTestCase):
@@ -154,6 +160,71 @@ class TestImportService(BaseTestCase):
         with pytest.raises(ImportException):
             self.import_service.import_project_structure(self.zip_path, test_user.id)
 
+    def test_import_shares_data_sets(self, user_factory, project_factory, monkeypatch):
+        """
+        Test that the H5 files of an imported project share their data sets through the blob store.
+        """
+        test_user = user_factory()
+        test_project = project_factory(test_user, "TestImportShared")
+        zip_path = os.path.join(os.path.dirname(tvb_data.__file__), 'connectivity', 'connectivity_66.zip')
+        connectivity = TestFactory.import_zip_connectivity(test_user, test_project, zip_path)
+        self.zip_path = ExportManager().export_project(test_project)
+        self.project_service.remove_project(test_project.id)
+
+        deduplicated = []
+
+        def deduplicate_h5(storage_interface, h5_path):
+            deduplicated.append(h5_path)
+            # The connectivity data sets are smaller than the default sharing threshold
+            return BlobStore().deduplicate(h5_path, min_bytes=1)
+
+        monkeypatch.setattr(StorageInterface, "deduplicate_h5", deduplicate_h5)
+        self.import_service.import_project_structure(self.zip_path, test_user.id)
+
+        imported = dao.get_datatype_by_gid(connectivity.gid)
+        connectivity_path = h5.path_for_stored_index(imported)
+        assert connectivity_path in deduplicated
+        assert len(BlobStore.shared_links_of(connectivity_path)) > 0
+
+        imported_project = self.project_service.retrieve_projects_for_user(test_user.id)[0][0]
+        self.project_service.remove_project(imported_project.id)
+        StorageInterface.collect_blob_garbage()
+
+    def test_import_missing_data_set(self, user_factory, project_factory, monkeypatch):
+        """
+        Test that a datatype with missing data fails the import with an explicit message.
+        """
+        test_user = user_factory()
+        test_project = project_factory(test_user, "TestImportMissingData")
+        zip_path = os.path.join(os.path.dirname(tvb_data.__file__), 'connectivity', 'connectivity_66.zip')
+        TestFactory.import_zip_connectivity(test_user, test_project, zip_path)
+        self.zip_path = ExportManager().export_project(test_project)
+        self.project_service.remove_project(test_project.id)
+
+        def deduplicate_h5(storage_interface, h5_path):
+            raise MissingDataSetException("weights")
+
+        monkeypatch.setattr(StorageInterface, "deduplicate_h5", deduplicate_h5)
+        with pytest.raises(ImportException, match="has missing data"):
+            self.import_service.import_project_structure(self.zip_path, test_user.id)
+
+    def test_store_datatypes_one_by_one_on_conflict(self, dummy_datatype_index_factory):
+        """
+        Test that a batch holding an already stored GID is stored one by one, keeping the other datatypes.
+        """
+        existing = dummy_datatype_index_factory()
+        new_datatype = DummyDataTypeIndex()
+        new_datatype.fill_from_has_traits(DummyDataType())
+        new_datatype.fk_from_operation = existing.fk_from_operation
+        duplicate = DummyDataTypeIndex()
+        duplicate.fill_from_has_traits(DummyDataType())
+        duplicate.gid = existing.gid
+        duplicate.fk_from_operation = existing.fk_from_operation
+
+        stored = self.import_service.store_datatypes([new_datatype, duplicate])
+        assert dao.get_datatype_by_gid(new_datatype.gid) is not None
+        assert stored[1].id == existing.id
+
     def test_export_import_burst(self, user_factory, project_factory, simulation_launch):
         """
         Test that fk_parent_burst is correctly preserved after export/import
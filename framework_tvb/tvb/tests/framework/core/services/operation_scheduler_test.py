@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+#
+
+from types import SimpleNamespace
+from tvb.core.adapters.abcadapter import AdapterLaunchModeEnum
+from tvb.core.adapters.cost_estimator import CostEstimate
+from tvb.core.services.backend_clients.operation_scheduler import OperationScheduler, ScheduledOperation
+from tvb.core.services.backend_clients.operation_scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+from tvb.core.services.backend_clients.operation_scheduler import PRIORITY_NORMAL
+
+GB = 2 ** 30
+
+
+class CountingAdapter(object):
+    """ Stands for an adapter, counting how many times it was configured to estimate a cost. """
+    launch_mode = AdapterLaunchModeEnum.ASYNC_DIFF_MEM
+
+    def __init__(self, cpus=1):
+        self.configured = 0
+        self.cpus = cpus
+
+    def load_view_model(self, operation):
+        return None
+
+    def configure(self, view_model):
+        self.configured += 1
+
+    def estimate_cost(self, view_model):
+        return CostEstimate(1000, 2 * GB, 0, 0)
+
+    def get_required_cpus(self, view_model):
+        return self.cpus
+
+
+class TestOperationScheduler(object):
+    """
+    Check the admission decisions of the OperationScheduler, on operations with known reservations.
+    """
+
+    def setup_method(self):
+        self.scheduler = OperationScheduler(memory_budget=8 * GB, cpu_budget=4)
+
+    def test_admission_by_memory(self):
+        for op_id in range(3):
+            self.scheduler.add(ScheduledOperation(op_id, PRIORITY_NORMAL, 3 * GB))
+        assert self.scheduler.select() == [0, 1]
+        assert self.scheduler.select() == []
+        self.scheduler.release(0)
+        assert self.scheduler.select() == [2]
+
+    def test_admission_by_cpus(self):
+        for op_id in range(6):
+            self.scheduler.add(ScheduledOperation(op_id, PRIORITY_NORMAL, GB // 2))
+        assert self.scheduler.select() == [0, 1, 2, 3]
+        assert self.scheduler.metrics()['queued'] == 2
+
+    def test_priorities(self):
+        self.scheduler.add(ScheduledOperation(1, PRIORITY_BATCH, 3 * GB))
+        self.scheduler.add(ScheduledOperation(2, PRIORITY_NORMAL, 3 * GB))
+        self.scheduler.add(ScheduledOperation(3, PRIORITY_INTERACTIVE, 3 * GB))
+        assert self.scheduler.select() == [3, 2]
+        metrics = self.scheduler.metrics()
+        assert metrics['queued_per_priority'] == {'interactive': 0, 'normal': 0, 'batch': 1}
+        assert metrics['memory_reserved'] == 6 * GB
+
+    def test_backfill_around_large_operation(self):
+        self.scheduler.add(ScheduledOperation(1, PRIORITY_NORMAL, 5 * GB, runtime=100))
+        assert self.scheduler.select() == [1]
+        # Does not fit before operation 1 ends, and reserves the memory for when it does
+        self.scheduler.add(ScheduledOperation(2, PRIORITY_NORMAL, 7 * GB, runtime=100))
+        # Ends before the reservation of operation 2, so it can start now
+        self.scheduler.add(ScheduledOperation(3, PRIORITY_BATCH, GB, runtime=10))
+        # Would still be running when operation 2 needs its memory
+        self.scheduler.add(ScheduledOperation(4, PRIORITY_BATCH, 2 * GB, runtime=1000))
+        # Fits in what operation 2 leaves free
+        self.scheduler.add(ScheduledOperation(5, PRIORITY_BATCH, GB // 2, runtime=1000))
+        assert self.scheduler.select() == [3, 5]
+        assert self.scheduler.metrics()['backfilled'] == 2
+
+        self.scheduler.release(1)
+        self.scheduler.release(3)
+        assert self.scheduler.select() == [2]
+
+    def test_oversized_operation_runs_alone(self):
+        self.scheduler.add(ScheduledOperation(1, PRIORITY_NORMAL, GB, runtime=10))
+        assert self.scheduler.select() == [1]
+        self.scheduler.add(ScheduledOperation(2, PRIORITY_NORMAL, 20 * GB))
+        self.scheduler.add(ScheduledOperation(3, PRIORITY_NORMAL, GB, runtime=5))
+        self.scheduler.add(ScheduledOperation(4, PRIORITY_NORMAL, GB))
+        assert self.scheduler.select() == [3]
+        assert self.scheduler.select() == []
+        self.scheduler.release(1)
+        self.scheduler.release(3)
+        assert self.scheduler.select() == [2]
+        self.scheduler.add(ScheduledOperation(5, PRIORITY_INTERACTIVE, GB))
+        assert self.scheduler.select() == []
+
+    def test_estimate_reused_until_released(self):
+        adapter = CountingAdapter()
+        operation = SimpleNamespace(id=1, fk_operation_group=None)
+        self.scheduler.enqueue(operation, adapter)
+        self.scheduler.discard(1, forget=False)
+        self.scheduler.enqueue(operation, adapter)
+        assert adapter.configured == 1
+        assert self.scheduler.queued[1].memory == 2 * GB
+        self.scheduler.release(1)
+        assert self.scheduler.waiting() == set()
+        self.scheduler.enqueue(operation, adapter)
+        assert adapter.configured == 2
+
+    def test_group_estimate_evicted_when_group_finishes(self):
+        adapter = CountingAdapter()
+        for op_id in range(3):
+            self.scheduler.enqueue(SimpleNamespace(id=op_id, fk_operation_group=7), adapter)
+        assert adapter.configured == 1
+        assert self.scheduler.select() == [0, 1, 2]
+        self.scheduler.release(0)
+        self.scheduler.release(1)
+        assert 7 in self.scheduler._group_estimates
+        self.scheduler.release(2)
+        assert self.scheduler._group_estimates == {}
+
+    def test_cpus_declared_by_adapter(self):
+        self.scheduler.enqueue(SimpleNamespace(id=1, fk_operation_group=None), CountingAdapter(cpus=3))
+        self.scheduler.enqueue(SimpleNamespace(id=2, fk_operation_group=None), CountingAdapter(cpus=2))
+        self.scheduler.enqueue(SimpleNamespace(id=3, fk_operation_group=None), CountingAdapter(cpus=16))
+        assert self.scheduler.queued[3].cpus == 4
+        assert self.scheduler.select() == [1]
+        assert self.scheduler.metrics()['cpus_reserved'] == 3
+        self.scheduler.release(1)
+        assert self.scheduler.select() == [2]
+        self.scheduler.release(2)
+        assert self.scheduler.select() == [3]
@@ -40,6 +40,7 @@ from tvb.core.adapters.exceptions import NoMemoryAvailableException
 from tvb.core.entities.model import model_operation
 from tvb.core.entities.storage import dao
 from tvb.core.entities.transient.structure_entities import DataTypeMetaData
+from tvb.core.services import operation_service
 from tvb.core.services.operation_service import OperationService
 from tvb.core.services.project_service import initialize_storage, ProjectService
 from tvb.storage.storage_interface import StorageInterface
@@ -148,6 +149,49 @@ class TestOperationService(BaseTestCase):
         assert datatype.subject == "Test4242", "Wrong data stored."
         assert datatype.type == adapter.get_output()[0].__name__, "Wrong data stored."
 
+    def test_initiate_operation_stage_timings(self, test_adapter_factory):
+        """
+        Test that the time spent in the stages of an operation is stored with it, and can be exported.
+        """
+        test_adapter_factory()
+        adapter = TestFactory.create_adapter("tvb.tests.framework.adapters.dummy_adapter1", "DummyAdapter1")
+        view_model = DummyModel()
+        view_model.test1_val1 = 5
+        view_model.test1_val2 = 5
+
+        self.operation_service.initiate_operation(self.test_user, self.test_project, adapter, model_view=view_model)
+
+        rows = self.operation_service.get_stage_timings_rows("DummyAdapter1")
+        stages = set(row['stage'] for row in rows)
+        for stage_name in ['queueing', 'view_model_load', 'configure', 'launch', 'store_results', 'h5_io',
+                           'db_write']:
+            assert stage_name in stages
+        assert all(row['seconds'] >= 0 for row in rows)
+        assert all(row['tvb_version'] == TvbProfile.current.version.CURRENT_VERSION for row in rows)
+
+        timings = self.operation_service.load_stage_timings(rows[0]['operation_id'])
+        assert timings.calls['launch'] == 1
+
+    def test_stage_timings_pruned(self, test_adapter_factory, monkeypatch):
+        """
+        Test that only the most recent stage timings of an algorithm are kept.
+        """
+        monkeypatch.setattr(operation_service, 'STAGE_TIMINGS_KEPT', 1)
+        test_adapter_factory()
+        adapter = TestFactory.create_adapter("tvb.tests.framework.adapters.dummy_adapter1", "DummyAdapter1")
+        view_model = DummyModel()
+        view_model.test1_val1 = 5
+        view_model.test1_val2 = 5
+
+        self.operation_service.initiate_operation(self.test_user, self.test_project, adapter, model_view=view_model)
+        first_operation_id = self.operation_service.get_stage_timings_rows("DummyAdapter1")[0]['operation_id']
+        self.operation_service.initiate_operation(self.test_user, self.test_project, adapter, model_view=view_model)
+
+        rows = self.operation_service.get_stage_timings_rows("DummyAdapter1")
+        operation_ids = set(row['operation_id'] for row in rows)
+        assert len(operation_ids) == 1
+        assert first_operation_id not in operation_ids
+
     def test_delete_dt_free_hdd_space(self, test_adapter_factory, operation_factory):
         """
         Launch two operations and give enough available space for user so that both should finish.
@@ -39,12 +39,14 @@ import tvb_data
 
 from tvb.basic.profile import TvbProfile
 from tvb.core.entities.model import model_datatype, model_project, model_operation
+from tvb.core.entities.model.model_disk_usage import DiskUsage, OWNER_USER
 from tvb.core.entities.storage import dao
 from tvb.core.entities.transient.context_overlay import DataTypeOverlayDetails
-from tvb.core.entities.transient.structure_entities import DataTypeMetaData
+from tvb.core.entities.transient.structure_entities import DataTypeMetaData, StructureNode
 from tvb.core.neocom import h5
 from tvb.core.services.exceptions import ProjectServiceException
 from tvb.core.services.algorithm_service import AlgorithmService
+from tvb.core.services import project_service
 from tvb.core.services.project_service import ProjectService, PROJECTS_PAGE_SIZE
 from tvb.storage.storage_interface import StorageInterface
 from tvb.tests.framework.adapters.dummy_adapter3 import DummyAdapter3
@@ -304,6 +306,32 @@ class TestProjectService(TransactionalTestCase):
             msg = "Real disk usage: %s The one recorded in the db : %s" % (actual_disk_size, project.disk_size)
             assert ratio < 1.1, msg
 
+    def test_disk_usage_counters(self):
+        project = TestFactory.create_project(self.test_user, 'test_proj')
+        zip_path = os.path.join(os.path.dirname(tvb_data.__file__), 'connectivity', 'connectivity_66.zip')
+        connectivity = TestFactory.import_zip_connectivity(self.test_user, project, zip_path, 'testSubject')
+
+        user_size = dao.compute_user_generated_disk_size(self.test_user.id)
+        assert 0 < user_size
+        assert user_size <= dao.get_project_disk_size(project.id)
+        assert 0 == dao.reconcile_disk_usage(), "Counters were not kept up to date on store"
+
+        user_key = str(self.test_user.id)
+        usage = [usage for usage in dao.get_generic_entity(DiskUsage, OWNER_USER, "owner_type")
+                 if usage.owner_key == user_key][0]
+        usage.disk_size = 1
+        dao.store_entity(usage)
+        assert 1 == dao.reconcile_disk_usage()
+        assert user_size == dao.compute_user_generated_disk_size(self.test_user.id)
+
+        self.project_service.remove_datatype(project.id, connectivity.gid)
+        assert 0 == dao.compute_user_generated_disk_size(self.test_user.id)
+        assert 0 == dao.reconcile_disk_usage(), "Counters were not kept up to date on remove"
+
+        self.project_service.remove_project(project.id)
+        assert 0 == dao.get_project_disk_size(project.id)
+        assert 0 == dao.reconcile_disk_usage(), "Counters were not removed with their project"
+
     def test_get_linkable_projects(self):
         """
         Test for retrieving the projects for a given user.
@@ -505,3 +533,41 @@ class TestProjectService(TransactionalTestCase):
         for link_gid in expected_links:
             assert link_gid in node_json, "Expected Link not present"
             assert link_gid in dts_in_tree, "Expected Link not present"
+
+    def test_project_structure_cache(self, dummy_datatype_index_factory, project_factory, user_factory):
+        """
+        Tests the cached project tree is rebuilt once a DataType shown in it changes
+        """
+        project = project_factory(user_factory(), name="TestPSCache")
+        datatype = dummy_datatype_index_factory(state="RAW_DATA", project=project)
+        levels = DataTypeMetaData.KEY_STATE, DataTypeMetaData.KEY_SUBJECT
+
+        version = dao.get_project_structure_version(project.id)
+        node_json = self.project_service.get_project_structure(project, None, *levels, None)
+        assert datatype.gid in node_json
+        assert node_json == self.project_service.get_project_structure(project, None, *levels, None)
+
+        datatype = dao.get_datatype_by_gid(datatype.gid)
+        datatype.user_tag_1 = "cached_tag"
+        dao.store_entity(datatype)
+        assert dao.get_project_structure_version(project.id) > version
+        assert "cached_tag" in self.project_service.get_project_structure(project, None, *levels, None)
+
+    def test_project_structure_lazy(self, dummy_datatype_index_factory, project_factory, user_factory,
+                                    monkeypatch):
+        """
+        Tests large projects get their DataTypes only when the second level node is expanded
+        """
+        monkeypatch.setattr(project_service, "LAZY_STRUCTURE_SIZE", 0)
+        project = project_factory(user_factory(), name="TestPSLazy")
+        datatype = dummy_datatype_index_factory(state="RAW_DATA", project=project, subject="lazy_subject")
+        levels = DataTypeMetaData.KEY_STATE, DataTypeMetaData.KEY_SUBJECT
+
+        node_json = self.project_service.get_project_structure(project, None, *levels, None)
+        assert datatype.gid not in node_json
+        assert 'state:"closed"' in node_json
+
+        node_id = StructureNode.PREFIX_ID_NODE + "RAW_DATA" + StructureNode.SEP + "lazy_subject"
+        children_json = self.project_service.get_project_structure(project, None, *levels, None, node_id)
+        assert children_json.startswith('[')
+        assert datatype.gid in children_json
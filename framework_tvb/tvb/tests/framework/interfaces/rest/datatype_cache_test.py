@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import os
+
+from tvb.interfaces.rest.client.datatype.datatype_api import DataTypeApi
+from tvb.interfaces.rest.client.datatype.datatype_cache import DatatypeFileCache
+from tvb.interfaces.rest.commons.status_codes import HTTP_STATUS_OK, HTTP_STATUS_NOT_MODIFIED
+
+LAST_MODIFIED = "Mon, 19 Oct 2026 10:00:00 GMT"
+
+
+class DummyResponse(object):
+
+    def __init__(self, status_code, content=b'', file_name=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.content = content
+        self.headers = {'Last-Modified': LAST_MODIFIED}
+        if file_name is not None:
+            self.headers['Content-Disposition'] = 'attachment; filename=%s' % file_name
+
+    def iter_content(self, chunk_size):
+        yield self.content
+
+    def close(self):
+        pass
+
+
+class DummySession(object):
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers=None, stream=False):
+        self.requests.append((url, headers))
+        if headers is not None and headers.get('If-Modified-Since') == LAST_MODIFIED:
+            return DummyResponse(HTTP_STATUS_NOT_MODIFIED)
+        gid = url.split('/')[-1]
+        return DummyResponse(HTTP_STATUS_OK, gid.encode(), 'Connectivity_%s.h5' % gid)
+
+
+class TestDatatypeFileCache(object):
+
+    def test_cache_put_get(self, tmpdir):
+        cache = DatatypeFileCache(str(tmpdir))
+        assert cache.get('gid1') == (None, None)
+
+        open(os.path.join(str(tmpdir), 'file1.h5'), 'w').close()
+        cache.put('gid1', 'file1.h5', LAST_MODIFIED)
+        assert cache.get('gid1') == (os.path.join(str(tmpdir), 'file1.h5'), LAST_MODIFIED)
+
+        # The index is persisted in the folder, so a new cache instance finds the file
+        assert DatatypeFileCache(str(tmpdir)).get('gid1')[1] == LAST_MODIFIED
+
+        os.remove(os.path.join(str(tmpdir), 'file1.h5'))
+        assert cache.get('gid1') == (None, None)
+
+    def test_cache_without_modification_time(self, tmpdir):
+        cache = DatatypeFileCache(str(tmpdir))
+        open(os.path.join(str(tmpdir), 'file1.h5'), 'w').close()
+        cache.put('gid1', 'file1.h5', None)
+        assert cache.get('gid1') == (None, None)
+
+    def test_retrieve_datatypes_uses_cache(self, tmpdir):
+        session = DummySession()
+        datatype_api = DataTypeApi('http://localhost')
+        datatype_api.secured_request = lambda: session
+
+        gids = ['gid%d' % i for i in range(5)]
+        paths = datatype_api.retrieve_datatypes(gids + gids[:2], str(tmpdir))
+        assert sorted(paths.keys()) == gids
+        assert len(session.requests) == 5
+        for gid, path in paths.items():
+            with open(path, 'rb') as downloaded_file:
+                assert downloaded_file.read() == gid.encode()
+
+        # Second time, the server is only asked whether the files changed
+        assert datatype_api.retrieve_datatypes(gids, str(tmpdir)) == paths
+        assert len(session.requests) == 10
+        assert all(headers['If-Modified-Since'] == LAST_MODIFIED for _, headers in session.requests[5:])
@@ -28,15 +28,22 @@
 #
 #
 
+import io
 import os
+import flask
+import numpy
 import pytest
 import tvb_data
 
 from tvb.adapters.datatypes.db.connectivity import ConnectivityIndex
-from tvb.core.utils import no_matlab
-from tvb.interfaces.rest.commons.exceptions import InvalidIdentifierException
+from tvb.core.entities.load import load_entity_by_gid
+from tvb.core.neocom import h5
+from tvb.interfaces.rest.commons import hyperslab
+from tvb.interfaces.rest.commons.exceptions import InvalidIdentifierException, BadRequestException
+from tvb.interfaces.rest.commons.status_codes import HTTP_STATUS_PARTIAL_CONTENT
+from tvb.interfaces.rest.server.facades.datatype_facade import DatatypeFacade
 from tvb.interfaces.rest.server.resources.datatype.datatype_resource import RetrieveDatatypeResource, \
-    GetOperationsForDatatypeResource
+    GetOperationsForDatatypeResource, RetrieveDatatypeDatasetResource
 from tvb.interfaces.rest.server.resources.project.project_resource import GetDataInProjectResource
 from tvb.storage.storage_interface import StorageInterface
 from tvb.tests.framework.core.factory import TestFactory
@@ -49,6 +56,7 @@ class TestDatatypeResource(RestResourceTest):
         self.test_user = TestFactory.create_user('Rest_User')
         self.test_project = TestFactory.create_project(self.test_user, 'Rest_Project', users=[self.test_user.id])
         self.retrieve_resource = RetrieveDatatypeResource()
+        self.retrieve_dataset_resource = RetrieveDatatypeDatasetResource()
         self.get_operations_resource = GetOperationsForDatatypeResource()
         self.get_data_in_project_resource = GetDataInProjectResource()
 
@@ -67,7 +75,8 @@ class TestDatatypeResource(RestResourceTest):
         assert len(datatypes_in_project) == 1
         assert datatypes_in_project[0].type == ConnectivityIndex().display_type
 
-        def send_file_dummy(path, as_attachment, attachment_filename):
+        def send_file_dummy(path, as_attachment, attachment_filename, conditional):
+            assert conditional
             return (path, as_attachment, attachment_filename)
 
         # Mock flask.send_file to behave like send_file_dummy
@@ -78,7 +87,64 @@ class TestDatatypeResource(RestResourceTest):
         assert result[1] is True
         assert os.path.basename(result[0]) == os.path.basename(result[2])
 
-    @pytest.mark.skipif(no_matlab(), reason="Matlab or Octave not installed!")
+    def _import_connectivity(self):
+        zip_path = os.path.join(os.path.dirname(tvb_data.__file__), 'connectivity', 'connectivity_96.zip')
+        connectivity = TestFactory.import_zip_connectivity(self.test_user, self.test_project, zip_path)
+        with h5.h5_file_for_index(load_entity_by_gid(connectivity.gid)) as conn_h5:
+            weights = conn_h5.weights.load()
+        return connectivity.gid, weights
+
+    def test_dataset_slice_stream(self):
+        connectivity_gid, weights = self._import_connectivity()
+
+        info = DatatypeFacade.get_dataset_info(connectivity_gid, 'weights')
+        assert tuple(info['shape']) == weights.shape
+
+        stream = DatatypeFacade.get_dataset_slice_stream(connectivity_gid, 'weights', '10:50:3,-1')
+        content = b''.join(stream.iter_bytes())
+        assert len(content) == stream.size
+        dtype, shape = hyperslab.read_npy_header(io.BytesIO(content))
+        assert shape == (14,)
+        numpy.testing.assert_array_equal(numpy.load(io.BytesIO(content)), weights[10:50:3, -1])
+
+        # A resumed download only receives the bytes after the given offset
+        offset = len(stream.header) + 5
+        assert b''.join(stream.iter_bytes(offset)) == content[offset:]
+
+    def test_dataset_slice_stream_raw_small_blocks(self, mocker):
+        connectivity_gid, weights = self._import_connectivity()
+        mocker.patch('tvb.interfaces.rest.server.facades.datatype_facade.STREAM_BLOCK_SIZE', 100)
+
+        stream = DatatypeFacade.get_dataset_slice_stream(connectivity_gid, 'weights', '::2,5:',
+                                                         hyperslab.FORMAT_RAW)
+        assert stream.header == b''
+        content = b''.join(stream.iter_bytes(37, 1000))
+        expected = numpy.ascontiguousarray(weights[::2, 5:], dtype='<f8').tobytes()
+        assert content == expected[37:1000]
+
+    def test_dataset_slice_stream_invalid(self):
+        connectivity_gid, _ = self._import_connectivity()
+        with pytest.raises(InvalidIdentifierException):
+            DatatypeFacade.get_dataset_slice_stream(connectivity_gid, 'inexistent_dataset', None)
+        with pytest.raises(BadRequestException):
+            DatatypeFacade.get_dataset_slice_stream(connectivity_gid, 'weights', '0:10:-1')
+        with pytest.raises(BadRequestException):
+            DatatypeFacade.get_dataset_slice_stream(connectivity_gid, 'weights', '1000')
+
+    def test_server_retrieve_dataset_range(self, mocker):
+        self._mock_user(mocker)
+        connectivity_gid, weights = self._import_connectivity()
+
+        with flask.Flask(__name__).test_request_context(query_string={'slice': '0:4'},
+                                                        headers={'Range': 'bytes=128-'}):
+            response = self.retrieve_dataset_resource.get(datatype_gid=connectivity_gid, dataset_name='weights')
+            assert response.status_code == HTTP_STATUS_PARTIAL_CONTENT
+            content = b''.join(response.response)
+
+        total_size = int(response.headers['Content-Range'].split('/')[-1])
+        assert len(content) == total_size - 128
+        assert numpy.frombuffer(content[-weights.shape[1] * 8:]).tolist() == weights[3].tolist()
+
     def test_server_get_operations_for_datatype(self, mocker):
         self._mock_user(mocker)
         zip_path = os.path.join(os.path.dirname(tvb_data.__file__), 'connectivity', 'connectivity_96.zip')
@@ -39,7 +39,7 @@ from tvb.basic.profile import TvbProfile
 from tvb.config.algorithm_categories import CreateAlgorithmCategoryConfig
 from tvb.core.entities.model.model_operation import Operation, STATUS_PENDING, STATUS_FINISHED
 from tvb.core.entities.storage import dao
-from tvb.core.services.backend_clients.standalone_client import LOCKS_QUEUE, StandAloneClient
+from tvb.core.services.backend_clients.standalone_client import SCHEDULER, StandAloneClient
 from tvb.core.services.operation_service import OperationService
 from tvb.interfaces.web.controllers import common
 from tvb.interfaces.web.controllers.flow_controller import FlowController
@@ -188,7 +188,7 @@ class TestFlowController(BaseControllersTest):
 
     def test_launch_multiple_operations(self, simulation_launch):
         operations = []
-        for i in range(LOCKS_QUEUE.qsize() + 1):
+        for i in range(SCHEDULER.cpu_budget - len(SCHEDULER.running) + 1):
             operations.append(simulation_launch(self.test_user, self.test_project, 1000))
         sleep(10)
         for i, operation in enumerate(operations):
@@ -35,19 +35,44 @@ Useful graph analyses.
 
 """
 
+import multiprocessing
+
 import numpy
-import networkx
+import scipy.sparse
+import scipy.sparse.csgraph
+from tvb.analyzers.graph_metrics import GraphMeasures
+
+
+def _binary_distances(A, indices=None):
+    """
+    Shortest path lengths of the binarised matrix A, by breadth-first search from
+    every node (or from ``indices`` only); inf for unreachable pairs.
+    """
+    graph = scipy.sparse.csr_matrix((A > 0).astype(numpy.float64))
+    return scipy.sparse.csgraph.shortest_path(graph, method='D', unweighted=True, indices=indices)
+
+
+def _inverse(distances):
+    inverse = numpy.zeros(distances.shape)
+    finite = numpy.isfinite(distances) & (distances > 0)
+    inverse[finite] = 1.0 / distances[finite]
+    return inverse
+
+
+def _largest_component(A):
+    _, labels = scipy.sparse.csgraph.connected_components(scipy.sparse.csr_matrix(A > 0), directed=False)
+    return numpy.bincount(labels).max()
 
 
 def betweenness_bin(A):
     """
 
-    Node betweenness centrality is the fraction of all shortest paths in 
-    the network that contain a given node. Nodes with high values of 
+    Node betweenness centrality is the fraction of all shortest paths in
+    the network that contain a given node. Nodes with high values of
     betweenness centrality participate in a large number of shortest paths.
-    
+
     :param A: binary (directed/undirected) connection matrix (array)
-            
+
     :returns: BC: a vector representing node between centrality vector.
 
 
@@ -55,123 +80,82 @@ def betweenness_bin(A):
 
     Betweenness centrality may be normalised to the range [0,1] as
     BC/[(N-1)(N-2)], where N is the number of nodes in the network.
-    
+
     Original Mika Rubinov, UNSW/U Cambridge, 2007-2012 - From BCT 2012-12-04
 
+    .. note:: Algorithm: Brandes (2001), with breadth-first searches over sparse matrices,
+              see :class:`tvb.analyzers.graph_metrics.GraphMeasures`.
+
 
     **Reference:**    [1] Kintali (2008) arXiv:0809.1906v2 [cs.DS] (generalization to directed and disconnected graphs)
-    
+
     **Author:**        Paula Sanz Leon
-    
+
     """
-    
-    n   = len(A)
-    I   = numpy.eye(n)        # logical ID matrix                                        
-    d   = 1                   # path length
-    number_of_paths_d         = A.copy()           # number of paths of length |d|
-    number_of_shortest_paths_d= A.copy()           # number of shortest paths of length |d|
-    number_of_shortest_paths  = A.copy()           # number of shortest paths of any length
-    length_of_shortest_paths  = A.copy()           # length of shortest paths
-        
-    number_of_shortest_paths[numpy.where(I)] = 1
-    length_of_shortest_paths[numpy.where(I)] = 1
-
-    #compute the number of shortest paths and their lengths
-    while numpy.any(number_of_shortest_paths_d):
-        d += 1
-        number_of_paths_d          = numpy.dot(number_of_paths_d, A)
-        number_of_shortest_paths_d = number_of_paths_d * (length_of_shortest_paths == 0)
-        number_of_shortest_paths  += number_of_shortest_paths_d
-        length_of_shortest_paths   = length_of_shortest_paths + d * (number_of_shortest_paths_d != 0)
-
-    length_of_shortest_paths[length_of_shortest_paths == 0] = numpy.inf       # length for disconnected vertices is inf
-    length_of_shortest_paths[numpy.where(I)] = 0.0
-    number_of_shortest_paths[number_of_shortest_paths == 0] = 1.0  # number of shortest paths for disconn vertices is 1
-
-    dependency = numpy.zeros((n, n))  # node on node dependency
-    diam = d - 1                      # graph diameter
-    
-    #calculate dependency
-    for d in range(diam, 1, -1):
-        temp = (numpy.dot(((length_of_shortest_paths == d) * (1 + dependency) / number_of_shortest_paths), A.T)
-                * ((length_of_shortest_paths == (d - 1)) * number_of_shortest_paths))
-                #temp: dependencies on vertices |d-1| from source
-        dependency += temp
-                
-    return dependency.sum(axis=0)
 
+    return GraphMeasures(A).betweenness_bin()['C']
 
 
 def efficiency_bin(A, compute_local_efficiency=False):
     """
-    
+
     Computes global efficiency or local efficiency of a connectivity matrix.
-    The global efficiency is the average of inverse shortest path length, 
+    The global efficiency is the average of inverse shortest path length,
     and is inversely related to the characteristic path length.
-    
+
     The local efficiency is the global efficiency computed on the
     neighborhood of the node, and is related to the clustering coefficient.
-    
+
     :param A: array; binary undirected connectivity matrix.
-    
+
     :param compute_local_efficiency: bool, optional
         flag to compute either local or global efficiency of the network.
-         
-    
+
+
     :returns:
         -  global efficiency (float)
         - local efficiency (array)
-             
+
 
     **References:** [1] Latora and Marchiori (2001) Phys Rev Lett 87:198701.
-    
-    
-    .. note:: Algorithm: algebraic path count
+
+
+    .. note:: Algorithm: breadth-first search over a sparse matrix
     .. note:: Original: Mika Rubinov, UNSW, 2008-2010 - From BCT 2012-12-04
-    .. note:: Tested with  Numpy 1.7
-    
-    .. warning:: tested against Matlab version... needs indexing improvement
-    
-    
+
+
     **Example:**
-         
+
     >>> import numpy.random
     >>> A = np.random.rand(5, 5)
     >>> E = efficiency_bin(A)
-    >>> E.shape == (1, ) 
+    >>> E.shape == (1, )
     >>> True
-    
+
     If you want to compute the local efficiency for every node in the network:
-    
+
     >>> E = efficiency_bin(A, compute_local_efficiency=True)
     >>> E.shape == (5, 1)
     >>> True
-    
-    
+
+
     **Author:**        Paula Sanz Leon
 
     """
-    
-    # Binarize without modifying the original matrix (in case A is weighted)
-    G = A.copy()
-    G[G > 0] = 1.0 
 
-    number_of_nodes = G.shape[0]     
+    number_of_nodes = A.shape[0]
     if compute_local_efficiency:
-        E = numpy.zeros((number_of_nodes,1))  
+        G = A > 0
+        E = numpy.zeros((number_of_nodes, 1))
         k = G.sum(axis=1)   # degree
-        for u in range(number_of_nodes):
-            indices = (G[u, :] > 0)
-            if k[u] >= 2:   # degree must be at least two
-                e = distance_inv(G[numpy.ix_(indices,indices)])
-                E[u,:] = e.sum() / (k[u] ** 2 - k[u])     # local efficiency
-        return E
-    else:
-        e = distance_inv(G)
-        E = e.sum() / (number_of_nodes ** 2 - number_of_nodes)
-        
+        for u in numpy.nonzero(k >= 2)[0]:   # degree must be at least two
+            indices = G[u, :]
+            e = distance_inv(A[numpy.ix_(indices, indices)])
+            E[u, :] = e.sum() / (k[u] ** 2 - k[u])     # local efficiency
         return E
 
+    e = distance_inv(A)
+    return e.sum() / (number_of_nodes ** 2 - number_of_nodes)
 
 
 def distance_inv(G):
@@ -181,90 +165,132 @@ def distance_inv(G):
     :param G: binary undirected connection matrix
     :returns: D: matrix of inverse distances
     """
-    L = numpy.zeros(G.shape)
-    D = numpy.eye(G.shape[0])
-    n = 1
-    nPATH = G.copy()                     # n-path matrix
-    L[nPATH != 0] = 1.                   # shortest n-path matrix
-
-    while L.sum() != 0:
-        D += n * L
-        n += 1
-        nPATH = numpy.dot(nPATH, G)
-        L = (nPATH > 0) * (D == 0)
-
-    D[D == 0] = numpy.inf
-    D = 1 / D                                # invert distance
-    D = D - numpy.eye(G.shape[0])
-    return D
-
+    return _inverse(_binary_distances(G))
 
 
 def get_components_sizes(A):
     """
     Get connected components sizes.
-    Returns the size of the largest component of an undirected graph specified by the *binary* and 
+    Returns the size of the largest component of an undirected graph specified by the *binary* and
     *undirected* connection matrix A.
-    
-    
+
+
     :param A: array
         - binary undirected (BU) connectivity matrix.
-    
+
     :returns:
         - largest component (float)
         - size  of the largest component
-    
+
     :raises: Value Error - If A is not square.
-              
-    .. warning::       Requires NetworkX
 
     **Author:**        Paula Sanz Leon
-    
-    """
 
-
-    # Just to preserve the original code. Check if the input matrix is square.
-    # Further checks should include: check if it's binary for the functions that require so
-    # and check that is undirected. 
+    """
 
     # Check if it is square
     if A.shape[0] != A.shape[1]:
         raise ValueError('The input matrix is not square')
-    else:
-        pass
 
-    # Binarize without modifying the original matrix (in case A is weighted)
-    temp_A = A.copy()
-    temp_A[temp_A > 0] = 1.0    
+    return _largest_component(A)
+
 
-    # Set diagonal elements to one
-    if numpy.diag(A).sum() != A.shape[0]:
-       numpy.fill_diagonal(temp_A, 1.0)
-    
-    # build a networkX graph to get largest connected component.
-    components = networkx.connected_components(networkx.from_numpy_matrix(numpy.matrix(temp_A)))
-    # For the time being returns the size of the largest component
-    component_sizes = [len(x) for x in components][0]
-    return component_sizes
+class LesionedDistances(object):
+    """
+    Shortest path lengths of a binarised connection matrix, kept up to date while nodes are removed.
 
+    Removing a node changes the distances from a source only when one of the node's successors
+    had it as its single parent in the breadth-first tree of that source: otherwise every node
+    keeps a shortest path avoiding the removed one. After each removal only those sources are
+    searched again, the other rows of the distance matrix are kept as they are.
+    """
+
+    def __init__(self, weights):
+        self.weights = numpy.array(weights, dtype=numpy.float64)
+        self.adjacency = (self.weights > 0).astype(numpy.float64)
+        self.distances = _binary_distances(self.adjacency)
+        self.removed = numpy.zeros(self.weights.shape[0], dtype=bool)
+
+    def remove(self, node):
+        """
+        Disconnect ``node`` and update the distances of the sources routed through it.
+        """
+        if self.removed[node]:
+            return
+        to_node = self.distances[:, node]
+        affected = numpy.zeros(len(to_node), dtype=bool)
+        for successor in numpy.nonzero(self.adjacency[node])[0]:
+            to_successor = self.distances[:, successor]
+            on_path = numpy.isfinite(to_node) & (to_successor == to_node + 1)
+            if not on_path.any():
+                continue
+            parents = numpy.nonzero(self.adjacency[:, successor])[0]
+            parents_on_path = (self.distances[:, parents] == (to_successor - 1)[:, numpy.newaxis]).sum(axis=1)
+            affected |= on_path & (parents_on_path == 1)
+        affected[node] = False
+        affected = numpy.nonzero(affected)[0]
+
+        self.removed[node] = True
+        for matrix in (self.weights, self.adjacency):
+            matrix[node, :] = 0.0
+            matrix[:, node] = 0.0
+        self.distances[node, :] = numpy.inf
+        self.distances[:, node] = numpy.inf
+        self.distances[node, node] = 0.0
+        if len(affected):
+            self.distances[affected] = _binary_distances(self.adjacency, indices=affected)
+
+    @property
+    def strength(self):
+        return self.weights.sum(axis=1) + self.weights.sum(axis=0)
+
+    @property
+    def degree(self):
+        return self.adjacency.sum(axis=1) + self.adjacency.sum(axis=0)
+
+    @property
+    def global_efficiency(self):
+        number_of_nodes = self.weights.shape[0]
+        return _inverse(self.distances).sum() / (number_of_nodes ** 2 - number_of_nodes)
+
+    @property
+    def largest_component(self):
+        return _largest_component(self.adjacency)
+
+
+def _random_deletion(weights, random_sequence, nor):
+    node_strength = numpy.zeros((nor, nor - 2))
+    node_degree = numpy.zeros((nor, nor - 2))
+    global_efficiency = numpy.zeros(nor - 2)
+    largest_component = numpy.zeros(nor - 2)
+    lesion = LesionedDistances(weights)
+
+    for i, idx in enumerate(random_sequence):
+        lesion.remove(idx)
+        node_strength[:, i] = lesion.strength
+        node_degree[:, i] = lesion.degree
+        global_efficiency[i] = lesion.global_efficiency
+        largest_component[i] = lesion.largest_component
+
+    return node_strength, node_degree, global_efficiency, largest_component
 
 
 def sequential_random_deletion(white_matter, random_sequence, nor):
     """
-    
+
     A strategy to lesion a connectivity matrix.
-    
+
     A single node is removed at each step until the network is reduced to only 2
     nodes. This method represents a structural failure analysis and it should
-    be run several times with different random sequences.
-    
+    be run several times with different random sequences (see random_deletion_ensemble).
+
     :param white_matter: tvb Connectivity DataType (yes, it's an example for TVB!)
                   a connectivity DataType that has a 'weights' attribute.
-                  
+
     :param random_sequence: int array; a sequence of random integer numbers indicating which
                      the nodes will be deleted at each step.
     :param nor:      number of nodes of the original connectivity matrix.
-                     
+
     :returns:
         - Node strength     (number_of_nodes, number_of_nodes -2)
         - Node degree       (number_of_nodes, number_of_nodes -2)
@@ -274,128 +300,112 @@ def sequential_random_deletion(white_matter, random_sequence, nor):
     **References:**    Alstott et al. (2009).
 
     **Author:**        Paula Sanz Leon
-    
+
     """
 
-    node_strength = numpy.zeros((nor, nor - 2))
-    node_degree   = numpy.zeros((nor, nor - 2))
-    global_efficieny = numpy.zeros(nor - 2)
-    largest_component = numpy.zeros(nor - 2)
-    temp_strength = white_matter.weights.copy()
-    temp_degree   = white_matter.weights.copy()
-    temp_degree[temp_degree > 0.0] = 1.0
+    return _random_deletion(white_matter.weights, random_sequence, nor)
 
-    for i, idx in enumerate(random_sequence):
-            # delete rows
-            temp_strength[idx, :] = 0.0
-            temp_degree[idx, :]   = 0.0
-        
-            # delete columns
-            temp_strength[:, idx] = 0.0
-            temp_degree[:, idx]   = 0.0
-        
-            # strength
-            in_strength     =  temp_strength.sum(axis=1)  
-            out_strength    =  temp_strength.sum(axis=0)
-            node_strength[:, i] = in_strength + out_strength
-        
-            # degree
-            in_degree       = temp_degree.sum(axis=1)
-            out_degree      = temp_degree.sum(axis=0)
-            node_degree[:, i] = in_degree + out_degree
-        
-            # efficiency
-            global_efficieny[i] = efficiency_bin(temp_degree)
-        
-            # largest connected component
-            largest_component[i] = get_components_sizes(temp_degree)
-            
-    return node_strength, node_degree, global_efficieny, largest_component
+
+_ensemble_weights = None
+
+
+def _init_ensemble_worker(weights):
+    global _ensemble_weights
+    _ensemble_weights = weights
 
 
+def _ensemble_member(random_sequence):
+    return _random_deletion(_ensemble_weights, random_sequence, _ensemble_weights.shape[0])
+
+
+def random_deletion_ensemble(white_matter, number_of_sequences, processes=None, random_state=None):
+    """
+    Run sequential_random_deletion for many random deletion sequences, spread over worker processes.
+
+    :param white_matter: a connectivity DataType that has a 'weights' attribute.
+    :param number_of_sequences: number of random deletion sequences to run.
+    :param processes: number of worker processes; None uses all CPUs, 1 runs in this process.
+    :param random_state: seed or numpy RandomState used to draw the sequences.
+
+    :returns:
+        - Deletion sequences (number_of_sequences, number_of_nodes - 2)
+        - Node strength     (number_of_sequences, number_of_nodes, number_of_nodes - 2)
+        - Node degree       (number_of_sequences, number_of_nodes, number_of_nodes - 2)
+        - Global efficiency (number_of_sequences, number_of_nodes - 2)
+        - Size of the largest component (number_of_sequences, number_of_nodes - 2)
+    """
+    weights = numpy.asarray(white_matter.weights, dtype=numpy.float64)
+    nor = weights.shape[0]
+    if not isinstance(random_state, numpy.random.RandomState):
+        random_state = numpy.random.RandomState(random_state)
+    sequences = numpy.array([random_state.permutation(nor)[:nor - 2] for _ in range(number_of_sequences)])
+
+    if processes == 1 or number_of_sequences < 2:
+        _init_ensemble_worker(weights)
+        results = [_ensemble_member(sequence) for sequence in sequences]
+    else:
+        pool = multiprocessing.Pool(processes, initializer=_init_ensemble_worker, initargs=(weights,))
+        try:
+            results = pool.map(_ensemble_member, sequences)
+        finally:
+            pool.close()
+            pool.join()
+
+    return (sequences,) + tuple(numpy.array(output) for output in zip(*results))
+
 
 def sequential_targeted_deletion(white_matter, nor):
     """
-    
+
     A strategy to lesion a connectivity matrix.
-    
+
     A single node is removed at each step until the network is reduced to only 2
     nodes. At each step different graph metrics are computed (degree, strength and
-    betweenness centrality). The single node with the highest degree, strength or 
+    betweenness centrality). The single node with the highest degree, strength or
     centrality is removed.
 
-    
+
     :param white_matter: tvb Connectivity datatype (yes, it's an example for TVB!)
                   a connectivity datatype that has a 'weights' attribute.
-                  
+
     :param nor: number of nodes of the original connectivity matrix.
-                     
+
     :returns:
         - Node strength          (number_of_nodes, number_of_nodes -2) array
         - Node degree            (number_of_nodes, number_of_nodes -2) array
         - Betweenness centrality (number_of_nodes, number_of_nodes -2) array
         - Global efficiency      (number_of_nodes, 3) array
         - Size of the largest component (number_of_nodes, 3) array
-    
-    
+
+
     **See also:**  sequential_random_deletion, localized_area_deletion
 
     **References:**    Alstott et al. (2009).
 
     **Author:**        Paula Sanz Leon
-    
+
     """
 
     node_strength = numpy.zeros((nor, nor - 2))
-    node_degree   = numpy.zeros((nor, nor - 2))
+    node_degree = numpy.zeros((nor, nor - 2))
     node_betweenness_centrality = numpy.zeros((nor, nor - 2))
     global_efficiency = numpy.zeros((nor - 2, 3))
     largest_component = numpy.zeros((nor - 2, 3))
-    temp_strength = white_matter.weights.copy()
-    temp_degree   = white_matter.weights.copy()
-    temp_bc       = white_matter.weights.copy()
-    temp_degree[temp_degree > 0.0] = 1.0
+    # one lesion per targeting strategy: by strength, by degree and by betweenness
+    lesions = [LesionedDistances(white_matter.weights) for _ in range(3)]
 
     for idx in range(nor - 2):
+        node_strength[:, idx] = lesions[0].strength
+        node_degree[:, idx] = lesions[1].degree
+        node_betweenness_centrality[:, idx] = betweenness_bin(lesions[2].adjacency)
 
-            # strength
-            in_strength     = temp_strength.sum(axis=1)
-            out_strength    = temp_strength.sum(axis=0)
-            node_strength[:, idx] = in_strength + out_strength
-        
-            # degree
-            in_degree       = temp_degree.sum(axis=1)
-            out_degree      = temp_degree.sum(axis=0)
-            node_degree[:, idx] = in_degree + out_degree
-            
-            # betweeness centrality
-            
-            node_betweenness_centrality[:, idx] = betweenness_bin(temp_bc)
-            
-            # define target index
-            sorted_strength_indices    = numpy.argsort(node_strength[:, idx])
-            sorted_degree_indices      = numpy.argsort(node_degree[:, idx])
-            sorted_bc_indices          = numpy.argsort(node_betweenness_centrality[:, idx])
-            
-            # lesion
-            temp_strength[sorted_strength_indices[-1], :] = 0.0
-            temp_strength[:, sorted_strength_indices[-1]] = 0.0
-
-            temp_degree[sorted_degree_indices[-1], :] = 0.0
-            temp_degree[:, sorted_degree_indices[-1]] = 0.0
-            
-            temp_bc[sorted_bc_indices[-1], :] = 0.0
-            temp_bc[:, sorted_bc_indices[-1]] = 0.0
-            
-            # global efficiency (BU)
-            global_efficiency[idx, 0] = efficiency_bin(temp_strength)  # compute the global eff of the binary matrix ver
-            global_efficiency[idx, 1] = efficiency_bin(temp_degree)
-            global_efficiency[idx, 2] = efficiency_bin(temp_bc)
-        
-            # largest connected component (BU)
-            largest_component[idx, 0] = get_components_sizes(temp_strength)
-            largest_component[idx, 1] = get_components_sizes(temp_degree)
-            largest_component[idx, 2] = get_components_sizes(temp_bc)
-            
-    return node_strength, node_degree, node_betweenness_centrality, global_efficiency, largest_component
+        targets = [numpy.argsort(node_strength[:, idx])[-1],
+                   numpy.argsort(node_degree[:, idx])[-1],
+                   numpy.argsort(node_betweenness_centrality[:, idx])[-1]]
 
+        for strategy, (lesion, target) in enumerate(zip(lesions, targets)):
+            lesion.remove(target)
+            global_efficiency[idx, strategy] = lesion.global_efficiency
+            largest_component[idx, strategy] = lesion.largest_component
+
+    return node_strength, node_degree, node_betweenness_centrality, global_efficiency, largest_component
@@ -0,0 +1,878 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Scientific Package. This package holds all simulators, and
+# analysers necessary to run brain-simulations. You can use it stand alone or
+# in conjunction with TheVirtualBrain-Framework Package. See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+In-process implementation of the graph measures of the Brain Connectivity Toolbox
+(BCT, Rubinov & Sporns 2010), built on NumPy and SciPy sparse graph kernels.
+
+Every measure is a method of :class:`GraphMeasures` named after its BCT function, which
+returns a dictionary keyed by the BCT output names, e.g. ``[Ci, Q] = modularity_dir(W)``
+becomes ``GraphMeasures(W).modularity_dir()`` returning ``{'Ci': ..., 'Q': ...}``.
+
+Intermediates (binarised and sparse matrices, distance matrices, shortest path counts,
+community structure) are computed once per connection matrix and shared by all measures
+asked from the same :class:`GraphMeasures`, so requesting several measures together costs
+little more than the most expensive of them.
+
+"""
+
+import functools
+import inspect
+import multiprocessing
+
+import numpy
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.csgraph
+import scipy.sparse.linalg
+
+
+def _shared(method):
+    """
+    Cache the result of an argument-less method on its GraphMeasures instance.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        if name not in self._cache:
+            self._cache[name] = method(self)
+        return self._cache[name]
+
+    return wrapper
+
+
+def _inverse_distances(distances):
+    """
+    Element-wise inverse of a distance matrix, with 0 on the diagonal and for unreachable pairs.
+    """
+    inverse = numpy.zeros_like(distances)
+    finite = numpy.isfinite(distances) & (distances > 0)
+    inverse[finite] = 1.0 / distances[finite]
+    numpy.fill_diagonal(inverse, 0.0)
+    return inverse
+
+
+def _cycles3(matrix):
+    """
+    diag(S^3) of a (possibly sparse) matrix, without forming the dense cube.
+    """
+    matrix = scipy.sparse.csr_matrix(matrix)
+    return numpy.asarray(matrix.dot(matrix).multiply(matrix.T).sum(axis=1)).ravel()
+
+
+def _diag_square(matrix):
+    """
+    diag(A^2) of a (possibly sparse) matrix.
+    """
+    matrix = scipy.sparse.csr_matrix(matrix)
+    return numpy.asarray(matrix.multiply(matrix.T).sum(axis=1)).ravel()
+
+
+def _newman_partition(modularity_matrix):
+    """
+    Spectral community detection of Newman (2006) with Kernighan-Lin like fine tuning,
+    as done by the BCT modularity_und / modularity_dir functions.
+
+    :param modularity_matrix: symmetric modularity matrix B
+    :returns: community index (1-based) of each node
+    """
+    n = modularity_matrix.shape[0]
+    communities = numpy.ones(n, dtype=numpy.int64)
+    count = 1
+    pending = [1, 0]
+    nodes = numpy.arange(n)
+    group_matrix = modularity_matrix.copy()
+
+    while pending[0]:
+        eigenvalues, eigenvectors = numpy.linalg.eigh(group_matrix)
+        leading = eigenvectors[:, numpy.argmax(eigenvalues)]
+        split = numpy.ones(len(nodes))
+        split[leading < 0] = -1
+        quality = split.dot(group_matrix).dot(split)
+
+        if quality > 1e-10:
+            best = quality
+            numpy.fill_diagonal(group_matrix, 0)
+            movable = numpy.ones(len(nodes), dtype=bool)
+            trial = split.copy()
+            while movable.any():
+                gains = best - 4 * trial * group_matrix.dot(trial)
+                gains[~movable] = -numpy.inf
+                moved = numpy.argmax(gains)
+                best = gains[moved]
+                trial[moved] = -trial[moved]
+                movable[moved] = False
+                if best > quality:
+                    quality = best
+                    split = trial.copy()
+
+            if abs(split.sum()) == len(nodes):
+                pending.pop(0)
+            else:
+                count += 1
+                communities[nodes[split == 1]] = pending[0]
+                communities[nodes[split == -1]] = count
+                pending.insert(0, count)
+        else:
+            pending.pop(0)
+
+        nodes = numpy.nonzero(communities == pending[0])[0]
+        sub_matrix = modularity_matrix[numpy.ix_(nodes, nodes)]
+        group_matrix = sub_matrix - numpy.diag(sub_matrix.sum(axis=0))
+
+    return communities
+
+
+class GraphMeasures(object):
+    """
+    Graph measures of one connection matrix, sharing intermediates between measures.
+
+    The matrix is read as ``weights[i, j]`` being the connection from node i to node j.
+    Measures flagged as binary in their description binarise the matrix first; the
+    weighted distance and betweenness measures read the weights as connection lengths,
+    as the corresponding BCT functions do.
+    """
+
+    # Number of BFS sources traversed together by the vectorised Brandes kernel
+    SOURCE_BLOCK = 256
+    # From this size on, the leading eigenvector is found with a sparse eigen-solver
+    SPARSE_EIGEN_SIZE = 1000
+
+    def __init__(self, weights):
+        weights = numpy.array(weights, dtype=numpy.float64)
+        if weights.ndim != 2 or weights.shape[0] != weights.shape[1]:
+            raise ValueError("A square connection matrix is expected, got shape %s" % str(weights.shape))
+        self.weights = weights
+        self.n = weights.shape[0]
+        self._cache = {}
+
+    def compute(self, measures):
+        """
+        Evaluate several measures, sharing their intermediates.
+
+        :param measures: names of measures, from ``MEASURES``
+        :returns: dictionary with the outputs of all requested measures
+        """
+        result = {}
+        for name in measures:
+            if name not in MEASURES:
+                raise ValueError("Unknown graph measure %s" % name)
+            result.update(getattr(self, name)())
+        return result
+
+    # Shared intermediates
+
+    @property
+    @_shared
+    def adjacency(self):
+        return (self.weights != 0).astype(numpy.float64)
+
+    @property
+    @_shared
+    def sparse_adjacency(self):
+        return scipy.sparse.csr_matrix(self.adjacency)
+
+    @property
+    @_shared
+    def sparse_lengths(self):
+        return scipy.sparse.csr_matrix(self.weights)
+
+    @property
+    @_shared
+    def distances_bin(self):
+        return scipy.sparse.csgraph.shortest_path(self.sparse_adjacency, method='D', unweighted=True)
+
+    @property
+    @_shared
+    def distances_wei(self):
+        return scipy.sparse.csgraph.dijkstra(self.sparse_lengths)
+
+    @property
+    @_shared
+    def brandes_bin(self):
+        """
+        Node and edge betweenness of the binarised graph, with level-synchronous BFS
+        over blocks of sources (Brandes 2001, vectorised).
+        """
+        n = self.n
+        adjacency = self.sparse_adjacency
+        transposed = adjacency.T.tocsr()
+        node_bc = numpy.zeros(n)
+        edge_bc = numpy.zeros((n, n))
+        dense_adjacency = self.adjacency
+
+        for start in range(0, n, self.SOURCE_BLOCK):
+            sources = numpy.arange(start, min(start + self.SOURCE_BLOCK, n))
+            rows = numpy.arange(len(sources))
+            sigma = numpy.zeros((len(sources), n))
+            depth = numpy.full((len(sources), n), -1)
+            sigma[rows, sources] = 1
+            depth[rows, sources] = 0
+
+            frontier = sigma.copy()
+            level = 0
+            while True:
+                reached = transposed.dot(frontier.T).T
+                new = (reached > 0) & (depth < 0)
+                if not new.any():
+                    break
+                level += 1
+                depth[new] = level
+                frontier = numpy.where(new, reached, 0.0)
+                sigma += frontier
+
+            delta = numpy.zeros_like(sigma)
+            for current in range(level, 0, -1):
+                on_level = depth == current
+                coefficient = numpy.zeros_like(sigma)
+                coefficient[on_level] = (1.0 + delta[on_level]) / sigma[on_level]
+                predecessors = numpy.where(depth == current - 1, sigma, 0.0)
+                delta += predecessors * adjacency.dot(coefficient.T).T
+                edge_bc += dense_adjacency * predecessors.T.dot(coefficient)
+
+            delta[rows, sources] = 0
+            node_bc += delta.sum(axis=0)
+
+        return node_bc, edge_bc
+
+    @property
+    @_shared
+    def brandes_wei(self):
+        """
+        Node and edge betweenness of the graph with weights as lengths: one Dijkstra
+        from every source (SciPy), then dependency accumulation on each shortest path DAG.
+        """
+        n = self.n
+        distances = self.distances_wei
+        rows, cols = numpy.nonzero(self.weights)
+        lengths = self.weights[rows, cols]
+        node_bc = numpy.zeros(n)
+        edge_bc = numpy.zeros((n, n))
+
+        for source in range(n):
+            dist = distances[source]
+            on_dag = numpy.isfinite(dist[rows]) & numpy.isclose(dist[rows] + lengths, dist[cols],
+                                                                 rtol=1e-12, atol=0)
+            dag = scipy.sparse.csr_matrix((numpy.ones(on_dag.sum()), (cols[on_dag], rows[on_dag])),
+                                          shape=(n, n))
+            indptr, parents = dag.indptr, dag.indices
+            order = numpy.argsort(dist, kind='stable')
+            order = order[numpy.isfinite(dist[order])]
+
+            sigma = numpy.zeros(n)
+            sigma[source] = 1
+            for node in order[1:]:
+                sigma[node] = sigma[parents[indptr[node]:indptr[node + 1]]].sum()
+
+            delta = numpy.zeros(n)
+            for node in order[:0:-1]:
+                preds = parents[indptr[node]:indptr[node + 1]]
+                contribution = sigma[preds] * (1.0 + delta[node]) / sigma[node]
+                delta[preds] += contribution
+                edge_bc[preds, node] += contribution
+            delta[source] = 0
+            node_bc += delta
+
+        return node_bc, edge_bc
+
+    def _kcoreness(self, directed):
+        adjacency = self.adjacency
+        coreness = numpy.zeros(self.n)
+        core_sizes = numpy.zeros(self.n)
+        alive = numpy.ones(self.n, dtype=bool)
+
+        for k in range(1, self.n + 1):
+            while True:
+                core = adjacency * alive[:, numpy.newaxis] * alive[numpy.newaxis, :]
+                degree = core.sum(axis=0) + (core.sum(axis=1) if directed else 0)
+                peeled = (degree < k) & (degree > 0)
+                if not peeled.any():
+                    break
+                alive[peeled] = False
+            core_sizes[k - 1] = (degree > 0).sum()
+            if not core_sizes[k - 1]:
+                break
+            coreness[core.sum(axis=0) > 0] = k
+
+        return {'coreness': coreness, 'kn': core_sizes}
+
+    def _local_efficiency(self, strengths, lengths, weighted):
+        """
+        Local efficiency of Wang et al. (2016), as computed by BCT: the efficiency of the
+        neighbourhood of each node, where for weighted graphs ``strengths`` are the cube roots
+        of the weights and inverse path lengths are cube-rooted as well.
+        """
+        adjacency = self.adjacency
+        efficiency = numpy.zeros(self.n)
+        for node in range(self.n):
+            neighbours = numpy.nonzero(adjacency[node] + adjacency[:, node])[0]
+            if len(neighbours) < 2:
+                continue
+            link_strengths = strengths[node, neighbours] + strengths[neighbours, node]
+            sub_lengths = scipy.sparse.csr_matrix(lengths[numpy.ix_(neighbours, neighbours)])
+            inverse = _inverse_distances(scipy.sparse.csgraph.dijkstra(sub_lengths))
+            if weighted:
+                inverse = numpy.cbrt(inverse)
+            numerator = (numpy.outer(link_strengths, link_strengths) * (inverse + inverse.T)).sum() / 2
+            if numerator != 0:
+                links = adjacency[node, neighbours] + adjacency[neighbours, node]
+                efficiency[node] = numerator / (links.sum() ** 2 - (links ** 2).sum())
+        return efficiency
+
+    # Degree, strength and density
+
+    @_shared
+    def degrees_und(self):
+        """
+        Node degree of an undirected (binary/weighted) connection matrix: the number of links of each node.
+        """
+        return {'deg': self.adjacency.sum(axis=0)}
+
+    @_shared
+    def degrees_dir(self):
+        """
+        Indegree (incoming links), outdegree (outgoing links) and their sum, for a directed
+        (binary/weighted) connection matrix.
+        """
+        in_degree = self.adjacency.sum(axis=0)
+        out_degree = self.adjacency.sum(axis=1)
+        return {'id': in_degree, 'od': out_degree, 'deg': in_degree + out_degree}
+
+    @_shared
+    def jdegree(self):
+        """
+        Joint degree distribution of a directed (binary/weighted) connection matrix.
+
+        J[i, j] is the number of nodes with indegree i and outdegree j. J_od, J_id and J_bl
+        count the nodes with outdegree larger than, smaller than and equal to indegree.
+        """
+        in_degree = self.adjacency.sum(axis=0).astype(numpy.int64)
+        out_degree = self.adjacency.sum(axis=1).astype(numpy.int64)
+        size = max(in_degree.max(initial=0), out_degree.max(initial=0)) + 1
+        joint = numpy.zeros((size, size))
+        numpy.add.at(joint, (in_degree, out_degree), 1)
+        return {'J': joint, 'J_od': numpy.triu(joint, 1).sum(),
+                'J_id': numpy.tril(joint, -1).sum(), 'J_bl': numpy.trace(joint)}
+
+    @_shared
+    def matching_ind(self):
+        """
+        Matching index of every pair of nodes of a binary (directed/undirected) connection matrix:
+        the proportion of their incoming (Min), outgoing (Mout) and all (Mall) connections that
+        they share, connections between the two nodes themselves excluded.
+        """
+        adjacency = self.adjacency
+        eye = numpy.eye(self.n)
+
+        def overlap(vectors):
+            # vectors[:, i] are the connections of node i; exclude entries i and j of each pair
+            common = vectors.T.dot(vectors)
+            own = vectors.diagonal()[:, numpy.newaxis] * vectors
+            common -= own + own.T
+            total = vectors.sum(axis=0)
+            total = total[:, numpy.newaxis] + total[numpy.newaxis, :]
+            total -= vectors.diagonal()[:, numpy.newaxis] + vectors.diagonal()[numpy.newaxis, :]
+            total -= vectors + vectors.T
+            return common, total
+
+        def matching(common, total):
+            result = numpy.zeros_like(total)
+            numpy.divide(2 * common, total, out=result, where=total > 0)
+            result[eye == 1] = 0
+            return result
+
+        common_in, total_in = overlap(adjacency)
+        common_out, total_out = overlap(adjacency.T)
+        return {'Min': matching(common_in, total_in),
+                'Mout': matching(common_out, total_out),
+                'Mall': matching(common_in + common_out, total_in + total_out)}
+
+    @_shared
+    def strengths_und(self):
+        """
+        Node strength of an undirected weighted connection matrix: the sum of the weights of its links.
+        """
+        return {'strength': self.weights.sum(axis=0)}
+
+    @_shared
+    def strengths_dir(self):
+        """
+        Instrength, outstrength and their sum, for a directed weighted connection matrix.
+        """
+        in_strength = self.weights.sum(axis=0)
+        out_strength = self.weights.sum(axis=1)
+        return {'is': in_strength, 'os': out_strength, 'strength': in_strength + out_strength}
+
+    @_shared
+    def strengths_und_sign(self):
+        """
+        Nodal strength of positive (Spos) and negative (Sneg) weights, and the total positive (vpos)
+        and negative (vneg) weight of an undirected connection matrix with signed weights.
+        """
+        weights = self.weights.copy()
+        numpy.fill_diagonal(weights, 0)
+        positive = numpy.where(weights > 0, weights, 0).sum(axis=0)
+        negative = numpy.where(weights < 0, -weights, 0).sum(axis=0)
+        return {'Spos': positive, 'Sneg': negative, 'vpos': positive.sum(), 'vneg': negative.sum()}
+
+    @_shared
+    def density_dir(self):
+        """
+        Density of a directed connection matrix: the fraction of present connections to
+        possible connections, the number of vertices N and of edges K.
+        """
+        edges = numpy.count_nonzero(self.weights)
+        return {'kden': edges / float(self.n ** 2 - self.n), 'N': self.n, 'K': edges}
+
+    @_shared
+    def density_und(self):
+        """
+        Density of an undirected connection matrix: the fraction of present connections to
+        possible connections, the number of vertices N and of edges K.
+        """
+        edges = numpy.count_nonzero(numpy.triu(self.weights))
+        return {'kden': edges / ((self.n ** 2 - self.n) / 2.0), 'N': self.n, 'K': edges}
+
+    # Clustering and transitivity
+
+    @_shared
+    def clustering_coef_bd(self):
+        """
+        Clustering coefficient of each node of a binary directed connection matrix: the fraction of
+        triangles around a node out of all possible ones (Fagiolo 2007).
+        """
+        adjacency = self.adjacency
+        cycles = _cycles3(adjacency + adjacency.T) / 2
+        degree = (adjacency + adjacency.T).sum(axis=1)
+        degree[cycles == 0] = numpy.inf
+        possible = degree * (degree - 1) - 2 * _diag_square(adjacency)
+        return {'C': cycles / possible}
+
+    @_shared
+    def clustering_coef_bu(self):
+        """
+        Clustering coefficient of each node of a binary undirected connection matrix: the fraction
+        of its neighbours that are neighbours of each other (Watts & Strogatz 1998).
+        """
+        adjacency = self.adjacency
+        links = (adjacency.dot(adjacency) * adjacency).sum(axis=1)
+        degree = adjacency.sum(axis=1)
+        possible = degree ** 2 - degree
+        clustering = numpy.zeros(self.n)
+        numpy.divide(links, possible, out=clustering, where=degree >= 2)
+        return {'C': clustering}
+
+    @_shared
+    def clustering_coef_wu(self):
+        """
+        Clustering coefficient of each node of a weighted undirected connection matrix: the average
+        intensity of the triangles around the node (Onnela et al. 2005). Weights should be in [0, 1].
+        """
+        degree = self.adjacency.sum(axis=1)
+        cycles = _cycles3(numpy.cbrt(self.weights))
+        degree[cycles == 0] = numpy.inf
+        with numpy.errstate(divide='ignore'):
+            return {'C': cycles / (degree * (degree - 1))}
+
+    @_shared
+    def clustering_coef_wd(self):
+        """
+        Clustering coefficient of each node of a weighted directed connection matrix: the average
+        intensity of the triangles around the node (Fagiolo 2007). Weights should be in [0, 1].
+        """
+        adjacency = self.adjacency
+        roots = numpy.cbrt(self.weights)
+        cycles = _cycles3(roots + roots.T) / 2
+        degree = (adjacency + adjacency.T).sum(axis=1)
+        degree[cycles == 0] = numpy.inf
+        possible = degree * (degree - 1) - 2 * _diag_square(adjacency)
+        return {'C': cycles / possible}
+
+    @_shared
+    def transitivity_bd(self):
+        """
+        Transitivity of a binary directed connection matrix: the ratio of triangles to triplets.
+        """
+        adjacency = self.adjacency
+        cycles = _cycles3(adjacency + adjacency.T) / 2
+        degree = (adjacency + adjacency.T).sum(axis=1)
+        possible = degree * (degree - 1) - 2 * _diag_square(adjacency)
+        return {'T': cycles.sum() / possible.sum()}
+
+    @_shared
+    def transitivity_wd(self):
+        """
+        Transitivity of a weighted directed connection matrix: the ratio of triangle intensities
+        to triplets. Weights should be in [0, 1].
+        """
+        adjacency = self.adjacency
+        roots = numpy.cbrt(self.weights)
+        cycles = _cycles3(roots + roots.T) / 2
+        degree = (adjacency + adjacency.T).sum(axis=1)
+        possible = degree * (degree - 1) - 2 * _diag_square(adjacency)
+        return {'T': cycles.sum() / possible.sum()}
+
+    @_shared
+    def transitivity_bu(self):
+        """
+        Transitivity of a binary undirected connection matrix: the ratio of triangles to triplets.
+        """
+        adjacency = self.sparse_adjacency
+        square = adjacency.dot(adjacency)
+        return {'T': _cycles3(adjacency).sum() / (square.sum() - square.diagonal().sum())}
+
+    @_shared
+    def transitivity_wu(self):
+        """
+        Transitivity of a weighted undirected connection matrix: the ratio of triangle intensities
+        to triplets. Weights should be in [0, 1].
+        """
+        degree = self.adjacency.sum(axis=1)
+        return {'T': _cycles3(numpy.cbrt(self.weights)).sum() / (degree * (degree - 1)).sum()}
+
+    # Community structure
+
+    @_shared
+    def modularity_dir(self):
+        """
+        Optimal community structure (Ci) and maximised modularity (Q) of a directed (weighted/binary)
+        connection matrix, by spectral optimisation with fine tuning (Leicht & Newman 2008).
+        """
+        weights = self.weights
+        total = weights.sum()
+        modularity = weights - numpy.outer(weights.sum(axis=1), weights.sum(axis=0)).T / total
+        modularity = modularity + modularity.T
+        communities = _newman_partition(modularity)
+        same = communities[:, numpy.newaxis] == communities[numpy.newaxis, :]
+        return {'Ci': communities, 'Q': (modularity * same).sum() / (2 * total)}
+
+    @_shared
+    def modularity_und(self):
+        """
+        Optimal community structure (Ci) and maximised modularity (Q) of an undirected
+        (weighted/binary) connection matrix, by spectral optimisation with fine tuning (Newman 2006).
+        """
+        weights = self.weights
+        degree = weights.sum(axis=0)
+        total = degree.sum()
+        modularity = weights - numpy.outer(degree, degree) / total
+        communities = _newman_partition(modularity)
+        same = communities[:, numpy.newaxis] == communities[numpy.newaxis, :]
+        return {'Ci': communities, 'Q': (modularity * same).sum() / total}
+
+    # Distances, paths and efficiency
+
+    @_shared
+    def distance_bin(self):
+        """
+        Distance matrix of a binary (directed/undirected) connection matrix: the number of links
+        of the shortest path between each pair of nodes (BFS), inf for unreachable pairs.
+        """
+        return {'D': self.distances_bin}
+
+    @_shared
+    def distance_wei(self):
+        """
+        Distance matrix of a weighted (directed/undirected) connection matrix whose weights are
+        connection lengths: the length of the shortest path between each pair of nodes (Dijkstra).
+        """
+        return {'D': self.distances_wei}
+
+    @_shared
+    def breadthdist(self):
+        """
+        Reachability (R) and distance (D) matrices of a binary (directed/undirected) connection
+        matrix, by breadth-first search. Nodes are not considered reachable from themselves.
+        """
+        distances = self.distances_bin.copy()
+        distances[distances == 0] = numpy.inf
+        return {'R': numpy.isfinite(distances).astype(numpy.float64), 'D': distances}
+
+    @_shared
+    def reachdist(self):
+        """
+        Reachability (R) and distance (D) matrices of a binary (directed/undirected) connection
+        matrix, as by algebraic path count: the diagonal holds the length of the shortest cycle
+        through each node.
+        """
+        distances = self.distances_bin.copy()
+        cycles = numpy.where(self.adjacency > 0, 1 + distances.T, numpy.inf).min(axis=1)
+        numpy.fill_diagonal(distances, cycles)
+        return {'R': numpy.isfinite(distances).astype(numpy.float64), 'D': distances}
+
+    @_shared
+    def findwalks(self):
+        """
+        Walks of a binary (directed/undirected) connection matrix: Wq[:, :, q - 1] counts the walks
+        of length q between each pair of nodes, twalk is the total number of walks and wlq the
+        number of walks of each length, up to the number of nodes.
+        """
+        adjacency = self.adjacency
+        walks = numpy.zeros((self.n, self.n, self.n))
+        power = adjacency
+        for length in range(self.n):
+            walks[:, :, length] = power
+            power = power.dot(adjacency)
+        per_length = walks.sum(axis=(0, 1))
+        return {'Wq': walks, 'twalk': per_length.sum(), 'wlq': per_length}
+
+    @_shared
+    def efficiency_bin(self):
+        """
+        Global efficiency (Eglob), the average inverse shortest path length, and local efficiency
+        (Eloc), the global efficiency of the neighbourhood of each node, of a binary
+        (directed/undirected) connection matrix (Latora & Marchiori 2001, Rubinov & Sporns 2010).
+        """
+        inverse = _inverse_distances(self.distances_bin)
+        local = self._local_efficiency(self.adjacency, self.adjacency, weighted=False)
+        return {'Eglob': inverse.sum() / (self.n ** 2 - self.n), 'Eloc': local}
+
+    @_shared
+    def efficiency_wei(self):
+        """
+        Global efficiency (Eglob) and local efficiency (Eloc) of a weighted (directed/undirected)
+        connection matrix, with connection lengths being inverse weights (Latora & Marchiori 2001,
+        Wang et al. 2016). Weights should be in [0, 1].
+        """
+        lengths = numpy.zeros_like(self.weights)
+        present = self.weights != 0
+        lengths[present] = 1.0 / self.weights[present]
+        inverse = _inverse_distances(scipy.sparse.csgraph.dijkstra(scipy.sparse.csr_matrix(lengths)))
+        local = self._local_efficiency(numpy.cbrt(self.weights), lengths, weighted=True)
+        return {'Eglob': inverse.sum() / (self.n ** 2 - self.n), 'Eloc': local}
+
+    # Centrality
+
+    @_shared
+    def betweenness_bin(self):
+        """
+        Node betweenness centrality of a binary (directed/undirected) connection matrix: the number
+        of shortest paths between other nodes that pass through each node (Brandes 2001).
+        """
+        return {'C': self.brandes_bin[0]}
+
+    @_shared
+    def betweenness_wei(self):
+        """
+        Node betweenness centrality of a weighted (directed/undirected) connection matrix whose
+        weights are connection lengths: the number of shortest paths through each node.
+        """
+        return {'C': self.brandes_wei[0]}
+
+    @_shared
+    def edge_betweenness_bin(self):
+        """
+        Edge (EBC) and node (BC) betweenness centrality of a binary (directed/undirected) connection
+        matrix: the number of shortest paths that pass through each edge and node.
+        """
+        return {'EBC': self.brandes_bin[1], 'BC': self.brandes_bin[0]}
+
+    @_shared
+    def edge_betweenness_wei(self):
+        """
+        Edge (EBC) and node (BC) betweenness centrality of a weighted (directed/undirected)
+        connection matrix whose weights are connection lengths.
+        """
+        return {'EBC': self.brandes_wei[1], 'BC': self.brandes_wei[0]}
+
+    @_shared
+    def eigenvector_centrality_und(self):
+        """
+        Eigenvector centrality of an undirected (binary/weighted) connection matrix: the entries of
+        the eigenvector of its largest eigenvalue, so that central nodes connect to central nodes.
+        """
+        if self.n < self.SPARSE_EIGEN_SIZE:
+            eigenvalues, eigenvectors = numpy.linalg.eigh(self.weights)
+            leading = eigenvectors[:, numpy.argmax(eigenvalues)]
+        else:
+            _, eigenvectors = scipy.sparse.linalg.eigsh(self.sparse_lengths, k=1, which='LA')
+            leading = eigenvectors[:, 0]
+        return {'v': numpy.abs(leading)}
+
+    @_shared
+    def kcoreness_centrality_bu(self):
+        """
+        K-coreness of each node of a binary undirected connection matrix: the largest k for which the
+        node belongs to the k-core, the subgraph whose nodes all have degree k or more, together
+        with the size of every k-core (kn).
+        """
+        return self._kcoreness(directed=False)
+
+    @_shared
+    def kcoreness_centrality_bd(self):
+        """
+        K-coreness of each node of a binary directed connection matrix, with degree being indegree
+        plus outdegree, together with the size of every k-core (kn).
+        """
+        return self._kcoreness(directed=True)
+
+    @_shared
+    def erange(self):
+        """
+        Range of each edge of a binary directed connection matrix: the length of the shortest path
+        between its ends once the edge is removed (Watts & Strogatz 1998). Also the average range
+        (eta), the shortcuts, i.e. edges of range over two (Eshort), and their fraction (fs).
+        """
+        adjacency = self.sparse_adjacency
+        ranges = numpy.zeros((self.n, self.n))
+        for position, (source, target) in enumerate(zip(*adjacency.nonzero())):
+            cut = scipy.sparse.csr_matrix(adjacency, copy=True)
+            cut.data[position] = 0
+            cut.eliminate_zeros()
+            if source != target:
+                dist = scipy.sparse.csgraph.shortest_path(cut, method='D', unweighted=True, indices=source)
+                ranges[source, target] = dist[target]
+            else:
+                back = scipy.sparse.csgraph.shortest_path(cut.T, method='D', unweighted=True, indices=source)
+                successors = cut.indices[cut.indptr[source]:cut.indptr[source + 1]]
+                ranges[source, target] = (1 + back[successors]).min(initial=numpy.inf)
+        finite = (ranges > 0) & numpy.isfinite(ranges)
+        shortcuts = ranges > 2
+        return {'Erange': ranges, 'eta': ranges[finite].mean() if finite.any() else numpy.nan,
+                'Eshort': shortcuts.astype(numpy.float64),
+                'fs': numpy.count_nonzero(shortcuts) / float(adjacency.nnz)}
+
+    @_shared
+    def flow_coef_bd(self):
+        """
+        Flow coefficient of each node of a binary directed connection matrix: the fraction of its
+        neighbours joined through it by a path of length two but not directly (Honey et al. 2007),
+        the average flow coefficient (FC) and the number of such paths (total_flo).
+        """
+        adjacency = self.adjacency
+        coefficients = numpy.zeros(self.n)
+        total_flow = numpy.zeros(self.n)
+        for node in range(self.n):
+            neighbours = numpy.nonzero(adjacency[node] + adjacency[:, node])[0]
+            if not len(neighbours):
+                continue
+            flow = numpy.outer(adjacency[neighbours, node], adjacency[node, neighbours]) - \
+                adjacency[numpy.ix_(neighbours, neighbours)]
+            numpy.fill_diagonal(flow, 0)
+            total_flow[node] = numpy.count_nonzero(flow == 1)
+            possible = len(neighbours) ** 2 - len(neighbours)
+            coefficients[node] = total_flow[node] / possible if possible else 0
+        return {'fc': coefficients, 'FC': coefficients.mean(), 'total_flo': total_flow}
+
+    @staticmethod
+    def _participation(weights, communities):
+        strength = weights.sum(axis=1)
+        within = numpy.zeros(len(weights))
+        for community in numpy.unique(communities):
+            within += weights[:, communities == community].sum(axis=1) ** 2
+        participation = numpy.zeros(len(weights))
+        numpy.divide(within, strength ** 2, out=participation, where=strength != 0)
+        return numpy.where(strength != 0, 1 - participation, 0)
+
+    @_shared
+    def participation_coef(self):
+        """
+        Participation coefficient of each node of a (binary/weighted, directed/undirected)
+        connection matrix: the diversity of its connections across the communities found by
+        modularity_dir (Guimera & Amaral 2005).
+        """
+        return {'P': self._participation(self.weights, self.modularity_dir()['Ci'])}
+
+    @_shared
+    def participation_coef_sign(self):
+        """
+        Participation coefficient of each node computed separately from the positive (Ppos) and
+        negative (Pneg) weights of a signed connection matrix, over the communities found by
+        modularity_dir.
+        """
+        weights = self.weights.copy()
+        numpy.fill_diagonal(weights, 0)
+        communities = self.modularity_dir()['Ci']
+        return {'Ppos': self._participation(numpy.where(weights > 0, weights, 0), communities),
+                'Pneg': self._participation(numpy.where(weights < 0, -weights, 0), communities)}
+
+    @_shared
+    def subgraph_centrality(self):
+        """
+        Subgraph centrality of each node of a binary adjacency matrix: the weighted sum of closed
+        walks of all lengths starting and ending at the node, diag(exp(A)) (Estrada 2005).
+        """
+        adjacency = self.adjacency
+        if numpy.array_equal(adjacency, adjacency.T):
+            eigenvalues, eigenvectors = numpy.linalg.eigh(adjacency)
+            return {'Cs': (eigenvectors ** 2).dot(numpy.exp(eigenvalues))}
+        return {'Cs': numpy.diag(scipy.linalg.expm(adjacency)).copy()}
+
+
+MEASURES = ('degrees_und', 'degrees_dir', 'jdegree', 'matching_ind', 'strengths_und', 'strengths_dir',
+            'strengths_und_sign', 'density_dir', 'density_und',
+            'clustering_coef_bd', 'clustering_coef_bu', 'clustering_coef_wu', 'clustering_coef_wd',
+            'transitivity_bd', 'transitivity_wd', 'transitivity_bu', 'transitivity_wu',
+            'modularity_dir', 'modularity_und',
+            'distance_bin', 'distance_wei', 'breadthdist', 'reachdist', 'findwalks',
+            'efficiency_bin', 'efficiency_wei',
+            'betweenness_bin', 'betweenness_wei', 'edge_betweenness_bin', 'edge_betweenness_wei',
+            'eigenvector_centrality_und', 'kcoreness_centrality_bu', 'kcoreness_centrality_bd',
+            'erange', 'flow_coef_bd', 'participation_coef', 'participation_coef_sign', 'subgraph_centrality')
+
+
+def describe(measure):
+    """
+    The description of a measure, as documented on its GraphMeasures method.
+    """
+    return inspect.getdoc(getattr(GraphMeasures, measure))
+
+
+def compute_measures(weights, measures):
+    """
+    Compute several graph measures of one connection matrix in a single pass.
+
+    :param weights: square connection matrix
+    :param measures: names of measures, from ``MEASURES``
+    :returns: dictionary with the outputs of all measures, keyed by their BCT names
+    """
+    return GraphMeasures(weights).compute(measures)
+
+
+def compute_measures_batch(connectomes, measures, processes=None):
+    """
+    Compute the same graph measures for a batch of connection matrices, e.g. all the connectivities
+    of a datatype group, spreading the matrices over worker processes.
+
+    :param connectomes: sequence of square connection matrices
+    :param measures: names of measures, from ``MEASURES``
+    :param processes: number of worker processes; None uses all CPUs, 1 computes in this process
+    :returns: list with the result dictionary of each connection matrix
+    """
+    jobs = [(weights, measures) for weights in connectomes]
+    if processes == 1 or len(jobs) < 2:
+        return [compute_measures(*job) for job in jobs]
+    pool = multiprocessing.Pool(processes)
+    try:
+        return pool.starmap(compute_measures, jobs)
+    finally:
+        pool.close()
+        pool.join()
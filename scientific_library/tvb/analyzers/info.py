@@ -29,21 +29,64 @@
 #
 
 """
-This module implements information theoretic analyses. 
+This module implements information theoretic analyses.
 
-TODO: Fix docstring of sampen
-TODO: Convert sampen to a traited class
-TODO: Fix compatibility with  Python 3 and recent numpy
+Template matches are counted with a KD-tree under the Chebyshev norm, which avoids
+comparing every pair of embedding vectors explicitly.
 
 .. moduleauthor:: Marmaduke Woodman <marmaduke.woodman@univ-amu.fr>
 
 """
 import numpy
+from scipy.spatial import cKDTree
+import tvb.datatypes.entropy as entropy
+from tvb.basic.logger.builder import get_logger
 
+log = get_logger(__name__)
 
-def sampen(y, m=2, r=None, qse=False, taus=1, info=False,
-           tile=numpy.tile, na=numpy.newaxis, abs=numpy.abs,
-           log=numpy.log, r_=numpy.r_):
+
+def _embed(y, n):
+    """
+    Read-only view of the (y.size - n + 1, n) embedding vectors of signal y.
+    """
+    stride = y.strides[0]
+    return numpy.lib.stride_tricks.as_strided(y, shape=(y.size - n + 1, n), strides=(stride, stride), writeable=False)
+
+
+def _count_matches(vectors, r):
+    """
+    Number of vector pairs (i < j) with a Chebyshev distance strictly below r.
+    """
+    if r <= 0 or vectors.shape[0] < 2:
+        return 0
+    tree = cKDTree(vectors)
+    # count_neighbors uses <= r and counts each pair twice, plus every vector with itself
+    all_pairs = tree.count_neighbors(tree, numpy.nextafter(r, 0), p=numpy.inf)
+    return (int(all_pairs) - vectors.shape[0]) // 2
+
+
+def _coarse_grain(y, tau):
+    if tau > 1:
+        y = y[:y.shape[0] // tau * tau].reshape((-1, tau)).mean(axis=1)
+    return numpy.ascontiguousarray(y, dtype=numpy.float64)
+
+
+def _match_counts(y, m, r):
+    """
+    Counts of template matches of length m and m + 1.
+    """
+    return _count_matches(_embed(y, m), r), _count_matches(_embed(y, m + 1), r)
+
+
+def _entropy(c1, c2, r, qse):
+    if c1 == 0:
+        return numpy.nan
+    p = c2 * 1.0 / c1
+    with numpy.errstate(divide='ignore'):
+        return -numpy.log(p / (2 * r) if qse else p)
+
+
+def sampen(y, m=2, r=None, qse=False, taus=1, info=False):
     """
     Computes (quadratic) sample entropy of a given input signal y, with
     embedding dimension n, and a match tolerance of r (ref 2). If an array
@@ -75,38 +118,70 @@ def sampen(y, m=2, r=None, qse=False, taus=1, info=False,
     if type(taus) in (list, numpy.ndarray):
         return numpy.array([sampen(y, m=m, r=r, qse=qse, taus=int(tau)) for tau in taus])
 
-    # helper function to reformat arrays for matching
-    subseq = lambda y, n: y[tile(r_[0:n], (y.size - n + 1, 1)) + r_[0:y.size - n + 1][:, na]]
+    y = numpy.asarray(y)
 
     # default value of r
     if r is None:
         r = 0.15 * y.std()
 
-    # if we have a scale factor, coarsen time series 
-    if taus > 1:
-        y = y[:y.shape[0] // taus * taus].reshape((-1, taus)).mean(axis=1)
-
-    # compute embedding of signal dims m, m+1, initialize match counts to 0
-    Y1 = subseq(y, m)
-    Y2 = subseq(y, m + 1)
-    c1 = 0
-    c2 = 0
-
-    # check for matches
-    for i in range(Y1.shape[0] - 1):
-        c1 += (abs(tile(Y1[i], (Y1.shape[0] - i - 1, 1)) - Y1[i + 1:]) < r).all(axis=1).sum()
-
-    for i in range(Y2.shape[0] - 1):
-        c2 += (abs(tile(Y2[i], (Y2.shape[0] - i - 1, 1)) - Y2[i + 1:]) < r).all(axis=1).sum()
+    # coarsen time series by the scale factor, then count matches of embedding dimensions m, m+1
+    c1, c2 = _match_counts(_coarse_grain(y, int(taus)), m, r)
 
     # ref 2, last paragraph of methods, warn inaccurate estimate
     if c2 < 5:
-        print("m+1 template match count is low, %d < 5" % c2)
+        log.warning("m+1 template match count is low, %d < 5" % c2)
 
-    p = c2 * 1.0 / c1
-    e = -log(p / (2 * r) if qse else p)
+    e = _entropy(c1, c2, r, qse)
 
     if info:
-        return e, p, c2, c1
+        return e, c2 * 1.0 / c1 if c1 else numpy.nan, c2, c1
     else:
         return e
+
+
+def multiscale_entropy(data, m=2, r=0.15, taus=(1,), qse=False):
+    """
+    Sample entropy of every signal in data, for each scale factor in taus (ref 1 of `sampen`).
+
+    :param data: array with time on the first axis, any other axes index distinct signals
+    :param m: embedding dimension
+    :param r: match tolerance, as a fraction of the standard deviation of each signal
+    :param taus: integer scale factors
+    :returns: array of shape (len(taus),) + data.shape[1:]
+    """
+    data = numpy.asarray(data)
+    taus = [int(tau) for tau in numpy.atleast_1d(taus)]
+    signals = data.reshape((data.shape[0], -1))
+    result = numpy.empty((len(taus), signals.shape[1]))
+    for idx in range(signals.shape[1]):
+        signal = signals[:, idx]
+        tolerance = r * signal.std()
+        for tau_idx, tau in enumerate(taus):
+            c1, c2 = _match_counts(_coarse_grain(signal, tau), m, tolerance)
+            result[tau_idx, idx] = _entropy(c1, c2, tolerance, qse)
+    return result.reshape((len(taus),) + data.shape[1:])
+
+
+def calculate_multiscale_entropy(time_series, m=2, r=0.15, taus=(1,), qse=False):
+    """
+    # type: (TimeSeries, int, float, list, bool)  -> MultiscaleEntropy
+    Compute the sample entropy of each state variable, node and mode of the time series, at every scale.
+
+    Parameters
+    __________
+    time_series : TimeSeries
+    The TimeSeries to which the Multiscale Entropy is to be applied.
+
+    m : int
+    Embedding dimension.
+
+    r : float
+    Match tolerance, as a fraction of the standard deviation of each signal.
+
+    taus : list
+    Integer scale factors.
+    """
+    taus = numpy.array([int(tau) for tau in numpy.atleast_1d(taus)])
+    result = multiscale_entropy(time_series.data, m=m, r=r, taus=taus, qse=qse)
+    return entropy.MultiscaleEntropy(source=time_series, array_data=result, scales=taus,
+                                     embedding_dimension=m, tolerance=r)
@@ -69,7 +69,9 @@ KEY_CRYPT_PASSDIR = 'CRYPT_PASSDIR'
 KEY_CRYPT_DATADIR = 'CRYPT_DATADIR'
 KEY_HPC_COMPUTE_SITE = 'HPC_COMPUTE_SITE'
 KEY_MAX_THREAD_NR = 'MAXIMUM_NR_OF_THREADS'
+KEY_OP_MEMORY_BUDGET = 'OPERATIONS_MEMORY_BUDGET'
 KEY_OP_BACKGROUND_INTERVAL = 'OP_BACKGROUND_JOB_INTERVAL'
+KEY_DISK_USAGE_INTERVAL = 'DISK_USAGE_RECONCILE_INTERVAL'
 KEY_MAX_RANGE_NR = 'MAXIMUM_NR_OF_OPS_IN_RANGE'
 KEY_MAX_NR_SURFACE_VERTEX = 'MAXIMUM_NR_OF_VERTICES_ON_SURFACE'
 KEY_LAST_CHECKED_FILE_VERSION = 'LAST_CHECKED_FILE_VERSION'
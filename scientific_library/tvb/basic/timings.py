@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Scientific Package. This package holds all simulators, and
+# analysers necessary to run brain-simulations. You can use it stand alone or
+# in conjunction with TheVirtualBrain-Framework Package. See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Wall clock time spent in the named stages of a run, e.g. of a simulation or of an operation.
+
+A `StageTimings` can be made active on the current thread with `collecting`. The code of the lower layers
+(H5 storage, DB) then marks its own stages with `stage` or `timed`, which cost a look up only while nothing
+is collected. A stage nested in itself (e.g. a H5 read calling another H5 read) is counted once.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+clock = time.perf_counter
+
+_local = threading.local()
+
+
+class StageTimings(object):
+    """
+    Seconds spent in, and number of calls to, each stage, by stage name.
+    """
+
+    def __init__(self):
+        self.seconds = {}
+        self.calls = {}
+
+    def add(self, stage_name, seconds, calls=1):
+        self.seconds[stage_name] = self.seconds.get(stage_name, 0.0) + seconds
+        self.calls[stage_name] = self.calls.get(stage_name, 0) + calls
+
+    def update(self, other):
+        """ Add the stages of another StageTimings into this one """
+        for stage_name, seconds in other.seconds.items():
+            self.add(stage_name, seconds, other.calls.get(stage_name, 0))
+
+    def __len__(self):
+        return len(self.seconds)
+
+    def to_dict(self):
+        return {stage_name: {'seconds': seconds, 'calls': self.calls.get(stage_name, 0)}
+                for stage_name, seconds in self.seconds.items()}
+
+    @classmethod
+    def from_dict(cls, dikt):
+        timings = cls()
+        for stage_name, values in dikt.items():
+            timings.add(stage_name, values['seconds'], values['calls'])
+        return timings
+
+    def report(self):
+        """ One line per stage, the slowest first """
+        total = sum(self.seconds.values()) or 1.0
+        lines = []
+        for stage_name, seconds in sorted(self.seconds.items(), key=lambda item: -item[1]):
+            lines.append("%-40s %10.3f s %6.1f %% %10d calls" % (stage_name, seconds, 100.0 * seconds / total,
+                                                                 self.calls[stage_name]))
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return "<StageTimings(%s)>" % self.to_dict()
+
+
+def active_timings():
+    """ The StageTimings being collected on the current thread, or None """
+    return getattr(_local, 'timings', None)
+
+
+@contextmanager
+def collecting(timings):
+    """ Make timings the active StageTimings of the current thread, for the duration of the block """
+    previous, previous_open = active_timings(), getattr(_local, 'open_stages', None)
+    _local.timings, _local.open_stages = timings, set()
+    try:
+        yield timings
+    finally:
+        _local.timings, _local.open_stages = previous, previous_open
+
+
+@contextmanager
+def stage(stage_name):
+    """ Count the time spent in the block as stage_name, in the active StageTimings (if any) """
+    timings = active_timings()
+    if timings is None or stage_name in _local.open_stages:
+        yield
+        return
+    _local.open_stages.add(stage_name)
+    start = clock()
+    try:
+        yield
+    finally:
+        timings.add(stage_name, clock() - start)
+        _local.open_stages.discard(stage_name)
+
+
+def timed(stage_name):
+    """ Decorator counting the calls of a function as stage_name, like `stage` """
+
+    def wrap(func):
+
+        @wraps(func)
+        def timed_function(*args, **kwargs):
+            if getattr(_local, 'timings', None) is None:
+                return func(*args, **kwargs)
+            with stage(stage_name):
+                return func(*args, **kwargs)
+
+        return timed_function
+
+    return wrap
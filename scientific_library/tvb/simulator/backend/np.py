@@ -56,7 +56,8 @@ class NpBackend(MakoUtilMix):
             modname=None, fname=None):
         "Build and retrieve one or more Python functions from template."
         source = self.render_template(template_source, content)
-        source = autopep8.fix_code(source)
+        # declared dfuns can expand to very long expressions, which autopep8 is slow to wrap
+        source = autopep8.fix_code(source, options={'ignore': ['E501']})
         if print_source:
             print(self.insert_line_numbers(source))
         if fname is not None:
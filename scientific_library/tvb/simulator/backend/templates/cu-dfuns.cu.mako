@@ -28,6 +28,8 @@
 #
 #
 
+#define where(cond, if_true, if_false) ((cond) ? (if_true) : (if_false))
+
 __device__ void dfuns(
 	unsigned int id,
 	unsigned int n_node,
@@ -38,7 +40,7 @@ __device__ void dfuns(
 ) {
 
 % for par in sim.model.global_parameter_names:
-    const float ${par} = ${getattr(sim.model, par)[0]}f;
+    const float ${par} = ${float(getattr(sim.model, par)[0])}f;
 % endfor
 
 % for par in sim.model.spatial_parameter_names:
@@ -32,6 +32,11 @@ import math
 import numpy as np
 import numba as nb
 sin, cos, exp = math.sin, math.cos, math.exp
+log, sqrt, tanh, fabs, erfc = math.log, math.sqrt, math.tanh, math.fabs, math.erfc
+
+${'' if debug_nojit else '@nb.njit(inline="always")'}
+def where(cond, if_true, if_false):
+    return if_true if cond else if_false
 
 <%
     svars = ', '.join(sim.model.state_variables)
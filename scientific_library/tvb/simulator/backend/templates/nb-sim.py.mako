@@ -60,14 +60,15 @@ def run_sim(sim, nstep=None, sim_time=None):
     nnode = sim.connectivity.weights.shape[0]
     nsvar = len(sim.model.state_variables)
     # arrays
-    parmat = sim.model.spatial_parameter_matrix.T.astype(np.float32)
+    parmat = sim.model.spatial_parameter_matrix.T.astype(np.float32).reshape((nnode, -1))
     weights = sim.connectivity.weights.astype(np.float32)
     idelays = sim.connectivity.idelays.astype(np.uint32)
     # allocate buffers
     state = np.zeros((nsvar, nnode, horizon + nstep), np.float32)
     assert sim.current_step == 0, 'requires an un-run simulator'
-    state[:,:,:horizon-1] = np.transpose(sim.history.buffer[1:,:,:,0], (1,2,0))
-    state[:,:, horizon-1] = sim.history.buffer[0,:,:,0]
+    # history holds coupled variables only, uncoupled ones start from the current state
+    state[sim.model.cvar,:,:horizon-1] = np.transpose(sim.history.buffer[1:,:,:,0], (1,2,0))
+    state[:,:, horizon-1] = sim.current_state[:,:,0]
 % if stochastic:
     nsig = sim.integrator.noise.nsig
     # TODO use newer RNG infra in NumPy
@@ -39,10 +39,13 @@ def dfuns(dX, state, cX, parmat):
 % endfor
 
     pi = np.pi
+    exp, log, sqrt, tanh, sin, cos = np.exp, np.log, np.sqrt, np.tanh, np.sin, np.cos
+    fabs, where = np.abs, np.where
+    from scipy.special import erfc
 
     # unpack coupling terms and states as in dfuns
-    ${','.join(sim.model.coupling_terms)} = cX
-    ${','.join(sim.model.state_variables)} = state
+    ${','.join(sim.model.coupling_terms)}, = cX
+    ${','.join(sim.model.state_variables)}, = state
 
     # compute dfuns
 % for svar in sim.model.state_variables:
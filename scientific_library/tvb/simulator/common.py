@@ -37,12 +37,14 @@ A module of classes and functions of common use.
 
 """
 
+import copy
 import numpy
 import os
 import re
 import six
 import logging
 from tvb.basic.logger.builder import GLOBAL_LOGGER_BUILDER, get_logger
+from tvb.basic.neotraits.api import NArray
 from .backend.ref import ReferenceBackend
 
 
@@ -116,6 +118,29 @@ except ImportError:
     psutil = None
 
 
+def cast_float_arrays(traited, dtype):
+    """
+    Return a shallow copy of a HasTraits instance, e.g. a model or a coupling function, with its floating point
+    NArray attributes cast to dtype, so that they don't promote a state of another precision. The instance itself
+    is left untouched, and returned as it is when no attribute needs a cast.
+    Attributes whose declared dtype can't hold dtype are left as they are.
+    """
+    cast = {}
+    for name in type(traited).declarative_attrs:
+        attr = getattr(type(traited), name)
+        if not isinstance(attr, NArray) or not numpy.can_cast(dtype, attr.dtype, 'safe'):
+            continue
+        value = getattr(traited, name, None)
+        if isinstance(value, numpy.ndarray) and value.dtype.kind == 'f' and value.dtype != dtype:
+            cast[attr.field_name] = value.astype(dtype)
+    if not cast:
+        return traited
+    traited = copy.copy(traited)
+    # The NArray setter would cast the values back to the declared dtype, so the copy holds them directly
+    traited.__dict__.update(cast)
+    return traited
+
+
 class Struct(dict):
     """
     the Struct class is a dictionary with matlab/C struct-like access
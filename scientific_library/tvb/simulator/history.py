@@ -136,7 +136,7 @@ class BaseHistory(StaticAttr):
         sim.log.info('Final initial history shape is %r', history.shape)
 
         # create initial state from history
-        sim.current_state = history[sim.current_step % sim.connectivity.horizon].copy()
+        sim.current_state = history[sim.current_step % sim.connectivity.horizon].astype(sim.state_dtype)
         sim.log.debug('initial state has shape %r' % (sim.current_state.shape, ))
         if sim.surface is not None and history.shape[2] > sim.connectivity.number_of_regions:
             n_reg = sim.connectivity.number_of_regions
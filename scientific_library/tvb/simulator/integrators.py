@@ -48,6 +48,9 @@ import abc
 import functools
 import numpy
 import scipy.integrate
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
 from . import noise
 from .common import get_logger, simple_gen_astr
 from tvb.basic.neotraits.api import HasTraits, Attr, NArray, Float
@@ -224,14 +227,15 @@ class Integrator(HasTraits):
             self.clamp_integration_state(state)
 
     def integrate_with_update(self, X, model, coupling, local_coupling, stimulus):
+        # the updated state keeps the precision of the state given
         temp = model.update_state_variables_before_integration(X, coupling, local_coupling, stimulus)
         if temp is not None:
-            X = temp
+            X = temp.astype(X.dtype, copy=False)
             self.bound_and_clamp(X)
         X = self.integrate(X, model, coupling, local_coupling, stimulus)
         temp = model.update_state_variables_after_integration(X)
         if temp is not None:
-            X = temp
+            X = temp.astype(X.dtype, copy=False)
             self.bound_and_clamp(X)
         return X
 
@@ -543,6 +547,231 @@ class IdentityStochastic(IntegratorStochastic):
         return X_next
 
 
+class LinearizedBase(object):
+    """
+    Provides the Jacobian used by the semi-implicit and exponential integrators.
+
+    Within a node, the Jacobian of the model's dfun is taken from
+    ``Model.jacobian`` when the model implements it and integrates all of its
+    state variables, otherwise it is estimated by finite differences, with one
+    dfun evaluation per state variable. The result is block-sparse: one small
+    ``(nvar, nvar)`` block per node and mode.
+
+    On surfaces, the local coupling adds ``local_coupling * x`` terms which
+    couple neighbouring vertices. Their coefficients are estimated once per
+    local coupling matrix, assuming (as all built-in models do) that they do
+    not depend on the state, and the global sparse Jacobian is then solved
+    with SciPy's sparse routines, so that local coupling is treated implicitly.
+
+    """
+
+    _model = None
+    _model_jacobian = None
+    _local_coupling = None
+    _local_jacobian = None
+
+    def integrate(self, X, model, coupling, local_coupling, stimulus):
+        if model is not self._model:
+            self._model = model
+            # the model's Jacobian covers all its state variables, not only the integrated ones
+            self._model_jacobian = model.jacobian if model.state_variable_mask.all() else None
+        return super(LinearizedBase, self).integrate(X, model, coupling, local_coupling, stimulus)
+
+    def _node_jacobian(self, X, dfun, coupling, local_coupling, dX):
+        "Jacobian of dfun within each node and mode, of shape (nvar, nvar, nnode, nmode)."
+        if self._model_jacobian is not None:
+            try:
+                return self._model_jacobian(X, coupling, local_coupling)
+            except NotImplementedError:
+                self._model_jacobian = None
+        # the step has to follow the precision of the state, a float64 step vanishes on float32 states
+        fd_step = numpy.sqrt(numpy.finfo(X.dtype if X.dtype.kind == 'f' else numpy.float64).eps)
+        jac = numpy.empty((X.shape[0],) + X.shape)
+        for k in range(X.shape[0]):
+            X_k = X.copy()
+            X_k[k] += fd_step * numpy.maximum(1.0, numpy.abs(X[k]))
+            # divide by the step actually taken, after rounding to the state's precision
+            step = X_k[k] - X[k]
+            jac[:, k] = (dfun(X_k, coupling, local_coupling) - dX) / step
+        return jac
+
+    def _local_coupling_jacobian(self, X, dfun, coupling, local_coupling):
+        "Sparse Jacobian of the local coupling terms over the raveled state."
+        if self._local_coupling is not local_coupling:
+            nvar, _, nmode = X.shape
+
+            def local_terms(X_):
+                return dfun(X_, coupling, 1.0) - dfun(X_, coupling, 0.0)
+
+            spread = scipy.sparse.kron(local_coupling, scipy.sparse.identity(nmode), format='csr')
+            at_X = local_terms(X)
+            jac = scipy.sparse.csr_matrix((nvar * X[0].size,) * 2)
+            for k in range(nvar):
+                X_k = X.copy()
+                X_k[k] += 1.0
+                coefficients = local_terms(X_k) - at_X
+                for j in range(nvar):
+                    if numpy.any(coefficients[j]):
+                        block = scipy.sparse.diags(coefficients[j].ravel()) @ spread
+                        jac = jac + scipy.sparse.kron(
+                            scipy.sparse.coo_matrix(([1.0], ([j], [k])), shape=(nvar, nvar)), block)
+            self._local_coupling = local_coupling
+            self._local_jacobian = jac.tocsr()
+        return self._local_jacobian
+
+    def _linearize(self, X, dfun, coupling, local_coupling):
+        """
+        Returns dfun at X and its Jacobian, either as a dense (nvar, nvar, nnode, nmode) array
+        or, with a sparse local coupling, as a sparse matrix over the raveled state.
+
+        """
+        dX = dfun(X, coupling, local_coupling)
+        if not scipy.sparse.issparse(local_coupling):
+            return dX, self._node_jacobian(X, dfun, coupling, local_coupling, dX)
+        jac = self._node_jacobian(X, dfun, coupling, 0.0, dfun(X, coupling, 0.0))
+        nvar = X.shape[0]
+        node_jac = scipy.sparse.bmat([[scipy.sparse.diags(jac[j, k].ravel()) for k in range(nvar)]
+                                      for j in range(nvar)])
+        return dX, node_jac + self._local_coupling_jacobian(X, dfun, coupling, local_coupling)
+
+
+class SemiImplicitBase(LinearizedBase):
+    "Provides the linearly implicit Euler increment."
+
+    def _increment(self, X, dfun, coupling, local_coupling, stimulus):
+        dX, jac = self._linearize(X, dfun, coupling, local_coupling)
+        rhs = self.dt * (dX + stimulus)
+        if scipy.sparse.issparse(jac):
+            lhs = scipy.sparse.identity(jac.shape[0], format='csc') - self.dt * jac
+            return scipy.sparse.linalg.splu(lhs.tocsc()).solve(rhs.ravel()).reshape(X.shape)
+        lhs = numpy.eye(X.shape[0]) - self.dt * numpy.moveaxis(jac, (0, 1), (-2, -1))
+        increment = numpy.linalg.solve(lhs, numpy.moveaxis(rhs, 0, -1)[..., numpy.newaxis])
+        return numpy.moveaxis(increment[..., 0], -1, 0)
+
+
+class ExponentialBase(LinearizedBase):
+    "Provides the exponential Euler increment."
+
+    def _increment(self, X, dfun, coupling, local_coupling, stimulus):
+        dX, jac = self._linearize(X, dfun, coupling, local_coupling)
+        rhs = self.dt * (dX + stimulus)
+        # the exponential of the augmented matrix [[dt J, dt f], [0, 0]] holds dt phi_1(dt J) f in its last column
+        if scipy.sparse.issparse(jac):
+            size = jac.shape[0]
+            augmented = scipy.sparse.bmat([[self.dt * jac, rhs.reshape((-1, 1))],
+                                           [None, scipy.sparse.csr_matrix((1, 1))]], format='csc')
+            last = numpy.zeros(size + 1)
+            last[-1] = 1.0
+            return scipy.sparse.linalg.expm_multiply(augmented, last)[:size].reshape(X.shape)
+        nvar = X.shape[0]
+        augmented = numpy.zeros(X.shape[1:] + (nvar + 1, nvar + 1))
+        augmented[..., :nvar, :nvar] = self.dt * numpy.moveaxis(jac, (0, 1), (-2, -1))
+        augmented[..., :nvar, nvar] = numpy.moveaxis(rhs, 0, -1)
+        return numpy.moveaxis(scipy.linalg.expm(augmented)[..., :nvar, nvar], -1, 0)
+
+
+class SemiImplicitEulerDeterministic(SemiImplicitBase, Integrator):
+    """
+    The linearly implicit (Rosenbrock-Euler) method treats the model's Jacobian
+    implicitly and the rest of the drift, the long-range coupling and the
+    stimulus explicitly. It remains stable for stiff models at step sizes
+    where the explicit Euler and Heun schemes diverge.
+
+    """
+
+    _ui_name = "Semi-implicit Euler"
+    n_dx = 1
+
+    def scheme(self, X, dfun, coupling, local_coupling, stimulus):
+        r"""
+
+        .. math::
+            X_{n+1} = X_n + (I - dt \, J(X_n))^{-1} \, dt \, dX(t_n, X_n)
+
+        """
+
+        X_next = X + self._increment(X, dfun, coupling, local_coupling, stimulus)
+        self.integration_bound_and_clamp(X_next)
+
+        return X_next
+
+
+class SemiImplicitEulerStochastic(SemiImplicitBase, IntegratorStochastic):
+    """
+    A stochastic variant of the semi-implicit Euler method, with the noise
+    added explicitly as in the Euler-Maruyama scheme.
+
+    """
+
+    _ui_name = "Stochastic semi-implicit Euler"
+    n_dx = 1
+
+    def scheme(self, X, dfun, coupling, local_coupling, stimulus):
+        r"""
+
+        .. math::
+            X_{n+1} = X_n + (I - dt \, J(X_n))^{-1} \, dt \, dX(t_n, X_n) + g(X_n) Z_1
+
+        """
+
+        noise = self.noise.generate(X.shape)
+        X_next = X + self._increment(X, dfun, coupling, local_coupling, stimulus) + self.noise.gfun(X) * noise
+        self.integration_bound_and_clamp(X_next)
+
+        return X_next
+
+
+class ExponentialEulerDeterministic(ExponentialBase, Integrator):
+    """
+    The exponential Euler method integrates the model's linearization
+    exactly over a step, and is therefore exact for linear models and stable
+    for stiff ones whatever the step size.
+
+    """
+
+    _ui_name = "Exponential Euler"
+    n_dx = 1
+
+    def scheme(self, X, dfun, coupling, local_coupling, stimulus):
+        r"""
+
+        .. math::
+            X_{n+1} = X_n + dt \, \varphi_1(dt \, J(X_n)) \, dX(t_n, X_n), \quad
+            \varphi_1(z) = (e^z - 1) / z
+
+        """
+
+        X_next = X + self._increment(X, dfun, coupling, local_coupling, stimulus)
+        self.integration_bound_and_clamp(X_next)
+
+        return X_next
+
+
+class ExponentialEulerStochastic(ExponentialBase, IntegratorStochastic):
+    """
+    A stochastic variant of the exponential Euler method, with the noise
+    added explicitly as in the Euler-Maruyama scheme.
+
+    """
+
+    _ui_name = "Stochastic exponential Euler"
+    n_dx = 1
+
+    def scheme(self, X, dfun, coupling, local_coupling, stimulus):
+        r"""
+
+        .. math::
+            X_{n+1} = X_n + dt \, \varphi_1(dt \, J(X_n)) \, dX(t_n, X_n) + g(X_n) Z_1
+
+        """
+
+        noise = self.noise.generate(X.shape)
+        X_next = X + self._increment(X, dfun, coupling, local_coupling, stimulus) + self.noise.gfun(X) * noise
+        self.integration_bound_and_clamp(X_next)
+
+        return X_next
+
+
 class SciPyODEBase(object):
     "Provides a base class for integrators using SciPy's ode class."
 
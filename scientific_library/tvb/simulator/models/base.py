@@ -54,6 +54,8 @@ class Model(HasTraits):
     stvar = None
     state_variable_boundaries = None
     state_variable_mask = None
+    # why the model can not declare its dfun as state_variable_dfuns expressions, for the code generation backends
+    undeclared_dfuns_reason = None
 
     def _build_observer(self):
         template = ("def observe(state):\n"
@@ -166,6 +168,19 @@ class Model(HasTraits):
 
         """
 
+    def jacobian(self, state_variables, coupling, local_coupling=0.0):
+        """
+        Optionally provides the node-local Jacobian of ``dfun``, i.e. the
+        derivative of each state-variable's derivative with respect to each
+        state-variable of the same node and mode, as an array of shape
+        ``(nvar, nvar, nnode, nmode)``. ``local_coupling`` is a scalar here;
+        the sparse surface local coupling is assembled by the integrators.
+
+        Models which do not implement it are differentiated numerically by the
+        implicit and exponential integrators.
+
+        """
+        raise NotImplementedError
 
     # TODO refactor as a NodeSimulator class
     def stationary_trajectory(self,
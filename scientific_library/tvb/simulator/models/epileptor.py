@@ -282,6 +282,31 @@ class Epileptor(ModelNumbaDfun):
         doc="Quantities of the Epileptor available to monitor.",
     )
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["c_pop1", "c_pop2"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "x1": "tt * (y1 - z + Iext + Kvf * c_pop1 + where(x1 < 0.0, -a * pow(x1, 2) + b * x1, slope - x2"
+                  " + 0.6 * pow(z - 4.0, 2)) * x1)",
+            "y1": "tt * (c - d * pow(x1, 2) - y1)",
+            "z": "tt * (r * (where(modification, x0 + 3.0 / (1.0 + exp(-(x1 + 0.5) / 0.1)), 4.0 * (x1 - x0)"
+                 " + where(z < 0.0, -0.1 * pow(z, 7), 0.0)) - z + Ks * c_pop1))",
+            "x2": "tt * (-y2 + x2 - pow(x2, 3) + Iext2 + bb * g - 0.3 * (z - 3.5) + Kf * c_pop2)",
+            "y2": "tt * ((-y2 + where(x2 < -0.25, 0.0, aa * (x2 + 0.25))) / tau)",
+            "g": "tt * (-0.01 * (g - 0.1 * x1))",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple('x0 Iext Iext2 a b slope tt Kvf c d r Ks Kf aa bb tau modification'.split()))
+
     state_variables = ('x1', 'y1', 'z', 'x2', 'y2', 'g')
 
     _nvar = 6
@@ -493,6 +518,27 @@ class Epileptor2D(ModelNumbaDfun):
         default=('x1',),
         doc="Quantities of the Epileptor 2D available to monitor.")
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["c_pop"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "x1": "tt * (c - z + Iext + Kvf * c_pop - where(x1 < 0.0, a * pow(x1, 2) + (d - b) * x1, -slope"
+                  " - 0.6 * pow(z - 4.0, 2) + d * x1) * x1)",
+            "z": "tt * (r * (where(modification, x0 + 3.0 / (1.0 + exp(-(x1 + 0.5) / 0.1)), 4.0 * (x1 - x0)"
+                 " + where(z < 0.0, -0.1 * pow(z, 7), 0.0)) - z + Ks * c_pop))",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple('x0 Iext a b slope c d r Kvf Ks tt modification'.split()))
+
     state_variables = ('x1', 'z')
 
     _nvar = 2
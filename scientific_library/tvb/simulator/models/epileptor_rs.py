@@ -296,6 +296,34 @@ class EpileptorRestingState(ModelNumbaDfun):
         default=("x2 - x1", "z", "x_rs"),
         doc="Quantities of EpileptorRestingState available to monitor.")
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["c_pop1", "c_pop2", "c_pop3"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "x1": "tt * (y1 - z + Iext + Kvf * c_pop1 + where(x1 < 0.0, -a * pow(x1, 2) + b * x1, slope - x2"
+                  " + 0.6 * pow(z - 4.0, 2)) * x1)",
+            "y1": "tt * (c - d * pow(x1, 2) - y1)",
+            "z": "tt * (r * (4.0 * (x1 - x0) + where(z < 0.0, -0.1 * pow(z, 7), 0.0) - z + Ks * c_pop1))",
+            "x2": "tt * (-y2 + x2 - pow(x2, 3) + Iext2 + bb * g - 0.3 * (z - 3.5) + Kf * c_pop2)",
+            "y2": "tt * ((-y2 + where(x2 < -0.25, 0.0, aa * (x2 + 0.25))) / tau)",
+            "g": "tt * (-0.01 * (g - 0.1 * x1))",
+            "x_rs": "d_rs * tau_rs * (alpha_rs * y_rs - f_rs * pow(x_rs, 3) + e_rs * x_rs * x_rs"
+                    " + gamma_rs * I_rs + gamma_rs * K_rs * c_pop3)",
+            "y_rs": "d_rs * (a_rs + b_rs * x_rs - beta_rs * y_rs) / tau_rs",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple(('x0 Iext Iext2 a b slope tt Kvf c d r Ks Kf aa bb tau tau_rs I_rs a_rs b_rs '
+                       'd_rs e_rs f_rs beta_rs alpha_rs gamma_rs K_rs').split()))
+
     state_variables = ("x1", "y1", "z", "x2", "y2", "g", "x_rs", "y_rs")
 
     _nvar = 8                                           # number of state-variables
@@ -165,6 +165,8 @@ class EpileptorCodim3(ModelNumbaDfun):
     # number of state variables
     _nvar = 3
     cvar = numpy.array([0], dtype=numpy.int32)
+    undeclared_dfuns_reason = ("The resting state x_s is the real part of a complex cube root branch, chosen by N, "
+                               "on a great arc given by the derived unit vectors E and F.")
 
     # If there are derived parameters from the predefined parameters, then initialize them to None
     G = None
@@ -490,6 +492,8 @@ class EpileptorCodim3SlowMod(ModelNumbaDfun):
     # number of state variables
     _nvar = 5
     cvar = numpy.array([0], dtype=numpy.int32)
+    undeclared_dfuns_reason = ("The resting state x_s is the real part of a complex cube root branch, chosen by N, "
+                               "on a great arc given by the derived unit vectors E and F, themselves moving with uA and uB.")
 
     # If there are derived parameters from the predefined parameters, then initialize them to None
     G = None
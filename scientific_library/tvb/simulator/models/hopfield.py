@@ -132,6 +132,26 @@ class Hopfield(Model):
             conditions when the simulation isn't started from an explicit
             history, it is also provides the default range of phase-plane plots.""")
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["c_0"]
+    )
+
+    # static threshold equations of dfun, the dynamic threshold (dfunDyn) is not declared
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "x": "(-x + c_0) / taux",
+            "theta": "(-x + c_0) / taux",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple('taux'.split()))
+
     state_variables = ('x', 'theta')
 
     _nvar = 2
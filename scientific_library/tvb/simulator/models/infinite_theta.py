@@ -292,6 +292,27 @@ class CoombesByrne(Model):
     )
 
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["Coupling_Term_r", "Coupling_Term_V", "Coupling_Term_g", "Coupling_Term_q"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "r": "Delta / pi + 2.0 * V * r - g * r",
+            "V": "V * V - pi * pi * r * r + eta + (v_syn - V) * g + Coupling_Term_r",
+            "g": "alpha * q",
+            "q": "alpha * (k * pi * r - g - 2.0 * q)",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple('Delta alpha v_syn k eta'.split()))
+
     state_variables = ('r', 'V', 'g', 'q')
     _nvar = 4
     # Cvar is the coupling variable. 
@@ -401,6 +422,25 @@ class CoombesByrne2D(Model):
     )
 
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["Coupling_Term_r", "Coupling_Term_V"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "r": "Delta / pi + 2.0 * V * r - k * pi * r * r",
+            "V": "V * V - pi * pi * r * r + eta + (v_syn - V) * k * pi * r + Coupling_Term_r",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple('Delta v_syn k eta'.split()))
+
     state_variables = ('r', 'V')
     _nvar = 2
     # Cvar is the coupling variable. 
@@ -547,6 +587,28 @@ class GastSchmidtKnosche_SD(Model):
     )
 
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["Coupling_Term_r", "Coupling_Term_V", "Coupling_Term_A", "Coupling_Term_B"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "r": "1.0 / tau * (Delta / (pi * tau) + 2.0 * V * r)",
+            "V": "1.0 / tau * (V * V - pi * pi * tau * tau * r * r + eta + J * tau * r * (1.0 - A) + I"
+                 " + cr * Coupling_Term_r + cv * Coupling_Term_V)",
+            "A": "1.0 / tau_A * B",
+            "B": "1.0 / tau_A * (-2.0 * B - A + alpha * r)",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple('tau tau_A alpha I Delta J eta cr cv'.split()))
+
     state_variables = ('r', 'V', 'A', 'B')
     _nvar = 4
     # Cvar is the coupling variable. 
@@ -701,6 +763,28 @@ class GastSchmidtKnosche_SF(Model):
     )
 
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["Coupling_Term_r", "Coupling_Term_V", "Coupling_Term_A", "Coupling_Term_B"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "r": "1.0 / tau * (Delta / (pi * tau) + 2.0 * V * r)",
+            "V": "1.0 / tau * (V * V - pi * pi * tau * tau * r * r + eta + J * tau * r + I - A"
+                 " + cr * Coupling_Term_r + cv * Coupling_Term_V)",
+            "A": "1.0 / tau_A * B",
+            "B": "1.0 / tau_A * (-2.0 * B - A + alpha * r)",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple('tau tau_A alpha I Delta J eta cr cv'.split()))
+
     state_variables = ('r', 'V', 'A', 'B')
     _nvar = 4
     # Cvar is the coupling variable. 
@@ -891,6 +975,34 @@ class DumontGutkin(Model):
     )
 
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["Coupling_Term_r_e", "Coupling_Term_V_e", "Coupling_Term_r_i", "Coupling_Term_V_i"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "r_e": "1.0 / tau_e * (Delta_e / (pi * tau_e) + 2.0 * V_e * r_e)",
+            "V_e": "1.0 / tau_e * (V_e * V_e + eta_e - tau_e * tau_e * pi * pi * r_e * r_e + tau_e * s_ee"
+                   " - tau_e * s_ei + I_e)",
+            "s_ee": "1.0 / tau_s * (-s_ee + J_ee * r_e + Coupling_Term_r_e)",
+            "s_ei": "1.0 / tau_s * (-s_ei + J_ei * r_i)",
+            "r_i": "1.0 / tau_i * (Delta_i / (pi * tau_i) + 2.0 * V_i * r_i)",
+            "V_i": "1.0 / tau_i * (V_i * V_i + eta_i - tau_i * tau_i * pi * pi * r_i * r_i + tau_i * s_ie"
+                   " - tau_i * s_ii + I_i)",
+            "s_ie": "1.0 / tau_s * (-s_ie + J_ie * r_e + Gamma * Coupling_Term_r_e)",
+            "s_ii": "1.0 / tau_s * (-s_ii + J_ii * r_i)",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple(('I_e Delta_e eta_e tau_e I_i Delta_i eta_i tau_i tau_s J_ee J_ei J_ie J_ii '
+                       'Gamma').split()))
+
     state_variables = ('r_e', 'V_e', 's_ee', 's_ei', 'r_i', 'V_i', 's_ie', 's_ii')
     _nvar = 8
     # Cvar is the coupling variable. 
@@ -199,6 +199,31 @@ class JansenRit(ModelNumbaDfun):
                                     :math:`y1 = 1`, :math:`y2 = 2`, :math:`y3 = 3`, :math:`y4 = 4`, and
                                     :math:`y5 = 5`""")
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["c_y1", "c_y2"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "y0": "y3",
+            "y1": "y4",
+            "y2": "y5",
+            "y3": "A * a * 2.0 * nu_max / (1.0 + exp(r * (v0 - (y1 - y2)))) - 2.0 * a * y3 - a * a * y0",
+            "y4": "A * a * (mu + a_2 * J * 2.0 * nu_max / (1.0 + exp(r * (v0 - (a_1 * J * y0)))) + c_y1)"
+                  " - 2.0 * a * y4 - a * a * y1",
+            "y5": "B * b * (a_4 * J * 2.0 * nu_max / (1.0 + exp(r * (v0 - (a_3 * J * y0))))) - 2.0 * b * y5"
+                  " - b * b * y2",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple('nu_max r v0 a a_1 a_2 a_3 a_4 A b B J mu'.split()))
+
     state_variables = tuple('y0 y1 y2 y3 y4 y5'.split())
     _nvar = 6
     cvar = numpy.array([1, 2], dtype=numpy.int32)
@@ -468,6 +493,41 @@ class ZetterbergJansen(Model):
                                     :math:`v_7 = 1`, :math:`v_2 = 2`, :math:`v_3 = 3`, :math:`v_4 = 4`, and
                                     :math:`v_5 = 5`""")
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["c_v6"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "v1": "y1",
+            "y1": "He * ke * (gamma_1 * 2.0 * e0 / (1.0 + exp(rho_1 * (rho_2 - (v2 - v3)))) + gamma_1T * (U"
+                  " + 2.0 * e0 / (1.0 + exp(rho_1 * (rho_2 - c_v6))))) - 2.0 * ke * y1 - ke * ke * v1",
+            "v2": "y2",
+            "y2": "He * ke * (gamma_2 * 2.0 * e0 / (1.0 + exp(rho_1 * (rho_2 - v1))) + gamma_2T * (P"
+                  " + 2.0 * e0 / (1.0 + exp(rho_1 * (rho_2 - c_v6))))) - 2.0 * ke * y2 - ke * ke * v2",
+            "v3": "y3",
+            "y3": "Hi * ki * (gamma_4 * 2.0 * e0 / (1.0 + exp(rho_1 * (rho_2 - (v4 - v5))))) - 2.0 * ki * y3"
+                  " - ki * ki * v3",
+            "v4": "y4",
+            "y4": "He * ke * (gamma_3 * 2.0 * e0 / (1.0 + exp(rho_1 * (rho_2 - (v2 - v3)))) + gamma_3T * (Q"
+                  " + 2.0 * e0 / (1.0 + exp(rho_1 * (rho_2 - c_v6))))) - 2.0 * ke * y4 - ke * ke * v4",
+            "v5": "y5",
+            "y5": "Hi * ki * (gamma_5 * 2.0 * e0 / (1.0 + exp(rho_1 * (rho_2 - (v4 - v5))))) - 2.0 * ki * y5"
+                  " - ke * ke * v5",
+            "v6": "y2 - y3",
+            "v7": "y4 - y5",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple(('He Hi ke ki e0 rho_2 rho_1 gamma_1 gamma_2 gamma_3 gamma_4 gamma_5 '
+                       'gamma_1T gamma_2T gamma_3T P U Q').split()))
+
     state_variables = tuple('v1 y1 v2 y2 v3 y3 v4 y4 v5 y5 v6 v7'.split())
     _nvar = 12
     cvar = numpy.array([10], dtype=numpy.int32)
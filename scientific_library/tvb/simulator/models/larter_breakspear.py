@@ -433,6 +433,31 @@ class LarterBreakspear(Model):
             conditions when the simulation isn't started from an explicit
             history, it is also provides the default range of phase-plane plots.""")
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["c_0"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "V": "t_scale * (-(gCa + (1.0 - C) * rNMDA * aee * 0.5 * QV_max * (1.0 + tanh((V - VT) / d_V))"
+                 " + C * rNMDA * aee * c_0) * 0.5 * (1.0 + tanh((V - TCa) / d_Ca)) * (V - VCa) - gK * W * (V"
+                 " - VK) - gL * (V - VL) - (gNa * 0.5 * (1.0 + tanh((V - TNa) / d_Na)) + (1.0"
+                 " - C) * aee * 0.5 * QV_max * (1.0 + tanh((V - VT) / d_V)) + C * aee * c_0) * (V - VNa)"
+                 " - aie * Z * 0.5 * QZ_max * (1.0 + tanh((Z - ZT) / d_Z)) + ane * Iext)",
+            "W": "t_scale * phi * (0.5 * (1.0 + tanh((V - TK) / d_K)) - W) / tau_K",
+            "Z": "t_scale * b * (ani * Iext + aei * V * 0.5 * QV_max * (1.0 + tanh((V - VT) / d_V)))",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple(('gCa gK gL phi gNa TK TCa TNa VCa VK VL VNa d_K tau_K d_Na d_Ca aei aie b C '
+                       'ane ani aee Iext rNMDA VT d_V ZT d_Z QV_max QZ_max t_scale').split()))
+
     state_variables = tuple('V W Z'.split())
     _state_variables = ("V", "W", "Z")
     _nvar = 3
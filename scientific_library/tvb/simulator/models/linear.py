@@ -86,3 +86,7 @@ class Linear(Model):
         c, = coupling
         dx = self.gamma * x + c + local_coupling * x
         return numpy.array([dx])
+
+    def jacobian(self, state, coupling, local_coupling=0.0):
+        x, = state
+        return numpy.array([[numpy.zeros_like(x) + self.gamma + local_coupling]])
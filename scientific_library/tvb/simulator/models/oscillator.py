@@ -324,6 +324,25 @@ class Generic2dOscillator(ModelNumbaDfun):
         default=("V", ),
         doc="The quantities of interest for monitoring for the generic 2D oscillator.")
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["c_0"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "V": "d * tau * (alpha * W - f * V * V * V + e * V * V + g * V + gamma * I + gamma * c_0)",
+            "W": "d * (a + b * V + c * V * V - beta * W) / tau",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple('tau I a b c d e f g alpha beta gamma'.split()))
+
     state_variables = ('V', 'W')
     _nvar = 2
     cvar = numpy.array([0], dtype=numpy.int32)
@@ -386,6 +405,18 @@ class Generic2dOscillator(ModelNumbaDfun):
                                 self.beta, self.alpha, self.gamma, lc_0)
         return deriv.T[..., numpy.newaxis]
 
+    def jacobian(self, vw, c, local_coupling=0.0):
+        V = vw[0]
+        # spatialized parameters are flat here, see ModelNumbaDfun.spatial_param_reshape
+        tau, a, b, c, d, e, f, g, beta, alpha = [numpy.reshape(p, (-1, 1)) for p in (
+            self.tau, self.a, self.b, self.c, self.d, self.e, self.f, self.g, self.beta, self.alpha)]
+        jac = numpy.empty((2, 2) + V.shape)
+        jac[0, 0] = d * tau * (-3.0 * f * V ** 2 + 2.0 * e * V + g + local_coupling)
+        jac[0, 1] = d * tau * alpha
+        jac[1, 0] = d * (b + 2.0 * c * V) / tau
+        jac[1, 1] = -d * beta / tau
+        return jac
+
 
 @guvectorize([(float64[:],) * 16], '(n),(m)' + ',()'*13 + '->(n)', nopython=True)
 def _numba_dfun_g2d(vw, c_0, tau, I, a, b, c, d, e, f, g, beta, alpha, gamma, lc_0, dx):
@@ -453,6 +484,24 @@ class Kuramoto(Model):
                             model, however, only has one state variable with and index of 0, so it
                             is not necessary to change the default here.""")
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["c_0"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "theta": "omega + c_0",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple('omega'.split()))
+
     state_variables = ['theta']
     _nvar = 1
     cvar = numpy.array([0], dtype=numpy.int32)
@@ -547,6 +596,25 @@ class SupHopf(ModelNumbaDfun):
         default=("x",),
         doc="Quantities of supHopf available to monitor.")
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["c_0", "c_1"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "x": "(a - x * x - y * y) * x - omega * y + c_0",
+            "y": "(a - x * x - y * y) * y + omega * x + c_1",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple('a omega'.split()))
+
     state_variables = ["x", "y"]
     
     _nvar = 2                                           # number of state-variables
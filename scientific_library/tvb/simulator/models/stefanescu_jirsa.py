@@ -41,6 +41,8 @@ class ReducedSetBase(Model):
     number_of_modes = 3
     nu = 1500
     nv = 1500
+    undeclared_dfuns_reason = ("The dfun mixes the modes through the derived matrices (e.g. Aik, Bik, Cik), "
+                               "which element-wise expressions of one mode can not represent.")
 
     def configure(self):
         super(ReducedSetBase, self).configure()
@@ -305,6 +305,28 @@ class WilsonCowan(Model):
                corresponding state-variable indices for this model are :math:`E = 0`
                and :math:`I = 1`.""")
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["c_0", "c_1"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "E": "(-E + (k_e - r_e * E) * c_e / (1.0 + exp(-a_e * (alpha_e * (c_ee * E - c_ei * I + P"
+                 " - theta_e + c_0) - b_e)))) / tau_e",
+            "I": "(-I + (k_i - r_i * I) * c_i / (1.0 + exp(-a_i * (alpha_i * (c_ie * E - c_ii * I + Q"
+                 " - theta_i) - b_i)))) / tau_i",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple(('c_ee c_ei c_ie c_ii tau_e tau_i a_e b_e c_e theta_e a_i b_i theta_i c_i '
+                       'r_e r_i k_e k_i P Q alpha_e alpha_i').split()))
+
     state_variables = 'E I'.split()
     _nvar = 2
     cvar = numpy.array([0, 1], dtype=numpy.int32)
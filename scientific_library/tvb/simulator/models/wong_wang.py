@@ -141,6 +141,25 @@ class ReducedWongWang(ModelNumbaDfun):
         default=("S",),
         doc="""default state variables to be monitored""")
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["c_0"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "S": "-(S / tau_s) + (1.0 - S) * (a * (w * J_N * S + I_o + J_N * c_0) - b) / (1.0"
+                 " - exp(-d * (a * (w * J_N * S + I_o + J_N * c_0) - b))) * gamma",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple('a b d gamma tau_s w J_N I_o'.split()))
+
     state_variables = ['S']
     _nvar = 1
     cvar = numpy.array([0], dtype=numpy.int32)
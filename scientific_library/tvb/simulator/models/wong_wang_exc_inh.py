@@ -222,6 +222,30 @@ class ReducedWongWangExcInh(ModelNumbaDfun):
         default=('S_e', 'S_i'),
         doc="""default state variables to be monitored""")
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["c_0"]
+    )
+
+    state_variable_dfuns = Final(
+        label="Drift functions",
+        default={
+            "S_e": "-(S_e / tau_e) + (1.0 - S_e) * (a_e * (w_p * J_N * S_e - J_i * S_i + W_e * I_o"
+                   " + G * J_N * c_0 + I_ext) - b_e) / (1.0 - exp(-d_e * (a_e * (w_p * J_N * S_e - J_i * S_i"
+                   " + W_e * I_o + G * J_N * c_0 + I_ext) - b_e))) * gamma_e",
+            "S_i": "-(S_i / tau_i) + (a_i * (J_N * S_e - S_i + W_i * I_o + lamda * G * J_N * c_0)"
+                   " - b_i) / (1.0 - exp(-d_i * (a_i * (J_N * S_e - S_i + W_i * I_o + lamda * G * J_N * c_0)"
+                   " - b_i))) * gamma_i",
+        }
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple(('a_e b_e d_e gamma_e tau_e w_p J_N W_e a_i b_i d_i gamma_i tau_i J_i W_i '
+                       'I_o I_ext G lamda').split()))
+
     state_variables = ['S_e', 'S_i']
     _nvar = 2
     cvar = numpy.array([0], dtype=numpy.int32)
@@ -37,6 +37,34 @@ from tvb.basic.neotraits.api import NArray, Range, Final, List
 from numba import jit
 
 
+def _fluct_regime_exprs(Fe, Fi, Fe_ext, Fi_ext, W, E_L):
+    "Expressions of mu_V, sigma_V and T_V, as computed by ZerlautAdaptationFirstOrder.get_fluct_regime_vars."
+    fe = "((%s + 1.0e-6) * (1. - g) * p_connect * N_tot + (%s) * K_ext_e)" % (Fe, Fe_ext)
+    fi = "((%s + 1.0e-6) * g * p_connect * N_tot + (%s) * K_ext_i)" % (Fi, Fi_ext)
+    mu_Ge, mu_Gi = "(Q_e * tau_e * %s)" % fe, "(Q_i * tau_i * %s)" % fi
+    mu_G = "(g_L + %s + %s)" % (mu_Ge, mu_Gi)
+    T_m = "(C_m / %s)" % mu_G
+    mu_V = "((%s * E_e + %s * E_i + g_L * %s - %s) / %s)" % (mu_Ge, mu_Gi, E_L, W, mu_G)
+    U_e, U_i = "(Q_e / %s * (E_e - %s))" % (mu_G, mu_V), "(Q_i / %s * (E_i - %s))" % (mu_G, mu_V)
+    fluct_e = "%s * pow(%s * tau_e, 2)" % (fe, U_e)
+    fluct_i = "%s * pow(%s * tau_i, 2)" % (fi, U_i)
+    sigma_V = "sqrt(%s / (2. * (tau_e + %s)) + %s / (2. * (tau_i + %s)))" % (fluct_e, T_m, fluct_i, T_m)
+    T_V = "((%s + %s) / (%s / (tau_e + %s) + %s / (tau_i + %s)))" % (fluct_e, fluct_i, fluct_e, T_m, fluct_i, T_m)
+    return mu_V, sigma_V, T_V
+
+
+def _TF_expr(P, Fe, Fi, Fe_ext, Fi_ext, W, E_L):
+    "Expression of ZerlautAdaptationFirstOrder.TF, with the threshold polynomial coefficients P inlined."
+    mu_V, sigma_V, T_V = _fluct_regime_exprs(Fe, Fi, Fe_ext, Fi_ext, W, E_L)
+    V = "((%s - -60.0) / 10.0)" % mu_V
+    S = "((%s - 4.0) / 6.0)" % sigma_V
+    T = "((%s * g_L / C_m - 0.5) / 1.)" % T_V
+    monomials = ("1.0", V, S, T, "pow(%s, 2)" % V, "pow(%s, 2)" % S, "pow(%s, 2)" % T,
+                 "%s * %s" % (V, S), "%s * %s" % (V, T), "%s * %s" % (S, T))
+    V_thre = " + ".join("%r * %s" % (float(p), monomial) for p, monomial in zip(P, monomials))
+    return "erfc(((%s) * 1e3 - %s) / (sqrt(2.0) * %s)) / (2 * %s)" % (V_thre, mu_V, sigma_V, T_V)
+
+
 class ZerlautAdaptationFirstOrder(Model):
     r"""
     **References**:
@@ -355,6 +383,36 @@ class ZerlautAdaptationFirstOrder(Model):
     _nvar = 4
     cvar = numpy.array([0], dtype=numpy.int32)
 
+    coupling_terms = Final(
+        label="Coupling terms",
+        # how to unpack coupling array
+        default=["c_0"]
+    )
+
+    parameter_names = List(
+        of=str,
+        label="List of parameters for this model",
+        default=tuple('g_L E_L_e E_L_i C_m b_e a_e b_i a_i tau_w_e tau_w_i E_e E_i Q_e Q_i tau_e tau_i N_tot '
+                      'p_connect g K_ext_e K_ext_i T external_input_ex_ex external_input_ex_in '
+                      'external_input_in_ex external_input_in_in'.split()))
+
+    @property
+    def state_variable_dfuns(self):
+        """
+        Drift functions, with the transfer functions expanded. The coefficients of the
+        threshold polynomials P_e and P_i are inlined, with their current values.
+        """
+        input_e = ("E", "I", "c_0 + external_input_ex_ex", "external_input_ex_in")
+        input_i = ("E", "I", "c_0 + external_input_in_ex", "external_input_in_in")
+        mu_V_e = _fluct_regime_exprs(*input_e, "W_e", "E_L_e")[0]
+        mu_V_i = _fluct_regime_exprs(*input_i, "W_i", "E_L_i")[0]
+        return {
+            "E": "(%s - E) / T" % _TF_expr(self.P_e, *input_e, "W_e", "E_L_e"),
+            "I": "(%s - I) / T" % _TF_expr(self.P_i, *input_i, "W_i", "E_L_i"),
+            "W_e": "-W_e / tau_w_e + b_e * E + a_e * (%s - E_L_e) / tau_w_e" % mu_V_e,
+            "W_i": "-W_i / tau_w_i + b_i * I + a_i * (%s - E_L_i) / tau_w_i" % mu_V_i,
+        }
+
     def dfun(self, state_variables, coupling, local_coupling=0.00):
         r"""
         .. math::
@@ -634,6 +692,10 @@ class ZerlautAdaptationSecondOrder(ZerlautAdaptationFirstOrder):
     state_variables = 'E I C_ee C_ei C_ii W_e W_i'.split()
     _nvar = 7
 
+    state_variable_dfuns = None
+    undeclared_dfuns_reason = ("The dfun takes first and second order finite differences of the transfer functions, "
+                               "which would expand them about twenty times in each expression.")
+
     def dfun(self, state_variables, coupling, local_coupling=0.00):
         r"""
         .. math::
@@ -56,6 +56,7 @@ Conversion of power of 2 sample-rates(Hz) to Monitor periods(ms)
 
 import abc
 import numpy
+import scipy.sparse
 from tvb.datatypes.time_series import (TimeSeries, TimeSeriesRegion, TimeSeriesEEG, TimeSeriesMEG, TimeSeriesSEEG,
                                        TimeSeriesSurface)
 from tvb.simulator import noise
@@ -66,6 +67,7 @@ import tvb.datatypes.equations as equations
 from tvb.simulator.common import numpy_add_at
 from tvb.simulator.backend.ref import ReferenceBackend
 from tvb.basic.neotraits.api import HasTraits, Attr, NArray, Float, narray_describe
+from tvb.basic.timings import clock
 from .backend import ReferenceBackend
 
 class Monitor(HasTraits):
@@ -92,6 +94,10 @@ class Monitor(HasTraits):
     dt = None
     voi = None
     _stock = numpy.empty([])
+    # dtype in which the state is summed or averaged, from the simulator's precision
+    _accumulator_dtype = numpy.float64
+    # whether sample needs the state of every step, or only of the steps multiple of istep
+    accumulates = True
 
     def __str__(self):
         clsname = self.__class__.__name__
@@ -117,6 +123,7 @@ class Monitor(HasTraits):
         the the Simulator's configure() method.
 
         """
+        self._accumulator_dtype = simulator.accumulator_dtype
         self._config_vois(simulator)
         self._config_time(simulator)
 
@@ -137,6 +144,16 @@ class Monitor(HasTraits):
 
         """
 
+    def sample_voi(self, step, voi_state):
+        """
+        Provide monitor output from ``state[self.voi]`` only. Subclasses whose sample
+        depends on nothing else implement it, and their ``sample`` delegates to it, so
+        that a :class:`MonitorPipeline` can extract the variables of interest once per
+        step for all the monitors watching them.
+
+        """
+        raise NotImplementedError
+
     def create_time_series(self, connectivity=None, surface=None, region_map=None, region_volume_map=None):
         """
         Create a time series instance that will be populated by this monitor
@@ -223,11 +240,16 @@ class SubSample(Monitor):
 
     """
     _ui_name = "Temporally sub-sample"
+    accumulates = False
 
     def sample(self, step, state):
+        if step % self.istep == 0:
+            return self.sample_voi(step, state[self.voi, :])
+
+    def sample_voi(self, step, voi_state):
         if step % self.istep == 0:
             time = step * self.dt
-            return [time, state[self.voi, :]]
+            return [time, voi_state]
 
 
 class SpatialAverage(Monitor):
@@ -246,6 +268,7 @@ class SpatialAverage(Monitor):
 
     """
     _ui_name = "Spatial average with temporal sub-sample"
+    accumulates = False
     CORTICAL = "cortical"
     HEMISPHERES = "hemispheres"
     REGION_MAPPING = "region mapping"
@@ -320,20 +343,25 @@ class SpatialAverage(Monitor):
 
         self.log.debug("spatial_mask")
         self.log.debug(narray_describe(self.spatial_mask))
-        spatial_sum = numpy.zeros((number_of_nodes, number_of_areas))
-        spatial_sum[numpy.arange(number_of_nodes), self.spatial_mask] = 1
-        spatial_sum = spatial_sum.T
-        self.log.debug("spatial_sum")
-        self.log.debug(narray_describe(spatial_sum))
-        nodes_per_area = numpy.sum(spatial_sum, axis=1)[:, numpy.newaxis]
-        self.spatial_mean = spatial_sum / nodes_per_area
-        self.log.debug("spatial_mean")
-        self.log.debug(narray_describe(self.spatial_mean))
+        # each node belongs to exactly one area, so the averaging operator has one
+        # non-zero per column: keep it sparse, (n_areas, n_nodes) is mostly zeros
+        nodes_per_area = numpy.bincount(self.spatial_mask, minlength=number_of_areas)
+        self.spatial_mean = scipy.sparse.csr_matrix(
+            (1.0 / nodes_per_area[self.spatial_mask], (self.spatial_mask, numpy.arange(number_of_nodes))),
+            shape=(number_of_areas, number_of_nodes), dtype=self._accumulator_dtype)
+        self.log.debug("spatial_mean has %d non-zeros for shape %s",
+                       self.spatial_mean.nnz, self.spatial_mean.shape)
 
     def sample(self, step, state):
+        if step % self.istep == 0:
+            return self.sample_voi(step, state[self.voi, :])
+
+    def sample_voi(self, step, voi_state):
         if step % self.istep == 0:
             time = step * self.dt
-            monitored_state = numpy.dot(self.spatial_mean, state[self.voi, :])
+            n_voi, n_node, n_mode = voi_state.shape
+            nodes_first = voi_state.transpose((1, 0, 2)).reshape((n_node, n_voi * n_mode))
+            monitored_state = self.spatial_mean.dot(nodes_first).reshape((-1, n_voi, n_mode))
             return [time, monitored_state.transpose((1, 0, 2))]
 
     def create_time_series(self, connectivity=None, surface=None,
@@ -358,12 +386,17 @@ class GlobalAverage(Monitor):
 
     """
     _ui_name = "Global average"
+    accumulates = False
 
     def sample(self, step, state):
         """Records if integration step corresponds to sampling period."""
+        if step % self.istep == 0:
+            return self.sample_voi(step, state[self.voi, :])
+
+    def sample_voi(self, step, voi_state):
         if step % self.istep == 0:
             time = step * self.dt
-            data = numpy.mean(state[self.voi, :], axis=1)[:, numpy.newaxis, :]
+            data = numpy.mean(voi_state, axis=1, dtype=self._accumulator_dtype)[:, numpy.newaxis, :]
             return [time, data]
 
     def create_time_series(self, connectivity=None, surface=None,
@@ -376,30 +409,34 @@ class TemporalAverage(Monitor):
     """
     Monitors the averaged value for the model's variable/s of interest over all
     the nodes at each sampling period. Time steps that are not modulo ``istep``
-    are stored temporarily in the ``_stock`` attribute and then that temporary
-    store is averaged and returned when time step is modulo ``istep``.
+    are summed into the ``_stock`` attribute and that running sum is divided by
+    ``istep`` and returned when time step is modulo ``istep``.
 
     """
     _ui_name = "Temporal average"
 
     def _config_time(self, simulator):
         super(TemporalAverage, self)._config_time(simulator)
-        stock_size = (self.istep, self.voi.shape[0],
+        stock_size = (self.voi.shape[0],
                       simulator.number_of_nodes,
                       simulator.model.number_of_modes)
         self.log.debug("Temporal average stock_size is %s" % (str(stock_size),))
-        self._stock = numpy.zeros(stock_size)
+        self._stock = numpy.zeros(stock_size, dtype=self._accumulator_dtype)
 
     def sample(self, step, state):
         """
         Records if integration step corresponds to sampling period, Otherwise
-        just update the monitor's stock. When the step corresponds to the sample
-        period, the ``_stock`` is averaged over time for return. 
+        just add the state to the monitor's stock. When the step corresponds to
+        the sample period, the ``_stock`` is averaged over time for return.
 
         """
-        self._stock[((step % self.istep) - 1), :] = state[self.voi]
+        return self.sample_voi(step, state[self.voi])
+
+    def sample_voi(self, step, voi_state):
+        self._stock += voi_state
         if step % self.istep == 0:
-            avg_stock = numpy.mean(self._stock, axis=0)
+            avg_stock = self._stock / self.istep
+            self._stock[:] = 0.0
             time = (step - self.istep / 2.0) * self.dt
             return [time, avg_stock]
 
@@ -431,8 +468,8 @@ class AfferentCouplingTemporalAverage(AfferentCoupling, TemporalAverage):
     """
     Monitors the averaged value for the model's coupling variable/s of interest over all
     the nodes at each sampling period. Time steps that are not modulo ``istep``
-    are stored temporarily in the ``_stock`` attribute and then that temporary
-    store is averaged and returned when time step is modulo ``istep``.
+    are summed into the ``_stock`` attribute and that running sum is averaged
+    and returned when time step is modulo ``istep``.
 
     """
     _ui_name = "Coupling Temporal average"
@@ -580,8 +617,10 @@ class Projection(Monitor):
         self.gain[~nan_mask] = 0.0
         self.log.debug('Zeroed %d NaN gain coefficients', nan_mask.sum())
 
-        # attrs used for recording
-        self._state = numpy.zeros((self.gain.shape[0], len(self.voi)))
+        # attrs used for recording; the projection being linear, the node state is summed
+        # over the period and projected once when sampling, instead of on every step
+        self.gain = self.gain.astype(self._accumulator_dtype, copy=False)
+        self._state = numpy.zeros((self.gain.shape[1], len(self.voi)), dtype=self._accumulator_dtype)
         self._period_in_steps = int(self.period / self.dt)
         self.log.debug('State shape %s, period in steps %s', self._state.shape, self._period_in_steps)
 
@@ -592,17 +631,25 @@ class Projection(Monitor):
 
     def sample(self, step, state):
         "Record state, returning sample at sampling frequency / period."
-        self._state += self.gain.dot(state[self.voi].sum(axis=-1).T)
+        return self.sample_voi(step, state[self.voi])
+
+    def sample_voi(self, step, voi_state):
+        self._state += voi_state.sum(axis=-1).T
         if step % self._period_in_steps == 0:
-            time = (step - self._period_in_steps / 2.0) * self.dt
-            sample = self._state.copy() / self._period_in_steps
+            projected = self.gain.dot(self._state)
+            self._state[:] = 0.0
+            return self._projected_sample(step, projected)
 
-            # add observation noise if available
-            if self.obsnoise is not None:
-                sample += self.obsnoise.generate(shape=sample.shape)
+    def _projected_sample(self, step, projected):
+        "Build the sample of a period from the projection of the state summed over it."
+        time = (step - self._period_in_steps / 2.0) * self.dt
+        sample = projected / self._period_in_steps
 
-            self._state[:] = 0.0
-            return time, sample.T[..., numpy.newaxis] # for compatibility
+        # add observation noise if available
+        if self.obsnoise is not None:
+            sample += self.obsnoise.generate(shape=sample.shape)
+
+        return time, sample.T[..., numpy.newaxis] # for compatibility
 
     _gain = None
 
@@ -706,12 +753,10 @@ class EEG(Projection):
             V_r[sensor_k, :] = numpy.sum(Q * (a / na**3), axis=1 ) / (4.0 * numpy.pi * self.sigma)
         return V_r
 
-    def sample(self, step, state):
-        maybe_sample = super(EEG, self).sample(step, state)
-        if maybe_sample is not None:
-            time, sample = maybe_sample
-            sample -= self._ref_vec.dot(sample[:, self._ref_vec_mask])[:, numpy.newaxis]
-            return time, sample.reshape((state.shape[0], -1, 1))
+    def _projected_sample(self, step, projected):
+        time, sample = super(EEG, self)._projected_sample(step, projected)
+        sample -= self._ref_vec.dot(sample[:, self._ref_vec_mask])[:, numpy.newaxis]
+        return time, sample
 
     def create_time_series(self, connectivity=None, surface=None,
                            region_map=None, region_volume_map=None):
@@ -926,11 +971,12 @@ class Bold(Monitor):
     def _config_time(self, simulator):
         super(Bold, self)._config_time(simulator)
         self.compute_hrf()
+        self.hemodynamic_response_function = self.hemodynamic_response_function.astype(self._accumulator_dtype)
         sample_shape = self.voi.shape[0], simulator.number_of_nodes, simulator.model.number_of_modes
-        self._interim_stock = numpy.zeros((self._interim_istep,) + sample_shape)
+        self._interim_stock = numpy.zeros((self._interim_istep,) + sample_shape, dtype=self._accumulator_dtype)
         self.log.debug("BOLD inner buffer %s %.2f MB" % (
             self._interim_stock.shape, self._interim_stock.nbytes / 2 ** 20))
-        self._stock = numpy.zeros((self._stock_steps,) + sample_shape)
+        self._stock = numpy.zeros((self._stock_steps,) + sample_shape, dtype=self._accumulator_dtype)
         self.log.debug("BOLD outer buffer %s %.2f MB" % (
             self._stock.shape, self._stock.nbytes / 2 ** 20))
 
@@ -1008,3 +1054,106 @@ class ProgressLogger(Monitor):
 
     def sample(self, step, state):
         raise NotImplementedError
+
+
+class _FusedProjections(object):
+    """
+    Projection monitors with the same period and variables of interest: their state is summed
+    once per step and projected through their stacked gain matrices once per period.
+    """
+
+    def __init__(self, projections):
+        self.monitors = projections
+        self.gain = numpy.vstack([monitor.gain for monitor in projections])
+        self._splits = numpy.cumsum([monitor.gain.shape[0] for monitor in projections])[:-1]
+        self._period_in_steps = projections[0]._period_in_steps
+        self._state = numpy.zeros((self.gain.shape[1], len(projections[0].voi)), dtype=self.gain.dtype)
+        self._step = None
+        self._projected = None
+
+    def sample(self, step, monitor, voi_state):
+        if step != self._step:
+            self._step = step
+            self._state += voi_state.sum(axis=-1).T
+            self._projected = None
+            if step % self._period_in_steps == 0:
+                self._projected = numpy.split(self.gain.dot(self._state), self._splits)
+                self._state[:] = 0.0
+        if self._projected is not None:
+            return monitor._projected_sample(step, self._projected[self.monitors.index(monitor)])
+
+
+class MonitorPipeline(object):
+    """
+    Runs the monitors of a simulation on each integration step. The observed state is
+    restricted to each distinct set of variables of interest at most once per step and
+    shared by the monitors watching them; monitors which only sub-sample are given that
+    state on their sampling steps only; projection monitors sharing a period and variables
+    of interest are evaluated together (see :class:`_FusedProjections`).
+
+    Monitors which don't implement `sample_voi`, or which override `sample` without it,
+    are recorded as before with the full observed state.
+
+    While `seconds` is set to a list (one float per monitor), the time spent recording
+    each monitor is added to it.
+    """
+
+    OBSERVED = "observed"
+    COUPLING = "coupling"
+
+    def __init__(self, monitors):
+        self.monitors = list(monitors)
+        self.seconds = None
+        self._plan = []
+        self._fused = {}
+        fusable = {}
+        for monitor in self.monitors:
+            source = self.COUPLING if isinstance(monitor, AfferentCoupling) else self.OBSERVED
+            if not self._samples_voi(monitor):
+                self._plan.append((monitor, source, None))
+                continue
+            key = source, tuple(numpy.asarray(monitor.voi).tolist())
+            self._plan.append((monitor, source, key))
+            if isinstance(monitor, Projection) and type(monitor).sample_voi is Projection.sample_voi:
+                fusable.setdefault(key + (monitor._period_in_steps,), []).append(monitor)
+
+        for projections in fusable.values():
+            if len(projections) > 1:
+                fused = _FusedProjections(projections)
+                for monitor in projections:
+                    self._fused[id(monitor)] = fused
+                fused.monitors[0].log.debug("Fused %d projection monitors, gain shape %s", len(projections), fused.gain.shape)
+
+    @staticmethod
+    def _samples_voi(monitor):
+        "Whether the monitor's sample is its `sample_voi` applied to ``state[voi]``."
+        monitor_class = type(monitor)
+        for klass in monitor_class.__mro__:
+            if 'sample_voi' in vars(klass):
+                return klass is not Monitor and monitor_class.sample is klass.sample
+        return False
+
+    def record(self, step, observed, node_coupling):
+        sources = {self.OBSERVED: observed, self.COUPLING: node_coupling}
+        voi_states = {}
+        if self.seconds is None:
+            return [self._record_one(step, planned, sources, voi_states) for planned in self._plan]
+        output = []
+        for i, planned in enumerate(self._plan):
+            start = clock()
+            output.append(self._record_one(step, planned, sources, voi_states))
+            self.seconds[i] += clock() - start
+        return output
+
+    def _record_one(self, step, planned, sources, voi_states):
+        monitor, source, key = planned
+        if key is None:
+            return monitor.record(step, sources[source])
+        if not monitor.accumulates and step % monitor.istep != 0:
+            return None
+        if key not in voi_states:
+            voi_states[key] = sources[source][monitor.voi]
+        fused = self._fused.get(id(monitor))
+        if fused is None:
+            return monitor.sample_voi(step, voi_states[key])
+        return fused.sample(step, monitor, voi_states[key])
@@ -39,21 +39,54 @@ simulation and the method for running the simulation.
 
 """
 
+import copy
 import math
 import time
 
 import numpy
 from tvb.basic.neotraits.api import HasTraits, Attr, NArray, List, Float
 from tvb.basic.profile import TvbProfile
+from tvb.basic.timings import StageTimings, clock
 from tvb.datatypes import cortex, connectivity, patterns, region_mapping
 from tvb.simulator import models, integrators, monitors, coupling
 from tvb.simulator.models.base import Model
 
 from .backend import ReferenceBackend
-from .common import psutil
+from .common import psutil, cast_float_arrays
 from .history import SparseHistory
 
 
+STAGE_STIMULUS = "simulator.stimulus"
+STAGE_INTEGRATION = "simulator.integration"
+STAGE_MODEL_DFUN = "simulator.model_dfun"
+STAGE_HISTORY = "simulator.history"
+STAGE_COUPLING = "simulator.coupling"
+STAGE_OBSERVE = "simulator.observe"
+STAGE_MONITOR = "simulator.monitor.%d.%s"
+
+
+class _TimedModel(object):
+    """
+    Stands for the model given to the integrator, adding up the time spent in its dfun.
+    """
+
+    def __init__(self, model):
+        self._model = model
+        self.seconds = 0.0
+        self.calls = 0
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+    def dfun(self, *args, **kwargs):
+        start = clock()
+        try:
+            return self._model.dfun(*args, **kwargs)
+        finally:
+            self.seconds += clock() - start
+            self.calls += 1
+
+
 # TODO with refactor, this becomes more of a builder, since iterator will account for
 # most of the runtime associated with a simulation.
 class Simulator(HasTraits):
@@ -163,6 +196,24 @@ class Simulator(HasTraits):
         required=True,
         doc="""The length of a simulation (default in milliseconds).""")
 
+    FLOAT64 = "float64"
+    FLOAT32 = "float32"
+    MIXED = "mixed"
+
+    precision = Attr(
+        field_type=str,
+        label="Floating point precision",
+        default=FLOAT64,
+        choices=(FLOAT64, FLOAT32, MIXED),
+        required=False,
+        doc="""Precision of the numbers the simulation works with. ``float64``
+        keeps the state, model and coupling parameters, noise and monitors in
+        double precision. ``float32`` keeps all of them in single precision,
+        halving the memory traffic of each step. ``mixed`` keeps the state in
+        single precision, but monitors which sum the state over time or nodes
+        (e.g. TemporalAverage, Bold, EEG) accumulate in double precision.
+        The delay buffers of the history are kept in single precision in every mode.""")
+
     backend = ReferenceBackend()
 
     history = None  # type: SparseHistory
@@ -181,9 +232,13 @@ class Simulator(HasTraits):
     _memory_requirement_census = None
     _storage_requirement = None
     _runtime = None
+    _monitor_pipeline = None
 
     integrate_next_step = None
 
+    stage_timings = None  # type: StageTimings
+    """When set to a StageTimings, the time spent in each stage of the integration loop is added to it."""
+
     # methods consist of
     # 1) generic configure
     # 2) component specific configure
@@ -191,6 +246,20 @@ class Simulator(HasTraits):
     # 4) loop step
     # 5) estimations
 
+    @property
+    def state_dtype(self):
+        """The dtype of the state, and of the parameters and noise it is combined with."""
+        if self.precision in (self.FLOAT32, self.MIXED):
+            return numpy.float32
+        return numpy.float64
+
+    @property
+    def accumulator_dtype(self):
+        """The dtype in which monitors sum or average the state."""
+        if self.precision == self.FLOAT32:
+            return numpy.float32
+        return numpy.float64
+
     @property
     def is_surface_simulation(self):
         if self.surface:
@@ -272,6 +341,7 @@ class Simulator(HasTraits):
         # Reshape integrator.noise.nsig, if necessary.
         if isinstance(self.integrator, integrators.IntegratorStochastic):
             self._configure_integrator_noise()
+        self._configure_precision()
         # create history
         # TODO refactor history impl to backend
         self._configure_history()
@@ -282,10 +352,28 @@ class Simulator(HasTraits):
         # Allow user to chain configure to another call or assignment.
         return self
 
+    def _configure_precision(self):
+        """
+        Bring everything combined with the state on each step to the dtype of the state.
+        The simulator then works on cast copies, the model, coupling and integrator given by the user keep theirs.
+        """
+        dtype = self.state_dtype
+        self.model = cast_float_arrays(self.model, dtype)
+        self.coupling = cast_float_arrays(self.coupling, dtype)
+        if isinstance(self.integrator, integrators.IntegratorStochastic):
+            noise = cast_float_arrays(self.integrator.noise, dtype)
+            if noise.dtype != dtype:
+                if noise is self.integrator.noise:
+                    noise = copy.copy(noise)
+                noise.dtype = dtype
+            if noise is not self.integrator.noise:
+                self.integrator = copy.copy(self.integrator)
+                self.integrator.noise = noise
+
     def _prepare_local_coupling(self):
         if self.surface is None:
             return 0.0
-        return self.surface.prepare_local_coupling(self.number_of_nodes)
+        return self.surface.prepare_local_coupling(self.number_of_nodes).astype(self.state_dtype)
 
     def _loop_compute_node_coupling(self, step):
         """Compute delayed node coupling values."""
@@ -301,7 +389,7 @@ class Simulator(HasTraits):
             # TODO time grid wrong for continuations
             time = numpy.r_[0.0: self.simulation_length: self.integrator.dt]
             self.stimulus.configure_time(time.reshape((1, -1)))
-            stimulus = numpy.zeros((self.model.nvar, self.number_of_nodes, 1))
+            stimulus = numpy.zeros((self.model.nvar, self.number_of_nodes, 1), dtype=self.state_dtype)
             self.log.debug("stimulus shape is: %s", stimulus.shape)
         return stimulus
 
@@ -318,14 +406,65 @@ class Simulator(HasTraits):
             state = self.backend.surface_state_to_rois(self._regmap, self.connectivity.number_of_regions, state)
         self.history.update(step, state)
 
-    def _loop_monitor_output(self, step, state, node_coupling):
-        observed = self.model.observe(state)
-        output = [monitor.record(step,
-                                 node_coupling if isinstance(monitor, monitors.AfferentCoupling) else observed)
-                  for monitor in self.monitors]
+    def _loop_monitor_output(self, step, state, node_coupling, observe_seconds=None):
+        if self._monitor_pipeline is None:
+            self._monitor_pipeline = monitors.MonitorPipeline(self.monitors)
+        if observe_seconds is None:
+            observed = self.model.observe(state)
+        else:
+            start = clock()
+            observed = self.model.observe(state)
+            observe_seconds[0] += clock() - start
+        output = self._monitor_pipeline.record(step, observed, node_coupling)
         if any(outputi is not None for outputi in output):
             return output
 
+    def _timed_loop(self, start_step, n_steps, state, node_coupling, local_coupling, stimulus):
+        """
+        The integration loop of __call__, adding the time spent in each of its stages to stage_timings.
+        Times are summed in local variables and added once the loop ends (or is left), to keep the cost
+        of the measures to a few clock reads per step.
+        """
+        model = _TimedModel(self.model)
+        pipeline = self._monitor_pipeline = self._monitor_pipeline or monitors.MonitorPipeline(self.monitors)
+        pipeline.seconds = [0.0] * len(pipeline.monitors)
+        stimulus_time = integration_time = history_time = coupling_time = 0.0
+        observe_seconds = [0.0]
+        steps_done = 0
+        try:
+            for step in range(start_step, start_step + n_steps):
+                time_0 = clock()
+                self._loop_update_stimulus(step, stimulus)
+                time_1 = clock()
+                state = self.integrate_next_step(state, model, node_coupling, local_coupling, stimulus)
+                time_2 = clock()
+                self._loop_update_history(step, state)
+                time_3 = clock()
+                node_coupling = self._loop_compute_node_coupling(step + 1)
+                time_4 = clock()
+                stimulus_time += time_1 - time_0
+                integration_time += time_2 - time_1
+                history_time += time_3 - time_2
+                coupling_time += time_4 - time_3
+                steps_done += 1
+                output = self._loop_monitor_output(step, state, node_coupling, observe_seconds)
+                if output is not None:
+                    yield output
+        finally:
+            timings = self.stage_timings
+            if self.stimulus is not None:
+                timings.add(STAGE_STIMULUS, stimulus_time, steps_done)
+            # the dfun calls happen within the integration step
+            timings.add(STAGE_INTEGRATION, integration_time - model.seconds, steps_done)
+            timings.add(STAGE_MODEL_DFUN, model.seconds, model.calls)
+            timings.add(STAGE_HISTORY, history_time, steps_done)
+            timings.add(STAGE_COUPLING, coupling_time, steps_done)
+            timings.add(STAGE_OBSERVE, observe_seconds[0], steps_done)
+            for i, (monitor, seconds) in enumerate(zip(pipeline.monitors, pipeline.seconds)):
+                timings.add(STAGE_MONITOR % (i, type(monitor).__name__), seconds, steps_done)
+            pipeline.seconds = None
+        return state
+
     def __call__(self, simulation_length=None, random_state=None, n_steps=None):
         """
         Return an iterator which steps through simulation time, generating monitor outputs.
@@ -360,14 +499,17 @@ class Simulator(HasTraits):
             if not numpy.issubdtype(type(n_steps), numpy.integer):
                 raise TypeError("Incorrect type for n_steps: %s, expected integer" % type(n_steps))
 
-        for step in range(start_step, start_step + n_steps):
-            self._loop_update_stimulus(step, stimulus)
-            state = self.integrate_next_step(state, self.model, node_coupling, local_coupling, stimulus)
-            self._loop_update_history(step, state)
-            node_coupling = self._loop_compute_node_coupling(step + 1)
-            output = self._loop_monitor_output(step, state, node_coupling)
-            if output is not None:
-                yield output
+        if self.stage_timings is not None:
+            state = yield from self._timed_loop(start_step, n_steps, state, node_coupling, local_coupling, stimulus)
+        else:
+            for step in range(start_step, start_step + n_steps):
+                self._loop_update_stimulus(step, stimulus)
+                state = self.integrate_next_step(state, self.model, node_coupling, local_coupling, stimulus)
+                self._loop_update_history(step, state)
+                node_coupling = self._loop_compute_node_coupling(step + 1)
+                output = self._loop_monitor_output(step, state, node_coupling)
+                if output is not None:
+                    yield output
 
         self.current_state = state
         self.current_step = self.current_step + n_steps
@@ -437,6 +579,7 @@ class Simulator(HasTraits):
         # Configure monitors
         for monitor in self.monitors:
             monitor.config_for_sim(self)
+        self._monitor_pipeline = monitors.MonitorPipeline(self.monitors)
 
     def _configure_stimuli(self):
         """ Configure the defined Stimuli for this Simulator """
@@ -500,6 +643,7 @@ class Simulator(HasTraits):
         magic_number = 2.42  # Current guesstimate is low by about a factor of 2, seems safer to over estimate...
         bits_64 = 8.0  # Bytes
         bits_32 = 4.0  # Bytes
+        stock_bytes = numpy.dtype(self.accumulator_dtype).itemsize
         # NOTE: The speed hack for getting the first element of hist shape should
         #      partially resolves calling of this method with a non-configured
         #     connectivity, there remains the less common issue if no tract_lengths...
@@ -525,7 +669,7 @@ class Simulator(HasTraits):
                                len(self.model.variables_of_interest),
                                number_of_nodes,
                                self.model.number_of_modes)
-                memreq += numpy.prod(stock_shape) * bits_64
+                memreq += numpy.prod(stock_shape) * stock_bytes
                 if hasattr(monitor, "sensors"):
                     try:
                         memreq += number_of_nodes * monitor.sensors.number_of_sensors * bits_64  # projection_matrix
@@ -542,8 +686,8 @@ class Simulator(HasTraits):
                                        len(self.model.variables_of_interest),
                                        number_of_nodes,
                                        self.model.number_of_modes)
-                memreq += numpy.prod(stock_shape) * bits_64
-                memreq += numpy.prod(interim_stock_shape) * bits_64
+                memreq += numpy.prod(stock_shape) * stock_bytes
+                memreq += numpy.prod(interim_stock_shape) * stock_bytes
 
         if psutil and memreq > psutil.virtual_memory().total:
             self.log.warning("There may be insufficient memory for this simulation.")
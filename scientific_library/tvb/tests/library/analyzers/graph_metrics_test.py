@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Scientific Package. This package holds all simulators, and
+# analysers necessary to run brain-simulations. You can use it stand alone or
+# in conjunction with TheVirtualBrain-Framework Package. See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import networkx
+import numpy
+import pytest
+from tvb.analyzers import graph_metrics
+from tvb.tests.library.base_testcase import BaseTestCase
+
+
+def _random_weights(n=30, density=0.15, seed=7, symmetric=False):
+    rng = numpy.random.RandomState(seed)
+    weights = (rng.rand(n, n) < density) * rng.rand(n, n)
+    if symmetric:
+        weights = numpy.triu(weights, 1)
+        weights = weights + weights.T
+    numpy.fill_diagonal(weights, 0)
+    return weights
+
+
+class TestGraphMetrics(BaseTestCase):
+    """
+    Compares `tvb.analyzers.graph_metrics` against the networkx implementations of the same measures.
+    """
+
+    def test_betweenness(self):
+        weights = _random_weights()
+        measures = graph_metrics.compute_measures(weights, ['edge_betweenness_bin', 'betweenness_wei'])
+
+        binary = networkx.from_numpy_array((weights != 0) * 1.0, create_using=networkx.DiGraph)
+        expected = networkx.betweenness_centrality(binary, normalized=False)
+        assert numpy.allclose(measures['BC'], [expected[i] for i in range(len(weights))])
+        for (i, j), value in networkx.edge_betweenness_centrality(binary, normalized=False).items():
+            assert numpy.isclose(measures['EBC'][i, j], value)
+
+        weighted = networkx.from_numpy_array(weights, create_using=networkx.DiGraph)
+        expected = networkx.betweenness_centrality(weighted, normalized=False, weight='weight')
+        assert numpy.allclose(measures['C'], [expected[i] for i in range(len(weights))])
+
+    def test_distances_and_efficiency(self):
+        weights = _random_weights(symmetric=True)
+        graph = networkx.from_numpy_array(weights)
+        measures = graph_metrics.GraphMeasures(weights)
+
+        lengths = dict(networkx.all_pairs_dijkstra_path_length(graph))
+        distances = measures.distance_wei()['D']
+        for i in range(len(weights)):
+            for j in range(len(weights)):
+                assert numpy.isclose(distances[i, j], lengths[i].get(j, numpy.inf))
+
+        binary = networkx.from_numpy_array((weights != 0) * 1.0)
+        assert numpy.isclose(measures.efficiency_bin()['Eglob'], networkx.global_efficiency(binary))
+        reach = measures.breadthdist()['R']
+        assert not reach.diagonal().any()
+
+    def test_clustering_and_cores(self):
+        weights = _random_weights(symmetric=True, density=0.3)
+        binary = networkx.from_numpy_array((weights != 0) * 1.0)
+        measures = graph_metrics.compute_measures(weights, ['clustering_coef_bu', 'transitivity_bu',
+                                                            'kcoreness_centrality_bu', 'subgraph_centrality'])
+        nodes = range(len(weights))
+        clustering = networkx.clustering(binary)
+        assert numpy.allclose(measures['C'], [clustering[i] for i in nodes])
+        assert numpy.isclose(measures['T'], networkx.transitivity(binary))
+        cores = networkx.core_number(binary)
+        assert numpy.allclose(measures['coreness'], [cores[i] for i in nodes])
+        centrality = networkx.subgraph_centrality(binary)
+        assert numpy.allclose(measures['Cs'], [centrality[i] for i in nodes])
+
+    def test_modularity(self):
+        weights = _random_weights(symmetric=True)
+        measures = graph_metrics.compute_measures(weights, ['modularity_und', 'participation_coef'])
+        communities = [set(numpy.nonzero(measures['Ci'] == c)[0]) for c in numpy.unique(measures['Ci'])]
+        assert len(communities) > 1
+        expected = networkx.algorithms.community.modularity(networkx.from_numpy_array(weights), communities)
+        assert numpy.isclose(measures['Q'], expected)
+        assert ((measures['P'] >= 0) & (measures['P'] <= 1)).all()
+
+    def test_degrees_and_density(self):
+        weights = _random_weights()
+        measures = graph_metrics.compute_measures(weights, ['degrees_dir', 'strengths_dir', 'density_dir'])
+        assert numpy.array_equal(measures['id'], (weights != 0).sum(axis=0))
+        assert numpy.array_equal(measures['od'], (weights != 0).sum(axis=1))
+        assert numpy.allclose(measures['strength'], weights.sum(axis=0) + weights.sum(axis=1))
+        assert measures['K'] == numpy.count_nonzero(weights)
+
+    def test_batch_and_shared_intermediates(self):
+        connectomes = [_random_weights(seed=seed) for seed in range(3)]
+        batch = graph_metrics.compute_measures_batch(connectomes, ['betweenness_bin', 'distance_bin'], processes=2)
+        for weights, result in zip(connectomes, batch):
+            single = graph_metrics.GraphMeasures(weights)
+            assert numpy.allclose(result['C'], single.betweenness_bin()['C'])
+            assert single.edge_betweenness_bin()['BC'] is single.betweenness_bin()['C']
+
+    def test_unknown_measure(self):
+        with pytest.raises(ValueError):
+            graph_metrics.compute_measures(_random_weights(), ['not_a_measure'])
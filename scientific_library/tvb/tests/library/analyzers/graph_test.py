@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Scientific Package. This package holds all simulators, and
+# analysers necessary to run brain-simulations. You can use it stand alone or
+# in conjunction with TheVirtualBrain-Framework Package. See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import networkx
+import numpy
+import scipy.sparse.csgraph
+from tvb.analyzers import graph
+from tvb.tests.library.base_testcase import BaseTestCase
+
+
+class _WhiteMatter(object):
+    def __init__(self, weights):
+        self.weights = weights
+
+
+def _random_weights(n=30, density=0.15, seed=11):
+    rng = numpy.random.RandomState(seed)
+    weights = numpy.triu((rng.rand(n, n) < density) * rng.rand(n, n), 1)
+    return weights + weights.T
+
+
+class TestGraph(BaseTestCase):
+    """
+    Tests the path based analyses and the lesion strategies of `tvb.analyzers.graph`.
+    """
+
+    def test_path_measures(self):
+        weights = _random_weights()
+        binary = networkx.from_numpy_array((weights > 0) * 1.0)
+        expected = networkx.betweenness_centrality(binary, normalized=False)
+        assert numpy.allclose(graph.betweenness_bin(weights), [2 * expected[i] for i in range(len(weights))])
+        assert numpy.isclose(graph.efficiency_bin(weights), networkx.global_efficiency(binary))
+        assert graph.efficiency_bin(weights, compute_local_efficiency=True).shape == (len(weights), 1)
+        largest = max(len(component) for component in networkx.connected_components(binary))
+        assert graph.get_components_sizes(weights) == largest
+
+    def test_lesion_updates_distances(self):
+        weights = _random_weights()
+        lesion = graph.LesionedDistances(weights)
+        for node in numpy.random.RandomState(3).permutation(len(weights))[:-2]:
+            lesion.remove(node)
+            expected = scipy.sparse.csgraph.shortest_path(lesion.adjacency, unweighted=True)
+            assert numpy.array_equal(lesion.distances, expected)
+            assert numpy.isclose(lesion.global_efficiency, graph.efficiency_bin(lesion.adjacency))
+            assert lesion.largest_component == graph.get_components_sizes(lesion.adjacency)
+
+    def test_random_deletion_ensemble(self):
+        white_matter = _WhiteMatter(_random_weights(n=12))
+        sequences, strength, degree, efficiency, component = graph.random_deletion_ensemble(
+            white_matter, 3, processes=2, random_state=5)
+        assert sequences.shape == (3, 10)
+        assert strength.shape == degree.shape == (3, 12, 10)
+        assert efficiency.shape == component.shape == (3, 10)
+        single = graph.sequential_random_deletion(white_matter, sequences[1], 12)
+        assert numpy.allclose(single[2], efficiency[1])
+        assert numpy.allclose(single[3], component[1])
+
+    def test_targeted_deletion(self):
+        weights = _random_weights(n=12)
+        results = graph.sequential_targeted_deletion(_WhiteMatter(weights), 12)
+        assert results[2].shape == (12, 10)
+        assert results[3].shape == results[4].shape == (10, 3)
+        assert (numpy.diff(results[4], axis=0) <= 0).all()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Scientific Package. This package holds all simulators, and
+# analysers necessary to run brain-simulations. You can use it stand alone or
+# in conjunction with TheVirtualBrain-Framework Package. See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+from tvb.basic.timings import StageTimings, active_timings, collecting, stage, timed
+from tvb.tests.library.base_testcase import BaseTestCase
+
+
+@timed("io")
+def _read(depth):
+    if depth:
+        _read(depth - 1)
+
+
+class TestStageTimings(BaseTestCase):
+
+    def test_nothing_collected_when_inactive(self):
+        assert active_timings() is None
+        with stage("io"):
+            _read(1)
+        assert active_timings() is None
+
+    def test_collecting(self):
+        timings = StageTimings()
+        with collecting(timings):
+            with stage("load"):
+                _read(0)
+            _read(2)
+        assert active_timings() is None
+        assert timings.calls == {"load": 1, "io": 2}
+        assert all(seconds >= 0 for seconds in timings.seconds.values())
+
+    def test_nested_stage_counted_once(self):
+        timings = StageTimings()
+        with collecting(timings):
+            _read(3)
+        assert timings.calls == {"io": 1}
+
+    def test_nested_collecting(self):
+        outer, inner = StageTimings(), StageTimings()
+        with collecting(outer):
+            with stage("io"):
+                with collecting(inner):
+                    _read(0)
+            _read(0)
+        assert inner.calls == {"io": 1}
+        assert outer.calls == {"io": 2}
+
+    def test_dict_round_trip_and_update(self):
+        timings = StageTimings()
+        timings.add("launch", 2.0)
+        timings.add("h5_io", 0.5, calls=3)
+        copy = StageTimings.from_dict(timings.to_dict())
+        assert copy.to_dict() == timings.to_dict()
+        copy.update(timings)
+        assert copy.seconds == {"launch": 4.0, "h5_io": 1.0}
+        assert copy.calls == {"launch": 2, "h5_io": 6}
+        assert copy.report().splitlines()[0].startswith("launch")
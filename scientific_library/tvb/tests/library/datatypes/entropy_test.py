@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Scientific Package. This package holds all simulators, and
+# analysers necessary to run brain-simulations. You can use it stand alone or
+# in conjunction with TheVirtualBrain-Framework Package. See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import numpy
+from tvb.analyzers.info import sampen, calculate_multiscale_entropy
+from tvb.tests.library.base_testcase import BaseTestCase
+from tvb.datatypes import entropy, time_series
+
+
+def _brute_force_sampen(y, m, r):
+    """ Reference implementation, comparing every pair of templates. """
+    counts = []
+    for n in (m, m + 1):
+        templates = numpy.array([y[i:i + n] for i in range(y.size - n + 1)])
+        distances = numpy.abs(templates[:, numpy.newaxis] - templates[numpy.newaxis]).max(axis=-1)
+        counts.append((numpy.triu(distances < r, k=1)).sum())
+    return -numpy.log(counts[1] * 1.0 / counts[0])
+
+
+class TestEntropy(BaseTestCase):
+    """
+    Tests the defaults for `tvb.datatypes.entropy` module and the `tvb.analyzers.info` computations.
+    """
+
+    def test_sampen_matches_brute_force(self):
+        y = numpy.random.RandomState(42).randn(500)
+        r = 0.2 * y.std()
+        assert numpy.allclose(sampen(y, m=2, r=r), _brute_force_sampen(y, 2, r))
+        coarse = y[:y.size // 3 * 3].reshape((-1, 3)).mean(axis=1)
+        assert numpy.allclose(sampen(y, m=2, r=r, taus=numpy.array([1, 3])),
+                              [_brute_force_sampen(y, 2, r), _brute_force_sampen(coarse, 2, r)])
+
+    def test_multiscale_entropy(self):
+        data = numpy.random.RandomState(42).randn(400, 2, 3, 1)
+        ts = time_series.TimeSeries(data=data, title='meh')
+        mse = calculate_multiscale_entropy(ts, m=2, r=0.15, taus=[1, 2])
+        assert mse.array_data.shape == (2, 2, 3, 1)
+        signal = data[:, 1, 2, 0]
+        assert numpy.allclose(mse.array_data[:, 1, 2, 0],
+                              sampen(signal, m=2, r=0.15 * signal.std(), taus=numpy.array([1, 2])))
+
+        summary_info = mse.summary_info()
+        assert isinstance(mse, entropy.MultiscaleEntropy)
+        assert summary_info['Dimensions'] == ('Scale', 'State Variable', 'Space', 'Mode')
+        assert summary_info['Source'] == 'meh'
+        assert summary_info['Scales'] == [1, 2]
+        assert summary_info['Embedding dimension'] == 2
@@ -38,6 +38,7 @@ Base classes for backend tests.
 import unittest
 import numpy as np
 
+from tvb.simulator.models import ModelsEnum
 from tvb.simulator.models.infinite_theta import MontbrioPazoRoxin
 from tvb.simulator.models.linear import Linear as LinearModel
 from tvb.datatypes.connectivity import Connectivity
@@ -52,8 +53,8 @@ class BaseTestSim(unittest.TestCase):
 
 
     def _create_sim(self, integrator=None, inhom_mmpr=False, delays=False,
-            run_sim=True):
-        mpr = MontbrioPazoRoxin()
+            run_sim=True, model=None):
+        mpr = MontbrioPazoRoxin() if model is None else model
         conn = Connectivity.from_file()
         if inhom_mmpr:
             dispersion = 1 + np.random.randn(conn.weights.shape[0])*0.1
@@ -74,7 +75,7 @@ class BaseTestSim(unittest.TestCase):
         # kernel has history in reverse order except 1st element 🤕
         rbuf = np.concatenate((buf[0:1], buf[1:][::-1]), axis=0)
         state = np.transpose(rbuf, (1, 0, 2)).astype('f')
-        self.assertEqual(state.shape[0], 2)
+        self.assertEqual(state.shape[0], len(mpr.cvar))
         self.assertEqual(state.shape[2], conn.weights.shape[0])
         if isinstance(sim.integrator, IntegratorStochastic):
             sim.integrator.noise.reset_random_stream()
@@ -141,6 +142,23 @@ class BaseTestDfun(unittest.TestCase):
         self.assertEqual(len(model.spatial_parameter_matrix), n_spatial)
         return model
 
+    def _declared_models(self):
+        "Built-in models which declare their drift functions symbolically."
+        models = []
+        for model_class in ModelsEnum.get_base_model_subclasses():
+            model = model_class()
+            if model.undeclared_dfuns_reason is None:
+                model.configure()
+                models.append(model)
+        return models
+
+    def _random_dfun_inputs(self, model, n_node=128):
+        "Random states within the state variable ranges, and small coupling terms."
+        state = np.array([np.random.uniform(*model.state_variable_range[svar], size=(n_node, 1))
+                          for svar in model.state_variables])
+        cX = np.random.rand(len(model.cvar), n_node, 1) / 10.0
+        return state, cX
+
 
 class BaseTestIntegrate(unittest.TestCase):
     pass
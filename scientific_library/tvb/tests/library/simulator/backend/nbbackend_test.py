@@ -42,6 +42,8 @@ from tvb.simulator.coupling import Sigmoidal, Linear
 from tvb.simulator.noise import Additive, Multiplicative
 from tvb.datatypes.connectivity import Connectivity
 from tvb.simulator.models.infinite_theta import MontbrioPazoRoxin
+from tvb.simulator.models.jansen_rit import JansenRit
+from tvb.simulator.models.oscillator import Generic2dOscillator
 from tvb.simulator.integrators import (EulerDeterministic, EulerStochastic,
     HeunDeterministic, HeunStochastic, IntegratorStochastic, 
     RungeKutta4thOrderDeterministic, Identity, IdentityStochastic,
@@ -165,6 +167,37 @@ def kernel(dx, state, cx, parmat):
         "Test MPR w/ 2 spatial parameters."
         self._test_dfun(self._prep_model(2))
 
+    def test_nb_builtin_models(self):
+        "Test jitted declared dfuns of all built-in models against their dfun."
+        template = '''import numpy as np
+<%
+    svars = ', '.join(sim.model.state_variables)
+    cvars = ', '.join(sim.model.coupling_terms)
+%>
+<%include file="nb-dfuns.py.mako"/>
+def kernel(dx, state, cx, parmat):
+    for i in range(state.shape[1]):
+        ${svars}, = state[:, i]
+% for cvar in sim.model.coupling_terms:
+        ${cvar} = cx[${loop.index}, i]
+% endfor
+% for svar in sim.model.state_variables:
+        dx[${loop.index},i] = dx_${svar}(${svars}, ${cvars},
+            parmat[:,i] if parmat.size else None)
+% endfor
+'''
+        for model_ in self._declared_models():
+            with self.subTest(model=type(model_).__name__):
+                class sim:  # dummy sim
+                    model = model_
+                kernel = NbBackend().build_py_func(template, dict(sim=sim, np=np))
+                state, cX = self._random_dfun_inputs(model_)
+                dX = np.zeros_like(state[..., 0])
+                kernel(dX, state[..., 0], cX[..., 0], model_.spatial_parameter_matrix)
+                with np.errstate(over='ignore'):
+                    expected = model_.dfun(state, cX)[..., 0]
+                np.testing.assert_allclose(dX, expected, rtol=1e-6, atol=1e-9)
+
 
 class TestNbIntegrate(BaseTestIntegrate):
 
@@ -250,6 +283,18 @@ class TestNbSim(BaseTestSim):
     def _test_mvar(self, integrator):
         pass # TODO
 
+    def _test_model(self, model):
+        sim = self._create_sim(model=model, run_sim=False)
+        template = '<%include file="nb-sim.py.mako"/>'
+        content = dict(sim=sim, np=np, debug_nojit=True)
+        kernel = NbBackend().build_py_func(
+                template, content, name='run_sim',
+                )
+        state = kernel(sim)  # (nsvar, nnode, horizon + nstep)
+        yh = np.transpose(state[:,:,sim.connectivity.horizon:], (2,0,1))
+        (_, y), = sim.run()
+        self._check_match(y, yh[:, sim.monitors[0].voi])
+
     def _test_integrator(self, Integrator, delays=False):
         dt = 0.01
         if issubclass(Integrator, IntegratorStochastic):
@@ -267,6 +312,8 @@ class TestNbSim(BaseTestSim):
     def test_heun(self): self._test_integrator(HeunDeterministic)
     def test_heuns(self): self._test_integrator(HeunStochastic)
     def test_rk4(self): self._test_integrator(RungeKutta4thOrderDeterministic)
+    def test_g2do(self): self._test_model(Generic2dOscillator())
+    def test_jansen_rit(self): self._test_model(JansenRit())
 
     @unittest.skip('TODO')
     def test_id(self): self._test_integrator(Identity)
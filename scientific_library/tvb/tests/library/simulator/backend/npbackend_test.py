@@ -197,6 +197,23 @@ class TestNpDfun(BaseTestDfun):
         "Test MPR w/ 2 spatial parameters."
         self._test_dfun(self._prep_model(2))
 
+    def test_py_builtin_models(self):
+        "Test declared dfuns of all built-in models against their dfun."
+        template = '''import numpy as np
+<%include file="np-dfuns.py.mako"/>
+'''
+        for model_ in self._declared_models():
+            with self.subTest(model=type(model_).__name__):
+                class sim:  # dummy sim
+                    model = model_
+                kernel = NpBackend().build_py_func(template, dict(sim=sim, np=np), name='dfuns')
+                state, cX = self._random_dfun_inputs(model_)
+                dX = np.zeros_like(state)
+                with np.errstate(over='ignore'):
+                    kernel(dX, state, cX, model_.spatial_parameter_matrix)
+                    expected = model_.dfun(state, cX)
+                np.testing.assert_allclose(dX, expected, rtol=1e-6, atol=1e-9)
+
 
 class TestNpIntegrate(BaseTestIntegrate):
 
@@ -38,10 +38,14 @@ Test for tvb.simulator.coupling module
 
 import numpy
 import pytest
+import scipy.linalg
+import scipy.sparse
 from tvb.tests.library.base_testcase import BaseTestCase
 from tvb.tests.library.simulator.models_test import TestUpdateVariablesModel, TestUpdateVariablesBoundsModel
 from tvb.simulator import integrators
 from tvb.simulator import noise
+from tvb.simulator.models.linear import Linear
+from tvb.simulator.models.oscillator import Generic2dOscillator
 
 
 # For the moment all integrators inherit dt from the base class
@@ -51,7 +55,9 @@ dt = integrators.Integrator.dt.default
 INTEGRATORStoTEST = [integrators.HeunDeterministic, integrators.HeunStochastic,
                      integrators.EulerDeterministic, integrators.EulerStochastic,
                      integrators.RungeKutta4thOrderDeterministic,
-                     integrators.VODE, integrators.VODEStochastic]
+                     integrators.VODE, integrators.VODEStochastic,
+                     integrators.SemiImplicitEulerDeterministic, integrators.SemiImplicitEulerStochastic,
+                     integrators.ExponentialEulerDeterministic, integrators.ExponentialEulerStochastic]
 
 
 class TestIntegrators(BaseTestCase):
@@ -117,6 +123,67 @@ class TestIntegrators(BaseTestCase):
         assert xp1 == 4
         self._test_scheme(integ)
 
+    def _linear_step(self, integrator, x, gamma, local_coupling=0.0):
+        model = Linear(gamma=numpy.array([gamma]))
+        model.configure()
+        return integrator.integrate(x.copy(), model, numpy.zeros_like(x), local_coupling, 0.0)
+
+    def test_semi_implicit_euler(self):
+        for name in ('SemiImplicitEulerDeterministic', 'SemiImplicitEulerStochastic'):
+            obj = getattr(integrators, name)()
+            if hasattr(obj, 'noise'):
+                obj.noise.configure_white(dt=dt)
+            self._test_scheme(obj)
+        # stiff linear decay, where Euler with this step size diverges
+        integ = integrators.SemiImplicitEulerDeterministic(dt=0.1)
+        x = numpy.ones((1, 3, 1))
+        assert numpy.allclose(self._linear_step(integ, x, -1000.0), x / (1.0 + 0.1 * 1000.0))
+
+    def test_exponential_euler(self):
+        for name in ('ExponentialEulerDeterministic', 'ExponentialEulerStochastic'):
+            obj = getattr(integrators, name)()
+            if hasattr(obj, 'noise'):
+                obj.noise.configure_white(dt=dt)
+            self._test_scheme(obj)
+        integ = integrators.ExponentialEulerDeterministic(dt=0.1)
+        x = numpy.ones((1, 3, 1))
+        assert numpy.allclose(self._linear_step(integ, x, -1000.0), x * numpy.exp(-100.0))
+        assert numpy.allclose(self._linear_step(integ, x, -2.0), x * numpy.exp(-0.2))
+
+    def test_local_coupling_implicit(self):
+        nnode = 6
+        local_coupling = scipy.sparse.random(nnode, nnode, density=0.5, random_state=42, format='csr')
+        x = numpy.random.randn(1, nnode, 1)
+        system = -5.0 * numpy.eye(nnode) + local_coupling.toarray()
+        integ = integrators.SemiImplicitEulerDeterministic(dt=0.1)
+        x_next = self._linear_step(integ, x, -5.0, local_coupling)
+        expected = x[0, :, 0] + numpy.linalg.solve(numpy.eye(nnode) - 0.1 * system, 0.1 * system.dot(x[0, :, 0]))
+        assert numpy.allclose(x_next[0, :, 0], expected)
+        integ = integrators.ExponentialEulerDeterministic(dt=0.1)
+        x_next = self._linear_step(integ, x, -5.0, local_coupling)
+        assert numpy.allclose(x_next[0, :, 0], scipy.linalg.expm(0.1 * system).dot(x[0, :, 0]))
+
+    def test_model_jacobian(self):
+        model = Generic2dOscillator()
+        model.configure()
+        x = numpy.random.randn(2, 5, 1)
+        coupling = numpy.random.randn(1, 5, 1)
+        integ = integrators.SemiImplicitEulerDeterministic()
+        dX = model.dfun(x, coupling)
+        numerical = integ._node_jacobian(x, model.dfun, coupling, 0.0, dX)
+        assert numpy.allclose(model.jacobian(x, coupling), numerical, rtol=1e-5, atol=1e-5)
+
+    def test_node_jacobian_single_precision(self):
+        model = Generic2dOscillator()
+        model.configure()
+        x = numpy.random.randn(2, 5, 1)
+        coupling = numpy.random.randn(1, 5, 1)
+        integ = integrators.SemiImplicitEulerDeterministic()
+        double = integ._node_jacobian(x, model.dfun, coupling, 0.0, model.dfun(x, coupling))
+        x, coupling = x.astype(numpy.float32), coupling.astype(numpy.float32)
+        single = integ._node_jacobian(x, model.dfun, coupling, 0.0, model.dfun(x, coupling))
+        assert numpy.allclose(double, single, rtol=1e-2, atol=1e-2)
+
     def _scipy_scheme_tester(self, name):
         """Test a SciPy integration scheme."""
         for name_ in (name, name + 'Stochastic'):
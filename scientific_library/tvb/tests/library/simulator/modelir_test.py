@@ -40,6 +40,7 @@ TODO have just tests to cover various attributes of models have everything
 import unittest
 
 from tvb.simulator.coupling import Sigmoidal, Linear
+from tvb.simulator.models import ModelsEnum
 from tvb.simulator.models.infinite_theta import MontbrioPazoRoxin
 from tvb.simulator.integrators import (EulerDeterministic, EulerStochastic,
     HeunDeterministic, HeunStochastic)
@@ -54,6 +55,19 @@ class TestModelIR(unittest.TestCase):
     def test_MontbrioPazoRoxin(self):
         self._test_model(MontbrioPazoRoxin())
 
+    def test_builtin_models(self):
+        for model_class in ModelsEnum.get_base_model_subclasses():
+            with self.subTest(model=model_class.__name__):
+                if model_class.undeclared_dfuns_reason is not None:
+                    self.assertFalse(getattr(model_class(), 'state_variable_dfuns', None))
+                    continue
+                model = model_class()
+                self._test_model(model)
+                self.assertEqual(set(model.state_variable_dfuns), set(model.state_variables))
+                self.assertEqual(len(model.coupling_terms), len(model.cvar))
+                for name in model.parameter_names:
+                    self.assertTrue(hasattr(model, name))
+
 
 class TestIntegratorIR(unittest.TestCase):
 
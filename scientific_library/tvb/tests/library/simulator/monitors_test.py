@@ -124,6 +124,75 @@ class TestMonitorsConfiguration(BaseTestCase):
         assert monitor.period == 2000.0
 
 
+class TestMonitorPipeline(BaseTestCase):
+    """
+    The pipeline shares the variables of interest between monitors and fuses projections;
+    its output must match recording each monitor on its own.
+
+    """
+
+    def _configured_simulator(self):
+        region_mapping = RegionMapping.from_file('regionMapping_16k_76.txt')
+        mons = (monitors.TemporalAverage(period=0.5),
+                monitors.SpatialAverage(period=0.25, default_mask=monitors.SpatialAverage.HEMISPHERES),
+                monitors.GlobalAverage(period=0.25),
+                monitors.SubSample(period=0.5, variables_of_interest=numpy.array([1])),
+                monitors.iEEG(period=0.5, sensors=SensorsInternal.from_file(), region_mapping=region_mapping,
+                              obsnoise=None),
+                monitors.EEG(period=0.5, sensors=sensors.SensorsEEG.from_file(), region_mapping=region_mapping),
+                monitors.AfferentCouplingTemporalAverage(period=0.5))
+        model = models.Generic2dOscillator(variables_of_interest=('V', 'W'))
+        sim = simulator.Simulator(model=model, connectivity=connectivity.Connectivity.from_file(),
+                                  monitors=mons, integrator=integrators.HeunDeterministic(dt=0.125))
+        return sim.configure()
+
+    def test_spatial_average_is_sparse(self):
+        sim = self._configured_simulator()
+        savg = sim.monitors[1]
+        dense = savg.spatial_mean.toarray()
+        assert savg.spatial_mean.nnz == sim.number_of_nodes
+        numpy.testing.assert_allclose(dense.sum(axis=1), 1.0)
+
+    def test_projections_fused(self):
+        sim = self._configured_simulator()
+        pipeline = monitors.MonitorPipeline(sim.monitors)
+        assert pipeline._fused[id(sim.monitors[4])] is pipeline._fused[id(sim.monitors[5])]
+        assert id(sim.monitors[0]) not in pipeline._fused
+
+    def test_pipeline_matches_monitors(self):
+        import copy
+        sim = self._configured_simulator()
+        pipeline = monitors.MonitorPipeline(sim.monitors)
+        alone = copy.deepcopy(list(sim.monitors))
+        n_voi = len(sim.model.variables_of_interest)
+        n_cvar = len(sim.model.cvar)
+        ieeg = sim.monitors[4]
+        rng = numpy.random.RandomState(42)
+        n_samples = 0
+        period = []
+        for step in range(1, 17):
+            observed = rng.randn(n_voi, sim.number_of_nodes, 1)
+            node_coupling = rng.randn(n_cvar, sim.number_of_nodes, 1)
+            period.append(observed)
+            fused = pipeline.record(step, observed, node_coupling)
+            if step % 4 == 0:
+                # reference: the average of the stored states, and their projection on each step
+                numpy.testing.assert_allclose(fused[0][1], numpy.mean(period, axis=0))
+                projected = numpy.mean([ieeg.gain.dot(state.sum(axis=-1).T) for state in period], axis=0)
+                numpy.testing.assert_allclose(fused[4][1], projected.T[..., numpy.newaxis])
+                period = []
+            expected = [monitor.record(step, node_coupling if isinstance(monitor, monitors.AfferentCoupling)
+                                       else observed) for monitor in alone]
+            for actual, wanted in zip(fused, expected):
+                if wanted is None:
+                    assert actual is None
+                    continue
+                n_samples += 1
+                assert actual[0] == wanted[0]
+                numpy.testing.assert_allclose(actual[1], wanted[1], rtol=1e-10, atol=1e-12)
+        assert n_samples == 5 * 4 + 2 * 8
+
+
 class TestProjectionMonitorsWithSubcorticalRegions(BaseTestCase):
     """
     Cortical surface with subcortical regions, sEEG, EEG & MEG, using a stochastic
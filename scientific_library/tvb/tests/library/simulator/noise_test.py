@@ -34,6 +34,7 @@ Test for tvb.simulator.noise module
 .. moduleauthor:: Paula Sanz Leon <sanzleon.paula@gmail.com>
 
 """
+import numpy
 from tvb.tests.library.base_testcase import BaseTestCase
 from tvb.simulator import noise
 from tvb.datatypes import equations
@@ -48,3 +49,21 @@ class TestNoise(BaseTestCase):
         noise_multiplicative = noise.Multiplicative()
         assert noise_multiplicative.ntau == 0.0
         assert isinstance(noise_multiplicative.b, equations.Linear)
+
+    def _draws(self, **kwargs):
+        noise_additive = noise.Additive(**kwargs)
+        noise_additive.configure_white(dt=0.1)
+        return numpy.array([noise_additive.generate((2, 3, 1)) for _ in range(10)])
+
+    def test_block_generation(self):
+        assert numpy.allclose(self._draws(block_steps=1), self._draws(block_steps=4))
+        assert numpy.allclose(self._draws(block_steps=3, bit_generator="Philox"),
+                              self._draws(block_steps=10, bit_generator="Philox"))
+        assert not numpy.allclose(self._draws(block_steps=4), self._draws(block_steps=4, substream=1))
+        assert not numpy.allclose(self._draws(block_steps=4), self._draws(block_steps=4, bit_generator="Philox"))
+
+    def test_additive_gfun_cached(self):
+        noise_additive = noise.Additive()
+        assert noise_additive.gfun(None) is noise_additive.gfun(None)
+        noise_additive.nsig = numpy.array([2.0])
+        assert numpy.allclose(noise_additive.gfun(None), 2.0)
@@ -42,6 +42,7 @@ import itertools
 
 import numpy
 import pytest
+from tvb.basic.timings import StageTimings
 from tvb.datatypes.connectivity import Connectivity
 from tvb.datatypes.cortex import Cortex
 from tvb.datatypes.equations import Linear
@@ -322,3 +323,68 @@ class TestSimulator(BaseTestCase):
         assert numpy.allclose(stimulus[test_simulator.sim.model.stvar, test_simulator.stim_nodes, :],
                               test_simulator.stim_value,
                               1.0 / numpy.finfo("single").max)
+
+    @staticmethod
+    def _run_with_precision(precision):
+        model = ModelsEnum.GENERIC_2D_OSCILLATOR.get_class()(a=numpy.array([0.5]))
+        sim = simulator.Simulator(
+            connectivity=Connectivity.from_file(), model=model, coupling=coupling.Linear(a=numpy.array([0.01])),
+            integrator=integrators.HeunStochastic(dt=0.1, noise=noise.Additive(nsig=numpy.array([1e-5]), noise_seed=42)),
+            monitors=[monitors.TemporalAverage(period=1.0), monitors.Raw()],
+            simulation_length=50.0, precision=precision).configure()
+        (_, tavg), (_, raw) = sim.run()
+        return sim, tavg, raw
+
+    @pytest.mark.parametrize('precision, state_dtype, stock_dtype', [
+        (simulator.Simulator.FLOAT64, numpy.float64, numpy.float64),
+        (simulator.Simulator.FLOAT32, numpy.float32, numpy.float32),
+        (simulator.Simulator.MIXED, numpy.float32, numpy.float64)])
+    def test_simulator_precision(self, precision, state_dtype, stock_dtype):
+        sim, tavg, raw = self._run_with_precision(precision)
+        assert sim.current_state.dtype == state_dtype
+        assert raw.dtype == state_dtype
+        assert tavg.dtype == stock_dtype
+        assert sim.model.a.dtype == state_dtype
+        assert sim.coupling.a.dtype == state_dtype
+        assert sim.integrator.noise.nsig.dtype == state_dtype
+
+        if precision != simulator.Simulator.FLOAT64:
+            _, reference_tavg, _ = self._run_with_precision(simulator.Simulator.FLOAT64)
+            assert numpy.allclose(tavg, reference_tavg, rtol=1e-4, atol=1e-4 * numpy.abs(reference_tavg).max())
+
+    def test_simulator_precision_keeps_user_parameters(self):
+        model = ModelsEnum.GENERIC_2D_OSCILLATOR.get_class()()
+        cfun = coupling.Linear()
+        integrator = integrators.HeunStochastic(dt=0.1, noise=noise.Additive(nsig=numpy.array([1e-5])))
+        sim = simulator.Simulator(
+            connectivity=Connectivity.from_file(), model=model, coupling=cfun, integrator=integrator,
+            monitors=[monitors.Raw()], simulation_length=5.0, precision=simulator.Simulator.FLOAT32).configure()
+        sim.run()
+        assert sim.model.a.dtype == numpy.float32
+        assert model.a.dtype == cfun.a.dtype == integrator.noise.nsig.dtype == numpy.float64
+        assert integrator.noise.dtype == numpy.float64
+
+        sim.precision = simulator.Simulator.FLOAT64
+        sim.configure()
+        (_, raw), = sim.run()
+        assert raw.dtype == numpy.float64
+        assert sim.model.a.dtype == sim.coupling.a.dtype == sim.integrator.noise.nsig.dtype == numpy.float64
+
+    def test_simulator_stage_timings(self):
+        test_simulator = Simulator()
+        test_simulator.configure(surface_sim=False, with_stimulus=True)
+        sim = test_simulator.sim
+        sim.stage_timings = StageTimings()
+        n_steps = 20
+        for _ in sim(n_steps=n_steps):
+            pass
+
+        timings = sim.stage_timings
+        for stage_name in [simulator.STAGE_STIMULUS, simulator.STAGE_INTEGRATION, simulator.STAGE_HISTORY,
+                           simulator.STAGE_COUPLING, simulator.STAGE_OBSERVE]:
+            assert timings.calls[stage_name] == n_steps
+            assert timings.seconds[stage_name] >= 0
+        assert timings.calls[simulator.STAGE_MODEL_DFUN] >= n_steps
+        for i, monitor in enumerate(sim.monitors):
+            assert timings.calls[simulator.STAGE_MONITOR % (i, type(monitor).__name__)] == n_steps
+        assert sim._monitor_pipeline.seconds is None
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+#
+#  TheVirtualBrain-Contributors Package. This package holds simulator extensions.
+#  See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+
+"""
+Ragged populations of neurons/modes, for spiking mean-field models whose regions hold
+different numbers of neurons within the fixed modes dimension of the simulator state.
+
+A population is flattened over all regions into a pair of (region, mode) index arrays,
+so that its neurons' values are read, written and reduced per region in single numpy
+operations, instead of looping over the regions.
+"""
+
+import numpy
+
+
+class RaggedPopulation(object):
+    """
+    The neurons of one population (e.g. all excitatory neurons) across the regions: region i
+    holds ``sizes[i]`` neurons on the modes ``offset, ..., offset + sizes[i] - 1``.
+
+    ``state[k][population.index]`` is the flat vector of the k-th variable of all the neurons
+    of the population, ordered by region, then mode.
+    """
+
+    def __init__(self, sizes, offset, number_of_modes):
+        self.sizes = numpy.asarray(sizes, dtype='i').reshape((-1,))
+        self.offset = int(offset)
+        self.number_of_modes = int(number_of_modes)
+        self.number_of_regions = self.sizes.size
+        self.regions = numpy.repeat(numpy.arange(self.number_of_regions), self.sizes).astype('i')
+        starts = numpy.cumsum(self.sizes) - self.sizes
+        self.modes = (numpy.arange(self.regions.size) - starts[self.regions] + self.offset).astype('i')
+        self.index = (self.regions, self.modes)
+        self.mask = numpy.zeros((self.number_of_regions, self.number_of_modes), dtype=bool)
+        self.mask[self.index] = True
+
+    @property
+    def size(self):
+        return self.regions.size
+
+    def gather(self, x):
+        """
+        Flat vector of the values of a model parameter for every neuron of the population.
+        The parameter may be given per region and mode, shape (n_regions, n_modes), or per region,
+        shape (n_regions,) or (n_regions, 1), or globally, with one value; regions beyond its
+        first dimension get the values of the first region.
+        """
+        x = numpy.asarray(x)
+        if x.ndim == 0:
+            return numpy.full(self.size, x.item())
+        rows = numpy.where(self.regions < x.shape[0], self.regions, 0)
+        if x.ndim == 2 and x.shape[1] == self.number_of_modes:
+            return x[rows, self.modes]
+        return x.reshape((x.shape[0], -1))[rows, 0]
+
+    def sum(self, values):
+        "Sum the flat values of the population per region, to a vector of length n_regions."
+        return numpy.bincount(self.regions, weights=values, minlength=self.number_of_regions)
+
+    def spread(self, region_values):
+        "Broadcast a per region vector to the flat neurons of the population."
+        return numpy.asarray(region_values)[self.regions]
+
+
+def empty_modes_mask(populations):
+    "Mask (n_regions, n_modes) of the modes that no population occupies."
+    occupied = populations[0].mask.copy()
+    for population in populations[1:]:
+        occupied |= population.mask
+    return ~occupied
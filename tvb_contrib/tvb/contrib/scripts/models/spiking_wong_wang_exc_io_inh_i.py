@@ -32,21 +32,22 @@ Models based on Wong-Wang's work.
 from numba import guvectorize, float64
 from tvb.simulator.models.base import numpy, ModelNumbaDfun, Model
 from tvb.basic.neotraits.api import NArray, Final, List, Range
+from tvb.contrib.scripts.models.ragged_population import RaggedPopulation, empty_modes_mask
 
 
 class SpikingWongWangExcIOInhI(Model):
     _N_E_max = 200
     _n_regions = 0
-    __n_E = []
-    __n_I = []
-    __E = {}
-    __I = {}
+    _exc = None  # RaggedPopulation of the excitatory neurons of all regions
+    _inh = None  # RaggedPopulation of the inhibitory neurons of all regions
+    _empty = None
 
     _auto_connection = True
-    _refractory_neurons_E = {}
-    _refractory_neurons_I = {}
-    _spikes_E = {}
-    _spikes_I = {}
+    # flat over the neurons of the respective population:
+    _refractory_neurons_E = None
+    _refractory_neurons_I = None
+    _spikes_E = None
+    _spikes_I = None
 
     r"""
     .. [WW_2006] Kong-Fatt Wong and Xiao-Jing Wang,  *A Recurrent Network
@@ -381,268 +382,217 @@ class SpikingWongWangExcIOInhI(Model):
             return numpy.array(x[0])
 
     def _prepare_indices(self):
-        __n_E = []
-        __n_I = []
-        __E = {}
-        __I = {}
-        self.__n_E = None
-        self.__n_I = None
-        self.__E = None
-        self.__I = None
-        # Initialize all non-state variables, as well as t_ref, to 0, i.e., assuming no spikes in history.
-        for i_region in range(self._n_regions):  # For every region node....
-            __n_E.append(int(self._region(self.N_E, i_region).item()))
-            __n_I.append(int(self._region(self.N_I, i_region).item()))
-            __E[i_region] = numpy.arange(__n_E[-1]).astype('i')  # excitatory neurons' indices
-            __I[i_region] = numpy.arange(self._N_E_max, self._N_E_max + __n_I[-1]).astype('i')  # inhibitory neurons' indices
-        self.__n_E = __n_E
-        self.__n_I = __n_I
-        self.__E = __E
-        self.__I = __I
+        # Flatten the excitatory and inhibitory neurons of all regions:
+        n_E = [int(self._region(self.N_E, i_region).item()) for i_region in range(self._n_regions)]
+        n_I = [int(self._region(self.N_I, i_region).item()) for i_region in range(self._n_regions)]
+        # excitatory neurons occupy modes 0...n_E-1, inhibitory ones N_E_max...N_E_max+n_I-1, per region
+        self._exc = RaggedPopulation(n_E, 0, self.number_of_modes)
+        self._inh = RaggedPopulation(n_I, self._N_E_max, self.number_of_modes)
+        self._empty = empty_modes_mask([self._exc, self._inh])
 
     # Return number of excitatory neurons/modes per region
     def _n_E(self, i_region):
-        # if self.__n_E is not None:
-        return self.__n_E[i_region]
-        # else:
-        #     return int(self._region(self.N_E, i_region).item())
+        return self._exc.sizes[i_region]
 
     # Return number of inhibitory neurons/modes per region
     def _n_I(self, i_region):
-        # if self.__n_I is not None:
-        return self.__n_I[i_region]
-        # else:
-        #     return int(self._region(self.N_I, i_region).item())
+        return self._inh.sizes[i_region]
 
     # Return indices of excitatory neurons/modes per region
     def _E(self, i_region):
-        # if self.__E is not None:
-        return self.__E[i_region]
-        # else:
-        #     return numpy.arange(self._n_E(i_region)).astype('i')
+        return self._exc.modes[self._exc.regions == i_region]
 
     # Return indices of inhibitory neurons/modes per region
     def _I(self, i_region):
-        # if self.__I is not None:
-        return self.__I[i_region]
-        # else:
-        #     return numpy.arange(self._N_E_max, self._N_E_max + self._n_I(i_region)).astype('i')
-
-    # Return x variables of excitatory/inhibitory neurons/modes per region
-    def _x_E_I(self, x, i_region, E_I):
-        x_E_I = self._region(x, i_region)
-        x_E_I_shape = x_E_I.shape
-        if x_E_I_shape == (self.number_of_modes,):
-            return x_E_I[E_I(i_region)]  # if region parameter shape is (n_neurons,)
-        else:
-            return numpy.array([x_E_I.item(), ])  # if region parameter shape is (1,) or (1, 1)
-
-    # Return x variables of excitatory neurons/modes per region
-    def _x_E(self, x, i_region):
-        return self._x_E_I(x, i_region, self._E)
-
-    # Return  x variables of inhibitory neurons/modes per region
-    def _x_I(self, x, i_region):
-        return self._x_E_I(x, i_region, self._I)
-
-    # Return x variables of refractory excitatory neurons/modes per region
-    def _x_E_ref(self, x, i_region, ref):
-        x_E = self._x_E(x, i_region)
-        try:
-            return x_E[ref]
-        except:
-            return x_E
-
-    # Return x variables of refractory inhibitory neurons/modes per region
-    def _x_I_ref(self, x, i_region, ref):
-        x_I = self._x_I(x, i_region)
-        try:
-            return x_I[ref]
-        except:
-            return x_I
+        return self._inh.modes[self._inh.regions == i_region]
 
-    def _compute_region_exc_population_coupling(self, s_E, w_EE, w_EI):
+    def _compute_exc_population_coupling(self, s_E, w_EE, w_EI):
         # Scale w_EE, w_EI per region accordingly,
         # to implement coupling schemes that depend on the total number of neurons
         # exc -> exc
         c_ee = w_EE * s_E
-        c_ee = numpy.sum(c_ee) \
+        c_ee = self._exc.spread(self._exc.sum(c_ee)) \
                - numpy.where(self._auto_connection, 0.0, c_ee)  # optionally remove auto-connections
         #                exc -> inh:
-        return c_ee, numpy.sum(w_EI * s_E)
+        return c_ee, self._inh.spread(self._exc.sum(w_EI * s_E))
 
-    def _compute_region_inh_population_coupling(self, s_I, w_IE, w_II):
+    def _compute_inh_population_coupling(self, s_I, w_IE, w_II):
         # Scale w_IE, w_II per region accordingly,
         # to implement coupling schemes that depend on the total number of neurons
         # inh -> inh
         c_ii = w_II * s_I
-        c_ii = numpy.sum(c_ii) \
+        c_ii = self._inh.spread(self._inh.sum(c_ii)) \
                - numpy.where(self._auto_connection, 0.0, c_ii)  # optionally remove auto-connections
         #           inh -> exc:
-        return numpy.sum(w_IE * s_I), c_ii
+        return self._exc.spread(self._inh.sum(w_IE * s_I)), c_ii
 
-    def _zero_empty_positions(self, state_variables, _E, _I, ii):
+    def _zero_empty_positions(self, state_variables):
         # Make sure that all empty positions are set to 0.0, if any:
-        _empty = numpy.unique(_E.tolist() + _I.tolist())  # all indices occupied by neurons
-        if len(_empty) < state_variables[0].shape[1]:
-            _empty = numpy.delete(numpy.arange(state_variables[0].shape[1]), _empty)  # all empty indices
-            # Set all empty positions to 0
-            state_variables[:, ii, _empty] = 0.0
+        state_variables[:, self._empty] = 0.0
 
-    def _zero_cross_synapses(self, state_variables, _E, _I, ii):
+    def _zero_cross_synapses(self, state_variables):
         # Set excitatory synapses for inhibitory neurons to 0.0...
         # 0. s_AMPA, 1. x_NMDA and 2. s_NMDA
-        state_variables[:3][:, ii, _I] = 0.0
+        state_variables[:3][:, self._inh.mask] = 0.0
         # ...and  inhibitory synapses for excitatory neurons to 0.0
         # 4. s_GABA
-        state_variables[3, ii, _E] = 0.0
+        state_variables[3][self._exc.index] = 0.0
 
     def update_state_variables_before_integration(self, state_variables, coupling, local_coupling=0.0, stimulus=0.0):
         if self._n_regions == 0:
             self._n_regions = state_variables.shape[1]
             self._prepare_indices()
-        for ii in range(self._n_regions):  # For every region node....
-            _E = self._E(ii)  # excitatory neurons' indices
-            _I = self._I(ii)  # inhibitory neurons' indices
-
-            # Make sure that all empty positions are set to 0.0, if any:
-            self._zero_empty_positions(state_variables, _E, _I, ii)
-
-            # Set  inhibitory synapses for excitatory neurons & excitatory synapses for inhibitory neurons to 0.0...
-            self._zero_cross_synapses(state_variables, _E, _I, ii)
-
-            # -----------------------------------Updates after previous iteration:--------------------------------------
-
-            # Refractory neurons from past spikes if 6. t_ref > 0.0
-            self._refractory_neurons_E[ii] = state_variables[6, ii, _E] > 0.0
-            self._refractory_neurons_I[ii] = state_variables[6, ii, _I] > 0.0
-
-            # set 5. V_m for refractory neurons to V_reset
-            state_variables[5, ii, _E] = numpy.where(self._refractory_neurons_E[ii],
-                                                     self._x_E(self.V_reset, ii), state_variables[5, ii, _E])
-
-            state_variables[5, ii, _I] = numpy.where(self._refractory_neurons_I[ii],
-                                                     self._x_I(self.V_reset, ii), state_variables[5, ii, _I])
-
-            # Compute spikes sent at time t:
-            # 8. spikes
-            state_variables[8, ii, _E] = numpy.where(state_variables[5, ii, _E] > self._x_E(self.V_thr, ii), 1.0, 0.0)
-            state_variables[8, ii, _I] = numpy.where(state_variables[5, ii, _I] > self._x_I(self.V_thr, ii), 1.0, 0.0)
-            exc_spikes = state_variables[8, ii, _E]  # excitatory spikes
-            inh_spikes = state_variables[8, ii, _I]  # inhibitory spikes
-            self._spikes_E[ii] = exc_spikes > 0.0
-            self._spikes_I[ii] = inh_spikes > 0.0
-
-            # set 5. V_m for spiking neurons to V_reset
-            state_variables[5, ii, _E] = numpy.where(self._spikes_E[ii],
-                                                     self._x_E(self.V_reset, ii), state_variables[5, ii, _E])
-
-            state_variables[5, ii, _I] = numpy.where(self._spikes_I[ii],
-                                                     self._x_I(self.V_reset, ii), state_variables[5, ii, _I])
-
-            # set 6. t_ref  to tau_ref for spiking neurons
-            state_variables[6, ii, _E] = numpy.where(self._spikes_E[ii],
-                                                     self._x_E(self.tau_ref_E, ii), state_variables[6, ii, _E])
-
-            state_variables[6, ii, _I] = numpy.where(self._spikes_I[ii],
-                                                     self._x_I(self.tau_ref_I, ii), state_variables[6, ii, _I])
-
-            # Refractory neurons including current spikes sent at time t
-            self._refractory_neurons_E[ii] = numpy.logical_or(self._refractory_neurons_E[ii], self._spikes_E[ii])
-            self._refractory_neurons_I[ii] = numpy.logical_or(self._refractory_neurons_I[ii], self._spikes_I[ii])
-
-            # -------------------------------------Updates before next iteration:---------------------------------------
-
-            # ----------------------------------First deal with inputs at time t:---------------------------------------
-
-            # Collect external spikes received at time t, and update the incoming s_AMPA_ext synapse:
-
-            # 7. spikes_ext
-            # get external spike stimulus 7. spike_ext, if any:
-            state_variables[7, ii, _E] = self._x_E(self.spikes_ext, ii)
-            state_variables[7, ii, _I] = self._x_I(self.spikes_ext, ii)
-
-            # 4. s_AMPA_ext
-            # ds_AMPA_ext/dt = -1/tau_AMPA * (s_AMPA_exc + spikes_ext)
-            # Add the spike at this point to s_AMPA_ext
-            state_variables[4, ii, _E] += state_variables[7, ii, _E]  # spikes_ext
-            state_variables[4, ii, _I] += state_variables[7, ii, _I]  # spikes_ext
-
-            # Compute currents based on synaptic gating variables at time t:
-
-            # V_E_E = V_m - V_E
-            V_E_E = state_variables[5, ii, _E] - self._x_E(self.V_E, ii)
-            V_E_I = state_variables[5, ii, _I] - self._x_I(self.V_E, ii)
-
-            # 9. I_L = g_m * (V_m - V_E)
-            state_variables[9, ii, _E] = \
-                self._x_E(self.g_m_E, ii) * (state_variables[5, ii, _E] - self._x_E(self.V_L, ii))
-            state_variables[9, ii, _I] = \
-                self._x_I(self.g_m_I, ii) * (state_variables[5, ii, _I] - self._x_I(self.V_L, ii))
-
-            w_EE = self._x_E(self.w_EE, ii)
-            w_EI = self._x_E(self.w_EI, ii)
-
-            # 10. I_AMPA = g_AMPA * (V_m - V_E) * sum(w * s_AMPA_k)
-            coupling_AMPA_E, coupling_AMPA_I = \
-                self._compute_region_exc_population_coupling(state_variables[0, ii, _E], w_EE, w_EI)
-            state_variables[10, ii, _E] = self._x_E(self.g_AMPA_E, ii) * V_E_E * coupling_AMPA_E
-                                           # s_AMPA
-            state_variables[10, ii, _I] = self._x_I(self.g_AMPA_I, ii) * V_E_I * coupling_AMPA_I
-
-            # 11. I_NMDA = g_NMDA * (V_m - V_E) / (1 + lamda_NMDA * exp(-beta*V_m)) * sum(w * s_NMDA_k)
-            coupling_NMDA_E, coupling_NMDA_I = \
-                self._compute_region_exc_population_coupling(state_variables[2, ii, _E], w_EE, w_EI)
-            state_variables[11, ii, _E] = \
-                self._x_E(self.g_NMDA_E, ii) * V_E_E \
-                / (self._x_E(self.lamda_NMDA, ii) * numpy.exp(-self._x_E(self.beta, ii) *
-                                                              state_variables[5, ii, _E])) \
-                * coupling_NMDA_E  # s_NMDA
-            state_variables[11, ii, _I] = \
-                self._x_I(self.g_NMDA_I, ii) * V_E_I \
-                / (self._x_I(self.lamda_NMDA, ii) * numpy.exp(-self._x_I(self.beta, ii) *
-                                                              state_variables[5, ii, _I])) \
-                * coupling_NMDA_I  # s_NMDA
-
-            # 0. s_AMPA
-            # s_AMPA += exc_spikes
-            state_variables[0, ii, _E] += exc_spikes
-
-            # 1. x_NMDA
-            # x_NMDA += exc_spikes
-            state_variables[1, ii, _E] += exc_spikes
-
-            # 12. I_GABA = g_GABA * (V_m - V_I) * sum(w_ij * s_GABA_k)
-            w_IE = self._x_I(self.w_IE, ii)
-            w_II = self._x_I(self.w_II, ii)
-            coupling_GABA_E, coupling_GABA_I = \
-                self._compute_region_inh_population_coupling(state_variables[3, ii, _I], w_IE, w_II)
-            state_variables[12, ii, _E] = self._x_E(self.g_GABA_E, ii) * \
-                                          (state_variables[5, ii, _E] - self._x_E(self.V_I, ii)) * \
-                                          coupling_GABA_E  # s_GABA
-            state_variables[12, ii, _I] = self._x_I(self.g_GABA_I, ii) * \
-                                          (state_variables[5, ii, _I] - self._x_I(self.V_I, ii)) * \
-                                          coupling_GABA_I  # s_GABA
-
-            # 3. s_GABA += inh_spikes
-            state_variables[3, ii, _I] += inh_spikes
-
-            # 13. I_AMPA_ext = g_AMPA_ext * (V_m - V_E) * ( G*sum{c_ij sum{s_AMPA_j(t-delay_ij)}} + s_AMPA_ext)
-            # Compute large scale coupling_ij = sum(c_ij * S_e(t-t_ij))
-            large_scale_coupling = numpy.sum(coupling[0, ii, :self._N_E_max])
-            large_scale_coupling += numpy.sum(local_coupling * state_variables[0, ii, _E])
-            state_variables[13, ii, _E] = self._x_E(self.g_AMPA_ext_E, ii) * V_E_E * \
-                                          ( self._x_E(self.G, ii) * large_scale_coupling
-                                            + state_variables[4, ii, _E] )
-            #                                          # feedforward inhibition
-            state_variables[13, ii, _I] = self._x_I(self.g_AMPA_ext_I, ii) * V_E_I * \
-                                          ( self._x_I(self.G, ii) * self._x_I(self.lamda, ii) * large_scale_coupling
-                                            + state_variables[4, ii, _I] )
+        exc, inh = self._exc, self._inh
+        _E, _I = exc.index, inh.index  # excitatory and inhibitory neurons' indices, of all regions
+
+        # Make sure that all empty positions are set to 0.0, if any:
+        self._zero_empty_positions(state_variables)
+
+        # Set  inhibitory synapses for excitatory neurons & excitatory synapses for inhibitory neurons to 0.0...
+        self._zero_cross_synapses(state_variables)
+
+        # -----------------------------------Updates after previous iteration:--------------------------------------
+
+        # Refractory neurons from past spikes if 6. t_ref > 0.0
+        self._refractory_neurons_E = state_variables[6][_E] > 0.0
+        self._refractory_neurons_I = state_variables[6][_I] > 0.0
+
+        # set 5. V_m for refractory neurons to V_reset
+        V_reset_E = exc.gather(self.V_reset)
+        V_reset_I = inh.gather(self.V_reset)
+        V_m_E = numpy.where(self._refractory_neurons_E, V_reset_E, state_variables[5][_E])
+        V_m_I = numpy.where(self._refractory_neurons_I, V_reset_I, state_variables[5][_I])
+
+        # Compute spikes sent at time t:
+        # 8. spikes
+        exc_spikes = numpy.where(V_m_E > exc.gather(self.V_thr), 1.0, 0.0)  # excitatory spikes
+        inh_spikes = numpy.where(V_m_I > inh.gather(self.V_thr), 1.0, 0.0)  # inhibitory spikes
+        state_variables[8][_E] = exc_spikes
+        state_variables[8][_I] = inh_spikes
+        self._spikes_E = exc_spikes > 0.0
+        self._spikes_I = inh_spikes > 0.0
+
+        # set 5. V_m for spiking neurons to V_reset
+        V_m_E = numpy.where(self._spikes_E, V_reset_E, V_m_E)
+        V_m_I = numpy.where(self._spikes_I, V_reset_I, V_m_I)
+        state_variables[5][_E] = V_m_E
+        state_variables[5][_I] = V_m_I
+
+        # set 6. t_ref  to tau_ref for spiking neurons
+        state_variables[6][_E] = numpy.where(self._spikes_E, exc.gather(self.tau_ref_E), state_variables[6][_E])
+        state_variables[6][_I] = numpy.where(self._spikes_I, inh.gather(self.tau_ref_I), state_variables[6][_I])
+
+        # Refractory neurons including current spikes sent at time t
+        self._refractory_neurons_E = numpy.logical_or(self._refractory_neurons_E, self._spikes_E)
+        self._refractory_neurons_I = numpy.logical_or(self._refractory_neurons_I, self._spikes_I)
+
+        # -------------------------------------Updates before next iteration:---------------------------------------
+
+        # ----------------------------------First deal with inputs at time t:---------------------------------------
+
+        # Collect external spikes received at time t, and update the incoming s_AMPA_ext synapse:
+
+        # 7. spikes_ext
+        # get external spike stimulus 7. spike_ext, if any:
+        spikes_ext_E = exc.gather(self.spikes_ext)
+        spikes_ext_I = inh.gather(self.spikes_ext)
+        state_variables[7][_E] = spikes_ext_E
+        state_variables[7][_I] = spikes_ext_I
+
+        # 4. s_AMPA_ext
+        # ds_AMPA_ext/dt = -1/tau_AMPA * (s_AMPA_exc + spikes_ext)
+        # Add the spike at this point to s_AMPA_ext
+        state_variables[4][_E] += spikes_ext_E  # spikes_ext
+        state_variables[4][_I] += spikes_ext_I  # spikes_ext
+
+        # Compute currents based on synaptic gating variables at time t:
+
+        # V_E_E = V_m - V_E
+        V_E_E = V_m_E - exc.gather(self.V_E)
+        V_E_I = V_m_I - inh.gather(self.V_E)
+
+        # 9. I_L = g_m * (V_m - V_E)
+        state_variables[9][_E] = exc.gather(self.g_m_E) * (V_m_E - exc.gather(self.V_L))
+        state_variables[9][_I] = inh.gather(self.g_m_I) * (V_m_I - inh.gather(self.V_L))
+
+        w_EE = exc.gather(self.w_EE)
+        w_EI = exc.gather(self.w_EI)
+
+        # 10. I_AMPA = g_AMPA * (V_m - V_E) * sum(w * s_AMPA_k)
+        coupling_AMPA_E, coupling_AMPA_I = \
+            self._compute_exc_population_coupling(state_variables[0][_E], w_EE, w_EI)
+        state_variables[10][_E] = exc.gather(self.g_AMPA_E) * V_E_E * coupling_AMPA_E  # s_AMPA
+        state_variables[10][_I] = inh.gather(self.g_AMPA_I) * V_E_I * coupling_AMPA_I
+
+        # 11. I_NMDA = g_NMDA * (V_m - V_E) / (1 + lamda_NMDA * exp(-beta*V_m)) * sum(w * s_NMDA_k)
+        coupling_NMDA_E, coupling_NMDA_I = \
+            self._compute_exc_population_coupling(state_variables[2][_E], w_EE, w_EI)
+        state_variables[11][_E] = \
+            exc.gather(self.g_NMDA_E) * V_E_E \
+            / (exc.gather(self.lamda_NMDA) * numpy.exp(-exc.gather(self.beta) * V_m_E)) \
+            * coupling_NMDA_E  # s_NMDA
+        state_variables[11][_I] = \
+            inh.gather(self.g_NMDA_I) * V_E_I \
+            / (inh.gather(self.lamda_NMDA) * numpy.exp(-inh.gather(self.beta) * V_m_I)) \
+            * coupling_NMDA_I  # s_NMDA
+
+        # 0. s_AMPA
+        # s_AMPA += exc_spikes
+        state_variables[0][_E] += exc_spikes
+
+        # 1. x_NMDA
+        # x_NMDA += exc_spikes
+        state_variables[1][_E] += exc_spikes
+
+        # 12. I_GABA = g_GABA * (V_m - V_I) * sum(w_ij * s_GABA_k)
+        w_IE = inh.gather(self.w_IE)
+        w_II = inh.gather(self.w_II)
+        coupling_GABA_E, coupling_GABA_I = \
+            self._compute_inh_population_coupling(state_variables[3][_I], w_IE, w_II)
+        state_variables[12][_E] = exc.gather(self.g_GABA_E) * (V_m_E - exc.gather(self.V_I)) * \
+                                  coupling_GABA_E  # s_GABA
+        state_variables[12][_I] = inh.gather(self.g_GABA_I) * (V_m_I - inh.gather(self.V_I)) * \
+                                  coupling_GABA_I  # s_GABA
+
+        # 3. s_GABA += inh_spikes
+        state_variables[3][_I] += inh_spikes
+
+        # 13. I_AMPA_ext = g_AMPA_ext * (V_m - V_E) * ( G*sum{c_ij sum{s_AMPA_j(t-delay_ij)}} + s_AMPA_ext)
+        # Compute large scale coupling_ij = sum(c_ij * S_e(t-t_ij))
+        large_scale_coupling = numpy.sum(coupling[0, :, :self._N_E_max], axis=-1)
+        large_scale_coupling += exc.sum(local_coupling * state_variables[0][_E])
+        state_variables[13][_E] = exc.gather(self.g_AMPA_ext_E) * V_E_E * \
+                                  (exc.gather(self.G) * exc.spread(large_scale_coupling)
+                                   + state_variables[4][_E])
+        #                                          # feedforward inhibition
+        state_variables[13][_I] = inh.gather(self.g_AMPA_ext_I) * V_E_I * \
+                                  (inh.gather(self.G) * inh.gather(self.lamda) * inh.spread(large_scale_coupling)
+                                   + state_variables[4][_I])
 
         self._non_integrated_variables = state_variables[self._non_integrated_variables_inds]
 
         return state_variables
 
+    def _V_m_t_ref_derivative(self, derivative, population, refractory, I_ext, C_m):
+        not_ref = numpy.logical_not(refractory)
+
+        # 5. Integrate only non-refractory V_m
+        # C_m*dV_m/dt = - I_L- I_AMPA - I_NMDA - I_GABA  - I_AMPA_EXT + I_ext
+        _not_ref = population.regions[not_ref], population.modes[not_ref]
+        non_integrated_variables = self._non_integrated_variables[(slice(None),) + _not_ref]
+        derivative[5][_not_ref] = (- non_integrated_variables[2]  # 9. I_L
+                                   - non_integrated_variables[3]  # 10. I_AMPA
+                                   - non_integrated_variables[4]  # 11. I_NMDA
+                                   - non_integrated_variables[5]  # 12. I_GABA
+                                   - non_integrated_variables[6]  # 13. I_AMPA_ext
+                                   + population.gather(I_ext)[not_ref]  # I_ext
+                                   ) / population.gather(C_m)[not_ref]
+
+        # 6...and only refractory t_ref:
+        # dt_ref/dt = -1 for t_ref > 0  so that t' = t - dt
+        # and 0 otherwise
+        derivative[6][population.regions[refractory], population.modes[refractory]] = -1.0
+
     def _numpy_dfun(self, integration_variables, coupling, local_coupling=0.0):
         r"""
         Equations taken from [DPA_2013]_ , page 11242
@@ -661,95 +611,55 @@ class SpikingWongWangExcIOInhI(Model):
         derivative = 0.0 * integration_variables
 
         if self._non_integrated_variables is None:
-            state_variables = np.array(integration_variables.tolist() +
-                                       [0.0 * integration_variables[0]] * self.n_nonintvar)
+            state_variables = numpy.array(integration_variables.tolist() +
+                                          [0.0 * integration_variables[0]] * self.n_nonintvar)
             state_variables = self.update_state_variables_before_integration(state_variables, coupling, local_coupling,
                                                                              self._stimulus)
 
         if self._n_regions == 0:
             self._n_regions = integration_variables.shape[1]
             self._prepare_indices()
-        for ii in range(self._n_regions):  # For every region node....
-
-            # Excitatory neurons:
-
-            _E = self._E(ii)  # excitatory neurons indices
-            tau_AMPA_E = self._x_E(self.tau_AMPA, ii)
-
-            # 0. s_AMPA
-            # ds_AMPA/dt = -1/tau_AMPA * s_AMPA
-            derivative[0, ii, _E] = -integration_variables[0, ii, _E] / tau_AMPA_E
-
-            # 1. x_NMDA
-            # dx_NMDA/dt = -x_NMDA/tau_NMDA_rise
-            derivative[1, ii, _E] = -integration_variables[1, ii, _E] / self._x_E(self.tau_NMDA_rise, ii)
-
-            # 2. s_NMDA
-            # ds_NMDA/dt = -1/tau_NMDA_decay * s_NMDA + alpha*x_NMDA*(1-s_NMDA)
-            derivative[2, ii, _E] = \
-                -integration_variables[2, ii, _E] / self._x_E(self.tau_NMDA_decay, ii) \
-                + self._x_E(self.alpha, ii) * integration_variables[1, ii, _E] * (1 - integration_variables[2, ii, _E])
-
-            # 4. s_AMPA_ext
-            # ds_AMPA_ext/dt = -s_AMPA_exc/tau_AMPA
-            derivative[4, ii, _E] = -integration_variables[4, ii, _E] / tau_AMPA_E
-
-            # excitatory refractory neurons:
-            ref = self._refractory_neurons_E[ii]
-            not_ref = numpy.logical_not(ref)
-
-            # 5. Integrate only non-refractory V_m
-            # C_m*dV_m/dt = - I_L- I_AMPA - I_NMDA - I_GABA  - I_AMPA_EXT + I_ext
-            _E_not_ref = _E[not_ref]
-            derivative[5, ii, _E_not_ref] = (
-                                                    - self._non_integrated_variables[2, ii, _E_not_ref]  # 9. I_L
-                                                    - self._non_integrated_variables[3, ii, _E_not_ref]  # 10. I_AMPA
-                                                    - self._non_integrated_variables[4, ii, _E_not_ref]  # 11. I_NMDA
-                                                    - self._non_integrated_variables[5, ii, _E_not_ref]  # 12. I_GABA
-                                                    - self._non_integrated_variables[6, ii, _E_not_ref]  # 13. I_AMPA_ext
-                                                    + self._x_E_ref(self.I_ext, ii, not_ref)  # I_ext
-                                            ) \
-                                            / self._x_E_ref(self.C_m_E, ii, not_ref)
-
-            # 6...and only refractory t_ref:
-            # dt_ref/dt = -1 for t_ref > 0  so that t' = t - dt
-            # and 0 otherwise
-            derivative[6, ii, _E[ref]] = -1.0
-
-            # Inhibitory neurons:
-
-            _I = self._I(ii)  # inhibitory neurons indices
-
-            # 3. s_GABA/dt = - s_GABA/tau_GABA
-            derivative[3, ii, _I] = -integration_variables[3, ii, _I] / self._x_I(self.tau_GABA, ii)
-
-            # 4. s_AMPA_ext
-            # ds_AMPA_ext/dt = -s_AMPA_exc/tau_AMPA
-            derivative[4, ii, _I] = -integration_variables[4, ii, _I] / self._x_I(self.tau_AMPA, ii)
-
-            # inhibitory refractory neurons:
-            ref = self._refractory_neurons_I[ii]
-            not_ref = numpy.logical_not(ref)
-
-            # 5. Integrate only non-refractory V_m
-            # C_m*dV_m/dt = - I_L - I_AMPA_EXT - I_AMPA - I_GABA - I_NMDA + I_ext
-            # 5. Integrate only non-refractory V_m
-            # C_m*dV_m/dt = - I_L- I_AMPA - I_NMDA - I_GABA  - I_AMPA_EXT + I_ext
-            _I_not_ref = _I[not_ref]
-            derivative[5, ii, _I_not_ref] = (
-                                                    - self._non_integrated_variables[2, ii, _I_not_ref]  # 9. I_L
-                                                    - self._non_integrated_variables[3, ii, _I_not_ref]  # 10. I_AMPA
-                                                    - self._non_integrated_variables[4, ii, _I_not_ref]  # 11. I_NMDA
-                                                    - self._non_integrated_variables[5, ii, _I_not_ref]  # 12. I_GABA
-                                                    - self._non_integrated_variables[6, ii, _I_not_ref]  # 13. I_AMPA_ext
-                                                    + self._x_I_ref(self.I_ext, ii, not_ref)  # I_ext
-                                             ) \
-                                             / self._x_I_ref(self.C_m_I, ii, not_ref)
-
-            # 6...and only refractory t_ref:
-            # dt_ref/dt = -1 for t_ref > 0  so that t' = t - dt
-            # and 0 otherwise
-            derivative[6, ii, _I[ref]] = -1.0
+        exc, inh = self._exc, self._inh
+
+        # Excitatory neurons:
+
+        _E = exc.index  # excitatory neurons indices
+        tau_AMPA_E = exc.gather(self.tau_AMPA)
+
+        # 0. s_AMPA
+        # ds_AMPA/dt = -1/tau_AMPA * s_AMPA
+        derivative[0][_E] = -integration_variables[0][_E] / tau_AMPA_E
+
+        # 1. x_NMDA
+        # dx_NMDA/dt = -x_NMDA/tau_NMDA_rise
+        derivative[1][_E] = -integration_variables[1][_E] / exc.gather(self.tau_NMDA_rise)
+
+        # 2. s_NMDA
+        # ds_NMDA/dt = -1/tau_NMDA_decay * s_NMDA + alpha*x_NMDA*(1-s_NMDA)
+        derivative[2][_E] = \
+            -integration_variables[2][_E] / exc.gather(self.tau_NMDA_decay) \
+            + exc.gather(self.alpha) * integration_variables[1][_E] * (1 - integration_variables[2][_E])
+
+        # 4. s_AMPA_ext
+        # ds_AMPA_ext/dt = -s_AMPA_exc/tau_AMPA
+        derivative[4][_E] = -integration_variables[4][_E] / tau_AMPA_E
+
+        # 5. V_m and 6. t_ref of excitatory refractory and non-refractory neurons:
+        self._V_m_t_ref_derivative(derivative, exc, self._refractory_neurons_E, self.I_ext, self.C_m_E)
+
+        # Inhibitory neurons:
+
+        _I = inh.index  # inhibitory neurons indices
+
+        # 3. s_GABA/dt = - s_GABA/tau_GABA
+        derivative[3][_I] = -integration_variables[3][_I] / inh.gather(self.tau_GABA)
+
+        # 4. s_AMPA_ext
+        # ds_AMPA_ext/dt = -s_AMPA_exc/tau_AMPA
+        derivative[4][_I] = -integration_variables[4][_I] / inh.gather(self.tau_AMPA)
+
+        # 5. V_m and 6. t_ref of inhibitory refractory and non-refractory neurons:
+        self._V_m_t_ref_derivative(derivative, inh, self._refractory_neurons_I, self.I_ext, self.C_m_I)
 
         self._non_integrated_variables = None
 
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+#
+#
+#  TheVirtualBrain-Contributors Package. This package holds simulator extensions.
+#  See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Tests for the ragged populations of spiking mean-field models.
+"""
+
+import os
+import numpy
+
+from tvb.contrib.scripts.models.ragged_population import RaggedPopulation, empty_modes_mask
+from tvb.contrib.scripts.models.spiking_wong_wang_exc_io_inh_i import SpikingWongWangExcIOInhI
+from tvb.tests.library.base_testcase import BaseTestCase
+
+
+class TestRaggedPopulation(BaseTestCase):
+
+    def test_indices(self):
+        exc = RaggedPopulation([2, 0, 3], 0, 6)
+        inh = RaggedPopulation([1, 2, 1], 3, 6)
+        assert exc.size == 5
+        assert exc.regions.tolist() == [0, 0, 2, 2, 2]
+        assert exc.modes.tolist() == [0, 1, 0, 1, 2]
+        assert inh.modes.tolist() == [3, 3, 4, 3]
+        empty = empty_modes_mask([exc, inh])
+        assert empty.tolist() == [[False, False, True, False, True, True],
+                                  [True, True, True, False, False, True],
+                                  [False, False, False, False, True, True]]
+
+    def test_gather_sum_spread(self):
+        exc = RaggedPopulation([2, 0, 3], 0, 6)
+        assert exc.gather(numpy.array([7.0])).tolist() == [7.0] * 5
+        assert exc.gather(numpy.array([[1.0], [2.0], [3.0]])).tolist() == [1.0, 1.0, 3.0, 3.0, 3.0]
+        per_mode = numpy.arange(18.0).reshape((3, 6))
+        assert exc.gather(per_mode).tolist() == [0.0, 1.0, 12.0, 13.0, 14.0]
+        sums = exc.sum(numpy.arange(5.0))
+        assert sums.tolist() == [1.0, 0.0, 9.0]
+        assert exc.spread(sums).tolist() == [1.0, 1.0, 9.0, 9.0, 9.0]
+
+
+class TestSpikingWongWangExcIOInhI(BaseTestCase):
+    """
+    Regions only interact through the coupling input, so integrating all regions at once
+    must give the same result as integrating each region on its own, and as the model did
+    when it integrated one region after the other.
+    """
+
+    # Trajectories of the first 5 steps, computed by the per-region dfun of the model before its vectorization
+    REFERENCE = os.path.join(os.path.dirname(__file__), 'spiking_wong_wang_exc_io_inh_i_reference.npz')
+
+    N_E = numpy.array([40, 25, 10])
+    N_I = numpy.array([10, 12, 5])
+
+    def _model(self, region=None, auto_connection=True):
+        rng = numpy.random.RandomState(3)
+        n_regions = self.N_E.size
+        number_of_modes = self.N_E.max() + self.N_I.max()
+        V_thr = -50.0 + rng.randn(n_regions, number_of_modes)
+        G = numpy.array([[1.0], [2.0], [3.0]])
+        regions = slice(None) if region is None else slice(region, region + 1)
+        model = SpikingWongWangExcIOInhI(N_E=self.N_E[regions], N_I=self.N_I[regions])
+        model._auto_connection = auto_connection
+        model.configure()
+        # keep the modes layout of the whole model
+        model._N_E_max = self.N_E.max()
+        model.number_of_modes = number_of_modes
+        model.V_thr = V_thr[regions]
+        model.G = G[regions]
+        model.spikes_ext = numpy.array([0.5])
+        model.I_ext = numpy.array([10.0])
+        return model
+
+    def _integrate(self, model, state, couplings):
+        results = []
+        for coupling in couplings:
+            state = model.update_state_variables_before_integration(state, coupling, 0.1)
+            derivative = model.dfun(state[:7], coupling, 0.1)
+            results.append((state.copy(), derivative))
+            state[:7] += 0.1 * derivative
+        return results
+
+    def _inputs(self, model):
+        rng = numpy.random.RandomState(42)
+        shape = (model.nvar, self.N_E.size, model.number_of_modes)
+        state = rng.uniform(0.0, 1.0, shape)
+        state[5] = rng.uniform(-60.0, -45.0, shape[1:])
+        state[6] = numpy.where(rng.rand(*shape[1:]) > 0.7, 1.0, 0.0)
+        couplings = rng.rand(10, 1, shape[1], shape[2])
+        return state, couplings
+
+    def _assert_regions_independent(self, auto_connection):
+        model = self._model(auto_connection=auto_connection)
+        state, couplings = self._inputs(model)
+        together = self._integrate(model, state.copy(), couplings)
+        assert sum(numpy.sum(result[0][8]) for result in together) > 0
+
+        for region in range(self.N_E.size):
+            alone = self._integrate(self._model(region, auto_connection),
+                                    state[:, region:region + 1].copy(), couplings[:, :, region:region + 1])
+            for (state_together, dfun_together), (state_alone, dfun_alone) in zip(together, alone):
+                numpy.testing.assert_allclose(state_together[:, region:region + 1], state_alone, rtol=1e-12)
+                numpy.testing.assert_allclose(dfun_together[:, region:region + 1], dfun_alone, rtol=1e-12)
+
+    def test_regions_independent(self):
+        self._assert_regions_independent(auto_connection=True)
+
+    def test_regions_independent_without_auto_connection(self):
+        self._assert_regions_independent(auto_connection=False)
+
+    def _assert_reference(self, auto_connection, name):
+        model = self._model(auto_connection=auto_connection)
+        state, couplings = self._inputs(model)
+        results = self._integrate(model, state, couplings[:5])
+        with numpy.load(self.REFERENCE) as reference:
+            numpy.testing.assert_allclose(numpy.array([result[1] for result in results]),
+                                          reference[name + '_dfun'], rtol=1e-10, atol=1e-10)
+            numpy.testing.assert_allclose(results[-1][0], reference[name + '_last_state'], rtol=1e-10, atol=1e-10)
+
+    def test_reference(self):
+        self._assert_reference(True, 'auto_connection')
+
+    def test_reference_without_auto_connection(self):
+        self._assert_reference(False, 'no_auto_connection')
+
+    def test_dfun_without_update(self):
+        model = self._model()
+        state = numpy.zeros((model.nvar, self.N_E.size, model.number_of_modes))
+        state[5] = -55.0
+        coupling = numpy.zeros((1, self.N_E.size, model.number_of_modes))
+        state = model.update_state_variables_before_integration(state, coupling)
+        first = model.dfun(state[:7], coupling)
+        # e.g. the second stage of Heun's method evaluates dfun again, without a prior update
+        second = model.dfun(state[:7] + 0.1 * first, coupling)
+        assert numpy.all(numpy.isfinite(second))
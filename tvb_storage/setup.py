@@ -45,6 +45,9 @@ STORAGE_TEAM = "Lia Domide, Paula Popa, Bogdan Valean, Robert Vincze, Calin Pave
 
 STORAGE_REQUIRED_PACKAGES = ["h5py", "numpy", "scipy"]
 
+# Pinned, as the encryption of single files relies on private parts of syncrypto
+STORAGE_REQUIRED_EXTRA = ["syncrypto==0.4.2"]
+
 with open(os.path.join(os.path.dirname(__file__), 'README.rst')) as fd:
     DESCRIPTION = fd.read()
 
@@ -54,6 +57,7 @@ setuptools.setup(name='tvb-storage',
                  packages=setuptools.find_packages(),
                  include_package_data=True,
                  install_requires=STORAGE_REQUIRED_PACKAGES,
+                 extras_require={"encrypt": STORAGE_REQUIRED_EXTRA},
                  description='A package which handles the storage of TVB data',
                  long_description="",
                  license="GPL-3.0-or-later",
@@ -34,9 +34,11 @@
 import os
 import shutil
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from io import BytesIO
 from os import stat
-from queue import Queue
+from queue import Queue, Empty
 from threading import Lock
 
 import pyAesCrypt
@@ -50,7 +52,8 @@ from tvb.storage.h5.file.files_helper import FilesHelper
 LOGGER = get_logger(__name__)
 
 try:
-    from syncrypto import Crypto, Syncrypto
+    from lockfile.mkdirlockfile import MkdirLockFile
+    from syncrypto import Crypto, FileEntry, FileTree, Syncrypto
 except ModuleNotFoundError:
     LOGGER.info("Cannot import syncrypto library.")
 
@@ -77,6 +80,87 @@ class DataEncryptionHandlerMeta(type):
         return cls._instance
 
 
+class SyncryptoTrees(object):
+    """
+    Access to the file trees of a Syncrypto instance, for encrypting only some files of a folder.
+    Syncrypto has no public API for this, so the private members used here are listed in PRIVATE_API and
+    only known to work with SYNCRYPTO_VERSION, the version pinned in setup.py.
+    """
+
+    SYNCRYPTO_VERSION = "0.4.2"
+
+    # Private Syncrypto methods used, with their parameters
+    PRIVATE_API = {
+        "_load_encrypted_tree": ("self",),
+        "_load_snapshot_tree": ("self",),
+        "_compare_file": ("self", "encrypted_file", "plain_file", "snapshot_file"),
+        "_generate_encrypted_path": ("self", "encrypted_file"),
+        "_encrypt_file": ("self", "pathname"),
+        "_save_trees": ("self",),
+    }
+
+    def __init__(self, syncro):
+        self.syncro = syncro
+
+    @property
+    def plain_folder(self):
+        return self.syncro.plain_folder
+
+    @property
+    def encrypted_folder(self):
+        return self.syncro.encrypted_folder
+
+    def load(self):
+        """
+        Read the encrypted and the snapshot trees from disk.
+        Return False when the encrypted folder is new, as it has no trees yet.
+        """
+        self.syncro._load_encrypted_tree()
+        if self.syncro._encrypted_folder_is_new:
+            return False
+        self.syncro._load_snapshot_tree()
+        return True
+
+    def has_folder(self, pathname):
+        return pathname == '' or self.syncro.encrypted_tree.get(pathname) is not None
+
+    def compare(self, plain_file):
+        """
+        Return the action Syncrypto would take for the plain file ("encrypt", "same", "ignore", "decrypt"...)
+        """
+        pathname = plain_file.pathname
+        return self.syncro._compare_file(self.syncro.encrypted_tree.get(pathname), plain_file,
+                                         self.syncro.snapshot_tree.get(pathname))
+
+    def prepare_encryption(self, plain_files):
+        """
+        Make the given files the only plain ones and give an encrypted path to those which do not have one yet.
+        """
+        self.syncro.plain_tree = FileTree()
+        for plain_file in plain_files:
+            self.syncro.plain_tree.set(plain_file.pathname, plain_file)
+            if self.syncro.encrypted_tree.get(plain_file.pathname) is None:
+                # Reserve the encrypted path before encrypting, as it depends on the paths already in the tree
+                encrypted_file = plain_file.clone()
+                self.syncro._generate_encrypted_path(encrypted_file)
+                self.syncro.encrypted_tree.set(plain_file.pathname, encrypted_file)
+
+    def encrypt(self, pathname):
+        """
+        Encrypt one of the files given to prepare_encryption. Safe to call from several threads.
+        """
+        return self.syncro._encrypt_file(pathname)
+
+    def save(self, encrypted_files):
+        """
+        Record the encrypted files in the trees and write the trees to disk.
+        """
+        for encrypted_file in encrypted_files:
+            self.syncro.encrypted_tree.set(encrypted_file.pathname, encrypted_file)
+        self.syncro.snapshot_tree = self.syncro.encrypted_tree
+        self.syncro._save_trees()
+
+
 class DataEncryptionHandler(metaclass=DataEncryptionHandlerMeta):
     ENCRYPTED_FOLDER_SUFFIX = "_encrypted"
     KEYS_FOLDER = ".storage-keys"
@@ -101,6 +185,22 @@ class DataEncryptionHandler(metaclass=DataEncryptionHandlerMeta):
     # Linked projects
     linked_projects = {}
 
+    # Dict used to keep, for each project, the files changed since its last synchronisation.
+    # None means that the whole project needs to be synchronised.
+    dirty_files = {}
+
+    # Projects which are currently being synchronised by the queue consumer
+    syncing_folders = set()
+
+    # One lock per project folder, so that the same folder is never synchronised concurrently
+    folder_sync_locks = {}
+
+    # Seconds to wait after a push, so that a burst of writes ends up in a single synchronisation
+    SYNC_COALESCE_DELAY = 0.5
+
+    # Maximum number of projects which are synchronised in parallel
+    SYNC_MAX_WORKERS = 4
+
     lock = Lock()
 
     def _queue_count(self, folder):
@@ -142,21 +242,6 @@ class DataEncryptionHandler(metaclass=DataEncryptionHandlerMeta):
         count -= 1
         self.running_operations[folder] = count
 
-    @synchronized(lock)
-    def _inc_queue_count(self, folder):
-        count = self._queue_count(folder)
-        count += 1
-        self.queue_elements_count[folder] = count
-
-    @synchronized(lock)
-    def dec_queue_count(self, folder):
-        count = self._queue_count(folder)
-        if count == 1:
-            self.queue_elements_count.pop(folder)
-            return
-        count -= 1
-        self.queue_elements_count[folder] = count
-
     @synchronized(lock)
     def check_and_delete(self, folder):
         # Check if we can remove a folder:
@@ -171,9 +256,47 @@ class DataEncryptionHandler(metaclass=DataEncryptionHandlerMeta):
 
     def is_in_usage(self, project_folder):
         return self._queue_count(project_folder) > 0 \
+               or project_folder in self.syncing_folders \
                or self._project_active_count(project_folder) > 0 \
                or self._running_op_count(project_folder) > 0
 
+    @synchronized(lock)
+    def _mark_dirty(self, folder, changed_file=None):
+        """
+        Remember the changed file and check if the folder needs to be pushed into the queue.
+        A push without a changed file requires the synchronisation of the whole folder.
+        A folder already waiting in the queue will pick up the new changes when it gets synchronised.
+        """
+        if changed_file is None:
+            self.dirty_files[folder] = None
+        elif self.dirty_files.setdefault(folder, set()) is not None:
+            self.dirty_files[folder].add(changed_file)
+        if self._queue_count(folder) > 0:
+            return False
+        self.queue_elements_count[folder] = 1
+        return True
+
+    @synchronized(lock)
+    def start_folder_sync(self, folder):
+        """
+        Take the folder out of the queue and return the files changed since its last synchronisation,
+        or None when the whole folder needs to be synchronised.
+        Changes which are pushed from now on will queue the folder again.
+        """
+        self.queue_elements_count.pop(folder, None)
+        self.syncing_folders.add(folder)
+        return self.dirty_files.pop(folder, None)
+
+    @synchronized(lock)
+    def finish_folder_sync(self, folder):
+        self.syncing_folders.discard(folder)
+
+    @synchronized(lock)
+    def _folder_sync_lock(self, folder):
+        if folder not in self.folder_sync_locks:
+            self.folder_sync_locks[folder] = Lock()
+        return self.folder_sync_locks[folder]
+
     @staticmethod
     def compute_encrypted_folder_path(current_project_folder):
         project_name = os.path.basename(current_project_folder)
@@ -181,7 +304,12 @@ class DataEncryptionHandler(metaclass=DataEncryptionHandlerMeta):
         return "{}{}".format(project_path, DataEncryptionHandler.ENCRYPTED_FOLDER_SUFFIX)
 
     @staticmethod
-    def sync_folders(folder):
+    def sync_folders(folder, changed_files=None):
+        """
+        Synchronise the plain project folder with its encrypted copy.
+        When the changed files are known, only those get encrypted (in parallel),
+        otherwise the whole folder is compared and synchronised.
+        """
         if not DataEncryptionHandler.encryption_enabled():
             return
 
@@ -191,14 +319,62 @@ class DataEncryptionHandler(metaclass=DataEncryptionHandlerMeta):
         if os.path.exists(encrypted_folder) or os.path.exists(folder):
             crypto_pass = DataEncryptionHandler._project_key(project_name)
             crypto = Crypto(crypto_pass)
-            syncro = Syncrypto(crypto, encrypted_folder, folder)
-            syncro.sync_folder()
-            trash_path = os.path.join(encrypted_folder, "_syncrypto", "trash")
-            if os.path.exists(trash_path):
-                shutil.rmtree(trash_path)
+            with encryption_handler._folder_sync_lock(folder):
+                syncro = Syncrypto(crypto, encrypted_folder, folder)
+                if not changed_files or not DataEncryptionHandler._encrypt_changed_files(syncro, changed_files):
+                    # Syncrypto only re-encrypts the files whose size or modification time changed since the last sync
+                    syncro.sync_folder()
+                trash_path = os.path.join(encrypted_folder, "_syncrypto", "trash")
+                if os.path.exists(trash_path):
+                    shutil.rmtree(trash_path)
         else:
             LOGGER.info("Project {} was deleted".format(project_name))
 
+    @staticmethod
+    def _changed_entries(trees, changed_files):
+        """
+        Build the plain file entries of the changed files which need to be encrypted.
+        Return None when a change can not be handled by encrypting single files
+        (deleted files, new folders or files changed on the encrypted side as well).
+        """
+        entries = []
+        for changed_file in changed_files:
+            pathname = os.path.relpath(changed_file, trees.plain_folder)
+            if pathname.startswith(os.pardir) or not os.path.isfile(changed_file):
+                return None
+            pathname = pathname.replace(os.sep, '/')
+            plain_file = FileEntry.from_file(changed_file, pathname)
+            parent, _ = plain_file.split()
+            if not trees.has_folder(parent):
+                return None
+            action = trees.compare(plain_file)
+            if action == "encrypt":
+                entries.append(plain_file)
+            elif action not in ("same", "ignore"):
+                return None
+        return entries
+
+    @staticmethod
+    def _encrypt_changed_files(syncro, changed_files):
+        """
+        Encrypt in parallel only the given files of the plain folder and update the Syncrypto file trees.
+        Return False when the folder needs a full synchronisation instead.
+        """
+        trees = SyncryptoTrees(syncro)
+        with MkdirLockFile(trees.encrypted_folder), MkdirLockFile(trees.plain_folder):
+            if not trees.load():
+                return False
+            entries = DataEncryptionHandler._changed_entries(trees, changed_files)
+            if entries is None:
+                return False
+
+            trees.prepare_encryption(entries)
+            with ThreadPoolExecutor(max_workers=DataEncryptionHandler.SYNC_MAX_WORKERS) as executor:
+                encrypted_files = list(executor.map(trees.encrypt, [entry.pathname for entry in entries]))
+            trees.save(encrypted_files)
+        LOGGER.info("Encrypted {} changed files of {}".format(len(entries), trees.plain_folder))
+        return True
+
     def set_project_active(self, project, linked_dt):
         if not self.encryption_enabled():
             return
@@ -225,20 +401,18 @@ class DataEncryptionHandler(metaclass=DataEncryptionHandlerMeta):
         projects.add(project_folder)
         for project_folder in projects:
             self._dec_project_usage_count(project_folder)
-            if self._queue_count(project_folder) > 0 \
-                    or self._project_active_count(project_folder) > 0 \
-                    or self._running_op_count(project_folder) > 0:
+            if self.is_in_usage(project_folder):
                 self.marked_for_delete.add(project_folder)
                 LOGGER.info("Project {} still in use. Marked for deletion.".format(project_folder))
                 continue
             LOGGER.info("Remove project: {}".format(project_folder))
             shutil.rmtree(project_folder)
 
-    def push_folder_to_sync(self, project_folder):
-        if not self.encryption_enabled() or self._queue_count(project_folder) > 0:
+    def push_folder_to_sync(self, project_folder, changed_file=None):
+        if not self.encryption_enabled():
             return
-        self._inc_queue_count(project_folder)
-        self.sync_project_queue.put(project_folder)
+        if self._mark_dirty(project_folder, changed_file):
+            self.sync_project_queue.put(project_folder)
 
     @staticmethod
     def encryption_enabled():
@@ -298,32 +472,68 @@ class DataEncryptionHandler(metaclass=DataEncryptionHandlerMeta):
 
 
 class FoldersQueueConsumer(threading.Thread):
-    was_processing = False
+    """
+    Thread which synchronises the project folders pushed into the queue.
+    It blocks while the queue is empty, coalesces the pushes received in a short interval
+    and synchronises the distinct projects of such a batch in parallel.
+    """
 
     marked_stop = False
 
     def mark_stop(self):
         self.marked_stop = True
+        # Wake up the consumer if it is waiting for the queue
+        encryption_handler.sync_project_queue.put(None)
+
+    @staticmethod
+    def _collect_batch(first_folder):
+        """
+        Wait for the burst of pushes to settle and drain the queue into an ordered list of distinct folders.
+        """
+        queue = encryption_handler.sync_project_queue
+        folders = [] if first_folder is None else [first_folder]
+        time.sleep(DataEncryptionHandler.SYNC_COALESCE_DELAY)
+        while True:
+            try:
+                folder = queue.get_nowait()
+            except Empty:
+                break
+            queue.task_done()
+            if folder is not None and folder not in folders:
+                folders.append(folder)
+        return folders
+
+    @staticmethod
+    def _sync_folder(folder):
+        changed_files = encryption_handler.start_folder_sync(folder)
+        try:
+            LOGGER.info("Sync folder {} ({} changed files)".format(
+                folder, "all" if changed_files is None else len(changed_files)))
+            DataEncryptionHandler.sync_folders(folder, changed_files)
+        except Exception as excep:
+            LOGGER.exception(excep)
+        finally:
+            encryption_handler.finish_folder_sync(folder)
+        encryption_handler.check_and_delete(folder)
 
     def run(self):
         if not DataEncryptionHandler.encryption_enabled():
             return
-        while True:
-            if encryption_handler.sync_project_queue.empty():
-                if self.was_processing:
-                    self.was_processing = False
-                    LOGGER.info("Finish processing queue")
-                if self.marked_stop:
+        queue = encryption_handler.sync_project_queue
+        with ThreadPoolExecutor(max_workers=DataEncryptionHandler.SYNC_MAX_WORKERS) as executor:
+            while True:
+                first_folder = queue.get()
+                queue.task_done()
+                if first_folder is None and queue.empty():
+                    if self.marked_stop:
+                        break
+                    continue
+                folders = self._collect_batch(first_folder)
+                LOGGER.info("Start processing queue for {} folders".format(len(folders)))
+                wait([executor.submit(self._sync_folder, folder) for folder in folders])
+                LOGGER.info("Finish processing queue")
+                if self.marked_stop and queue.empty():
                     break
-                continue
-            if not self.was_processing:
-                LOGGER.info("Start processing queue")
-                self.was_processing = True
-            folder = encryption_handler.sync_project_queue.get()
-            DataEncryptionHandler.sync_folders(folder)
-            encryption_handler.dec_queue_count(folder)
-            encryption_handler.check_and_delete(folder)
-            encryption_handler.sync_project_queue.task_done()
 
 
 encryption_handler = DataEncryptionHandler()
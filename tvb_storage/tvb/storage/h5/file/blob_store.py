@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and 
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Content-addressed store for the large data sets of H5 files, shared by all the files holding the same data.
+
+A shared data set is written once under TVB_STORAGE/BLOBS/<hash prefix>/<hash>/, as the single data set of its own
+H5 file. Every H5 file using it holds an external link to a reference file of its own in that folder. References
+are hard links to the blob: the link count of the blob is its reference count, and the data is freed when the last
+reference is removed. The linking files keep their GIDs and attributes, only the data moves.
+"""
+
+import hashlib
+import os
+import shutil
+import uuid
+
+import h5py as hdf5
+import numpy
+
+from tvb.basic.logger.builder import get_logger
+from tvb.basic.profile import TvbProfile
+from tvb.storage.h5.file.storage_policy import MAX_CHUNK_BYTES
+
+LOG = get_logger(__name__)
+
+BLOBS_FOLDER = "BLOBS"
+BLOB_FILE = "blob.h5"
+BLOB_DATASET = "/data"
+H5_EXTENSION = ".h5"
+# Smaller data sets are not worth an extra file and an external link
+MIN_SHARED_BYTES = 64 * 1024
+
+
+def _read_only_link_access():
+    link_access = hdf5.h5p.create(hdf5.h5p.LINK_ACCESS)
+    link_access.set_elink_acc_flags(hdf5.h5f.ACC_RDONLY)
+    return link_access
+
+
+# By default HDF5 opens the target of an external link in the mode of the linking file. Blobs are read by many files
+# and processes at once, so they are always opened read only: writing would change the data of all their users,
+# and the HDF5 write lock would block the other readers.
+READ_ONLY_LINK_ACCESS = _read_only_link_access()
+
+
+class BlobStore(object):
+    """
+    Moves the large data sets of H5 files into shared, reference counted blobs, and keeps the references
+    in step when the linking files are copied, changed or removed.
+    """
+
+    def __init__(self, root=None):
+        self._root = root
+
+    @property
+    def root(self):
+        if self._root is not None:
+            return self._root
+        return os.path.join(TvbProfile.current.TVB_STORAGE, BLOBS_FOLDER)
+
+    @staticmethod
+    def is_shared(link):
+        """
+        :returns: True when the h5py link (as returned by getlink=True) points into a blob store
+        """
+        return isinstance(link, hdf5.ExternalLink) and BLOBS_FOLDER in os.path.normpath(link.filename).split(os.sep)
+
+    @classmethod
+    def shared_link(cls, h5_file, path):
+        """
+        :returns: the ExternalLink at path in the open h5py file when it points into a blob store, otherwise None
+        """
+        if not path.strip('/') or path not in h5_file:
+            return None
+        link = h5_file.get(path, getlink=True)
+        return link if cls.is_shared(link) else None
+
+    @staticmethod
+    def open_shared(h5_file, path):
+        """
+        :returns: the h5py data set behind the shared link at path, opened read only
+        """
+        return hdf5.Dataset(hdf5.h5o.open(h5_file.id, path.encode(), lapl=READ_ONLY_LINK_ACCESS))
+
+    @classmethod
+    def shared_links(cls, h5_file):
+        """
+        :returns: dictionary {node path: ExternalLink} with the shared data sets linked from the open h5py file
+        """
+        links = {}
+
+        def visit(group):
+            for name in group:
+                path = group.name.rstrip('/') + '/' + name
+                link = group.get(name, getlink=True)
+                if cls.is_shared(link):
+                    links[path] = link
+                elif isinstance(link, hdf5.HardLink) and group.get(name, getclass=True) is hdf5.Group:
+                    visit(group[name])
+
+        visit(h5_file)
+        return links
+
+    @classmethod
+    def shared_links_of(cls, h5_path):
+        """
+        Same as shared_links, for the file at h5_path. Missing and non H5 files link nothing.
+        """
+        if not str(h5_path).endswith(H5_EXTENSION) or not os.path.isfile(h5_path):
+            return {}
+        try:
+            with hdf5.File(h5_path, 'r') as h5_file:
+                return cls.shared_links(h5_file)
+        except OSError:
+            LOG.warning("Could not read the shared data sets of %s" % h5_path)
+            return {}
+
+    def _reference_path(self, h5_path, link):
+        """
+        :returns: the real path of the reference which the shared link in the file at h5_path points to, or None
+                  when that is not a reference inside this store (e.g. a link crafted in an imported file), which
+                  must then never be removed
+        """
+        reference = os.path.realpath(os.path.join(os.path.dirname(os.path.abspath(h5_path)), link.filename))
+        root = os.path.realpath(self.root)
+        if os.path.commonpath([root, reference]) == root:
+            # References sit at <root>/<hash prefix>/<hash>/<uuid>.h5, next to their blob
+            parts = os.path.relpath(reference, root).split(os.sep)
+            if len(parts) == 3 and parts[2] != BLOB_FILE and parts[2].endswith(H5_EXTENSION):
+                return reference
+        LOG.warning("%s links %s, outside of the blob store %s, ignoring it" % (h5_path, link.filename, root))
+        return None
+
+    def logical_size(self, h5_path):
+        """
+        :returns: the size in bytes of the file at h5_path, counting the shared data sets it links to
+        """
+        size = os.path.getsize(h5_path)
+        for link in self.shared_links_of(h5_path).values():
+            reference = self._reference_path(h5_path, link)
+            if reference is not None and os.path.exists(reference):
+                size += os.path.getsize(reference)
+        return size
+
+    def physical_size(self):
+        """
+        :returns: the bytes held by the blobs, each counted once however many files link to it
+        """
+        seen = set()
+        total = 0
+        for folder, _, files in os.walk(self.root):
+            for file_name in files:
+                stat = os.stat(os.path.join(folder, file_name))
+                if (stat.st_dev, stat.st_ino) not in seen:
+                    seen.add((stat.st_dev, stat.st_ino))
+                    total += stat.st_size
+        return total
+
+    def deduplicate(self, h5_path, min_bytes=MIN_SHARED_BYTES):
+        """
+        Move the data sets of at least min_bytes from the file at h5_path into blobs, and link them from there.
+        :returns: the number of bytes freed in h5_path
+        """
+        if not hasattr(os, 'link'):
+            return 0
+        references = {}
+        try:
+            with hdf5.File(h5_path, 'r') as h5_file:
+                for path, dataset in self._large_datasets(h5_file, min_bytes):
+                    reference = self._new_reference(self._content_hash(dataset), dataset)
+                    if reference is not None:
+                        references[path] = reference
+            if not references:
+                return 0
+
+            size_before = os.path.getsize(h5_path)
+            folder = os.path.dirname(os.path.abspath(h5_path))
+            links = {path: hdf5.ExternalLink(os.path.relpath(reference, folder), BLOB_DATASET)
+                     for path, reference in references.items()}
+            self._rewrite(h5_path, lambda source, path: links.get(path))
+        except Exception:
+            for reference in references.values():
+                self._drop_reference(reference)
+            raise
+        LOG.debug("Shared %d data sets of %s" % (len(references), h5_path))
+        return size_before - os.path.getsize(h5_path)
+
+    def copy(self, source_path, dest_path, share):
+        """
+        Copy the file at source_path into dest_path. Its shared data sets get references of their own when share is
+        True, otherwise their data is copied into dest_path (e.g. for files leaving the TVB storage).
+        :returns: False when source_path links no shared data set, and nothing was copied
+        """
+        shared = self.shared_links_of(source_path)
+        if not shared:
+            return False
+        dest_folder = os.path.dirname(os.path.abspath(dest_path))
+        os.makedirs(dest_folder, exist_ok=True)
+        references = []
+
+        def replacement(source, path):
+            if path not in shared:
+                return None
+            source_reference = self._reference_path(source_path, shared[path])
+            if share and source_reference is not None:
+                reference = self._link_reference(source_reference)
+                if reference is not None:
+                    references.append(reference)
+                    return hdf5.ExternalLink(os.path.relpath(reference, dest_folder), BLOB_DATASET)
+            return self.open_shared(source, path)
+
+        temporary_path = "%s.%s.tmp" % (dest_path, uuid.uuid4().hex)
+        try:
+            self._write_copy(source_path, temporary_path, replacement)
+            os.replace(temporary_path, dest_path)
+        except Exception:
+            for reference in references:
+                self._drop_reference(reference)
+            raise
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+        return True
+
+    def unshare(self, h5_file, path):
+        """
+        Replace the shared link at path, in the h5py file open for writing, with a private copy of its data,
+        so that it can be changed. Nodes which are not shared are left as they are.
+        """
+        link = self.shared_link(h5_file, path)
+        if link is None:
+            return
+        shared = self.open_shared(h5_file, path)
+        del h5_file[path]
+        h5_file.copy(shared, path)
+        self._drop_link_reference(h5_file.filename, link)
+
+    def release_link(self, h5_file, path):
+        """
+        Drop the reference of the shared link at path in the open h5py file, before removing that link.
+        """
+        link = self.shared_link(h5_file, path)
+        if link is not None:
+            self._drop_link_reference(h5_file.filename, link)
+
+    def release(self, h5_path):
+        """
+        Drop the references of the file at h5_path, before removing that file.
+        """
+        for link in self.shared_links_of(h5_path).values():
+            self._drop_link_reference(h5_path, link)
+
+    def _drop_link_reference(self, h5_path, link):
+        reference = self._reference_path(h5_path, link)
+        if reference is not None:
+            self._drop_reference(reference)
+
+    def release_folder(self, folder):
+        """
+        Drop the references of all the H5 files under folder, before removing that folder.
+        """
+        for root, _, files in os.walk(folder):
+            for file_name in files:
+                if file_name.endswith(H5_EXTENSION):
+                    self.release(os.path.join(root, file_name))
+
+    def collect_garbage(self, folders):
+        """
+        Drop the references which no H5 file under folders links to anymore (e.g. left behind by files removed
+        outside the storage API), together with the blobs they were the last reference of.
+        :returns: the number of bytes freed
+        """
+        live = set()
+        for folder in folders:
+            for root, _, files in os.walk(folder):
+                for file_name in files:
+                    h5_path = os.path.join(root, file_name)
+                    for link in self.shared_links_of(h5_path).values():
+                        reference = self._reference_path(h5_path, link)
+                        if reference is not None:
+                            live.add(reference)
+
+        size_before = self.physical_size()
+        for root, _, files in os.walk(self.root):
+            for file_name in files:
+                reference = os.path.realpath(os.path.join(root, file_name))
+                if file_name != BLOB_FILE and file_name.endswith(H5_EXTENSION) and reference not in live:
+                    self._drop_reference(reference)
+            # Blobs left without references, by an interrupted deduplicate
+            self._drop_reference(os.path.join(root, BLOB_FILE))
+        return size_before - self.physical_size()
+
+    @staticmethod
+    def _large_datasets(h5_file, min_bytes):
+        found = []
+
+        def visit(name, node):
+            if isinstance(node, hdf5.Dataset) and node.shape and node.dtype.kind != 'O' and node.nbytes >= min_bytes:
+                found.append(('/' + name, node))
+
+        # Only follows hard links, data sets already shared are not visited again
+        h5_file.visititems(visit)
+        return found
+
+    @staticmethod
+    def _content_hash(dataset):
+        """
+        :returns: a digest of the data, attributes and on-disk layout of the h5py data set
+        """
+        digest = hashlib.sha256()
+        layout = (dataset.dtype.descr, dataset.shape, dataset.maxshape, dataset.chunks,
+                  dataset.compression, dataset.compression_opts, dataset.shuffle)
+        digest.update(repr(layout).encode())
+        for meta_key in sorted(dataset.attrs):
+            value = numpy.asarray(dataset.attrs[meta_key])
+            digest.update(meta_key.encode())
+            if value.dtype.kind in 'OSUV':
+                digest.update(repr(value.tolist()).encode())
+            else:
+                digest.update(value.dtype.str.encode())
+                digest.update(value.tobytes())
+        # Read in blocks along the first axis, to keep large data sets out of memory
+        row_bytes = max(1, dataset.nbytes // dataset.shape[0])
+        step = max(1, 16 * MAX_CHUNK_BYTES // row_bytes)
+        for start in range(0, dataset.shape[0], step):
+            digest.update(numpy.ascontiguousarray(dataset[start:start + step]).tobytes())
+        return digest.hexdigest()
+
+    def _new_reference(self, content_hash, dataset):
+        """
+        Add a reference to the blob of content_hash, writing it from the h5py data set when it is not stored yet.
+        :returns: the path of the new reference, or None when the file system can not link files
+        """
+        folder = os.path.join(self.root, content_hash[:2], content_hash)
+        blob = os.path.join(folder, BLOB_FILE)
+        for _ in range(2):
+            try:
+                os.makedirs(folder, exist_ok=True)
+                if not os.path.exists(blob):
+                    self._write_blob(blob, dataset)
+                reference = self._link_reference(blob)
+                if reference is not None or os.path.exists(blob):
+                    return reference
+            except FileNotFoundError:
+                # The last reference to this blob was released meanwhile
+                continue
+        return None
+
+    @staticmethod
+    def _link_reference(existing):
+        """
+        :returns: the path of a new reference next to the existing blob or reference, or None when linking fails
+        """
+        reference = os.path.join(os.path.dirname(existing), uuid.uuid4().hex + H5_EXTENSION)
+        try:
+            os.link(existing, reference)
+            return reference
+        except FileNotFoundError:
+            return None
+        except OSError:
+            LOG.warning("Could not link %s, its data will not be shared" % existing)
+            return None
+
+    @staticmethod
+    def _write_blob(blob, dataset):
+        temporary_path = "%s.%s.tmp" % (blob, uuid.uuid4().hex)
+        try:
+            with hdf5.File(temporary_path, 'w', libver='latest') as blob_file:
+                blob_file.copy(dataset, BLOB_DATASET)
+            os.replace(temporary_path, blob)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    @staticmethod
+    def _drop_reference(reference):
+        """
+        Remove one reference, and its blob too when no other reference is left.
+        """
+        folder = os.path.dirname(reference)
+        blob = os.path.join(folder, BLOB_FILE)
+        try:
+            if os.path.basename(reference) != BLOB_FILE:
+                os.remove(reference)
+            if os.stat(blob).st_nlink <= 1:
+                os.remove(blob)
+                # Only succeeds when no reference is being added concurrently
+                os.rmdir(folder)
+        except OSError:
+            pass
+
+    def _rewrite(self, h5_path, replacement):
+        temporary_path = "%s.%s.tmp" % (h5_path, uuid.uuid4().hex)
+        try:
+            self._write_copy(h5_path, temporary_path, replacement)
+            shutil.copymode(h5_path, temporary_path)
+            os.replace(temporary_path, h5_path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    def _write_copy(self, source_path, target_path, replacement):
+        """
+        Write a copy of the file at source_path into target_path. replacement(source, path) gives, for each node,
+        either an ExternalLink or an h5py data set to write in its place, or None to copy the node as it is.
+        """
+        with hdf5.File(source_path, 'r') as source, hdf5.File(target_path, 'w', libver='latest') as target:
+            self._copy_group(source, target, lambda path: replacement(source, path))
+
+    @classmethod
+    def _copy_group(cls, source, target, replacement):
+        for meta_key, value in source.attrs.items():
+            target.attrs[meta_key] = value
+        for name in source:
+            path = source.name.rstrip('/') + '/' + name
+            new_node = replacement(path)
+            link = source.get(name, getlink=True)
+            if isinstance(new_node, hdf5.ExternalLink):
+                target[name] = new_node
+            elif new_node is not None:
+                target.copy(new_node, name)
+            elif isinstance(link, hdf5.SoftLink):
+                target[name] = hdf5.SoftLink(link.path)
+            elif isinstance(link, hdf5.ExternalLink):
+                target[name] = hdf5.ExternalLink(link.filename, link.path)
+            elif source.get(name, getclass=True) is hdf5.Group:
+                cls._copy_group(source[name], target.create_group(name), replacement)
+            else:
+                source.copy(source[name], target, name=name)
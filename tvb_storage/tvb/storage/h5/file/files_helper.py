@@ -34,12 +34,15 @@
 
 import os
 import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from threading import Lock
-from zipfile import ZipFile, ZIP_DEFLATED, BadZipfile
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED, BadZipfile
 
 from tvb.basic.logger.builder import get_logger
 from tvb.basic.profile import TvbProfile
 from tvb.storage.h5.decorators import synchronized
+from tvb.storage.h5.file.blob_store import BlobStore
 from tvb.storage.h5.file.exceptions import FileStructureException
 from tvb.storage.h5.file.xml_metadata_handlers import XMLWriter, XMLReader
 
@@ -54,6 +57,8 @@ class FilesHelper(object):
     PROJECTS_FOLDER = "PROJECTS"
     ALLEN_MOUSE_CONNECTIVITY_CACHE_FOLDER = "ALLEN_MOUSE_CONNECTIVITY_CACHE"
     TUMOR_DATASET_FOLDER = "TUMOR_DATASET"
+    # Number of threads extracting the members of an archive in parallel
+    UNPACK_WORKERS = 4
 
     def __init__(self):
         self.logger = get_logger(self.__class__.__module__)
@@ -122,6 +127,7 @@ class FilesHelper(object):
             complete_path = self.get_project_folder(project_name)
             if os.path.exists(complete_path):
                 if os.path.isdir(complete_path):
+                    BlobStore().release_folder(complete_path)
                     shutil.rmtree(complete_path)
                 else:
                     os.remove(complete_path)
@@ -172,6 +178,7 @@ class FilesHelper(object):
             complete_path = self.get_project_folder(project_name, str(operation_id))
             self.logger.debug("Removing: " + str(complete_path))
             if os.path.isdir(complete_path):
+                BlobStore().release_folder(complete_path)
                 shutil.rmtree(complete_path)
             elif os.path.exists(complete_path):
                 os.remove(complete_path)
@@ -186,6 +193,7 @@ class FilesHelper(object):
         """
         try:
             if os.path.exists(h5_file):
+                BlobStore().release(h5_file)
                 os.remove(h5_file)
             else:
                 self.logger.warning("Data file already removed:" + str(h5_file))
@@ -259,7 +267,7 @@ class FilesHelper(object):
         :param zip_full_path: full path and name of the result ZIP file
         :param folders: array with the FULL names/path of the folders to add into ZIP 
         """
-        with ZipFile(zip_full_path, "w", ZIP_DEFLATED, True) as zip_res:
+        with TvbZip(zip_full_path, "w") as zip_res:
             for folder in set(folders):
                 parent_folder, _ = os.path.split(folder)
                 for root, _, files in os.walk(folder):
@@ -275,7 +283,7 @@ class FilesHelper(object):
         """
         Given a folder and a ZIP result name, create the corresponding archive.
         """
-        with ZipFile(result_name, "w", ZIP_DEFLATED, True) as zip_res:
+        with TvbZip(result_name, "w") as zip_res:
             for root, _, files in os.walk(folder_root):
                 # NOTE: ignore empty directories
                 for file_n in files:
@@ -286,7 +294,7 @@ class FilesHelper(object):
         return result_name
 
     def unpack_zip(self, uploaded_zip, folder_path):
-        """ Simple method to unpack ZIP archive in a given folder. """
+        """ Unpack ZIP archive in a given folder, extracting its members in parallel. """
 
         def to_be_excluded(name):
             excluded_paths = ["__MACOSX/", ".DS_Store"]
@@ -296,12 +304,9 @@ class FilesHelper(object):
             return False
 
         try:
-            result = []
             with ZipFile(uploaded_zip) as zip_arch:
-                for filename in zip_arch.namelist():
-                    if not to_be_excluded(filename):
-                        result.append(zip_arch.extract(filename, folder_path))
-            return result
+                members = [info for info in zip_arch.infolist() if not to_be_excluded(info.filename)]
+            return self._extract_members(uploaded_zip, members, folder_path)
         except BadZipfile as excep:
             self.logger.exception("Could not process zip file")
             raise FileStructureException("Invalid ZIP file..." + str(excep))
@@ -309,15 +314,58 @@ class FilesHelper(object):
             self.logger.exception("Could not process zip file")
             raise FileStructureException("Could not unpack the given ZIP file..." + str(excep))
 
+    def _extract_members(self, uploaded_zip, members, folder_path):
+        """
+        Split the members in groups of similar size and extract each group on its own archive handle.
+        :returns: the extracted paths, in the order of the members in the archive
+        """
+        nr_workers = max(1, min(self.UNPACK_WORKERS, len(members)))
+        groups = [[] for _ in range(nr_workers)]
+        group_sizes = [0] * nr_workers
+        for index, info in sorted(enumerate(members), key=lambda item: item[1].file_size, reverse=True):
+            smallest = group_sizes.index(min(group_sizes))
+            groups[smallest].append((index, info))
+            group_sizes[smallest] += info.file_size
+
+        def extract_member(zip_arch, info):
+            try:
+                return zip_arch.extract(info, folder_path)
+            except FileExistsError:
+                # Another extraction created the same parent folder in between its check and its makedirs
+                return zip_arch.extract(info, folder_path)
+
+        def extract_group(group):
+            # ZipFile.extract sanitizes the member names, so that nothing is written outside of folder_path
+            with ZipFile(uploaded_zip) as zip_arch:
+                return [(index, extract_member(zip_arch, info)) for index, info in group]
+
+        result = [None] * len(members)
+        with ThreadPoolExecutor(max_workers=nr_workers) as executor:
+            for extracted in executor.map(extract_group, groups):
+                for index, path in extracted:
+                    result[index] = path
+        return result
+
     @staticmethod
     def copy_file(source, dest, dest_postfix, buffer_size):
         """
         Copy a file from source to dest. source and dest can either be strings or 
         any object with a read or write method, like StringIO for example.
+        H5 files keep sharing their deduplicated data sets when copied into the projects folder,
+        and get their own copy of that data anywhere else.
         """
         should_close_source = False
         should_close_dest = False
 
+        if not hasattr(source, 'read') and not hasattr(dest, 'write'):
+            dest_path = os.path.join(dest, dest_postfix) if dest_postfix is not None else dest
+            # The references of an overwritten file are dropped, whatever replaces it
+            BlobStore().release(dest_path)
+            projects_folder = os.path.realpath(FilesHelper.get_projects_folder())
+            share = os.path.realpath(dest_path).startswith(projects_folder + os.sep)
+            if BlobStore().copy(source, dest_path, share):
+                return
+
         try:
             if not hasattr(source, 'read'):
                 source = open(source, 'rb')
@@ -348,8 +396,10 @@ class FilesHelper(object):
         for file_ in file_list:
             try:
                 if os.path.isfile(file_):
+                    BlobStore().release(file_)
                     os.remove(file_)
                 if os.path.isdir(file_):
+                    BlobStore().release_folder(file_)
                     shutil.rmtree(file_)
             except Exception:
                 logger = get_logger(__name__)
@@ -364,6 +414,7 @@ class FilesHelper(object):
         :param ignore_errors: When False throw FileStructureException if folder_path is invalid.
         """
         if os.path.isdir(folder_path):
+            BlobStore().release_folder(folder_path)
             shutil.rmtree(folder_path, ignore_errors)
             return
         if not ignore_errors:
@@ -374,9 +425,11 @@ class FilesHelper(object):
         """
         Given a file's path, return size occupied on disk by that file.
         Size should be a number, representing size in KB.
+        Deduplicated data sets are counted in full for every file linking them, so that sizes do not change
+        when data gets shared or when the other files sharing it are removed.
         """
         if os.path.isfile(file_path):
-            return int(os.path.getsize(file_path) / 1024)
+            return int(BlobStore().logical_size(file_path) / 1024)
         return 0
 
     @staticmethod
@@ -392,15 +445,37 @@ class FilesHelper(object):
             for f in file_names:
                 if f.endswith('.h5'):
                     fp = os.path.join(dir_path, f)
-                    total_size += os.path.getsize(fp)
+                    total_size += BlobStore().logical_size(fp)
                     n_files += 1
         return int(round(total_size / 1024.))
 
 
 class TvbZip(ZipFile):
+    # H5 files hold binary data which hardly compresses, so they are written as they are.
+    # Only the metadata files (XML, JSON, etc) are deflated.
+    STORED_EXTENSIONS = (".h5",)
+
     def __init__(self, dest_path, mode):
         ZipFile.__init__(self, dest_path, mode, ZIP_DEFLATED, True)
 
+    @classmethod
+    def compression_for(cls, file_name):
+        if file_name.lower().endswith(cls.STORED_EXTENSIONS):
+            return ZIP_STORED
+        return ZIP_DEFLATED
+
+    def write(self, filename, arcname=None, compress_type=None, compresslevel=None):
+        if compress_type is None:
+            compress_type = self.compression_for(str(filename))
+        if not BlobStore.shared_links_of(filename):
+            ZipFile.write(self, filename, arcname, compress_type, compresslevel)
+            return
+        # Archives leave the TVB storage, so they get the data of the shared data sets
+        with tempfile.TemporaryDirectory() as folder:
+            own_copy = os.path.join(folder, os.path.basename(filename))
+            BlobStore().copy(filename, own_copy, share=False)
+            ZipFile.write(self, own_copy, filename if arcname is None else arcname, compress_type, compresslevel)
+
     def __enter__(self):
         return self
 
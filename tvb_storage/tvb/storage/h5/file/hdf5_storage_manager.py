@@ -37,6 +37,7 @@ Persistence of data in HDF5 format.
 
 import copy
 import os
+import shutil
 import threading
 from datetime import datetime
 import h5py as hdf5
@@ -44,11 +45,14 @@ import numpy as numpy
 
 from tvb.basic.logger.builder import get_logger
 from tvb.basic.profile import TvbProfile
+from tvb.basic.timings import timed
 from tvb.storage.h5 import utils
 from tvb.storage.h5.encryption.data_encryption_handler import DataEncryptionHandler
+from tvb.storage.h5.file.blob_store import BlobStore
 from tvb.storage.h5.file.exceptions import MissingDataSetException, IncompatibleFileManagerException, \
     FileStructureException, MissingDataFileException
 from tvb.storage.h5.file.files_helper import FilesHelper
+from tvb.storage.h5.file.storage_policy import ALTERNATE_LAYOUT_SUFFIX, MAX_CHUNK_BYTES, chunks_touched
 
 # Create logger for this module
 LOG = get_logger(__name__)
@@ -56,6 +60,8 @@ LOG = get_logger(__name__)
 LOCK_OPEN_FILE = threading.Lock()
 BUFFER_SIZE = 300
 
+STAGE_H5_IO = "h5_io"
+
 
 class HDF5StorageManager(object):
     """
@@ -84,6 +90,7 @@ class HDF5StorageManager(object):
         self.__buffer_array = None
         self.data_buffers = {}
         self.data_encryption_handler = DataEncryptionHandler()
+        self.__pending_sync = False
 
     def is_valid_tvb_file(self):
         """
@@ -95,13 +102,15 @@ class HDF5StorageManager(object):
         except RuntimeError:
             return False
 
-    def store_data(self, data_list, dataset_name='', where=ROOT_NODE_PATH):
+    @timed(STAGE_H5_IO)
+    def store_data(self, data_list, dataset_name='', where=ROOT_NODE_PATH, storage_policy=None):
         """
         This method stores provided data list into a data set in the H5 file.
 
         :param dataset_name: Name of the data set where to store data
         :param data_list: Data to be stored
         :param where: represents the path where to store our dataset (e.g. /data/info)
+        :param storage_policy: optional StoragePolicy, applied when the data set is created
         """
         data_to_store = self._check_data(data_list)
 
@@ -111,11 +120,20 @@ class HDF5StorageManager(object):
             hdf5_file = self._open_h5_file()
 
             full_dataset_name = where + dataset_name
+            alternate_name = full_dataset_name + ALTERNATE_LAYOUT_SUFFIX
             if full_dataset_name not in hdf5_file:
-                hdf5_file.create_dataset(full_dataset_name, data=data_to_store)
-
-            elif hdf5_file[full_dataset_name].shape == data_to_store.shape:
+                options = self._dataset_options(storage_policy, data_to_store)
+                hdf5_file.create_dataset(full_dataset_name, data=data_to_store, **options)
+                if options and storage_policy.has_alternate_layout:
+                    hdf5_file.create_dataset(alternate_name, data=data_to_store,
+                                             **self._dataset_options(storage_policy, data_to_store, alternate=True))
+
+            elif self._get_node(hdf5_file, full_dataset_name).shape == data_to_store.shape:
+                self._unshare(hdf5_file, full_dataset_name)
                 hdf5_file[full_dataset_name][...] = data_to_store[...]
+                if alternate_name in hdf5_file:
+                    self._unshare(hdf5_file, alternate_name)
+                    hdf5_file[alternate_name][...] = data_to_store[...]
 
             else:
                 raise IncompatibleFileManagerException("Cannot update existing H5 DataSet %s with a different shape. "
@@ -124,10 +142,11 @@ class HDF5StorageManager(object):
         finally:
             # Now close file
             self.close_file()
-            self.data_encryption_handler.push_folder_to_sync(FilesHelper.get_project_folder_from_h5(
-                self.__storage_full_name))
+            self._push_file_to_sync()
 
-    def append_data(self, data_list, dataset_name='', grow_dimension=-1, close_file=True, where=ROOT_NODE_PATH):
+    @timed(STAGE_H5_IO)
+    def append_data(self, data_list, dataset_name='', grow_dimension=-1, close_file=True, where=ROOT_NODE_PATH,
+                    storage_policy=None):
         """
         This method appends data to an existing data set. If the data set does not exists, create it first.
 
@@ -137,36 +156,68 @@ class HDF5StorageManager(object):
         :param close_file: Specify if the file should be closed automatically after write operation. If not,
             you have to close file by calling method close_file()
         :param where: represents the path where to store our dataset (e.g. /data/info)
+        :param storage_policy: optional StoragePolicy, applied when the data set is created
 
         """
         data_to_store = self._check_data(data_list)
-        data_buffer = self.data_buffers.get(where + dataset_name, None)
+        datapath = where + dataset_name
+        created = self._append_to_dataset(datapath, data_to_store, grow_dimension,
+                                          self._dataset_options(storage_policy, data_to_store, grow_dimension))
 
-        if data_buffer is None:
-            hdf5_file = self._open_h5_file()
-            datapath = where + dataset_name
-            if datapath in hdf5_file:
-                dataset = hdf5_file[datapath]
-                self.data_buffers[datapath] = HDF5StorageManager.H5pyStorageBuffer(dataset,
-                                                                                   buffered_data=data_to_store,
-                                                                                   grow_dimension=grow_dimension)
-            else:
-                data_shape_list = list(data_to_store.shape)
-                data_shape_list[grow_dimension] = None
-                data_shape = tuple(data_shape_list)
-                dataset = hdf5_file.create_dataset(where + dataset_name, data=data_to_store, shape=data_to_store.shape,
-                                                   dtype=data_to_store.dtype, maxshape=data_shape)
-                self.data_buffers[datapath] = HDF5StorageManager.H5pyStorageBuffer(dataset,
-                                                                                   buffered_data=None,
-                                                                                   grow_dimension=grow_dimension)
+        if storage_policy is not None and storage_policy.has_alternate_layout:
+            # The second layout only exists for data sets created with it, files written before are left as they are
+            alternate_path = datapath + ALTERNATE_LAYOUT_SUFFIX
+            if created or alternate_path in self.data_buffers or alternate_path in self._open_h5_file():
+                options = self._dataset_options(storage_policy, data_to_store, grow_dimension, alternate=True)
+                self._append_to_dataset(alternate_path, data_to_store, grow_dimension, options)
+
+        if close_file:
+            self.close_file()
+            self._push_file_to_sync()
         else:
+            # An open file is still being written, it will be synchronised when closed
+            self.__pending_sync = True
+
+    def _append_to_dataset(self, datapath, data_to_store, grow_dimension, options):
+        """
+        Buffer data_to_store for appending to the data set at datapath, creating the data set with options if missing.
+        :returns: True when the data set was created by this call
+        """
+        data_buffer = self.data_buffers.get(datapath, None)
+        if data_buffer is not None:
             if not data_buffer.buffer_data(data_to_store):
                 data_buffer.flush_buffered_data()
-        if close_file:
-            self.close_file()
-        self.data_encryption_handler.push_folder_to_sync(
-            FilesHelper.get_project_folder_from_h5(self.__storage_full_name))
+            return False
+
+        hdf5_file = self._open_h5_file()
+        if datapath in hdf5_file:
+            self._unshare(hdf5_file, datapath)
+            dataset = hdf5_file[datapath]
+            self.data_buffers[datapath] = HDF5StorageManager.H5pyStorageBuffer(dataset,
+                                                                               buffered_data=data_to_store,
+                                                                               grow_dimension=grow_dimension)
+            return False
+
+        data_shape_list = list(data_to_store.shape)
+        data_shape_list[grow_dimension] = None
+        data_shape = tuple(data_shape_list)
+        dataset = hdf5_file.create_dataset(datapath, data=data_to_store, shape=data_to_store.shape,
+                                           dtype=data_to_store.dtype, maxshape=data_shape, **options)
+        self.data_buffers[datapath] = HDF5StorageManager.H5pyStorageBuffer(dataset,
+                                                                           buffered_data=None,
+                                                                           grow_dimension=grow_dimension)
+        return True
+
+    @staticmethod
+    def _dataset_options(storage_policy, data_to_store, grow_dimension=None, alternate=False):
+        """
+        :returns: the h5py create_dataset keyword arguments the storage policy asks for, for data_to_store
+        """
+        if storage_policy is None or isinstance(data_to_store, hdf5.Empty):
+            return {}
+        return storage_policy.dataset_options(data_to_store.shape, data_to_store.dtype, grow_dimension, alternate)
 
+    @timed(STAGE_H5_IO)
     def remove_data(self, dataset_name='', where=ROOT_NODE_PATH):
         """
         Deleting a data set from H5 file.
@@ -179,16 +230,20 @@ class HDF5StorageManager(object):
         try:
             # Open file in append mode ('a') to allow data remove
             hdf5_file = self._open_h5_file()
+            BlobStore().release_link(hdf5_file, where + dataset_name)
             del hdf5_file[where + dataset_name]
+            if where + dataset_name + ALTERNATE_LAYOUT_SUFFIX in hdf5_file:
+                BlobStore().release_link(hdf5_file, where + dataset_name + ALTERNATE_LAYOUT_SUFFIX)
+                del hdf5_file[where + dataset_name + ALTERNATE_LAYOUT_SUFFIX]
 
         except KeyError:
             LOG.warning("Trying to delete data set: %s but current file does not contain it." % dataset_name)
             raise FileStructureException("Could not locate dataset: %s" % dataset_name)
         finally:
             self.close_file()
-            self.data_encryption_handler.push_folder_to_sync(
-                FilesHelper.get_project_folder_from_h5(self.__storage_full_name))
+            self._push_file_to_sync()
 
+    @timed(STAGE_H5_IO)
     def get_data(self, dataset_name='', data_slice=None, where=ROOT_NODE_PATH, ignore_errors=False, close_file=True):
         """
         This method reads data from the given data set based on the slice specification
@@ -208,7 +263,7 @@ class HDF5StorageManager(object):
             # Open file to read data
             hdf5_file = self._open_h5_file('r')
             if data_path in hdf5_file:
-                data_array = hdf5_file[data_path]
+                data_array = self._get_node(hdf5_file, data_path)
                 # Now read data
                 if data_slice is None:
                     result = data_array[()]
@@ -216,7 +271,7 @@ class HDF5StorageManager(object):
                         return numpy.empty([])
                     return result
                 else:
-                    return data_array[data_slice]
+                    return self._cheapest_layout(hdf5_file, data_path, data_slice)[data_slice]
             else:
                 if not ignore_errors:
                     LOG.error("Trying to read data from a missing data set: %s" % dataset_name)
@@ -227,6 +282,43 @@ class HDF5StorageManager(object):
             if close_file:
                 self.close_file()
 
+    @staticmethod
+    def _get_node(hdf5_file, path):
+        """
+        :returns: the h5py node at path, where data sets shared through the blob store are opened read only
+        """
+        if BlobStore.shared_link(hdf5_file, path) is not None:
+            return BlobStore.open_shared(hdf5_file, path)
+        return hdf5_file[path]
+
+    @staticmethod
+    def _unshare(hdf5_file, path):
+        """
+        Give the file its own copy of the data set at path, when it is shared through the blob store,
+        before it gets changed.
+        """
+        BlobStore().unshare(hdf5_file, path)
+
+    @classmethod
+    def _cheapest_layout(cls, hdf5_file, data_path, data_slice):
+        """
+        :returns: the h5py data set at data_path, or its alternate layout when that one reads data_slice
+            by decompressing fewer chunks
+        """
+        data_array = cls._get_node(hdf5_file, data_path)
+        alternate_path = data_path + ALTERNATE_LAYOUT_SUFFIX
+        if alternate_path not in hdf5_file:
+            return data_array
+        alternate_array = cls._get_node(hdf5_file, alternate_path)
+        if alternate_array.shape != data_array.shape:
+            # An append was interrupted between the two layouts, the primary one is the reference
+            return data_array
+        own_chunks = chunks_touched(data_slice, data_array.shape, data_array.chunks)
+        alternate_chunks = chunks_touched(data_slice, alternate_array.shape, alternate_array.chunks)
+        if own_chunks is None or alternate_chunks is None or own_chunks <= alternate_chunks:
+            return data_array
+        return alternate_array
+
     def get_data_shape(self, dataset_name='', where=ROOT_NODE_PATH):
         """
         This method reads data-size from the given data set
@@ -240,7 +332,7 @@ class HDF5StorageManager(object):
         try:
             # Open file to read data
             hdf5_file = self._open_h5_file('r')
-            data_array = hdf5_file[where + dataset_name]
+            data_array = self._get_node(hdf5_file, where + dataset_name)
             return data_array.shape
         except KeyError:
             LOG.debug("Trying to read data from a missing data set: %s" % dataset_name)
@@ -249,6 +341,27 @@ class HDF5StorageManager(object):
         finally:
             self.close_file()
 
+    def get_data_dtype(self, dataset_name='', where=ROOT_NODE_PATH):
+        """
+        This method reads the data type of the elements in the given data set
+
+        :param dataset_name: Name of the data set from where to read data
+        :param where: represents the path where dataset is stored (e.g. /data/info)
+        :returns: a numpy.dtype instance
+        """
+        LOG.debug("Reading data type from data set: %s" % dataset_name)
+        try:
+            hdf5_file = self._open_h5_file('r')
+            data_array = self._get_node(hdf5_file, where + dataset_name)
+            return data_array.dtype
+        except KeyError:
+            LOG.debug("Trying to read data type from a missing data set: %s" % dataset_name)
+            raise MissingDataSetException("Could not locate dataset: %s" % dataset_name)
+
+        finally:
+            self.close_file()
+
+    @timed(STAGE_H5_IO)
     def set_metadata(self, meta_dictionary, dataset_name='', tvb_specific_metadata=True, where=ROOT_NODE_PATH):
         """
         Set meta-data information for root node or for a given data set.
@@ -264,6 +377,7 @@ class HDF5StorageManager(object):
         # Open file to read data
         hdf5_file = self._open_h5_file()
         try:
+            self._unshare(hdf5_file, where + dataset_name)
             node = hdf5_file[where + dataset_name]
         except KeyError:
             LOG.debug("Trying to set metadata on a missing data set: %s" % dataset_name)
@@ -280,8 +394,7 @@ class HDF5StorageManager(object):
                 node.attrs[key_to_store] = processed_value
         finally:
             self.close_file()
-            self.data_encryption_handler.push_folder_to_sync(
-                FilesHelper.get_project_folder_from_h5(self.__storage_full_name))
+            self._push_file_to_sync()
 
     @staticmethod
     def serialize_bool(value):
@@ -307,6 +420,7 @@ class HDF5StorageManager(object):
         else:
             return value
 
+    @timed(STAGE_H5_IO)
     def remove_metadata(self, meta_key, dataset_name='', tvb_specific_metadata=True, where=ROOT_NODE_PATH):
         """
         Remove meta-data information for root node or for a given data set.
@@ -322,6 +436,7 @@ class HDF5StorageManager(object):
         try:
             # Open file to read data
             hdf5_file = self._open_h5_file()
+            self._unshare(hdf5_file, where + dataset_name)
             node = hdf5_file[where + dataset_name]
 
             # Now delete metadata
@@ -337,9 +452,9 @@ class HDF5StorageManager(object):
             raise FileStructureException("There is no metadata named %s on this node" % meta_key)
         finally:
             self.close_file()
-            self.data_encryption_handler.push_folder_to_sync(
-                FilesHelper.get_project_folder_from_h5(self.__storage_full_name))
+            self._push_file_to_sync()
 
+    @timed(STAGE_H5_IO)
     def get_metadata(self, dataset_name='', where=ROOT_NODE_PATH):
         """
         Retrieve ALL meta-data information for root node or for a given data set.
@@ -354,7 +469,7 @@ class HDF5StorageManager(object):
         try:
             # Open file to read data
             hdf5_file = self._open_h5_file('r')
-            node = hdf5_file[where + dataset_name]
+            node = self._get_node(hdf5_file, where + dataset_name)
             # Now retrieve metadata values
             all_meta_data = {}
 
@@ -382,6 +497,74 @@ class HDF5StorageManager(object):
         finally:
             self.close_file()
 
+    def repack(self, storage_policies):
+        """
+        Rewrite this file with the given storage policies, then replace it in place.
+        Data sets without a policy, together with all the attributes, are copied unchanged.
+
+        :param storage_policies: dictionary {data set name: StoragePolicy} for data sets on the root node
+        :returns: the file size in bytes, before and after repacking
+        """
+        self.close_file()
+        size_before = os.path.getsize(self.__storage_full_name)
+        temporary_path = self.__storage_full_name + ".repack"
+        try:
+            with hdf5.File(self.__storage_full_name, 'r') as source, \
+                    hdf5.File(temporary_path, 'w', libver='latest') as target:
+                for meta_key, value in source.attrs.items():
+                    target.attrs[meta_key] = value
+                for name, node in source.items():
+                    if name.endswith(ALTERNATE_LAYOUT_SUFFIX):
+                        primary_name = name[:-len(ALTERNATE_LAYOUT_SUFFIX)]
+                        if BlobStore.shared_link(source, primary_name) is None:
+                            # Rebuilt from the primary layout, when the policy still asks for it
+                            continue
+                    shared_link = BlobStore.shared_link(source, name)
+                    if shared_link is not None:
+                        # Shared data keeps its layout, changing it would mean a private copy
+                        target[name] = hdf5.ExternalLink(shared_link.filename, shared_link.path)
+                        continue
+                    policy = storage_policies.get(name)
+                    if not self._copy_with_policy(node, target, name, policy):
+                        source.copy(node, target, name=name)
+                    elif policy.has_alternate_layout:
+                        self._copy_with_policy(node, target, name + ALTERNATE_LAYOUT_SUFFIX, policy, alternate=True)
+            shutil.copymode(self.__storage_full_name, temporary_path)
+            os.replace(temporary_path, self.__storage_full_name)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+        self._push_file_to_sync()
+        return size_before, os.path.getsize(self.__storage_full_name)
+
+    @staticmethod
+    def _copy_with_policy(node, target, name, policy, alternate=False):
+        """
+        Copy the h5py data set node under target, laid out as the storage policy asks.
+        :returns: False when the node is not a data set the policy applies to, and nothing was copied
+        """
+        if policy is None or not isinstance(node, hdf5.Dataset) or node.shape is None:
+            return False
+        growing = [dim for dim, length in enumerate(node.maxshape) if length is None]
+        grow_dimension = growing[0] if growing else None
+        options = policy.dataset_options(node.shape, node.dtype, grow_dimension, alternate)
+        if not options:
+            return False
+        # The data is complete by now, chunks longer than the data would only be padding
+        options['chunks'] = tuple(min(chunk, max(1, length)) for chunk, length in zip(options['chunks'], node.shape))
+
+        dataset = target.create_dataset(name, shape=node.shape, dtype=node.dtype,
+                                        maxshape=node.maxshape if growing else None, **options)
+        if node.size > 0:
+            # Copy in blocks along the first axis, to keep large time series out of memory
+            row_bytes = max(1, node.dtype.itemsize * node.size // node.shape[0])
+            step = max(1, 16 * MAX_CHUNK_BYTES // row_bytes)
+            for start in range(0, node.shape[0], step):
+                dataset[start:start + step] = node[start:start + step]
+        for meta_key, value in node.attrs.items():
+            dataset.attrs[meta_key] = value
+        return True
+
     def get_file_data_version(self, data_version, dataset_name='', where=ROOT_NODE_PATH):
         """
         Checks the data version for the current file.
@@ -439,6 +622,7 @@ class HDF5StorageManager(object):
             raise Exception("Some lock was deleted without being released beforehand.")
         lock.release()
 
+    @timed(STAGE_H5_IO)
     def close_file(self):
         """
         The synchronization of open/close doesn't seem to be needed anymore for h5py in
@@ -451,6 +635,16 @@ class HDF5StorageManager(object):
             self.__close_file()
         finally:
             self.__release_lock()
+        if self.__pending_sync:
+            self._push_file_to_sync()
+
+    def _push_file_to_sync(self):
+        """
+        Mark the current file as changed and push its project folder to be synchronised with the encrypted storage.
+        """
+        self.__pending_sync = False
+        self.data_encryption_handler.push_folder_to_sync(
+            FilesHelper.get_project_folder_from_h5(self.__storage_full_name), self.__storage_full_name)
 
     def _open_h5_file(self, mode='a'):
         """
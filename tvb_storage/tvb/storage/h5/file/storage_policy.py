@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and 
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Declarative on-disk layout (chunking, compression and an optional second layout) for H5 data sets.
+"""
+
+import numpy
+
+# HDF5 keeps a 1 MiB chunk cache per open data set: larger chunks would be decompressed again on every read
+MAX_CHUNK_BYTES = 1024 * 1024
+# The last chunk along a growing axis is allocated whole, so its length bounds the space lost at the end of the data
+MAX_GROWING_CHUNK_LENGTH = 64
+ALTERNATE_LAYOUT_SUFFIX = "__alternate_layout"
+
+
+class StoragePolicy(object):
+    """
+    Describes how one data set is laid out in its H5 file.
+
+    Chunk shapes are given per dimension: an int fixes the chunk length on that axis, while None means
+    "the whole axis" (or, on the growing axis of an appended data set, "as many rows as fit in a chunk", up to
+    MAX_GROWING_CHUNK_LENGTH).
+    Chunks are halved on their longest axis until they hold at most MAX_CHUNK_BYTES. A chunk shape which does not
+    match the dimensions of the data is ignored.
+    The alternate chunk shape, when given, makes the storage keep a second copy of the data set chunked for
+    the other dominant access pattern (e.g. one voxel over all time points); reads pick the cheaper copy.
+    """
+
+    def __init__(self, chunks=None, compression=None, compression_level=None, shuffle=False,
+                 alternate_chunks=None):
+        self.chunks = tuple(chunks) if chunks is not None else None
+        self.compression = compression
+        self.compression_level = compression_level
+        self.shuffle = shuffle
+        self.alternate_chunks = tuple(alternate_chunks) if alternate_chunks is not None else None
+
+    @property
+    def has_alternate_layout(self):
+        return self.alternate_chunks is not None
+
+    def dataset_options(self, shape, dtype, grow_dimension=None, alternate=False):
+        """
+        :returns: the keyword arguments for h5py create_dataset, for data of the given shape and dtype
+        """
+        dtype = numpy.dtype(dtype)
+        if len(shape) == 0 or dtype.kind in 'OSUV' or dtype.itemsize == 0:
+            # Scalars, empty markers and strings are stored as they come
+            return {}
+        options = {}
+        chunk_spec = self.alternate_chunks if alternate else self.chunks
+        if chunk_spec is not None or grow_dimension is not None or self.compression is not None:
+            options['chunks'] = self._chunk_shape(shape, dtype.itemsize, chunk_spec, grow_dimension)
+        if self.compression is not None:
+            options['compression'] = self.compression
+            if self.compression_level is not None:
+                options['compression_opts'] = self.compression_level
+            options['shuffle'] = self.shuffle
+        return options
+
+    @staticmethod
+    def _chunk_shape(shape, itemsize, chunk_spec, grow_dimension):
+        ndim = len(shape)
+        if chunk_spec is None or len(chunk_spec) != ndim:
+            # Data sets like TimeSeries.data do not always have the dimensions the policy was written for
+            chunk_spec = (None,) * ndim
+        if grow_dimension is not None:
+            grow_dimension %= ndim
+
+        chunks = []
+        for dim, (length, spec) in enumerate(zip(shape, chunk_spec)):
+            if dim == grow_dimension:
+                chunks.append(spec)
+            else:
+                chunks.append(max(1, length if spec is None else min(spec, length)))
+
+        if grow_dimension is not None and chunks[grow_dimension] is None:
+            row_bytes = itemsize * int(numpy.prod([c for dim, c in enumerate(chunks) if dim != grow_dimension]))
+            chunks[grow_dimension] = max(1, min(MAX_CHUNK_BYTES // max(row_bytes, 1), MAX_GROWING_CHUNK_LENGTH))
+
+        while itemsize * int(numpy.prod(chunks)) > MAX_CHUNK_BYTES and max(chunks) > 1:
+            longest = chunks.index(max(chunks))
+            chunks[longest] = (chunks[longest] + 1) // 2
+        return tuple(chunks)
+
+
+def chunks_touched(data_slice, shape, chunks):
+    """
+    Count the chunks a read of data_slice has to decompress, in a data set of the given shape and chunk shape.
+    :returns: the number of chunks, or None when the selection is not made of ints and slices only
+    """
+    if chunks is None:
+        return None
+    if not isinstance(data_slice, tuple):
+        data_slice = (data_slice,)
+    if len(data_slice) > len(shape):
+        return None
+
+    touched = 1
+    for dim, length in enumerate(shape):
+        selection = data_slice[dim] if dim < len(data_slice) else slice(None)
+        if isinstance(selection, (int, numpy.integer)):
+            first = last = selection % length if length else 0
+        elif isinstance(selection, slice):
+            indices = range(*selection.indices(length))
+            if len(indices) == 0:
+                return 0
+            first, last = min(indices[0], indices[-1]), max(indices[0], indices[-1])
+        else:
+            return None
+        touched *= last // chunks[dim] - first // chunks[dim] + 1
+    return touched
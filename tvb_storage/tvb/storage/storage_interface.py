@@ -43,6 +43,7 @@ from tvb.basic.profile import TvbProfile
 from tvb.storage.h5.encryption.data_encryption_handler import DataEncryptionHandler, FoldersQueueConsumer, \
     encryption_handler
 from tvb.storage.h5.encryption.encryption_handler import EncryptionHandler
+from tvb.storage.h5.file.blob_store import BlobStore
 from tvb.storage.h5.file.exceptions import RenameWhileSyncEncryptingException
 from tvb.storage.h5.file.files_helper import FilesHelper, TvbZip
 from tvb.storage.h5.file.hdf5_storage_manager import HDF5StorageManager
@@ -165,6 +166,33 @@ class StorageInterface:
     def compute_recursive_h5_disk_usage(start_path='.'):
         return FilesHelper.compute_recursive_h5_disk_usage(start_path)
 
+    # BlobStore methods start here #
+
+    def deduplicate_h5(self, h5_path):
+        """
+        Share the large data sets of the given H5 file with all the files holding the same data.
+        Encrypted storage is left alone: the shared blobs are not under the encrypted project folders.
+        :returns: the number of bytes freed
+        """
+        if self.encryption_enabled():
+            return 0
+        return BlobStore().deduplicate(h5_path)
+
+    @staticmethod
+    def collect_blob_garbage():
+        """
+        Remove the shared data sets no H5 file in the projects folder links to anymore.
+        :returns: the number of bytes freed
+        """
+        return BlobStore().collect_garbage([FilesHelper.get_projects_folder()])
+
+    @staticmethod
+    def compute_blob_store_size():
+        """
+        :returns: the size in KB taken on disk by the shared data sets, each counted once
+        """
+        return int(BlobStore().physical_size() / 1024)
+
     # TvbZip methods start here #
 
     def write_zip_folder(self, dest_path, folder, exclude=None):
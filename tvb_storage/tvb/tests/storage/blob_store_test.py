@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and 
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Tests for the content-addressed sharing of H5 data sets.
+"""
+
+import os
+import shutil
+from zipfile import ZipFile
+
+import h5py
+import numpy
+
+from tvb.basic.profile import TvbProfile
+from tvb.storage.h5.file.blob_store import BlobStore, BLOB_FILE
+from tvb.storage.h5.file.files_helper import TvbZip
+from tvb.storage.h5.file.hdf5_storage_manager import HDF5StorageManager
+from tvb.storage.storage_interface import StorageInterface
+from tvb.tests.storage.storage_test import StorageTestCase
+
+
+class TestBlobStore(StorageTestCase):
+    """
+    Identical data sets stored once, and reference counted through the files linking them.
+    """
+
+    def storage_setup_method(self):
+        self.storage_interface = StorageInterface()
+        self.blob_store = BlobStore()
+        self.weights = numpy.random.random((200, 200))
+        self.paths = [self._write_file("project_%d" % i) for i in range(2)]
+
+    def storage_teardown_method(self):
+        self.delete_projects_folders()
+        shutil.rmtree(self.blob_store.root, ignore_errors=True)
+
+    def _write_file(self, project_name):
+        path = os.path.join(self.storage_interface.get_project_folder(project_name, "1"), "Connectivity_gid.h5")
+        storage = HDF5StorageManager(path)
+        storage.store_data(self.weights, "weights")
+        storage.store_data(numpy.arange(10), "small")
+        storage.set_metadata({"gid": project_name})
+        storage.set_metadata({"unit": "mm"}, "weights")
+        storage.close_file()
+        return path
+
+    def _blobs(self):
+        return [os.path.join(root, name) for root, _, files in os.walk(self.blob_store.root)
+                for name in files if name == BLOB_FILE]
+
+    def test_deduplicate(self):
+        size_before = self.storage_interface.compute_size_on_disk(self.paths[0])
+        for path in self.paths:
+            assert self.storage_interface.deduplicate_h5(path) > self.weights.nbytes / 2
+
+        blobs = self._blobs()
+        assert len(blobs) == 1
+        # The blob and one reference per file
+        assert os.stat(blobs[0]).st_nlink == 3
+        for i, path in enumerate(self.paths):
+            assert os.path.getsize(path) < self.weights.nbytes / 2
+            assert list(BlobStore.shared_links_of(path)) == ["/weights"]
+            storage = HDF5StorageManager(path)
+            numpy.testing.assert_array_equal(storage.get_data("weights"), self.weights)
+            numpy.testing.assert_array_equal(storage.get_data("weights", (slice(2, 4),)), self.weights[2:4])
+            assert storage.get_metadata("weights")["unit"] == "mm"
+            assert storage.get_metadata()["gid"] == "project_%d" % i
+            # Sizes do not depend on sharing
+            assert abs(self.storage_interface.compute_size_on_disk(path) - size_before) <= 4
+
+    def test_release_last_reference(self):
+        for path in self.paths:
+            self.storage_interface.deduplicate_h5(path)
+        blob = self._blobs()[0]
+
+        self.storage_interface.remove_datatype_file(self.paths[0])
+        assert os.stat(blob).st_nlink == 2
+        self.storage_interface.remove_project_structure("project_1")
+        assert not os.path.exists(os.path.dirname(blob))
+
+    def test_write_shared_data(self):
+        for path in self.paths:
+            self.storage_interface.deduplicate_h5(path)
+        blob = self._blobs()[0]
+
+        storage = HDF5StorageManager(self.paths[0])
+        storage.store_data(self.weights * 2, "weights")
+        storage.set_metadata({"unit": "m"}, "weights")
+        storage.close_file()
+
+        assert BlobStore.shared_links_of(self.paths[0]) == {}
+        assert os.stat(blob).st_nlink == 2
+        numpy.testing.assert_array_equal(storage.get_data("weights"), self.weights * 2)
+        other = HDF5StorageManager(self.paths[1])
+        numpy.testing.assert_array_equal(other.get_data("weights"), self.weights)
+        assert other.get_metadata("weights")["unit"] == "mm"
+
+        other.remove_data("weights")
+        assert not os.path.exists(blob)
+
+    def test_copy_file(self):
+        self.storage_interface.deduplicate_h5(self.paths[0])
+        blob = self._blobs()[0]
+
+        in_storage = os.path.join(self.storage_interface.get_project_folder("project_2", "1", "2"), "copy.h5")
+        StorageInterface.copy_file(self.paths[0], in_storage)
+        assert list(BlobStore.shared_links_of(in_storage)) == ["/weights"]
+        assert os.stat(blob).st_nlink == 3
+
+        outside = os.path.join(TvbProfile.current.TVB_TEMP_FOLDER, "exported.h5")
+        StorageInterface.copy_file(in_storage, outside)
+        assert BlobStore.shared_links_of(outside) == {}
+        numpy.testing.assert_array_equal(HDF5StorageManager(outside).get_data("weights"), self.weights)
+        os.remove(outside)
+
+        zip_path = os.path.join(TvbProfile.current.TVB_TEMP_FOLDER, "exported.zip")
+        with TvbZip(zip_path, "w") as zip_file:
+            zip_file.write(in_storage, "copy.h5")
+        with ZipFile(zip_path) as zip_file, zip_file.open("copy.h5") as archived:
+            with h5py.File(archived, 'r') as h5_file:
+                assert isinstance(h5_file.get("weights", getlink=True), h5py.HardLink)
+                numpy.testing.assert_array_equal(h5_file["weights"][()], self.weights)
+        os.remove(zip_path)
+
+    def test_collect_garbage(self):
+        for path in self.paths:
+            self.storage_interface.deduplicate_h5(path)
+        assert StorageInterface.collect_blob_garbage() == 0
+
+        for path in self.paths:
+            # Removed without going through the storage API
+            os.remove(path)
+        assert StorageInterface.collect_blob_garbage() >= self.weights.nbytes
+        assert self._blobs() == []
+        assert StorageInterface.compute_blob_store_size() == 0
+
+    def test_links_out_of_store_are_never_removed(self):
+        # A file, e.g. imported, with links into a folder which only looks like a blob store
+        outside = os.path.join(os.path.dirname(self.paths[0]), "outside", "BLOBS", "ab", "abcd")
+        os.makedirs(outside)
+        victims = [os.path.join(outside, name) for name in ("victim.h5", BLOB_FILE)]
+        for victim in victims:
+            with h5py.File(victim, 'w') as victim_file:
+                victim_file["data"] = self.weights
+        with h5py.File(self.paths[0], 'a') as h5_file:
+            h5_file["absolute"] = h5py.ExternalLink(victims[0], "/data")
+            h5_file["relative"] = h5py.ExternalLink(os.path.relpath(victims[0], os.path.dirname(self.paths[0])),
+                                                    "/data")
+        assert sorted(BlobStore.shared_links_of(self.paths[0])) == ["/absolute", "/relative"]
+
+        self.blob_store.release(self.paths[0])
+        StorageInterface.collect_blob_garbage()
+        assert self.blob_store.logical_size(self.paths[0]) == os.path.getsize(self.paths[0])
+        storage = HDF5StorageManager(self.paths[0])
+        storage.remove_data("absolute")
+        storage.close_file()
+
+        for victim in victims:
+            assert os.path.exists(victim)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import inspect
+import os
+import pytest
+
+import syncrypto
+from syncrypto import Crypto, Syncrypto
+from tvb.storage.h5.encryption.data_encryption_handler import DataEncryptionHandler, FoldersQueueConsumer, \
+    SyncryptoTrees, encryption_handler
+
+
+class TestDataEncryptionHandler(object):
+    """
+    This class contains tests for the synchronisation queue of tvb.storage.h5.encryption.data_encryption_handler
+    """
+
+    @pytest.fixture(autouse=True)
+    def sync_calls(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(DataEncryptionHandler, "encryption_enabled", staticmethod(lambda: True))
+        monkeypatch.setattr(DataEncryptionHandler, "sync_folders", staticmethod(lambda folder, changed_files=None: calls.append((folder, changed_files))))
+        monkeypatch.setattr(DataEncryptionHandler, "SYNC_COALESCE_DELAY", 0)
+        yield calls
+        encryption_handler.queue_elements_count.clear()
+        encryption_handler.dirty_files.clear()
+
+    def test_push_coalesces_folder(self, sync_calls):
+        folder = os.path.join("projects", "coalesced")
+        for i in range(5):
+            encryption_handler.push_folder_to_sync(folder, os.path.join(folder, "file_%d.h5" % i))
+        assert encryption_handler.is_in_usage(folder)
+        assert len(encryption_handler.dirty_files[folder]) == 5
+
+        consumer = FoldersQueueConsumer()
+        consumer.start()
+        consumer.mark_stop()
+        consumer.join(5)
+
+        assert not consumer.is_alive()
+        assert sync_calls == [(folder, {os.path.join(folder, "file_%d.h5" % i) for i in range(5)})]
+        assert not encryption_handler.is_in_usage(folder)
+        assert folder not in encryption_handler.dirty_files
+
+    def test_push_during_sync_requeues_folder(self, sync_calls):
+        folder = os.path.join("projects", "requeued")
+        encryption_handler.push_folder_to_sync(folder)
+        changed_files = encryption_handler.start_folder_sync(folder)
+        assert changed_files is None
+        assert encryption_handler.is_in_usage(folder)
+
+        encryption_handler.push_folder_to_sync(folder, os.path.join(folder, "file.h5"))
+        encryption_handler.finish_folder_sync(folder)
+        assert encryption_handler.is_in_usage(folder)
+
+        consumer = FoldersQueueConsumer()
+        consumer.start()
+        consumer.mark_stop()
+        consumer.join(5)
+
+        assert sync_calls == [(folder, {os.path.join(folder, "file.h5")})]
+        assert not encryption_handler.is_in_usage(folder)
+
+    def test_push_without_file_syncs_whole_folder(self, sync_calls):
+        folder = os.path.join("projects", "whole")
+        encryption_handler.push_folder_to_sync(folder, os.path.join(folder, "file.h5"))
+        encryption_handler.push_folder_to_sync(folder)
+        encryption_handler.push_folder_to_sync(folder, os.path.join(folder, "other.h5"))
+
+        assert encryption_handler.start_folder_sync(folder) is None
+        encryption_handler.finish_folder_sync(folder)
+
+    def test_encrypt_changed_files(self, tmpdir):
+        plain_folder = str(tmpdir.mkdir("project"))
+        encrypted_folder = str(tmpdir.join("project_encrypted"))
+        crypto = Crypto("test_password")
+        for name in ("changed.h5", "untouched.h5"):
+            with open(os.path.join(plain_folder, name), "w") as f:
+                f.write(name)
+        first_sync = Syncrypto(crypto, encrypted_folder, plain_folder)
+        first_sync.sync_folder()
+        untouched_path = first_sync.encrypted_tree.get("untouched.h5").fs_path(encrypted_folder)
+        os.utime(untouched_path, (0, 0))
+
+        with open(os.path.join(plain_folder, "changed.h5"), "w") as f:
+            f.write("new content")
+        with open(os.path.join(plain_folder, "new.h5"), "w") as f:
+            f.write("new file")
+        changed_files = {os.path.join(plain_folder, "changed.h5"), os.path.join(plain_folder, "new.h5")}
+        syncro = Syncrypto(crypto, encrypted_folder, plain_folder)
+        assert DataEncryptionHandler._encrypt_changed_files(syncro, changed_files)
+        assert os.path.getmtime(untouched_path) == 0
+
+        decrypted_folder = str(tmpdir.join("decrypted"))
+        Syncrypto(crypto, encrypted_folder, decrypted_folder).sync_folder()
+        for name, content in (("changed.h5", "new content"), ("untouched.h5", "untouched.h5"),
+                              ("new.h5", "new file")):
+            with open(os.path.join(decrypted_folder, name)) as f:
+                assert f.read() == content
+
+    def test_encrypt_deleted_file_needs_full_sync(self, tmpdir):
+        plain_folder = str(tmpdir.mkdir("project"))
+        encrypted_folder = str(tmpdir.join("project_encrypted"))
+        crypto = Crypto("test_password")
+        deleted_file = os.path.join(plain_folder, "deleted.h5")
+        with open(deleted_file, "w") as f:
+            f.write("deleted")
+        Syncrypto(crypto, encrypted_folder, plain_folder).sync_folder()
+        os.remove(deleted_file)
+
+        syncro = Syncrypto(crypto, encrypted_folder, plain_folder)
+        assert not DataEncryptionHandler._encrypt_changed_files(syncro, {deleted_file})
+
+    def test_syncrypto_private_api(self, tmpdir):
+        # Fails when syncrypto is upgraded and the private members used by SyncryptoTrees are gone or changed
+        assert syncrypto.__version__ == SyncryptoTrees.SYNCRYPTO_VERSION
+        for name, parameters in SyncryptoTrees.PRIVATE_API.items():
+            assert tuple(inspect.signature(getattr(Syncrypto, name)).parameters) == parameters, name
+        syncro = Syncrypto(Crypto("test_password"), str(tmpdir.join("project_encrypted")),
+                           str(tmpdir.mkdir("project")))
+        for attribute in ("_encrypted_folder_is_new", "plain_tree", "encrypted_tree", "snapshot_tree"):
+            assert hasattr(syncro, attribute), attribute
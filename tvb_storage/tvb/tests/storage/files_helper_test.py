@@ -36,6 +36,7 @@
 
 import os
 import pytest
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 
 from tvb.basic.profile import TvbProfile
 from tvb.storage.h5.file.exceptions import FileStructureException
@@ -204,6 +205,51 @@ class TestFilesHelper(StorageTestCase):
         with pytest.raises(FileStructureException):
             self.files_helper.remove_folder(folder_name, ignore_errors=False)
 
+    def test_zip_and_unpack_folder(self, tmpdir):
+        """
+        H5 files are stored uncompressed, metadata is deflated and unpacking restores all files in order.
+        """
+        source = tmpdir.mkdir("source")
+        for op_idx in range(3):
+            op_folder = source.mkdir("Operation_%d" % op_idx)
+            op_folder.join("data_%d.h5" % op_idx).write_binary(os.urandom(2048 * (op_idx + 1)))
+            op_folder.join("Operation.xml").write("<tvb_data>%s</tvb_data>" % ("x" * 1024))
+        zip_path = str(tmpdir.join("export.zip"))
+        FilesHelper.zip_folder(zip_path, str(source))
+
+        with ZipFile(zip_path) as zip_arch:
+            for info in zip_arch.infolist():
+                expected = ZIP_STORED if info.filename.endswith(".h5") else ZIP_DEFLATED
+                assert info.compress_type == expected
+            names = zip_arch.namelist()
+
+        target = str(tmpdir.join("target"))
+        extracted = self.files_helper.unpack_zip(zip_path, target)
+        assert extracted == [os.path.join(target, name) for name in names]
+        for name in names:
+            with open(os.path.join(str(source), name), "rb") as expected_file, \
+                    open(os.path.join(target, name), "rb") as extracted_file:
+                assert expected_file.read() == extracted_file.read()
+
+    def test_unpack_zip_stays_in_folder(self, tmpdir):
+        """
+        Members named with ../ or absolute paths are extracted inside the target folder, never outside of it.
+        """
+        zip_path = str(tmpdir.join("malicious.zip"))
+        with ZipFile(zip_path, 'w') as zip_arch:
+            zip_arch.writestr("../../escaped_folder/escaped.txt", "x")
+            zip_arch.writestr(str(tmpdir.join("absolute_folder", "absolute.txt")), "x")
+            zip_arch.writestr("inside/inside.txt", "x")
+
+        target = str(tmpdir.join("parent", "target"))
+        extracted = self.files_helper.unpack_zip(zip_path, target)
+
+        assert not os.path.exists(str(tmpdir.join("escaped_folder")))
+        assert not os.path.exists(str(tmpdir.join("absolute_folder")))
+        for path in extracted:
+            assert os.path.realpath(path).startswith(os.path.realpath(target) + os.sep)
+        assert os.listdir(str(tmpdir.join("parent"))) == ["target"]
+
     def _dictContainsSubset(self, expected, actual, msg=None):
         """Checks whether actual is a superset of expected."""
         missing = []
@@ -34,6 +34,7 @@
 """
 
 import os
+import h5py
 import numpy
 import shutil
 import pytest
@@ -42,6 +43,7 @@ from tvb.basic.profile import TvbProfile
 from tvb.storage.h5.file.exceptions import MissingDataSetException, IncompatibleFileManagerException, \
     FileStructureException
 from tvb.storage.h5.file.hdf5_storage_manager import HDF5StorageManager
+from tvb.storage.h5.file.storage_policy import StoragePolicy, ALTERNATE_LAYOUT_SUFFIX, chunks_touched
 from tvb.storage.storage_interface import StorageInterface
 
 # Some constants used by tests
@@ -459,3 +461,64 @@ class TestHDF5Storage(object):
         read_data = self.storage.get_metadata('', StorageInterface.ROOT_NODE_PATH)
         self._assert_arrays_are_equal(TvbProfile.current.version.DATA_VERSION,
                                       read_data[TvbProfile.current.version.DATA_VERSION_ATTRIBUTE])
+
+    def test_store_data_with_storage_policy(self):
+        """
+        Test that chunks and compression declared by a storage policy are applied to a new data set
+        """
+        policy = StoragePolicy(chunks=(5, None), compression='gzip', compression_level=4, shuffle=True)
+        self.storage.store_data(self.test_2D_array, DATASET_NAME_1, storage_policy=policy)
+
+        with h5py.File(os.path.join(self.storage_folder, STORAGE_FILE_NAME), 'r') as h5_file:
+            assert h5_file[DATASET_NAME_1].chunks == (5, 10)
+            assert h5_file[DATASET_NAME_1].compression == 'gzip'
+            assert h5_file[DATASET_NAME_1].shuffle
+        self._assert_arrays_are_equal(self.test_2D_array, self.storage.get_data(DATASET_NAME_1))
+
+    def test_append_data_alternate_layout(self):
+        """
+        Test that a second layout is kept in sync at append time, used for the reads it serves better,
+        and removed together with its data set
+        """
+        policy = StoragePolicy(chunks=(None, None), alternate_chunks=(None, 1))
+        for row in self.test_2D_array:
+            self.storage.append_data(row.reshape((1, 10)), DATASET_NAME_1, grow_dimension=0, close_file=False,
+                                     storage_policy=policy)
+        self.storage.close_file()
+
+        alternate_name = DATASET_NAME_1 + ALTERNATE_LAYOUT_SUFFIX
+        self._assert_arrays_are_equal(self.test_2D_array, self.storage.get_data(DATASET_NAME_1))
+        self._assert_arrays_are_equal(self.test_2D_array, self.storage.get_data(alternate_name))
+        self._assert_arrays_are_equal(self.test_2D_array[:, 3], self.storage.get_data(DATASET_NAME_1, (slice(None), 3)))
+
+        hdf5_file = self.storage._open_h5_file('r')
+        primary, alternate = hdf5_file[DATASET_NAME_1], hdf5_file[alternate_name]
+        assert chunks_touched((slice(None), 3), primary.shape, primary.chunks) == 1
+        assert chunks_touched(3, primary.shape, primary.chunks) == 1
+        assert chunks_touched(3, alternate.shape, alternate.chunks) == 10
+        assert self.storage._cheapest_layout(hdf5_file, DATASET_NAME_1, 3) == primary
+        self.storage.close_file()
+
+        self.storage.remove_data(DATASET_NAME_1)
+        assert self.storage.get_data(alternate_name, ignore_errors=True) is None
+
+    def test_repack(self):
+        """
+        Test that repacking rewrites the data sets with a policy and copies the others with their metadata
+        """
+        self.storage.append_data(self.test_2D_array, DATASET_NAME_1, grow_dimension=0)
+        self.storage.store_data(self.test_3D_array, DATASET_NAME_2)
+        self.storage.set_metadata(META_DICT, DATASET_NAME_1)
+
+        policy = StoragePolicy(chunks=(2, None), compression='gzip', alternate_chunks=(None, 1))
+        self.storage.repack({DATASET_NAME_1: policy})
+
+        with h5py.File(os.path.join(self.storage_folder, STORAGE_FILE_NAME), 'r') as h5_file:
+            assert h5_file[DATASET_NAME_1].chunks == (2, 10)
+            assert h5_file[DATASET_NAME_1].maxshape == (None, 10)
+            # chunks on the growing axis are not longer than the data already written
+            assert h5_file[DATASET_NAME_1 + ALTERNATE_LAYOUT_SUFFIX].chunks == (10, 1)
+            assert h5_file[DATASET_NAME_2].chunks is None
+        self._assert_arrays_are_equal(self.test_2D_array, self.storage.get_data(DATASET_NAME_1))
+        self._assert_arrays_are_equal(self.test_3D_array, self.storage.get_data(DATASET_NAME_2))
+        assert META_VALUE == self.storage.get_metadata(DATASET_NAME_1)[META_KEY]